@@ -1,10 +1,29 @@
 import azure.functions as func
 import logging
 import json 
-import requests
 import aiohttp
 import asyncio
+import atexit
+import hashlib
 import os
+import random
+import time
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional, Union
+
+from azure.servicebus import ServiceBusMessage
+from azure.servicebus.aio import ServiceBusClient
+
+try:
+    # siren_common_utility가 함께 배포된 경우에만 계측/중복 방지를 사용할 수 있다. (켰는데 없으면 시작 시 실패한다)
+    from siren_common_utility.modules.telemetry import PROMETHEUS_CONTENT_TYPE, TELEMETRY, render_prometheus
+except ImportError:
+    TELEMETRY = None
+try:
+    from siren_common_utility.modules.dedup import LocalDedupStore
+except ImportError:
+    LocalDedupStore = None
 
 app = func.FunctionApp()
 
@@ -13,59 +32,684 @@ backend_base_port = os.getenv("BACKEND_BASE_PORT")
 
 # 동시성 제한 (외부 백엔드 보호)
 MAX_CONCURRENCY = int(os.getenv("MAX_CONCURRENCY", "10"))
-_semaphore = asyncio.Semaphore(MAX_CONCURRENCY)
+
+# 우선순위별 동시성 예약 (메세지의 Priority 속성, 없으면 Severity 속성)
+# MAX_CONCURRENCY 중 RELAY_PRIORITY_RESERVED개 슬롯은 RELAY_PRIORITY_RESERVED_FOR 이상의 우선순위만 사용하고,
+# 슬롯이 비면 높은 우선순위의 대기 요청부터 실행한다. (일반 알림이 몰려도 위급 알림이 뒤에서 기다리지 않는다)
+RELAY_PRIORITIES = ("critical", "high", "normal", "low")
+RELAY_DEFAULT_PRIORITY = "normal"
+RELAY_PRIORITY_RESERVED = int(os.getenv("RELAY_PRIORITY_RESERVED", str(max(1, MAX_CONCURRENCY // 5))))
+RELAY_PRIORITY_RESERVED_FOR = os.getenv("RELAY_PRIORITY_RESERVED_FOR", "high").lower()
+if RELAY_PRIORITY_RESERVED_FOR not in RELAY_PRIORITIES:
+    raise ValueError(f"RELAY_PRIORITY_RESERVED_FOR must be one of {RELAY_PRIORITIES}, got {RELAY_PRIORITY_RESERVED_FOR!r}")
+_PRIORITY_ALIASES = {"emergency": "critical", "urgent": "critical", "medium": "normal", "moderate": "normal", "routine": "low"}
 
 # 타임아웃
 TIMEOUT_SEC = int(os.getenv("HTTP_TIMEOUT_SEC", "10"))
 _client_timeout = aiohttp.ClientTimeout(total=TIMEOUT_SEC)
 
+# 커넥션 풀 (Keep-alive / DNS 캐시)
+KEEPALIVE_SEC = int(os.getenv("HTTP_KEEPALIVE_SEC", "30"))
+DNS_CACHE_SEC = int(os.getenv("HTTP_DNS_CACHE_SEC", "300"))
+
+# 리전별 재시도 (지수 백오프 + Full Jitter)
+HTTP_RETRY_ATTEMPTS = int(os.getenv("HTTP_RETRY_ATTEMPTS", "3"))
+HTTP_RETRY_BASE_DELAY_SEC = float(os.getenv("HTTP_RETRY_BASE_DELAY_SEC", "0.2"))
+HTTP_RETRY_MAX_DELAY_SEC = float(os.getenv("HTTP_RETRY_MAX_DELAY_SEC", "2"))
+
+# 리전별 서킷 브레이커 / 적응형 동시성 (AIMD)
+# 리전 하나가 느려져도 전체 슬롯을 모두 점유하지 않도록 기본값은 전체 동시성의 절반이다.
+REGION_MAX_CONCURRENCY = int(os.getenv("REGION_MAX_CONCURRENCY", str(max(1, MAX_CONCURRENCY // 2))))
+REGION_LATENCY_TARGET_MS = float(os.getenv("REGION_LATENCY_TARGET_MS", "1000"))
+CIRCUIT_FAILURE_THRESHOLD = int(os.getenv("CIRCUIT_FAILURE_THRESHOLD", "5"))
+CIRCUIT_OPEN_SEC = float(os.getenv("CIRCUIT_OPEN_SEC", "15"))
+
+# 계측 (리전별 HTTP 지연/상태, 재시도 수). 켜면 /api/metrics 에서 Prometheus 형식으로 확인한다.
+RELAY_METRICS_ENABLED = os.getenv("RELAY_METRICS_ENABLED", "false").lower() in ("1", "true", "yes")
+if RELAY_METRICS_ENABLED:
+    if TELEMETRY is None:
+        raise ImportError("RELAY_METRICS_ENABLED requires siren_common_utility in requirements.txt")
+    TELEMETRY.enable()
+
+# 백엔드 요청 본문 형식
+# - envelope: {"topic_body": "<원본 JSON 문자열>", "topic_message_id": ...} (기본값)
+# - passthrough: 원본 메세지 본문(bytes)을 Content-Type 그대로 전달하고 메타데이터는 헤더로 보낸다.
+#   (재파싱/이중 인코딩 없음. 백엔드는 siren_common_utility의 decode_relay_request로 두 형식 모두 처리 가능)
+RELAY_BODY_MODE = os.getenv("RELAY_BODY_MODE", "envelope").lower()
+if RELAY_BODY_MODE not in ("envelope", "passthrough"):
+    raise ValueError(f"RELAY_BODY_MODE must be 'envelope' or 'passthrough', got {RELAY_BODY_MODE!r}")
+
+# 중복 전달 방지 (최초 message_id + 리전/tenant 단위). 전달에 성공한 키를 TTL 동안 기억하여
+# 잠금 만료 재전달이나 메세지 전체 재시도 시 이미 전달한 대상에는 POST 하지 않는다.
+# (패키지가 필요하므로 기본은 꺼져 있다. requirements.txt에 siren_common_utility를 추가한 뒤 켠다)
+RELAY_DEDUP_ENABLED = os.getenv("RELAY_DEDUP_ENABLED", "false").lower() in ("1", "true", "yes")
+RELAY_DEDUP_TTL_SEC = float(os.getenv("RELAY_DEDUP_TTL_SEC", "600"))
+RELAY_DEDUP_CAPACITY = int(os.getenv("RELAY_DEDUP_CAPACITY", "100000"))
+if RELAY_DEDUP_ENABLED and LocalDedupStore is None:
+    raise ImportError(
+        "RELAY_DEDUP_ENABLED requires siren_common_utility in requirements.txt (set RELAY_DEDUP_ENABLED=false to disable)"
+    )
+_dedup = LocalDedupStore(RELAY_DEDUP_CAPACITY, RELAY_DEDUP_TTL_SEC) if RELAY_DEDUP_ENABLED else None
+
+# 배치 트리거 모드 (host.json의 serviceBus.maxMessageBatchSize 단위로 호출)
+RELAY_BATCH_MODE = os.getenv("RELAY_BATCH_MODE", "false").lower() in ("1", "true", "yes")
+
+# 실패 메세지 재전송 (예약 메세지로 다시 토픽에 넣는다)
+SERVICEBUS_CONNECTION_STR = os.getenv("sirengoldenhour_SERVICEBUS")
+RELAY_MAX_ATTEMPTS = int(os.getenv("RELAY_MAX_ATTEMPTS", "5"))
+RELAY_REQUEUE_DELAY_SEC = float(os.getenv("RELAY_REQUEUE_DELAY_SEC", "2"))
+
+# 배치 트리거는 메세지를 하나씩 Dead-letter 할 수 없으므로(호스트가 배치 전체를 정산한다), 해석할 수 없거나
+# 재전송 한도를 넘긴 메세지는 이 토픽으로 옮기고 완료 처리한다. 비어 있으면 트리거를 실패시켜
+# 호스트가 배치를 재전달하고 maxDeliveryCount를 넘기면 Dead-letter 하도록 한다.
+RELAY_DEAD_LETTER_TOPIC = os.getenv("RELAY_DEAD_LETTER_TOPIC", "")
+
+# 이벤트 루프에 묶이는 객체들 (루프가 바뀌면 다시 생성)
+_http_session: Optional[aiohttp.ClientSession] = None
+_limiter: Optional["_PriorityLimiter"] = None
+_servicebus_client: Optional[ServiceBusClient] = None
+_region_guards: dict = {}
+_bound_loop: Optional[asyncio.AbstractEventLoop] = None
+
 target_regions = ["Chungcheong","Gangwon","Gyeonggi","Honam","Incheon","Seoul","Yeongnam"]  #허용된 지역 목록
 
+def _get_http_session() -> aiohttp.ClientSession:
+    """호출 간에 재사용되는 ClientSession을 반환한다.
+
+    메세지마다 세션을 만들면 리전마다 TCP/TLS 핸드셰이크가 다시 발생하므로,
+    워커 프로세스에서 하나의 커넥션 풀을 공유한다. 이벤트 루프가 바뀌었거나
+    세션이 닫힌 경우에는 새로 만든다.
+    """
+    global _http_session, _limiter, _servicebus_client, _region_guards, _bound_loop
+    loop = asyncio.get_running_loop()
+    if _http_session is None or _http_session.closed or _bound_loop is not loop:
+        if _http_session is not None and not _http_session.closed:
+            # 이전 루프에 묶인 세션은 현재 루프에서 닫을 수 없으므로 참조만 교체한다.
+            logging.warning("Event loop changed, recreating shared HTTP session")
+        connector = aiohttp.TCPConnector(
+            limit=MAX_CONCURRENCY,
+            limit_per_host=MAX_CONCURRENCY,
+            keepalive_timeout=KEEPALIVE_SEC,
+            ttl_dns_cache=DNS_CACHE_SEC,
+            ssl=False,
+        )
+        _http_session = aiohttp.ClientSession(connector=connector, timeout=_client_timeout)
+        _limiter = _PriorityLimiter(MAX_CONCURRENCY, RELAY_PRIORITY_RESERVED)
+        _servicebus_client = None
+        _region_guards = {}
+        _bound_loop = loop
+    return _http_session
+
+
+def _get_servicebus_client() -> ServiceBusClient:
+    """실패 메세지 재전송에 사용하는 ServiceBusClient를 반환한다. (HTTP 세션과 같은 루프에 묶인다)"""
+    global _servicebus_client
+    _get_http_session()
+    if _servicebus_client is None:
+        if not SERVICEBUS_CONNECTION_STR:
+            raise RuntimeError("sirengoldenhour_SERVICEBUS connection string is required to requeue messages")
+        _servicebus_client = ServiceBusClient.from_connection_string(SERVICEBUS_CONNECTION_STR)
+    return _servicebus_client
+
+
+def _close_http_session():
+    """워커 종료 시 공유 세션을 닫는다."""
+    if _http_session is None or _http_session.closed:
+        return
+    if _bound_loop is not None and not _bound_loop.is_closed() and not _bound_loop.is_running():
+        _bound_loop.run_until_complete(_http_session.close())
+        if _servicebus_client is not None:
+            _bound_loop.run_until_complete(_servicebus_client.close())
+
+atexit.register(_close_http_session)
+
+
+def _register_if(enabled: bool, trigger):
+    """`enabled`일 때만 트리거를 등록한다. (단일/배치 모드 중 하나만 같은 구독을 소비)"""
+    return trigger if enabled else (lambda fn: fn)
+
+
 def _parse_regions(raw_region: str):
     # 기존 로직 유지: "xxx|a|b|c|" 같은 형태 가정
     # region.split("|")[1:-1]
     parts = raw_region.split("|")
     return parts[1:-1]
 
-async def _post_to_region(
+def _message_priority(user_properties: dict) -> str:
+    """메세지의 `Priority`(없으면 `Severity`) 속성을 우선순위로 변환한다. (siren_common_utility의 `message_priority`와 같은 규칙)"""
+    for name in ("Priority", "Severity"):
+        value = user_properties.get(name)
+        if isinstance(value, int) and not isinstance(value, bool) and 0 <= value < len(RELAY_PRIORITIES):
+            return RELAY_PRIORITIES[value]
+        if isinstance(value, str):
+            value = value.strip().lower()
+            value = _PRIORITY_ALIASES.get(value, value)
+            if value in RELAY_PRIORITIES:
+                return value
+    return RELAY_DEFAULT_PRIORITY
+
+
+def _highest_priority(priorities) -> str:
+    return min(priorities, key=RELAY_PRIORITIES.index, default=RELAY_DEFAULT_PRIORITY)
+
+
+class _PriorityLimiter:
+    """우선순위별 대기열을 가진 전체 동시성 제한. (기존 단일 Semaphore 대체)
+
+    - 전체 `limit`개 중 `reserved`개 슬롯은 `RELAY_PRIORITY_RESERVED_FOR` 이상의 우선순위만 사용할 수 있다.
+    - 슬롯이 비면 가장 높은 우선순위의 대기 요청부터 깨운다. (같은 우선순위는 도착 순서)
+    """
+
+    def __init__(self, limit: int, reserved: int) -> None:
+        self.limit = max(1, limit)
+        self.reserved = max(0, min(reserved, self.limit - 1))
+        self.in_flight = 0
+        self._waiters = {p: [] for p in RELAY_PRIORITIES}
+        self._reserved_rank = RELAY_PRIORITIES.index(RELAY_PRIORITY_RESERVED_FOR)
+
+    def _can_take(self, priority: str) -> bool:
+        if self.in_flight >= self.limit:
+            return False
+        return RELAY_PRIORITIES.index(priority) <= self._reserved_rank or self.in_flight < self.limit - self.reserved
+
+    async def acquire(self, priority: str) -> None:
+        rank = RELAY_PRIORITIES.index(priority)
+        ahead = any(self._waiters[p] for p in RELAY_PRIORITIES[:rank + 1])
+        if not ahead and self._can_take(priority):
+            self.in_flight += 1
+            return
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters[priority].append(waiter)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # 슬롯을 넘겨받은 뒤 취소되면 다음 대기 요청에게 넘긴다.
+                self.release()
+            elif waiter in self._waiters[priority]:
+                self._waiters[priority].remove(waiter)
+            raise
+
+    def release(self) -> None:
+        self.in_flight -= 1
+        for priority in RELAY_PRIORITIES:
+            waiters = self._waiters[priority]
+            while waiters and self._can_take(priority):
+                waiter = waiters.pop(0)
+                if not waiter.done():
+                    self.in_flight += 1
+                    waiter.set_result(None)
+            if waiters:
+                # 이 우선순위도 슬롯을 얻지 못했으면 더 낮은 우선순위는 기다린다.
+                break
+
+    @asynccontextmanager
+    async def slot(self, priority: str):
+        started = time.perf_counter()
+        await self.acquire(priority)
+        if TELEMETRY is not None and TELEMETRY.enabled:
+            TELEMETRY.observe("siren_relay_slot_wait_seconds", time.perf_counter() - started, priority=priority)
+        try:
+            yield
+        finally:
+            self.release()
+
+    def to_dict(self) -> dict:
+        return {
+            "limit": self.limit,
+            "reserved": self.reserved,
+            "in_flight": self.in_flight,
+            "waiting": {p: len(w) for p, w in self._waiters.items() if w},
+        }
+
+
+class _RegionGuard:
+    """리전 하나에 대한 서킷 브레이커(closed/open/half_open)와 AIMD 동시성 제한.
+
+    - retryable 실패가 `CIRCUIT_FAILURE_THRESHOLD`회 연속되면 open 되어 `CIRCUIT_OPEN_SEC` 동안 즉시 실패한다.
+    - 이후 half_open 상태에서 요청 하나만 통과시켜, 성공하면 closed, 실패하면 다시 open 된다.
+    - 동시 요청 수 한도는 응답이 빠르고 성공하면 조금씩 늘리고(+1/limit),
+      실패하거나 `REGION_LATENCY_TARGET_MS`보다 느리면 절반으로 줄인다.
+      줄이는 것은 지연 구간당 한 번이다. (한도를 줄이기 전에 보낸 요청의 결과로는 다시 줄이지 않는다)
+    - 지연시간은 전체 동시성 슬롯(_limiter)을 얻은 뒤부터 측정한다. (슬롯 대기는 리전의 느림이 아니다)
+    """
+
+    def __init__(self, region: str) -> None:
+        self.region = region
+        self.state = "closed"
+        self.limit = float(REGION_MAX_CONCURRENCY)
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._in_flight = 0
+        self._last_decrease = float("-inf")
+        self._cond = asyncio.Condition()
+
+    def allow_request(self) -> bool:
+        if self.state == "open":
+            if time.monotonic() - self._opened_at < CIRCUIT_OPEN_SEC:
+                return False
+            self._transition("half_open")
+        if self.state == "half_open":
+            if self._probe_in_flight:
+                return False
+            self._probe_in_flight = True
+        return True
+
+    async def acquire(self) -> None:
+        async with self._cond:
+            while self._in_flight >= max(1, int(self.limit)):
+                await self._cond.wait()
+            self._in_flight += 1
+
+    async def release(self) -> None:
+        async with self._cond:
+            self._in_flight -= 1
+            self._cond.notify_all()
+
+    def abort_probe(self) -> None:
+        """결과를 기록하지 못하고 끝난(취소 등) half_open 탐색 요청을 되돌린다. (다음 요청이 다시 탐색한다)"""
+        self._probe_in_flight = False
+
+    def record(self, ok: bool, retryable: bool, latency_ms: float) -> None:
+        self._probe_in_flight = False
+        if ok or not retryable:
+            # 4xx는 백엔드가 살아있다는 뜻이므로 서킷 판단에서 성공으로 본다.
+            self._failures = 0
+            if self.state == "half_open":
+                self._transition("closed")
+            if latency_ms <= REGION_LATENCY_TARGET_MS:
+                self.limit = min(float(REGION_MAX_CONCURRENCY), self.limit + 1 / self.limit)
+            else:
+                self._decrease(latency_ms)
+            return
+        self._failures += 1
+        self._decrease(latency_ms)
+        if self.state == "half_open" or self._failures >= CIRCUIT_FAILURE_THRESHOLD:
+            self._opened_at = time.monotonic()
+            self._transition("open")
+
+    def _decrease(self, latency_ms: float) -> None:
+        now = time.monotonic()
+        if now - latency_ms / 1000 < self._last_decrease:
+            # 이전 감소 전에 보낸 요청이다. (같은 혼잡에 대한 실패가 한도를 연달아 줄이지 않게 한다)
+            return
+        self.limit = max(1.0, self.limit / 2)
+        self._last_decrease = now
+
+    def _transition(self, state: str) -> None:
+        if self.state != state:
+            logging.warning(f"Circuit for region {self.region}: {self.state} -> {state}")
+            self.state = state
+
+    def to_dict(self) -> dict:
+        return {
+            "state": self.state,
+            "limit": int(self.limit),
+            "in_flight": self._in_flight,
+            "consecutive_failures": self._failures,
+        }
+
+
+def _get_region_guard(region: str) -> _RegionGuard:
+    _get_http_session()
+    guard = _region_guards.get(region)
+    if guard is None:
+        guard = _region_guards[region] = _RegionGuard(region)
+    return guard
+
+
+def _classify_status(status: Optional[int]) -> str:
+    """응답 상태를 ok / retryable / permanent 로 분류한다.
+
+    네트워크 오류·타임아웃(status=None), 408, 429, 5xx는 재시도하면 성공할 수 있는 실패이고,
+    그 외 4xx는 같은 요청을 다시 보내도 실패하는 요청 자체의 문제이다.
+    """
+    if status is None:
+        return "retryable"
+    if 200 <= status < 300:
+        return "ok"
+    if status in (408, 429) or status >= 500:
+        return "retryable"
+    return "permanent"
+
+
+async def _post_to_backend(
     session: aiohttp.ClientSession,
     url: str,
     headers: dict,
-    req_payload: dict,
+    req_payload: Union[dict, bytes],
     msg_id: str,
-    region: str,
+    target: str,
+    keep_body: bool = False,
+    guard: Optional[_RegionGuard] = None,
+    priority: str = RELAY_DEFAULT_PRIORITY,
 ) -> dict:
-    async with _semaphore:
-        try:
-            async with session.post(url, headers=headers, json=req_payload, ssl=False) as resp:
-                text = await resp.text()
-                ok = 200 <= resp.status < 300
-                return {
-                    "region": region,
-                    "status": resp.status,
-                    "ok": ok,
-                    "response_text": text[:2000],
-                }
-        except Exception as e:
-            logging.exception(f"Exception during POST to region: {region}. msg_id={msg_id} url={url}")
+    """`req_payload`가 bytes면 그대로, dict면 JSON으로 직렬화해 POST 한다. 동시성 슬롯은 `priority` 순서로 얻는다."""
+    probe = False
+    if guard is not None:
+        if not guard.allow_request():
+            if TELEMETRY is not None:
+                TELEMETRY.inc("siren_relay_circuit_rejections_total", target=target)
             return {
-                "region": region,
+                "target": target,
                 "status": None,
                 "ok": False,
-                "error": str(e),
+                "retryable": True,
+                "circuit_open": True,
+                "error": f"circuit {guard.state} for {guard.region}",
             }
+        # half_open에서 통과한 요청은 서킷을 닫을지 판단하는 탐색 요청이다.
+        probe = guard.state == "half_open"
+    try:
+        if guard is not None:
+            await guard.acquire()
+        try:
+            async with _limiter.slot(priority):
+                started = time.perf_counter()
+                try:
+                    if isinstance(req_payload, (bytes, bytearray)):
+                        request = session.post(url, headers=headers, data=req_payload, ssl=False)
+                    else:
+                        request = session.post(url, headers=headers, json=req_payload, ssl=False)
+                    async with request as resp:
+                        text = await resp.text()
+                        classification = _classify_status(resp.status)
+                        result = {
+                            "target": target,
+                            "status": resp.status,
+                            "ok": classification == "ok",
+                            "retryable": classification == "retryable",
+                            "response_text": text[:2000],
+                        }
+                        if keep_body:
+                            result["response_body"] = text
+                except Exception as e:
+                    logging.exception(f"Exception during POST to {target}. msg_id={msg_id} url={url}")
+                    result = {
+                        "target": target,
+                        "status": None,
+                        "ok": False,
+                        "retryable": True,
+                        "error": str(e),
+                    }
+        finally:
+            if guard is not None:
+                await guard.release()
+    except BaseException:
+        if probe:
+            # 취소되어 결과가 기록되지 않으면 탐색 표시가 남아 서킷이 half_open에 고착된다.
+            guard.abort_probe()
+        raise
+    elapsed = time.perf_counter() - started
+    if guard is not None:
+        guard.record(result["ok"], result["retryable"], elapsed * 1000)
+    if TELEMETRY is not None and TELEMETRY.enabled:
+        status = str(result["status"]) if result["status"] is not None else "error"
+        TELEMETRY.observe("siren_relay_http_seconds", elapsed, target=target, status=status)
+        TELEMETRY.inc("siren_relay_http_requests_total", target=target, status=status)
+    return result
+
+
+async def _post_with_retry(
+    session: aiohttp.ClientSession,
+    url: str,
+    headers: dict,
+    req_payload: Union[dict, bytes],
+    msg_id: str,
+    target: str,
+    **kwargs,
+) -> dict:
+    """retryable 실패에 한해 `HTTP_RETRY_ATTEMPTS`회까지 지수 백오프(Full Jitter)로 재시도한다.
+
+    백오프 대기 중에는 동시성 슬롯(_limiter)을 점유하지 않는다.
+    """
+    for attempt in range(1, HTTP_RETRY_ATTEMPTS + 1):
+        result = await _post_to_backend(session, url, headers, req_payload, msg_id, target, **kwargs)
+        result["attempts"] = attempt
+        if result["ok"] or not result["retryable"] or result.get("circuit_open") or attempt == HTTP_RETRY_ATTEMPTS:
+            return result
+        delay = random.uniform(0, min(HTTP_RETRY_MAX_DELAY_SEC, HTTP_RETRY_BASE_DELAY_SEC * (2 ** (attempt - 1))))
+        if TELEMETRY is not None:
+            TELEMETRY.inc("siren_relay_retries_total", target=target)
+        logging.warning(
+            f"Retrying POST to {target} in {delay:.2f}s (attempt {attempt}/{HTTP_RETRY_ATTEMPTS}). "
+            f"msg_id={msg_id} status={result.get('status')}"
+        )
+        await asyncio.sleep(delay)
+    return result
+
+
+async def _post_to_region(
+    session: aiohttp.ClientSession,
+    url: str,
+    headers: dict,
+    req_payload: Union[dict, bytes],
+    msg_id: str,
+    region: str,
+    priority: str = RELAY_DEFAULT_PRIORITY,
+) -> dict:
+    result = await _post_with_retry(
+        session, url, headers, req_payload, msg_id, region, guard=_get_region_guard(region), priority=priority
+    )
+    result["region"] = region
+    return result
+
+
+def _encode_payload(req_payload: dict) -> bytes:
+    """리전마다 같은 요청 본문을 한 번만 직렬화한다. (aiohttp의 `json=`은 요청마다 직렬화한다)"""
+    return json.dumps(req_payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def _passthrough_headers(msg: func.ServiceBusMessage, user_properties: dict) -> dict:
+    """pass-through 모드의 메타데이터 헤더. (본문은 원본 메세지 bytes)"""
+    return {
+        "Content-Type": getattr(msg, "content_type", None) or "application/json",
+        "x-relay-body-mode": "passthrough",
+        "x-session-id": getattr(msg, "session_id", "") or "",
+        "x-topic-properties": json.dumps(user_properties, separators=(",", ":"), default=str),
+    }
+
+
+async def _post_once(dedup_key: str, post, **result_fields) -> dict:
+    """`post()`를 호출하되, 이미 전달에 성공한 `dedup_key`면 HTTP 호출 없이 성공으로 반환한다.
+
+    실패하면 키를 해제하므로 재전송/재전달 시 다시 시도한다.
+    다른 호출에서 전달 중인 키는 그 전달이 실패할 수 있으므로 retryable 실패로 반환한다. (재전송 대상)
+    """
+    if _dedup is None:
+        return await post()
+    claim = await _dedup.try_claim(dedup_key)
+    if claim == _dedup.IN_FLIGHT:
+        return {
+            "ok": False, "retryable": True, "status": None, "in_flight": True,
+            "error": "delivery in flight", **result_fields,
+        }
+    if claim != _dedup.CLAIMED:
+        if TELEMETRY is not None:
+            TELEMETRY.inc("siren_relay_duplicates_total", target=result_fields.get("target", ""))
+        return {"ok": True, "retryable": False, "status": None, "duplicate": True, **result_fields}
+    try:
+        result = await post()
+    except BaseException:
+        await _dedup.release(dedup_key)
+        raise
+    if result["ok"]:
+        await _dedup.complete(dedup_key)
+    else:
+        await _dedup.release(dedup_key)
+    return result
 
 
-@app.service_bus_topic_trigger(
+async def _claim_entries(entries: list) -> tuple:
+    """배치 항목 중 이미 전달한 항목을 제외한다. (`idempotency_key` 기준)
+
+    (선점한 항목, 다른 호출에서 전달 중인 항목)을 반환한다. 전달 중인 항목은 재전송 대상이다.
+    """
+    if _dedup is None:
+        return entries, []
+    claimed = []
+    in_flight = []
+    for entry in entries:
+        claim = await _dedup.try_claim(entry[1]["idempotency_key"])
+        if claim == _dedup.CLAIMED:
+            claimed.append(entry)
+        elif claim == _dedup.IN_FLIGHT:
+            in_flight.append(entry)
+        elif TELEMETRY is not None:
+            TELEMETRY.inc("siren_relay_duplicates_total", target="batch")
+    return claimed, in_flight
+
+
+async def _settle_entries(entries: list, results: list) -> None:
+    if _dedup is None:
+        return
+    for (_, payload), ok in zip(entries, results):
+        if ok:
+            await _dedup.complete(payload["idempotency_key"])
+        else:
+            await _dedup.release(payload["idempotency_key"])
+
+
+def _idempotency_key(origin_message_id: str, target: str) -> str:
+    """(최초 message_id, 대상) 단위의 멱등 키. 백엔드는 같은 키의 중복 요청을 버릴 수 있다."""
+    return hashlib.sha256(f"{origin_message_id}:{target}".encode("utf-8")).hexdigest()[:32]
+
+
+def _origin_message_id(msg: func.ServiceBusMessage) -> str:
+    """재전송된 메세지도 최초 message_id를 기준으로 식별한다."""
+    user_properties = msg.user_properties or {}
+    return user_properties.get("OriginalMessageId") or getattr(msg, "message_id", "") or ""
+
+
+def _relay_attempt(msg: func.ServiceBusMessage) -> int:
+    """다시 보내면 몇 번째 시도인지 반환한다. (`RelayAttempt` 속성 + 1)"""
+    return int((msg.user_properties or {}).get("RelayAttempt", 0)) + 1
+
+
+async def _requeue_failed(topic_name: str, requeues: list) -> list:
+    """실패한 메세지만 예약 메세지로 토픽에 다시 넣는다.
+
+    `requeues`는 (원본 메세지, 변경할 application_properties) 목록이다.
+    재시도 횟수(`RelayAttempt`)가 `RELAY_MAX_ATTEMPTS`에 도달한 메세지는 재전송하지 않고 반환한다.
+    재전송 자체가 실패하면 예외를 발생시켜 호스트가 원본 메세지를 재전달하도록 한다.
+    """
+    messages = []
+    exhausted = []
+    for msg, overrides in requeues:
+        user_properties = dict(msg.user_properties or {})
+        attempt = _relay_attempt(msg)
+        origin_id = _origin_message_id(msg)
+        if attempt >= RELAY_MAX_ATTEMPTS:
+            logging.error(
+                f"Giving up relay after {attempt} attempts. topic={topic_name} msg_id={origin_id} "
+                f"properties={user_properties}"
+            )
+            exhausted.append(msg)
+            continue
+        user_properties.update(overrides)
+        user_properties["RelayAttempt"] = attempt
+        user_properties["OriginalMessageId"] = origin_id
+        delay = RELAY_REQUEUE_DELAY_SEC * (2 ** (attempt - 1))
+        messages.append(ServiceBusMessage(
+            msg.get_body(),
+            application_properties=user_properties,
+            correlation_id=getattr(msg, "correlation_id", None) or None,
+            session_id=getattr(msg, "session_id", None) or None,
+            content_type=getattr(msg, "content_type", None) or None,
+            scheduled_enqueue_time_utc=datetime.now(timezone.utc) + timedelta(seconds=delay),
+        ))
+    if messages:
+        async with _get_servicebus_client().get_topic_sender(topic_name=topic_name) as sender:
+            await sender.send_messages(messages)
+        logging.warning(f"Requeued {len(messages)} failed messages to {topic_name}")
+    return exhausted
+
+
+async def _dead_letter_messages(topic_name: str, dead_letters: list) -> None:
+    """처리할 수 없는 메세지를 `RELAY_DEAD_LETTER_TOPIC`으로 옮긴다.
+
+    `dead_letters`는 (원본 메세지, 변경할 application_properties, 사유, 설명) 목록이다.
+    대상 토픽이 없거나 전송에 실패하면 예외를 발생시켜 호스트가 메세지(배치)를 재전달하도록 한다.
+    """
+    if not dead_letters:
+        return
+    for msg, _, reason, description in dead_letters:
+        logging.error(
+            f"Dead-lettering message. topic={topic_name} msg_id={_origin_message_id(msg)} "
+            f"reason={reason} description={description}"
+        )
+    if not RELAY_DEAD_LETTER_TOPIC:
+        raise Exception(
+            f"{len(dead_letters)} messages cannot be relayed and RELAY_DEAD_LETTER_TOPIC is not set. "
+            f"topic={topic_name}"
+        )
+    messages = [
+        ServiceBusMessage(
+            msg.get_body(),
+            application_properties={
+                **(msg.user_properties or {}),
+                **overrides,
+                "OriginalMessageId": _origin_message_id(msg),
+                "DeadLetterSource": topic_name,
+                "DeadLetterReason": reason,
+                "DeadLetterErrorDescription": description[:1024],
+            },
+            correlation_id=getattr(msg, "correlation_id", None) or None,
+            session_id=getattr(msg, "session_id", None) or None,
+            content_type=getattr(msg, "content_type", None) or None,
+        )
+        for msg, overrides, reason, description in dead_letters
+    ]
+    async with _get_servicebus_client().get_topic_sender(topic_name=RELAY_DEAD_LETTER_TOPIC) as sender:
+        await sender.send_messages(messages)
+    logging.warning(f"Moved {len(messages)} messages from {topic_name} to {RELAY_DEAD_LETTER_TOPIC}")
+
+
+async def _finish_batch(topic_name: str, requeues: list, dead_letters: list) -> None:
+    """배치의 실패 메세지를 재전송하고, 재전송 한도(`RELAY_MAX_ATTEMPTS`)를 넘긴 메세지는 Dead-letter 한다.
+
+    Dead-letter를 먼저 처리하므로, 그 단계에서 실패하면 재전송 없이 배치 전체가 재전달된다.
+    """
+    dead_letters = dead_letters + [
+        (msg, overrides, "RelayAttemptsExhausted", f"Relay failed after {RELAY_MAX_ATTEMPTS} attempts")
+        for msg, overrides in requeues if _relay_attempt(msg) >= RELAY_MAX_ATTEMPTS
+    ]
+    await _dead_letter_messages(topic_name, dead_letters)
+    requeues = [(msg, overrides) for msg, overrides in requeues if _relay_attempt(msg) < RELAY_MAX_ATTEMPTS]
+    if requeues:
+        await _requeue_failed(topic_name, requeues)
+
+
+def _batch_results(result: dict, req_payloads: list) -> list:
+    """배치 엔드포인트 응답을 메세지별 성공 여부로 변환한다.
+
+    응답 계약: `{"results": [{"topic_message_id": "...", "ok": true}, ...]}`
+    요청이 실패하면 모두 실패이다. 2xx 응답이라도 `results`에 없는 메세지는 전달을 확인할 수 없으므로
+    실패(재전송 대상)로 본다.
+    """
+    if not result["ok"]:
+        return [False] * len(req_payloads)
+    try:
+        per_message = {
+            item["topic_message_id"]: bool(item.get("ok"))
+            for item in json.loads(result.get("response_body") or "{}").get("results", [])
+        }
+    except (ValueError, AttributeError, KeyError, TypeError):
+        per_message = {}
+    return [per_message.get(p["topic_message_id"], False) for p in req_payloads]
+
+
+@_register_if(not RELAY_BATCH_MODE, app.service_bus_topic_trigger(
         arg_name="azservicebus", 
         subscription_name="all",
         topic_name="emc-patient-alert",
-        connection="sirengoldenhour_SERVICEBUS") 
+        connection="sirengoldenhour_SERVICEBUS"))
 async def emc_patient_alert_servicebus_trigger(azservicebus: func.ServiceBusMessage):
 
 
     # /api/v1/emc/broadcast/to-centers/{region}
-    body = azservicebus.get_body().decode("utf-8")
+    raw_body = azservicebus.get_body()
 
     msg_id = getattr(azservicebus, "message_id", "") or ""
     corr_id = getattr(azservicebus, "correlation_id", "") or ""
@@ -77,10 +721,13 @@ async def emc_patient_alert_servicebus_trigger(azservicebus: func.ServiceBusMess
     
     
     try:
-        payload = json.loads(body)
         regions = _parse_regions(region)
-    except json.JSONDecodeError:
-        logging.exception(f"Invalid JSON. msg_id={msg_id} body={body}")
+        if RELAY_BODY_MODE == "envelope":
+            # topic_body에 문자열로 넣으므로 JSON인지 확인한다. (passthrough는 본문을 해석하지 않는다)
+            body = raw_body.decode("utf-8")
+            json.loads(body)
+    except (UnicodeDecodeError, json.JSONDecodeError):
+        logging.exception(f"Invalid JSON. msg_id={msg_id} body={raw_body[:2000]!r}")
         raise
     except AttributeError:
         logging.exception(f"Invalid Region format. msg_id={msg_id} region={region}")
@@ -91,71 +738,118 @@ async def emc_patient_alert_servicebus_trigger(azservicebus: func.ServiceBusMess
         "x-message-id": msg_id,
         "x-correlation-id": corr_id,
     }
+    if RELAY_BODY_MODE == "passthrough":
+        headers.update(_passthrough_headers(azservicebus, user_properties))
+        req_payload = raw_body
+    else:
+        # 모든 리전에 같은 본문을 보내므로 한 번만 직렬화한다.
+        req_payload = _encode_payload({
+            "topic_body": body,
+            "topic_message_id": msg_id,
+            "topic_correlation_id": corr_id,
+            "topic_session_id": sess_id,
+            "topic_properties": user_properties
+        })
+    if logging.getLogger().isEnabledFor(logging.DEBUG):
+        logging.debug(f"Prepared payload for regions {regions}: {req_payload[:2000]!r}")
 
-    logging.info(f"Regions to send: {regions}")
-    logging.info(f"azservicebus.user_properties tyep: {type(user_properties)}")
-    logging.info(f"azservicebus.body: {type(body)}")
+    origin_id = _origin_message_id(azservicebus)
+    priority = _message_priority(user_properties)
 
-    async with aiohttp.ClientSession(timeout=_client_timeout) as session:
-        tasks = []
-        for r in regions:
-            if not r in target_regions:
-                logging.warning(f"Skipping invalid region: {r}. msg_id={msg_id}")
-                continue
-            
-            url = f"https://{backend_base_url}:{backend_base_port}/api/v1/emc/broadcast/to-centers/{r}"
-            req_payload = {
-                "topic_body": body,
-                "topic_message_id": msg_id,
-                "topic_correlation_id": corr_id,
-                "topic_session_id": sess_id,
-                "topic_properties": user_properties
-            }
-            logging.info(f"Prepared payload for region {r}: {json.dumps(req_payload)}")
-            tasks.append(
-                _post_to_region(
+    logging.info(f"Regions to send: {regions} priority={priority}")
+
+    session = _get_http_session()
+    tasks = []
+    for r in regions:
+        if not r in target_regions:
+            logging.warning(f"Skipping invalid region: {r}. msg_id={msg_id}")
+            continue
+        
+        url = f"https://{backend_base_url}:{backend_base_port}/api/v1/emc/broadcast/to-centers/{r}"
+        key = _idempotency_key(origin_id, r)
+        tasks.append(
+            _post_once(
+                key,
+                lambda url=url, key=key, r=r: _post_to_region(
                     session,
                     url,
-                    headers,
+                    {**headers, "x-idempotency-key": key},
                     req_payload,
                     msg_id,
                     r,
-                )
+                    priority=priority,
+                ),
+                target=r,
+                region=r,
             )
+        )
 
-        results = await asyncio.gather(*tasks, return_exceptions=False)
+    results = await asyncio.gather(*tasks, return_exceptions=False)
     
     failures = [r for r in results if not r.get("ok")]
     for r in results:
-        if r.get("ok"):
+        if r.get("duplicate"):
+            logging.info(f"Skipped duplicate delivery msg_id={msg_id} region={r['region']}")
+        elif r.get("ok"):
             logging.info(f"Delivered to backend successfully msg_id={msg_id} region={r['region']}")
         else:
             logging.error(
                 f"Failed to send message msg_id={msg_id} region={r.get('region')} "
-                f"status={r.get('status')} error={r.get('error')} response={r.get('response_text')}"
+                f"status={r.get('status')} retryable={r.get('retryable')} circuit_open={r.get('circuit_open', False)} "
+                f"error={r.get('error')} response={r.get('response_text')}"
             )
+    # 영구 거절(4xx)한 리전은 재전송해도 같은 결과이므로, 거절한 리전만 담아 Dead-letter 한다.
+    # Dead-letter 토픽이 없으면 재전송하기 전에 실패시켜 호스트 재전달 후 Dead-letter 되도록 한다.
+    rejected = [r for r in failures if not r.get("retryable")]
+    if rejected:
+        await _dead_letter_messages("emc-patient-alert", [(
+            azservicebus,
+            {"Region": "|" + "|".join(r["region"] for r in rejected) + "|"},
+            "BackendRejected",
+            "; ".join(f"{r['region']}: status={r.get('status')} error={r.get('error')}" for r in rejected),
+        )])
+    # 재시도 후에도 실패한 리전만 다시 보낸다. (성공한 리전은 중복 수신하지 않는다)
+    retry_regions = [r["region"] for r in failures if r.get("retryable")]
+    exhausted = []
+    if retry_regions:
+        exhausted = await _requeue_failed("emc-patient-alert", [
+            (azservicebus, {"Region": "|" + "|".join(retry_regions) + "|"})
+        ])
     if failures:
-        raise Exception(f"One or more regions failed. msg_id={msg_id} failures={len(failures)}/{len(results)}")
+        logging.error(
+            f"One or more regions failed. msg_id={msg_id} failures={len(failures)}/{len(results)} "
+            f"requeued_regions={retry_regions} rejected_regions={[r['region'] for r in rejected]}"
+        )
+    if exhausted:
+        # 재전송 한도를 넘긴 메세지는 실패한 리전만 담고 있으므로, 호스트 재전달 후 Dead-letter 되도록 한다.
+        raise Exception(f"Relay attempts exhausted. msg_id={msg_id} regions={retry_regions}")
 
 
         
-@app.service_bus_topic_trigger(arg_name="azservicebus", 
+@_register_if(not RELAY_BATCH_MODE, app.service_bus_topic_trigger(arg_name="azservicebus", 
                                subscription_name="all", 
                                topic_name="emc-center-response",
-                               connection="sirengoldenhour_SERVICEBUS") 
-def emc_center_response_servicebus_trigger(azservicebus: func.ServiceBusMessage):
+                               connection="sirengoldenhour_SERVICEBUS"))
+async def emc_center_response_servicebus_trigger(azservicebus: func.ServiceBusMessage):
 
     #  /api/v1/emc/broadcast/to-field/{tenant_id}
-    body = azservicebus.get_body().decode("utf-8")
-    msg_id = getattr(azservicebus, "message_id", "")
-    corr_id = getattr(azservicebus, "correlation_id", "")
-    sess_id = getattr(azservicebus, "session_id", "")
+    raw_body = azservicebus.get_body()
+    msg_id = getattr(azservicebus, "message_id", "") or ""
+    corr_id = getattr(azservicebus, "correlation_id", "") or ""
+    sess_id = getattr(azservicebus, "session_id", "") or ""
+    user_properties = azservicebus.user_properties or {}
 
+    # 발신측이 TenantId 속성을 넣었으면(PatientAlertCodec.to_message) 본문을 해석하지 않는다.
+    tenant_id = user_properties.get("TenantId")
+    body = None
     try:
-        payload = json.loads(body)
-        tenant_id = payload.get("tenant_id")
-    except json.JSONDecodeError:
-        logging.exception(f"Invalid JSON. msg_id={msg_id} body={body}")
+        if RELAY_BODY_MODE == "envelope" or tenant_id is None:
+            body = raw_body.decode("utf-8")
+            payload = json.loads(body)
+            if tenant_id is None:
+                tenant_id = payload.get("tenant_id")
+    except (UnicodeDecodeError, json.JSONDecodeError):
+        logging.exception(f"Invalid JSON. msg_id={msg_id} body={raw_body[:2000]!r}")
         raise
     headers = {
         "Content-Type": "application/json",
@@ -164,30 +858,242 @@ def emc_center_response_servicebus_trigger(azservicebus: func.ServiceBusMessage)
     }
 
     logging.info(f"Regions to send: {tenant_id}")
-    logging.info(f"azservicebus.user_properties tyep: {type(azservicebus.user_properties)}")
-    logging.info(f"azservicebus.body: {type(body)}")
 
     url = f"https://{backend_base_url}:{backend_base_port}/api/v1/emc/broadcast/to-field/{tenant_id}"
-    req_payload = {
+    if RELAY_BODY_MODE == "passthrough":
+        headers.update(_passthrough_headers(azservicebus, user_properties))
+        req_payload = raw_body
+    else:
+        req_payload = {
+                "topic_body": body,
+                "topic_message_id": msg_id,
+                "topic_correlation_id": corr_id,
+                "topic_session_id": sess_id,
+                "topic_properties": azservicebus.user_properties
+            }
+    target = f"tenant:{tenant_id}"
+    key = _idempotency_key(_origin_message_id(azservicebus), target)
+    result = await _post_once(
+        key,
+        lambda: _post_with_retry(
+            _get_http_session(),
+            url,
+            {**headers, "x-idempotency-key": key},
+            req_payload,
+            msg_id,
+            target,
+            priority=_message_priority(user_properties),
+        ),
+        target=target,
+    )
+    if result.get("duplicate"):
+        logging.info(f"Skipped duplicate delivery msg_id={msg_id} tenant_id={tenant_id}")
+        return
+    logging.info(f"Sent message to tenant {tenant_id}: {result.get('status')}")
+
+    if not result["ok"]:
+        logging.error(
+            f"Failed to send message to tenant {tenant_id}. msg_id={msg_id} status_code={result.get('status')} "
+            f"retryable={result.get('retryable')} error={result.get('error')} \n response={result.get('response_text')}"
+        )
+        raise Exception(f"Failed to send message to tenant {tenant_id}. Status code: {result.get('status')}")
+
+    logging.info(f"Delivered to backend successfully msg_id={msg_id} tenant_id={tenant_id}")
+
+
+@_register_if(RELAY_BATCH_MODE, app.service_bus_topic_trigger(
+        arg_name="azservicebus",
+        subscription_name="all",
+        topic_name="emc-patient-alert",
+        connection="sirengoldenhour_SERVICEBUS",
+        cardinality=func.Cardinality.MANY))
+async def emc_patient_alert_servicebus_batch_trigger(azservicebus: List[func.ServiceBusMessage]):
+    """배치 모드: 여러 메세지를 리전별로 묶어 리전당 한 번만 POST 한다.
+
+    /api/v1/emc/broadcast/to-centers/{region}/batch  (`{"messages": [...]}`)
+    일부 리전에서 실패한 메세지는 실패한 리전만 남겨 재전송하고, 나머지는 완료 처리된다.
+    해석할 수 없는 메세지, 백엔드가 영구 거절(4xx)한 메세지, 재전송 한도를 넘긴 메세지는
+    하나씩 Dead-letter 한다. (`RELAY_DEAD_LETTER_TOPIC`)
+    """
+    by_region: dict = {}        # region -> [(메세지 index, req_payload)]
+    dead_letters = []           # (메세지, 변경할 속성, 사유, 설명)
+    for index, msg in enumerate(azservicebus):
+        msg_id = getattr(msg, "message_id", "") or ""
+        user_properties = msg.user_properties or {}
+        try:
+            body = msg.get_body().decode("utf-8")
+            json.loads(body)
+            regions = _parse_regions(user_properties.get("Region", ""))
+        except (UnicodeDecodeError, json.JSONDecodeError, AttributeError) as e:
+            # 재시도해도 성공할 수 없는 메세지이므로 배치 전체를 재전달하지 않고 이 메세지만 Dead-letter 한다.
+            logging.exception(f"Invalid message in batch. msg_id={msg_id}")
+            dead_letters.append((msg, {}, "InvalidMessage", repr(e)))
+            continue
+        if not regions:
+            dead_letters.append((msg, {}, "InvalidRegion", f"Region={user_properties.get('Region')!r}"))
+            continue
+        for r in regions:
+            if not r in target_regions:
+                logging.warning(f"Skipping invalid region: {r}. msg_id={msg_id}")
+                continue
+            by_region.setdefault(r, []).append((index, {
+                "topic_body": body,
+                "topic_message_id": msg_id,
+                "idempotency_key": _idempotency_key(_origin_message_id(msg), r),
+                "topic_correlation_id": getattr(msg, "correlation_id", "") or "",
+                "topic_session_id": getattr(msg, "session_id", "") or "",
+                "topic_properties": user_properties,
+            }))
+
+    failed_regions: dict = {}    # 메세지 index -> 실패한 리전 목록
+    rejected_regions: dict = {}  # 메세지 index -> 영구 거절한 리전 목록 (Dead-letter)
+    for r in list(by_region):
+        by_region[r], in_flight = await _claim_entries(by_region[r])
+        for index, _ in in_flight:
+            failed_regions.setdefault(index, []).append(r)
+        if not by_region[r]:
+            del by_region[r]
+
+    session = _get_http_session()
+    regions = list(by_region)
+    results = await asyncio.gather(*(
+        _post_with_retry(
+            session,
+            f"https://{backend_base_url}:{backend_base_port}/api/v1/emc/broadcast/to-centers/{r}/batch",
+            {"Content-Type": "application/json", "x-batch-size": str(len(by_region[r]))},
+            {"messages": [payload for _, payload in by_region[r]]},
+            f"batch[{len(azservicebus)}]",
+            r,
+            keep_body=True,
+            guard=_get_region_guard(r),
+            # 배치에 포함된 가장 높은 우선순위로 슬롯을 얻는다.
+            priority=_highest_priority(
+                _message_priority(azservicebus[index].user_properties or {}) for index, _ in by_region[r]
+            ),
+        )
+        for r in regions
+    ))
+
+    statuses = {r: result.get("status") for r, result in zip(regions, results)}
+    for r, result in zip(regions, results):
+        entries = by_region[r]
+        # 요청 자체가 영구 실패(4xx)면 재전송해도 같은 결과이므로 Dead-letter 한다.
+        requeue = result["ok"] or result["retryable"]
+        per_message = _batch_results(result, [p for _, p in entries])
+        await _settle_entries(entries, per_message)
+        for (index, _), ok in zip(entries, per_message):
+            if not ok:
+                (failed_regions if requeue else rejected_regions).setdefault(index, []).append(r)
+        if not result["ok"]:
+            logging.error(
+                f"Failed to send batch region={r} messages={len(entries)} status={result.get('status')} "
+                f"retryable={result.get('retryable')} error={result.get('error')}"
+            )
+
+    logging.info(
+        f"Relayed batch of {len(azservicebus)} messages to {len(regions)} regions. "
+        f"failed_messages={len(failed_regions)} rejected_messages={len(rejected_regions)}"
+    )
+    dead_letters.extend(
+        (azservicebus[index], {"Region": "|" + "|".join(rejected) + "|"}, "BackendRejected",
+         "; ".join(f"{r}: status={statuses[r]}" for r in rejected))
+        for index, rejected in rejected_regions.items()
+    )
+    await _finish_batch("emc-patient-alert", [
+        (azservicebus[index], {"Region": "|" + "|".join(failed) + "|"})
+        for index, failed in failed_regions.items()
+    ], dead_letters)
+
+
+@_register_if(RELAY_BATCH_MODE, app.service_bus_topic_trigger(
+        arg_name="azservicebus",
+        subscription_name="all",
+        topic_name="emc-center-response",
+        connection="sirengoldenhour_SERVICEBUS",
+        cardinality=func.Cardinality.MANY))
+async def emc_center_response_servicebus_batch_trigger(azservicebus: List[func.ServiceBusMessage]):
+    """배치 모드: 여러 응답 메세지를 tenant별로 묶어 tenant당 한 번만 POST 한다.
+
+    /api/v1/emc/broadcast/to-field/{tenant_id}/batch  (`{"messages": [...]}`)
+    실패한 메세지만 재전송하고, 나머지는 완료 처리된다.
+    해석할 수 없는 메세지, 백엔드가 영구 거절(4xx)한 메세지, 재전송 한도를 넘긴 메세지는
+    하나씩 Dead-letter 한다. (`RELAY_DEAD_LETTER_TOPIC`)
+    """
+    by_tenant: dict = {}        # tenant_id -> [(메세지 index, req_payload)]
+    dead_letters = []           # (메세지, 변경할 속성, 사유, 설명)
+    for index, msg in enumerate(azservicebus):
+        msg_id = getattr(msg, "message_id", "") or ""
+        try:
+            body = msg.get_body().decode("utf-8")
+            tenant_id = json.loads(body).get("tenant_id")
+        except (UnicodeDecodeError, json.JSONDecodeError, AttributeError) as e:
+            logging.exception(f"Invalid message in batch. msg_id={msg_id}")
+            dead_letters.append((msg, {}, "InvalidMessage", repr(e)))
+            continue
+        if tenant_id is None:
+            dead_letters.append((msg, {}, "InvalidTenant", "tenant_id is missing"))
+            continue
+        by_tenant.setdefault(tenant_id, []).append((index, {
             "topic_body": body,
             "topic_message_id": msg_id,
-            "topic_correlation_id": corr_id,
-            "topic_session_id": sess_id,
-            "topic_properties": azservicebus.user_properties
-        }
-    try:
-        response = requests.post(url, 
-                                 headers=headers, 
-                                 json=req_payload,
-                                 verify=False)
-        logging.info(f"Sent message to tenant {tenant_id}: {response.status_code}")
-    except requests.RequestException as e:
-        logging.exception(f"HTTP request failed. msg_id={msg_id} url={url}")
-        raise
+            "idempotency_key": _idempotency_key(_origin_message_id(msg), f"tenant:{tenant_id}"),
+            "topic_correlation_id": getattr(msg, "correlation_id", "") or "",
+            "topic_session_id": getattr(msg, "session_id", "") or "",
+            "topic_properties": msg.user_properties,
+        }))
+
+    failed = []
+    for tenant_id in list(by_tenant):
+        by_tenant[tenant_id], in_flight = await _claim_entries(by_tenant[tenant_id])
+        failed.extend(index for index, _ in in_flight)
+        if not by_tenant[tenant_id]:
+            del by_tenant[tenant_id]
+
+    session = _get_http_session()
+    tenants = list(by_tenant)
+    results = await asyncio.gather(*(
+        _post_with_retry(
+            session,
+            f"https://{backend_base_url}:{backend_base_port}/api/v1/emc/broadcast/to-field/{tenant_id}/batch",
+            {"Content-Type": "application/json", "x-batch-size": str(len(by_tenant[tenant_id]))},
+            {"messages": [payload for _, payload in by_tenant[tenant_id]]},
+            f"batch[{len(azservicebus)}]",
+            f"tenant:{tenant_id}",
+            keep_body=True,
+            priority=_highest_priority(
+                _message_priority(azservicebus[index].user_properties or {}) for index, _ in by_tenant[tenant_id]
+            ),
+        )
+        for tenant_id in tenants
+    ))
+
+    for tenant_id, result in zip(tenants, results):
+        entries = by_tenant[tenant_id]
+        requeue = result["ok"] or result["retryable"]
+        per_message = _batch_results(result, [p for _, p in entries])
+        await _settle_entries(entries, per_message)
+        for (index, _), ok in zip(entries, per_message):
+            if ok:
+                continue
+            if requeue:
+                failed.append(index)
+            else:
+                dead_letters.append(
+                    (azservicebus[index], {}, "BackendRejected", f"tenant:{tenant_id}: status={result.get('status')}")
+                )
+        if not result["ok"]:
+            logging.error(
+                f"Failed to send batch tenant_id={tenant_id} messages={len(entries)} status={result.get('status')} "
+                f"retryable={result.get('retryable')} error={result.get('error')}"
+            )
+
+    logging.info(
+        f"Relayed batch of {len(azservicebus)} messages to {len(tenants)} tenants. failed_messages={len(failed)}"
+    )
+    await _finish_batch("emc-center-response", [(azservicebus[index], {}) for index in failed], dead_letters)
 
-    if response.status_code >= 400:
-        logging.error(f"Failed to send message to tenant {tenant_id}. msg_id={msg_id} status_code={response.status_code} \n response={response.text}")
-        raise Exception(f"Failed to send message to tenant {tenant_id}. Status code: {response.status_code}")
 
-    if response.status_code == 200:
-        logging.info(f"Delivered to backend successfully msg_id={msg_id} tenant_id={tenant_id}")
+@_register_if(RELAY_METRICS_ENABLED, app.route(route="metrics", methods=["GET"], auth_level=func.AuthLevel.FUNCTION))
+def relay_metrics(req: func.HttpRequest) -> func.HttpResponse:
+    """리전별 HTTP 지연/상태, 재시도, 서킷 차단 수를 Prometheus 텍스트 형식으로 반환한다."""
+    return func.HttpResponse(render_prometheus(), headers={"Content-Type": PROMETHEUS_CONTENT_TYPE})
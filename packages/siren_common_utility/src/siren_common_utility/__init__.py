@@ -20,5 +20,34 @@ async def test():
 
 ```
 
+import 시에는 Azure SDK를 불러오지 않으며, `AzureServiceBusConnectorInstance`에 처음 접근할 때 로드합니다.
+로깅은 기본적으로 설정하지 않습니다. `set_default_logger()`를 호출하거나 `SIREN_COMMON_UTILITY_LOGGING=true`로 켭니다.
+
 """
-from .core import *
\ No newline at end of file
+from importlib import import_module
+
+from .core import *
+
+__all__ = (
+    'AzureServiceBusConnectorInstance',
+    'set_default_logger',
+    'stop_default_logger',
+)
+
+# 지연 로딩 대상 (이름 → 모듈)
+_LAZY_ATTRIBUTES = {
+    'AzureServiceBusConnectorInstance': '.service',
+}
+
+
+def __getattr__(name: str):
+    module = _LAZY_ATTRIBUTES.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES))
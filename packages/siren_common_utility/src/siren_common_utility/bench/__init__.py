@@ -0,0 +1,12 @@
+"""
+# 벤치마크
+
+로컬 브로커(`InMemoryServiceBus`)와 Mock 권역 백엔드로 publish / consume / relay 경로의 처리량과 지연을 측정한다.
+
+```bash
+python -m siren_common_utility.bench --quick --output bench.json
+python -m siren_common_utility.bench --quick --compare bench.json     # 회귀 비교 (회귀 시 종료 코드 1)
+```
+"""
+from .backend import *
+from .runner import *
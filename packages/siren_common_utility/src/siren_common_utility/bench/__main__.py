@@ -0,0 +1,82 @@
+from pathlib import Path
+import argparse
+import asyncio
+import json
+import logging
+import sys
+
+from .runner import SCENARIOS, BenchConfig, compare_reports, run_benchmarks
+
+
+def _ints(value: str) -> list[int]:
+    return [int(v) for v in value.split(',') if v]
+
+
+def _parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="python -m siren_common_utility.bench",
+        description="publish / consume / relay 경로의 처리량(msgs/s), p50/p95/p99 지연, CPU, RSS를 JSON으로 출력한다.",
+    )
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS), help=f"실행할 시나리오 ({','.join(SCENARIOS)})")
+    parser.add_argument("--messages", type=int, default=2000, help="publish/pubsub/listen 실행당 메세지 수")
+    parser.add_argument("--relay-messages", type=int, default=500, help="relay 실행당 메세지 수")
+    parser.add_argument("--sizes", type=_ints, default=[256, 4096], help="메세지 크기(bytes), 쉼표 구분")
+    parser.add_argument("--concurrency", type=_ints, default=[1, 8, 32], help="동시성 수준, 쉼표 구분")
+    parser.add_argument("--batch-sizes", type=_ints, default=[1, 10, 100], help="send_to_topic 1회당 메세지 수, 쉼표 구분")
+    parser.add_argument("--fanout", type=_ints, default=[1, 3, 7], help="리전 팬아웃 수, 쉼표 구분")
+    parser.add_argument("--broker-latency-ms", type=float, default=0.0, help="로컬 브로커 연산 지연(ms)")
+    parser.add_argument("--backend-latency-ms", type=float, default=5.0, help="Mock 백엔드 응답 지연(ms)")
+    parser.add_argument("--backend-error-rate", type=float, default=0.0, help="Mock 백엔드 503 확률")
+    parser.add_argument("--relay-app", type=Path, default=None, help="Relay function_app.py 경로")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--quick", action="store_true", help="작은 스윕으로 빠르게 실행한다")
+    parser.add_argument("--output", type=Path, default=None, help="리포트 JSON 저장 경로 (기본: stdout)")
+    parser.add_argument("--compare", type=Path, default=None, help="비교할 기준 리포트 JSON")
+    parser.add_argument("--threshold", type=float, default=0.10, help="회귀로 판단할 변화율")
+    parser.add_argument("--verbose", action="store_true")
+    args = parser.parse_args(argv)
+    if args.quick:
+        args.messages, args.relay_messages = 300, 100
+        args.sizes, args.concurrency, args.batch_sizes, args.fanout = [256], [1, 8], [1, 10], [1, 3]
+    return args
+
+
+def main(argv=None) -> int:
+    args = _parse_args(argv)
+    if not args.verbose:
+        logging.getLogger().setLevel(logging.WARNING)
+    config = BenchConfig(
+        scenarios=[s for s in args.scenarios.split(',') if s],
+        messages=args.messages,
+        relay_messages=args.relay_messages,
+        sizes=args.sizes,
+        concurrency=args.concurrency,
+        batch_sizes=args.batch_sizes,
+        fanout=args.fanout,
+        broker_latency_ms=args.broker_latency_ms,
+        backend_latency_ms=args.backend_latency_ms,
+        backend_error_rate=args.backend_error_rate,
+        relay_app=args.relay_app,
+        seed=args.seed,
+    )
+    report = asyncio.run(run_benchmarks(config))
+
+    exit_code = 0
+    if args.compare is not None:
+        baseline = json.loads(args.compare.read_text(encoding='utf-8'))
+        report["comparison"] = compare_reports(baseline, report, threshold=args.threshold)
+        regressions = [row["key"] for row in report["comparison"] if row["regression"]]
+        if regressions:
+            logging.warning(f"Regressions over {args.threshold:.0%}: {', '.join(regressions)}")
+            exit_code = 1
+
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output is not None:
+        args.output.write_text(text, encoding='utf-8')
+    else:
+        sys.stdout.write(text + "\n")
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
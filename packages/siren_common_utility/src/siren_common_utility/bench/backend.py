@@ -0,0 +1,100 @@
+from collections import Counter
+import asyncio
+import random
+
+from aiohttp import web
+
+from typing import Optional
+
+__all__ = (
+    'MockRegionalBackend',
+)
+
+
+class MockRegionalBackend:
+
+    def __init__(
+            self,
+            *,
+            latency_ms: float = 5.0,
+            jitter_ms: float = 0.0,
+            error_rate: float = 0.0,
+            error_status: int = 503,
+            seed: Optional[int] = None,
+            record: bool = False,
+    ) -> None:
+        """권역별 백엔드(`/api/v1/emc/broadcast/to-centers/{region}`, `/to-field/{tenant_id}`)를 흉내내는 로컬 HTTP 서버이다.
+
+        요청마다 `latency_ms` ± `jitter_ms` 동안 대기한 뒤 200을 반환하고, `error_rate` 확률로 `error_status`를 반환한다.
+
+        Args:
+            latency_ms (float): 응답 지연(ms).
+            jitter_ms (float): 지연에 더할 균등 분포 범위(ms).
+            error_rate (float): 오류 응답 확률. (0~1)
+            error_status (int): 오류 응답 상태 코드.
+            seed (Optional[int]): 지연/오류 난수 시드.
+            record (bool): 요청 `(target, headers, body)`를 `received`에 보관할지 여부.
+
+        Examples:
+
+            ```python
+            async with MockRegionalBackend(latency_ms=20) as backend:
+                url = backend.url_for('Seoul')      # http://127.0.0.1:{port}/api/v1/emc/broadcast/to-centers/Seoul
+            ```
+        """
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self._random = random.Random(seed)
+        self._runner: Optional[web.AppRunner] = None
+        self.port: Optional[int] = None
+        self.requests: Counter = Counter()
+        self.errors = 0
+        self.record = record
+        self.received: list[tuple[str, dict, bytes]] = []
+
+    @property
+    def base_url(self) -> str:
+        if self.port is None:
+            raise RuntimeError("backend is not started")
+        return f"http://127.0.0.1:{self.port}"
+
+    def url_for(self, region: str) -> str:
+        return f"{self.base_url}/api/v1/emc/broadcast/to-centers/{region}"
+
+    async def start(self) -> None:
+        app = web.Application()
+        app.router.add_post("/api/v1/emc/broadcast/to-centers/{target}", self._handle)
+        app.router.add_post("/api/v1/emc/broadcast/to-field/{target}", self._handle)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", 0)
+        await site.start()
+        self.port = site._server.sockets[0].getsockname()[1]
+
+    async def close(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def __aenter__(self) -> "MockRegionalBackend":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        await self.close()
+
+    async def _handle(self, request: web.Request) -> web.Response:
+        body = await request.read()
+        target = request.match_info["target"]
+        if self.record:
+            self.received.append((target, dict(request.headers), body))
+        self.requests[target] += 1
+        delay = self.latency_ms + (self._random.uniform(0, self.jitter_ms) if self.jitter_ms else 0.0)
+        if delay > 0:
+            await asyncio.sleep(delay / 1000)
+        if self.error_rate and self._random.random() < self.error_rate:
+            self.errors += 1
+            return web.json_response({"detail": "unavailable"}, status=self.error_status)
+        return web.json_response({"ok": True, "target": target})
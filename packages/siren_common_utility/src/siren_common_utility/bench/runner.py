@@ -0,0 +1,598 @@
+from contextlib import redirect_stdout
+from datetime import datetime, timezone
+from itertools import product
+from pathlib import Path
+from time import perf_counter, process_time
+import asyncio
+import importlib.util
+import json
+import logging
+import os
+import platform
+import sys
+import tempfile
+import uuid
+
+from azure.servicebus import ServiceBusMessage
+
+from .backend import MockRegionalBackend
+from ..modules.az_service_bus import InMemoryServiceBus, priority_sql_filter
+from ..modules.az_service_bus._stats import summarize_latencies
+from ..modules.codec import PatientAlert
+from ..modules.patient_logs import PatientLogSink, SQLitePatientLogStore
+from ..service import AzureServiceBusConnectorInstance
+
+from types import ModuleType
+from typing import Iterable, Optional, Sequence, Union
+
+__all__ = (
+    'BenchConfig',
+    'compare_reports',
+    'find_relay_app',
+    'load_relay_app',
+    'run_benchmarks',
+)
+
+REPORT_VERSION = 1
+SCENARIOS = ("publish", "pubsub", "listen", "relay", "outbox", "patient_logs", "priority")
+REGIONS = ("Seoul", "Gyeonggi", "Gangwon", "Chungcheong", "Honam", "Yeongnam", "Incheon")
+
+BENCH_TOPIC = "bench-topic"
+BENCH_SUBSCRIPTION = "bench"
+RELAY_APP_RELATIVE_PATH = Path("azure") / "functions" / "service_bus_relay" / "function_app.py"
+
+
+class BenchConfig:
+
+    def __init__(
+            self,
+            *,
+            scenarios: Sequence[str] = SCENARIOS,
+            messages: int = 2000,
+            relay_messages: int = 500,
+            sizes: Sequence[int] = (256, 4096),
+            concurrency: Sequence[int] = (1, 8, 32),
+            batch_sizes: Sequence[int] = (1, 10, 100),
+            fanout: Sequence[int] = (1, 3, 7),
+            broker_latency_ms: float = 0.0,
+            backend_latency_ms: float = 5.0,
+            backend_error_rate: float = 0.0,
+            relay_app: Optional[Union[str, Path]] = None,
+            seed: int = 0,
+    ) -> None:
+        """벤치마크 스윕 설정.
+
+        - publish: 메세지 크기 × 배치 크기 × 동시 호출 수 (`send_to_topic`)
+        - pubsub: 메세지 크기 × 소비자 동시성 (`publish` → `consume`, 종단 간 지연)
+        - listen: 메세지 크기 (`listening_subscribe_from_topic`, 직렬 처리)
+        - relay: 메세지 크기 × 리전 팬아웃 × 동시 메세지 수 (Relay Function의 `_post_to_region`)
+        - outbox: 메세지 크기 × 동시 호출 수 (`outbox_dir`을 지정한 `send_to_topic`, 디스크 기록까지)
+        - patient_logs: RAW_TEXT 크기 × 배치 크기 (`PatientLogSink` → SQLite 파일, 커밋까지)
+        - priority: 메세지 크기 × 소비자 동시성 (일반 알림 적체 중 critical 알림의 Lane별 큐 대기시간, `consume_priority`)
+
+        Args:
+            scenarios (Sequence[str]): 실행할 시나리오.
+            messages (int): publish/pubsub/listen 실행당 메세지 수.
+            relay_messages (int): relay 실행당 메세지 수.
+            sizes (Sequence[int]): 메세지 본문 크기(bytes).
+            concurrency (Sequence[int]): 동시성 수준.
+            batch_sizes (Sequence[int]): `send_to_topic` 1회당 메세지 수.
+            fanout (Sequence[int]): 메세지 1개가 전파되는 리전 수. (최대 7)
+            broker_latency_ms (float): 로컬 브로커 연산마다 주입할 지연(ms).
+            backend_latency_ms (float): Mock 백엔드 응답 지연(ms).
+            backend_error_rate (float): Mock 백엔드 503 응답 확률.
+            relay_app (Optional[str | Path]): Relay `function_app.py` 경로. 없으면 `find_relay_app()`로 찾는다.
+            seed (int): 난수 시드.
+        """
+        unknown = set(scenarios) - set(SCENARIOS)
+        if unknown:
+            raise ValueError(f"Unknown scenarios: {sorted(unknown)}")
+        if any(f < 1 or f > len(REGIONS) for f in fanout):
+            raise ValueError(f"fanout must be between 1 and {len(REGIONS)}")
+        self.scenarios = tuple(scenarios)
+        self.messages = messages
+        self.relay_messages = relay_messages
+        self.sizes = tuple(sizes)
+        self.concurrency = tuple(concurrency)
+        self.batch_sizes = tuple(batch_sizes)
+        self.fanout = tuple(fanout)
+        self.broker_latency_ms = broker_latency_ms
+        self.backend_latency_ms = backend_latency_ms
+        self.backend_error_rate = backend_error_rate
+        self.relay_app = relay_app
+        self.seed = seed
+
+    def to_dict(self) -> dict:
+        return {
+            name: (str(value) if isinstance(value, Path) else value)
+            for name, value in vars(self).items()
+        }
+
+
+class _ResourceSampler:
+    """구간의 벽시계 시간, 프로세스 CPU 시간, RSS를 측정한다. (표준 라이브러리만 사용)"""
+
+    def __enter__(self) -> "_ResourceSampler":
+        self.wall_started = perf_counter()
+        self.cpu_started = process_time()
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.wall_s = perf_counter() - self.wall_started
+        self.cpu_s = process_time() - self.cpu_started
+
+    @staticmethod
+    def _rss_mb() -> Optional[float]:
+        try:
+            with open("/proc/self/statm") as f:
+                return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 1024 / 1024
+        except (OSError, ValueError, AttributeError):
+            return None
+
+    @staticmethod
+    def _peak_rss_mb() -> Optional[float]:
+        try:
+            import resource
+        except ImportError:
+            return None
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux는 KB, macOS는 bytes 단위이다.
+        return peak / 1024 / 1024 if sys.platform == "darwin" else peak / 1024
+
+    def to_dict(self) -> dict:
+        return {
+            "cpu_s": round(self.cpu_s, 4),
+            "cpu_percent": round(self.cpu_s / self.wall_s * 100, 1) if self.wall_s else None,
+            "rss_mb": self._rss_mb(),
+            "peak_rss_mb": self._peak_rss_mb(),
+        }
+
+
+def _result(
+        scenario: str,
+        params: dict,
+        messages: int,
+        duration_s: float,
+        latencies_ms: Iterable[float],
+        resources: _ResourceSampler,
+        *,
+        errors: int = 0,
+        **extra,
+) -> dict:
+    latencies_ms = list(latencies_ms)
+    latency = summarize_latencies(latencies_ms)
+    latency["mean"] = sum(latencies_ms) / len(latencies_ms) if latencies_ms else None
+    return {
+        "scenario": scenario,
+        "params": params,
+        "messages": messages,
+        "errors": errors,
+        "duration_s": round(duration_s, 4),
+        "msgs_per_s": round(messages / duration_s, 1) if duration_s else None,
+        "latency_ms": latency,
+        **resources.to_dict(),
+        **extra,
+    }
+
+
+def _message(size: int, region: str = "|Seoul|", **properties) -> ServiceBusMessage:
+    body = json.dumps({"patient_id": str(uuid.uuid4()), "pad": ""})
+    body = body[:-2] + "x" * max(0, size - len(body)) + '"}'
+    return ServiceBusMessage(body, application_properties={"Region": region, **properties})
+
+
+def _new_bus(config: BenchConfig) -> InMemoryServiceBus:
+    latency = config.broker_latency_ms / 1000
+    bus = InMemoryServiceBus(latency=(latency * 0.5, latency * 1.5) if latency else 0.0, seed=config.seed)
+    bus.create_subscription(BENCH_TOPIC, BENCH_SUBSCRIPTION, lock_duration=60)
+    return bus
+
+
+async def _bench_publish(config: BenchConfig, size: int, batch_size: int, concurrency: int) -> dict:
+    """`send_to_topic` 호출 지연과 처리량."""
+    chunks = [
+        [_message(size) for _ in range(min(batch_size, config.messages - start))]
+        for start in range(0, config.messages, batch_size)
+    ]
+    queue: asyncio.Queue = asyncio.Queue()
+    for chunk in chunks:
+        queue.put_nowait(chunk)
+    latencies, errors = [], 0
+
+    async with AzureServiceBusConnectorInstance(transport=_new_bus(config)) as connector:
+        async def worker():
+            nonlocal errors
+            while not queue.empty():
+                chunk = queue.get_nowait()
+                started = perf_counter()
+                try:
+                    await connector.send_to_topic(BENCH_TOPIC, chunk)
+                except Exception:
+                    errors += len(chunk)
+                latencies.append((perf_counter() - started) * 1000)
+
+        with _ResourceSampler() as resources:
+            await asyncio.gather(*(worker() for _ in range(concurrency)))
+
+    return _result(
+        "publish",
+        {"size": size, "batch_size": batch_size, "concurrency": concurrency},
+        config.messages, resources.wall_s, latencies, resources, errors=errors,
+    )
+
+
+async def _bench_outbox(config: BenchConfig, size: int, concurrency: int) -> dict:
+    """Outbox `send_to_topic`(디스크 기록 후 반환)의 지연과 처리량, 그리고 백그라운드 전송 완료까지의 시간."""
+    queue: asyncio.Queue = asyncio.Queue()
+    for _ in range(config.messages):
+        queue.put_nowait(_message(size))
+    latencies, errors = [], 0
+
+    with tempfile.TemporaryDirectory(prefix="siren-outbox-") as directory:
+        async with AzureServiceBusConnectorInstance(transport=_new_bus(config), outbox_dir=directory) as connector:
+            async def worker():
+                nonlocal errors
+                while not queue.empty():
+                    message = queue.get_nowait()
+                    started = perf_counter()
+                    try:
+                        await connector.send_to_topic(BENCH_TOPIC, [message])
+                    except Exception:
+                        errors += 1
+                    latencies.append((perf_counter() - started) * 1000)
+
+            with _ResourceSampler() as resources:
+                await asyncio.gather(*(worker() for _ in range(concurrency)))
+            drain_started = perf_counter()
+            await connector.flush_outbox()
+            drain_s = perf_counter() - drain_started
+            spool = connector.get_stats()["outbox"]["spool"]
+
+    return _result(
+        "outbox",
+        {"size": size, "concurrency": concurrency},
+        config.messages, resources.wall_s, latencies, resources,
+        errors=errors, drain_s=round(drain_s, 4), commits=spool["commits"],
+    )
+
+
+async def _bench_patient_logs(config: BenchConfig, size: int, batch_size: int) -> dict:
+    """`PatientLogSink.write()`(배치 INSERT 커밋까지)의 지연과 처리량. batch_size=1은 행 단위 INSERT와 같다."""
+    alerts = [
+        PatientAlert(patient_id=str(i), raw_text="x" * size, patient_name="bench", age=70, dept_code="D001")
+        for i in range(config.messages)
+    ]
+    latencies, errors = [], 0
+
+    with tempfile.TemporaryDirectory(prefix="siren-patient-logs-") as directory:
+        store = SQLitePatientLogStore(Path(directory) / "patient_logs.db")
+        sink = PatientLogSink(store, max_batch_rows=batch_size, linger_ms=5, max_pending_rows=batch_size * 4)
+
+        async def write(alert):
+            nonlocal errors
+            started = perf_counter()
+            try:
+                await sink.write(alert)
+            except Exception:
+                errors += 1
+            latencies.append((perf_counter() - started) * 1000)
+
+        with _ResourceSampler() as resources:
+            await asyncio.gather(*(write(alert) for alert in alerts))
+        await sink.aclose()
+        stats = sink.get_stats()
+        store.close()
+
+    return _result(
+        "patient_logs",
+        {"size": size, "batch_size": batch_size},
+        config.messages, resources.wall_s, latencies, resources,
+        errors=errors, batches=stats["batches"],
+    )
+
+
+async def _bench_priority(config: BenchConfig, size: int, concurrency: int) -> dict:
+    """일반 알림 `messages`개가 쌓인 상태에서 critical 알림을 보낼 때의 Lane별 큐 대기시간.
+
+    핸들러는 `backend_latency_ms` 동안 대기하고, 가장 높은 Lane 전용 슬롯은 `concurrency // 4`개이다.
+    지연시간(`latency_ms`)은 critical 알림의 전송부터 핸들러 시작까지이다.
+    """
+    lanes = {"critical": "bench-critical", "normal": "bench-normal"}
+    bus = _new_bus(config)
+    for priority, subscription in lanes.items():
+        bus.create_subscription(BENCH_TOPIC, subscription, sql_filter=priority_sql_filter(priority), lock_duration=60)
+    critical_messages = max(1, config.messages // 20)
+    reserved = concurrency // 4
+    latencies = []
+
+    async def handler(msg):
+        sent_at = msg.application_properties.get("BenchSentAt")
+        if sent_at is not None:
+            latencies.append((perf_counter() - sent_at) * 1000)
+        await asyncio.sleep(config.backend_latency_ms / 1000)
+
+    async with AzureServiceBusConnectorInstance(transport=bus) as connector:
+        report = await connector.send_batch_to_topic(
+            BENCH_TOPIC, [_message(size) for _ in range(config.messages)], priority="normal"
+        )
+        errors = len(report.failed)
+        with _ResourceSampler() as resources:
+            consumer = asyncio.create_task(connector.consume_priority(
+                BENCH_TOPIC, lanes, handler,
+                max_concurrency=concurrency, reserved_concurrency=reserved,
+                idle_timeout=0.2, receiver_max_wait_time=0.05,
+            ))
+            for _ in range(critical_messages):
+                await asyncio.sleep(config.backend_latency_ms / 1000)
+                try:
+                    await connector.send_to_topic(
+                        BENCH_TOPIC, [_message(size, BenchSentAt=perf_counter())], priority="critical"
+                    )
+                except Exception:
+                    errors += 1
+            stats = await consumer
+
+    return _result(
+        "priority",
+        {"size": size, "concurrency": concurrency, "reserved": reserved},
+        config.messages + critical_messages, resources.wall_s, latencies, resources,
+        errors=errors + sum(lane["abandoned"] + lane["settle_errors"] for lane in stats["lanes"].values()),
+        lanes={
+            priority: {"completed": lane["completed"], "queue_wait_ms": lane["queue_wait_ms"]}
+            for priority, lane in stats["lanes"].items()
+        },
+    )
+
+
+async def _bench_pubsub(config: BenchConfig, size: int, concurrency: int) -> dict:
+    """`publish()`(마이크로 배치)로 보내고 `consume()`으로 받는 종단 간 지연과 처리량."""
+    messages = [_message(size) for _ in range(config.messages)]
+    latencies = []
+    done = asyncio.Event()
+
+    async def handler(msg):
+        latencies.append((perf_counter() - msg.application_properties["BenchSentAt"]) * 1000)
+        if len(latencies) >= config.messages:
+            done.set()
+
+    async with AzureServiceBusConnectorInstance(transport=_new_bus(config)) as connector:
+        with _ResourceSampler() as resources:
+            consumer = asyncio.create_task(connector.consume(
+                BENCH_TOPIC, BENCH_SUBSCRIPTION, handler,
+                max_concurrency=concurrency, stop=done, receiver_max_wait_time=0.05,
+            ))
+            futures = []
+            for message in messages:
+                message.application_properties["BenchSentAt"] = perf_counter()
+                futures.append(await connector.publish(BENCH_TOPIC, message))
+            results = await asyncio.gather(*futures, return_exceptions=True)
+            errors = sum(isinstance(r, BaseException) for r in results)
+            if errors < len(messages):
+                await done.wait()
+            else:
+                done.set()
+            stats = await consumer
+
+    return _result(
+        "pubsub",
+        {"size": size, "concurrency": concurrency},
+        len(latencies), resources.wall_s, latencies, resources,
+        errors=errors + stats["abandoned"] + stats["settle_errors"],
+    )
+
+
+async def _bench_listen(config: BenchConfig, size: int) -> dict:
+    """`listening_subscribe_from_topic`(메세지 하나씩 직렬 처리)의 처리량."""
+    bus = _new_bus(config)
+    latencies = []
+    async with AzureServiceBusConnectorInstance(transport=bus) as connector:
+        report = await connector.send_batch_to_topic(
+            BENCH_TOPIC, [_message(size) for _ in range(config.messages)]
+        )
+        with _ResourceSampler() as resources:
+            stream = connector.listening_subscribe_from_topic(
+                BENCH_TOPIC, BENCH_SUBSCRIPTION, receiver_max_wait_time=0.05
+            )
+            started = perf_counter()
+            async for msg in stream:
+                latencies.append((perf_counter() - started) * 1000)
+                started = perf_counter()
+                if len(latencies) >= report.sent_count:
+                    break
+            await stream.aclose()
+
+    return _result(
+        "listen",
+        {"size": size},
+        len(latencies), resources.wall_s, latencies, resources,
+        errors=len(report.failed),
+    )
+
+
+def find_relay_app(start: Optional[Union[str, Path]] = None) -> Optional[Path]:
+    """저장소의 Relay `function_app.py`를 찾는다. (`SIREN_RELAY_APP` 환경변수, 현재 경로와 패키지 경로의 상위 디렉토리 순)"""
+    configured = os.getenv("SIREN_RELAY_APP")
+    if configured:
+        return Path(configured)
+    for base in (Path(start or Path.cwd()).resolve(), Path(__file__).resolve()):
+        for parent in (base, *base.parents):
+            candidate = parent / RELAY_APP_RELATIVE_PATH
+            if candidate.is_file():
+                return candidate
+    return None
+
+
+def load_relay_app(path: Union[str, Path]) -> ModuleType:
+    """Relay Function 앱 모듈을 불러온다. (`azure-functions` 패키지가 필요하다)"""
+    spec = importlib.util.spec_from_file_location("siren_service_bus_relay_function_app", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+async def _bench_relay(
+        config: BenchConfig,
+        relay: ModuleType,
+        backend: MockRegionalBackend,
+        size: int,
+        fanout: int,
+        concurrency: int,
+) -> dict:
+    """Relay의 리전 팬아웃(`_post_to_region`)을 Mock 백엔드로 실행한 처리량과 메세지당 지연."""
+    # 모듈 전역 설정을 바꾸고 공유 세션/리전 가드를 새로 만들게 한다.
+    relay.MAX_CONCURRENCY = concurrency * fanout
+    relay.REGION_MAX_CONCURRENCY = concurrency
+    relay.HTTP_RETRY_BASE_DELAY_SEC = 0.01
+    relay._bound_loop = None
+    session = relay._get_http_session()
+    regions = REGIONS[:fanout]
+    queue: asyncio.Queue = asyncio.Queue()
+    for _ in range(config.relay_messages):
+        queue.put_nowait(_message(size, "|" + "|".join(regions) + "|"))
+    latencies, errors = [], 0
+
+    async def worker():
+        nonlocal errors
+        while not queue.empty():
+            message = queue.get_nowait()
+            body = str(message)
+            msg_id = message.message_id or str(uuid.uuid4())
+            payload = {
+                "topic_body": body,
+                "topic_message_id": msg_id,
+                "topic_correlation_id": "",
+                "topic_session_id": "",
+                "topic_properties": message.application_properties,
+            }
+            started = perf_counter()
+            results = await asyncio.gather(*(
+                relay._post_to_region(
+                    session,
+                    backend.url_for(region),
+                    {"Content-Type": "application/json", "x-message-id": msg_id},
+                    payload,
+                    msg_id,
+                    region,
+                )
+                for region in relay._parse_regions(message.application_properties["Region"])
+            ))
+            latencies.append((perf_counter() - started) * 1000)
+            errors += sum(not r.get("ok") for r in results)
+
+    try:
+        with _ResourceSampler() as resources:
+            await asyncio.gather(*(worker() for _ in range(concurrency)))
+    finally:
+        await session.close()
+
+    return _result(
+        "relay",
+        {"size": size, "fanout": fanout, "concurrency": concurrency},
+        config.relay_messages, resources.wall_s, latencies, resources,
+        errors=errors, posts=config.relay_messages * fanout,
+    )
+
+
+async def run_benchmarks(config: Optional[BenchConfig] = None) -> dict:
+    """설정된 스윕을 순서대로 실행하고 JSON으로 직렬화할 수 있는 리포트를 반환한다.
+
+    Returns:
+        dict: `{"version", "started_at", "environment", "config", "results": [...], "skipped": [...]}`
+            각 결과는 `msgs_per_s`, `latency_ms`(p50/p95/p99/max/mean), `cpu_s`, `cpu_percent`, `rss_mb`, `peak_rss_mb`를 가진다.
+
+    Examples:
+
+        ```python
+        report = asyncio.run(run_benchmarks(BenchConfig(scenarios=["publish"], messages=500)))
+        ```
+    """
+    config = config or BenchConfig()
+    report = {
+        "version": REPORT_VERSION,
+        "started_at": datetime.now(timezone.utc).isoformat(),
+        "environment": {
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+        },
+        "config": config.to_dict(),
+        "results": [],
+        "skipped": [],
+    }
+    results = report["results"]
+
+    # 라이브러리의 print() 출력이 JSON 리포트(stdout)에 섞이지 않도록 한다.
+    with redirect_stdout(sys.stderr):
+        if "publish" in config.scenarios:
+            for size, batch_size, concurrency in product(config.sizes, config.batch_sizes, config.concurrency):
+                results.append(await _bench_publish(config, size, batch_size, concurrency))
+        if "pubsub" in config.scenarios:
+            for size, concurrency in product(config.sizes, config.concurrency):
+                results.append(await _bench_pubsub(config, size, concurrency))
+        if "listen" in config.scenarios:
+            for size in config.sizes:
+                results.append(await _bench_listen(config, size))
+        if "outbox" in config.scenarios:
+            for size, concurrency in product(config.sizes, config.concurrency):
+                results.append(await _bench_outbox(config, size, concurrency))
+        if "patient_logs" in config.scenarios:
+            for size, batch_size in product(config.sizes, config.batch_sizes):
+                results.append(await _bench_patient_logs(config, size, batch_size))
+        if "priority" in config.scenarios:
+            for size, concurrency in product(config.sizes, config.concurrency):
+                results.append(await _bench_priority(config, size, concurrency))
+        if "relay" in config.scenarios:
+            path = config.relay_app or find_relay_app()
+            relay = None
+            try:
+                if path is None:
+                    raise FileNotFoundError(str(RELAY_APP_RELATIVE_PATH))
+                relay = load_relay_app(path)
+            except (ImportError, OSError) as e:
+                logging.warning(f"Skipping relay benchmark: {e!r}")
+                report["skipped"].append({"scenario": "relay", "reason": repr(e)})
+            if relay is not None:
+                async with MockRegionalBackend(
+                        latency_ms=config.backend_latency_ms,
+                        error_rate=config.backend_error_rate,
+                        seed=config.seed,
+                ) as backend:
+                    for size, fanout, concurrency in product(config.sizes, config.fanout, config.concurrency):
+                        results.append(await _bench_relay(config, relay, backend, size, fanout, concurrency))
+    return report
+
+
+def _result_key(result: dict) -> str:
+    params = ",".join(f"{k}={v}" for k, v in sorted(result["params"].items()))
+    return f"{result['scenario']}[{params}]"
+
+
+def compare_reports(baseline: dict, current: dict, *, threshold: float = 0.10) -> list[dict]:
+    """두 리포트에서 같은 (시나리오, 파라미터) 결과를 비교한다.
+
+    처리량(`msgs_per_s`)이 `threshold` 비율 이상 줄었거나 p99 지연이 `threshold` 비율 이상 늘면 `regression=True`이다.
+
+    Returns:
+        list[dict]: `{"key", "msgs_per_s": (기준, 현재, 변화율), "p99_ms": (기준, 현재, 변화율), "regression"}` 목록.
+    """
+    base = {_result_key(r): r for r in baseline.get("results", [])}
+    rows = []
+    for result in current.get("results", []):
+        key = _result_key(result)
+        before = base.get(key)
+        if before is None:
+            continue
+
+        def _change(old, new):
+            return round((new - old) / old, 4) if old and new is not None else None
+
+        tput = _change(before["msgs_per_s"], result["msgs_per_s"])
+        p99 = _change(before["latency_ms"]["p99"], result["latency_ms"]["p99"])
+        rows.append({
+            "key": key,
+            "msgs_per_s": (before["msgs_per_s"], result["msgs_per_s"], tput),
+            "p99_ms": (before["latency_ms"]["p99"], result["latency_ms"]["p99"], p99),
+            "regression": (tput is not None and tput <= -threshold) or (p99 is not None and p99 >= threshold),
+        })
+    return rows
@@ -1,31 +1,98 @@
 __all__ = (
-    'AzureServiceBusConnectorInstance',
+    'set_default_logger',
+    'stop_default_logger',
 )
 
+from logging.handlers import QueueHandler, QueueListener
+import atexit
 import logging
+import os
+import queue
 
-from .service import AzureServiceBusConnectorInstance
+from typing import Optional
 
 
-LOGGING = True
+# 환경 변수로 켜면 import 시 기본 로거를 설정한다. (기본값: 호스트 애플리케이션의 로깅 설정을 건드리지 않음)
+LOGGING = os.getenv("SIREN_COMMON_UTILITY_LOGGING", "false").lower() in ("1", "true", "yes")
+LOG_FILE = os.getenv("SIREN_COMMON_UTILITY_LOG_FILE") or None
 
-def set_default_logger():
-    logging.basicConfig(
-        level=logging.INFO,
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        datefmt='%Y-%m-%d %H:%M:%S',
-        handlers=[
-            logging.FileHandler("siren_common_utility.log"), 
-            logging.StreamHandler()          
-        ]
-    )
-    logging.getLogger("azure.servicebus").setLevel(logging.WARNING)
-    logging.getLogger("azure.core").setLevel(logging.WARNING)
-    logging.getLogger("asyncio").setLevel(logging.WARNING)
-    logging.getLogger("uamqp").setLevel(logging.WARNING) 
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+LOG_DATEFMT = '%Y-%m-%d %H:%M:%S'
+QUIET_LOGGERS = ("azure.servicebus", "azure.core", "asyncio", "uamqp")
+
+_listener: Optional[QueueListener] = None
+_queue_handler: Optional[QueueHandler] = None
+
+
+def set_default_logger(
+        level: int = logging.INFO,
+        log_file: Optional[str] = None,
+        *,
+        stream: bool = True,
+) -> QueueListener:
+    """루트 로거에 Queue 기반 Non-blocking 핸들러를 설정한다.
+
+    로그 호출은 `QueueHandler`로 큐에 넣기만 하고, 실제 출력(Stream/File)은 `QueueListener` 스레드가 처리한다.
+    다시 호출하면 기존 설정을 교체하며, 프로세스 종료 시 남은 로그를 비운다.
+
+    Args:
+        level (int): 루트 로거 레벨.
+        log_file (Optional[str]): 로그 파일 경로. (None이면 파일에 기록하지 않음)
+        stream (bool): 표준 에러 출력 여부.
+
+    Returns:
+        QueueListener: 실행 중인 리스너.
+
+    Examples:
+
+        ```python
+        import siren_common_utility
+
+        siren_common_utility.set_default_logger(log_file="siren_common_utility.log")
+        ```
+    """
+    global _listener, _queue_handler
+    stop_default_logger()
+
+    formatter = logging.Formatter(LOG_FORMAT, datefmt=LOG_DATEFMT)
+    handlers: list[logging.Handler] = []
+    if stream:
+        handlers.append(logging.StreamHandler())
+    if log_file:
+        handlers.append(logging.FileHandler(log_file))
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    _queue_handler = QueueHandler(log_queue)
+    _listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+
+    root = logging.getLogger()
+    root.addHandler(_queue_handler)
+    root.setLevel(level)
+    for name in QUIET_LOGGERS:
+        logging.getLogger(name).setLevel(logging.WARNING)
+    return _listener
+
+
+def stop_default_logger() -> None:
+    """`set_default_logger()`로 설정한 핸들러를 제거하고 큐에 남은 로그를 모두 출력한다."""
+    global _listener, _queue_handler
+    if _queue_handler is not None:
+        logging.getLogger().removeHandler(_queue_handler)
+        _queue_handler = None
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+
+
+atexit.register(stop_default_logger)
 
 if LOGGING:
-    set_default_logger()
+    set_default_logger(log_file=LOG_FILE)
 
 
 
@@ -41,4 +108,3 @@ if LOGGING:
 #         await task
 #     except asyncio.CancelledError:
 #         print("Listener task cancelled safely.")
-
@@ -1 +1,8 @@
-from .sender import *
\ No newline at end of file
+from .sender import *
+from .sender_pool import *
+from .publisher import *
+from .receiver import *
+from .session import *
+from .priority import *
+from .in_memory import *
+from .outbox import *
\ No newline at end of file
@@ -0,0 +1,18 @@
+from typing import Iterable
+
+
+def summarize_latencies(samples: Iterable[float]) -> dict:
+    """지연시간 샘플(ms)의 p50/p95/p99/max를 계산한다. 샘플이 없으면 값은 None이다."""
+    ordered = sorted(samples)
+
+    def _percentile(q: float) -> float | None:
+        if not ordered:
+            return None
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+    return {
+        "p50": _percentile(0.50),
+        "p95": _percentile(0.95),
+        "p99": _percentile(0.99),
+        "max": ordered[-1] if ordered else None,
+    }
@@ -0,0 +1,884 @@
+from azure.servicebus import NEXT_AVAILABLE_SESSION, ServiceBusMessage, ServiceBusMessageBatch, ServiceBusSubQueue
+from azure.servicebus.exceptions import (
+    MessageLockLostError,
+    MessagingEntityNotFoundError,
+    OperationTimeoutError,
+    ServiceBusConnectionError,
+    ServiceBusError,
+    ServiceBusServerBusyError,
+    SessionCannotBeLockedError,
+    SessionLockLostError,
+)
+from datetime import datetime, timedelta, timezone
+from itertools import count
+import asyncio
+import heapq
+import logging
+import random
+import re
+import uuid
+
+from typing import Any, Callable, Iterable, Mapping, Optional, Union
+
+__all__ = (
+    'InMemoryReceivedMessage',
+    'InMemoryServiceBus',
+    'compile_sql_filter',
+)
+
+MessageFilter = Callable[[Any], bool]
+
+# SQL 필터에서 `sys.` 접두사로 참조하는 시스템 속성 → 메세지 속성
+_SYSTEM_PROPERTIES = {
+    "messageid": "message_id",
+    "correlationid": "correlation_id",
+    "sessionid": "session_id",
+    "label": "subject",
+    "subject": "subject",
+    "to": "to",
+    "replyto": "reply_to",
+    "contenttype": "content_type",
+}
+
+_TOKEN_RE = re.compile(r"""
+    \s*(?:
+        (?P<string>'(?:[^']|'')*')
+      | (?P<number>-?\d+(?:\.\d*)?)
+      | (?P<op><>|!=|>=|<=|=|>|<|\(|\)|,)
+      | (?P<name>\[[^\]]+\]|[A-Za-z_][\w.]*)
+    )""", re.VERBOSE)
+
+
+def _tokenize(expression: str) -> list[tuple[str, Any]]:
+    tokens, pos = [], 0
+    expression = expression.rstrip()
+    while pos < len(expression):
+        match = _TOKEN_RE.match(expression, pos)
+        if match is None:
+            raise ValueError(f"Invalid SQL filter near {expression[pos:pos + 20]!r}")
+        kind = match.lastgroup
+        text = match.group(kind)
+        if kind == 'string':
+            tokens.append(('value', text[1:-1].replace("''", "'")))
+        elif kind == 'number':
+            tokens.append(('value', float(text) if '.' in text else int(text)))
+        elif kind == 'name' and text.upper() in (
+                'AND', 'OR', 'NOT', 'IN', 'LIKE', 'ESCAPE', 'IS', 'NULL', 'TRUE', 'FALSE', 'EXISTS'):
+            tokens.append(('kw', text.upper()))
+        elif kind == 'name':
+            tokens.append(('name', text.strip('[]')))
+        else:
+            tokens.append(('op', text))
+        pos = match.end()
+    return tokens
+
+
+def _property_getter(name: str) -> Callable[[Any], Any]:
+    scope, _, key = name.rpartition('.')
+    if scope.lower() == 'sys':
+        attr = _SYSTEM_PROPERTIES.get(key.lower())
+        if attr is None:
+            raise ValueError(f"Unsupported system property: {name}")
+        return lambda msg: getattr(msg, attr, None)
+    if scope and scope.lower() != 'user':
+        key = name
+
+    def get(msg):
+        props = msg.application_properties or {}
+        if key in props:
+            return props[key]
+        lowered = key.lower()
+        return next((v for k, v in props.items() if str(k).lower() == lowered), None)
+    return get
+
+
+def _like_regex(pattern: str, escape: Optional[str]) -> re.Pattern:
+    parts, i = [], 0
+    while i < len(pattern):
+        ch = pattern[i]
+        if escape and ch == escape and i + 1 < len(pattern):
+            parts.append(re.escape(pattern[i + 1]))
+            i += 2
+            continue
+        parts.append('.*' if ch == '%' else '.' if ch == '_' else re.escape(ch))
+        i += 1
+    return re.compile(''.join(parts), re.DOTALL)
+
+
+class _SqlFilterParser:
+    """SQL 필터 식을 (메세지 → True/False/None) 함수로 변환한다. None은 UNKNOWN(NULL 비교)이다."""
+
+    _COMPARE = {
+        '=': lambda a, b: a == b,
+        '<>': lambda a, b: a != b,
+        '!=': lambda a, b: a != b,
+        '>': lambda a, b: a > b,
+        '>=': lambda a, b: a >= b,
+        '<': lambda a, b: a < b,
+        '<=': lambda a, b: a <= b,
+    }
+
+    def __init__(self, expression: str) -> None:
+        self._expression = expression
+        self._tokens = _tokenize(expression)
+        self._pos = 0
+
+    def parse(self) -> Callable[[Any], Optional[bool]]:
+        node = self._or()
+        if self._pos != len(self._tokens):
+            raise ValueError(f"Unexpected token {self._tokens[self._pos][1]!r} in SQL filter: {self._expression}")
+        return node
+
+    def _peek(self, kind: str, value: Any = None) -> bool:
+        if self._pos >= len(self._tokens):
+            return False
+        token_kind, token_value = self._tokens[self._pos]
+        return token_kind == kind and (value is None or token_value == value)
+
+    def _accept(self, kind: str, value: Any = None) -> bool:
+        if self._peek(kind, value):
+            self._pos += 1
+            return True
+        return False
+
+    def _expect(self, kind: str, value: Any = None) -> Any:
+        if not self._peek(kind, value):
+            found = self._tokens[self._pos][1] if self._pos < len(self._tokens) else 'end of filter'
+            raise ValueError(f"Expected {value or kind} but found {found!r} in SQL filter: {self._expression}")
+        self._pos += 1
+        return self._tokens[self._pos - 1][1]
+
+    def _or(self):
+        operands = [self._and()]
+        while self._accept('kw', 'OR'):
+            operands.append(self._and())
+        if len(operands) == 1:
+            return operands[0]
+
+        def _any(m):
+            result = False
+            for operand in operands:
+                value = operand(m)
+                if value is True:
+                    return True
+                if value is None:
+                    result = None
+            return result
+        return _any
+
+    def _and(self):
+        operands = [self._not()]
+        while self._accept('kw', 'AND'):
+            operands.append(self._not())
+        if len(operands) == 1:
+            return operands[0]
+
+        def _all(m):
+            result = True
+            for operand in operands:
+                value = operand(m)
+                if value is False:
+                    return False
+                if value is None:
+                    result = None
+            return result
+        return _all
+
+    def _not(self):
+        if self._accept('kw', 'NOT'):
+            inner = self._not()
+            return lambda m: None if (v := inner(m)) is None else not v
+        return self._predicate()
+
+    def _operand(self) -> Callable[[Any], Any]:
+        if self._peek('name'):
+            return _property_getter(self._expect('name'))
+        if self._accept('kw', 'NULL'):
+            return lambda m: None
+        value = self._expect('value')
+        return lambda m: value
+
+    def _predicate(self):
+        if self._accept('op', '('):
+            node = self._or()
+            self._expect('op', ')')
+            return node
+        if self._accept('kw', 'TRUE'):
+            return lambda m: True
+        if self._accept('kw', 'FALSE'):
+            return lambda m: False
+        if self._accept('kw', 'EXISTS'):
+            self._expect('op', '(')
+            getter = _property_getter(self._expect('name'))
+            self._expect('op', ')')
+            return lambda m: getter(m) is not None
+
+        left = self._operand()
+        if self._accept('kw', 'IS'):
+            negate = self._accept('kw', 'NOT')
+            self._expect('kw', 'NULL')
+            return lambda m: (left(m) is None) != negate
+        negate = self._accept('kw', 'NOT')
+        if self._accept('kw', 'IN'):
+            self._expect('op', '(')
+            values = [self._expect('value')]
+            while self._accept('op', ','):
+                values.append(self._expect('value'))
+            self._expect('op', ')')
+            choices = frozenset(values)
+            return lambda m: None if (v := left(m)) is None else (v in choices) != negate
+        if self._accept('kw', 'LIKE'):
+            pattern = self._expect('value')
+            escape = self._expect('value') if self._accept('kw', 'ESCAPE') else None
+            regex = _like_regex(str(pattern), escape)
+            return lambda m: None if (v := left(m)) is None else bool(regex.fullmatch(str(v))) != negate
+        if negate:
+            raise ValueError(f"Expected IN or LIKE after NOT in SQL filter: {self._expression}")
+        op = self._expect('op')
+        compare = self._COMPARE.get(op)
+        if compare is None:
+            raise ValueError(f"Unsupported operator {op!r} in SQL filter: {self._expression}")
+        right = self._operand()
+
+        def _compare(m):
+            a, b = left(m), right(m)
+            if a is None or b is None:
+                return None
+            try:
+                return compare(a, b)
+            except TypeError:
+                return None
+        return _compare
+
+
+def compile_sql_filter(expression: str) -> MessageFilter:
+    """Service Bus SQL 필터 식을 메세지 판별 함수로 변환한다.
+
+    지원 문법: `=`, `<>`, `!=`, `>`, `>=`, `<`, `<=`, `[NOT] IN (...)`, `[NOT] LIKE '..%..' [ESCAPE '!']`,
+    `IS [NOT] NULL`, `EXISTS(prop)`, `AND`/`OR`/`NOT`, 괄호, `sys.CorrelationId` 등 시스템 속성.
+    NULL(속성 없음)과의 비교는 UNKNOWN이 되어 매칭되지 않는다.
+
+    Examples:
+
+        ```python
+        match = compile_sql_filter("Region = 'Seoul' OR Region LIKE '%|Seoul|%'")
+        match(ServiceBusMessage('...', application_properties={"Region": "|Seoul|Honam|"}))   # True
+        ```
+    """
+    node = _SqlFilterParser(expression).parse()
+    return lambda msg: node(msg) is True
+
+
+def _correlation_filter(properties: Mapping[str, Any]) -> MessageFilter:
+    getters = [(_property_getter(name), value) for name, value in properties.items()]
+    return lambda msg: all(getter(msg) == value for getter, value in getters)
+
+
+class InMemoryReceivedMessage:
+    """`ServiceBusReceivedMessage`와 같은 속성을 가진 수신 메세지."""
+
+    def __init__(self, message: ServiceBusMessage, sequence_number: int) -> None:
+        self._data = b"".join(message.body) if message.body_type.name == 'DATA' else message.body
+        self.message_id = message.message_id or str(uuid.uuid4())
+        self.application_properties = dict(message.application_properties or {})
+        self.session_id = message.session_id
+        self.correlation_id = message.correlation_id
+        self.subject = message.subject
+        self.to = message.to
+        self.reply_to = message.reply_to
+        self.content_type = message.content_type
+        self.sequence_number = sequence_number
+        self.enqueued_time_utc = datetime.now(timezone.utc)
+        self.delivery_count = 0
+        self.lock_token: Optional[str] = None
+        self.locked_until_utc: Optional[datetime] = None
+        self.dead_letter_reason: Optional[str] = None
+        self.dead_letter_error_description: Optional[str] = None
+
+    @property
+    def body(self):
+        if isinstance(self._data, bytes):
+            return (chunk for chunk in (self._data,))
+        return self._data
+
+    def __str__(self) -> str:
+        if isinstance(self._data, bytes):
+            return self._data.decode('utf-8')
+        return str(self._data)
+
+    def __repr__(self) -> str:
+        return (
+            f"InMemoryReceivedMessage(message_id={self.message_id}, session_id={self.session_id}, "
+            f"sequence_number={self.sequence_number}, delivery_count={self.delivery_count})"
+        )
+
+
+class _SessionLock:
+    __slots__ = ('owner', 'locked_until', 'state')
+
+    def __init__(self) -> None:
+        self.owner: Optional[object] = None
+        self.locked_until: Optional[datetime] = None
+        self.state: Optional[bytes] = None
+
+
+class _Subscription:
+    """구독 하나의 활성 메세지(세션별 힙), 잠긴 메세지, 데드레터 큐."""
+
+    def __init__(
+            self,
+            topic: str,
+            name: str,
+            match: MessageFilter,
+            *,
+            requires_session: bool,
+            lock_duration: float,
+            max_delivery_count: int,
+    ) -> None:
+        self.topic = topic
+        self.name = name
+        self.match = match
+        self.requires_session = requires_session
+        self.lock_duration = lock_duration
+        self.max_delivery_count = max_delivery_count
+        # 세션 ID(세션이 없으면 None) → [(sequence_number, message)] 힙
+        self.available: dict[Optional[str], list[tuple[int, InMemoryReceivedMessage]]] = {}
+        self.locked: dict[str, InMemoryReceivedMessage] = {}
+        self.dead_letter: list[tuple[int, InMemoryReceivedMessage]] = []
+        self.sessions: dict[str, _SessionLock] = {}
+        self._waiters: set[asyncio.Future] = set()
+
+        self.enqueued = 0
+        self.delivered = 0
+        self.completed = 0
+        self.abandoned = 0
+        self.dead_lettered = 0
+        self.lock_expirations = 0
+
+    def active_count(self) -> int:
+        return sum(len(heap) for heap in self.available.values())
+
+    def push(self, message: InMemoryReceivedMessage) -> None:
+        # 세션을 쓰지 않는 구독은 session_id와 관계없이 하나의 큐로 전달한다.
+        key = message.session_id if self.requires_session else None
+        heapq.heappush(self.available.setdefault(key, []), (message.sequence_number, message))
+        self.notify()
+
+    def notify(self) -> None:
+        for waiter in self._waiters:
+            if not waiter.done():
+                waiter.set_result(None)
+        self._waiters.clear()
+
+    async def wait(self, timeout: float) -> None:
+        """새 메세지가 들어오거나 `timeout`초가 지날 때까지 기다린다."""
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.add(waiter)
+        try:
+            await asyncio.wait_for(waiter, max(timeout, 0.0))
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            self._waiters.discard(waiter)
+
+    def dead_letter_message(self, message: InMemoryReceivedMessage, reason: Optional[str], description: Optional[str]) -> None:
+        message.dead_letter_reason = reason
+        message.dead_letter_error_description = description
+        message.lock_token = None
+        message.locked_until_utc = None
+        heapq.heappush(self.dead_letter, (message.sequence_number, message))
+        self.dead_lettered += 1
+
+    def release(self, message: InMemoryReceivedMessage) -> None:
+        """잠금을 풀고 다시 전달 가능한 상태로 되돌린다. 최대 전달 횟수를 넘으면 데드레터로 보낸다."""
+        message.lock_token = None
+        message.locked_until_utc = None
+        message.delivery_count += 1
+        if message.delivery_count >= self.max_delivery_count:
+            logging.debug(f"Dead-lettering message after {message.delivery_count} deliveries. message_id={message.message_id}")
+            self.dead_letter_message(
+                message, "MaxDeliveryCountExceeded",
+                f"Message could not be consumed after {self.max_delivery_count} delivery attempts.",
+            )
+        else:
+            self.push(message)
+
+    def expire_locks(self, now: datetime) -> Optional[datetime]:
+        """잠금이 만료된 메세지를 되돌리고, 남은 잠금 중 가장 이른 만료 시각을 반환한다."""
+        earliest = None
+        for token, message in list(self.locked.items()):
+            if message.locked_until_utc <= now:
+                del self.locked[token]
+                self.lock_expirations += 1
+                self.release(message)
+            elif earliest is None or message.locked_until_utc < earliest:
+                earliest = message.locked_until_utc
+        return earliest
+
+    def get_stats(self) -> dict:
+        return {
+            "active": self.active_count(),
+            "locked": len(self.locked),
+            "dead_letter": len(self.dead_letter),
+            "sessions_locked": sum(1 for s in self.sessions.values() if s.owner is not None),
+            "enqueued": self.enqueued,
+            "delivered": self.delivered,
+            "completed": self.completed,
+            "abandoned": self.abandoned,
+            "dead_lettered": self.dead_lettered,
+            "lock_expirations": self.lock_expirations,
+        }
+
+
+class _InMemorySender:
+
+    def __init__(self, bus: "InMemoryServiceBus", topic_name: str) -> None:
+        self._bus = bus
+        self.topic_name = topic_name
+        self.entity_name = topic_name
+        self.closed = False
+
+    async def send_messages(self, message, **kwargs) -> None:
+        if self.closed:
+            raise ServiceBusConnectionError(message="Sender is closed")
+        await self._bus._before('send')
+        if isinstance(message, ServiceBusMessageBatch):
+            messages = message._messages
+        elif isinstance(message, ServiceBusMessage):
+            messages = [message]
+        else:
+            messages = list(message)
+        self._bus._publish(self.topic_name, messages)
+
+    async def create_message_batch(self, max_size_in_bytes: Optional[int] = None) -> ServiceBusMessageBatch:
+        return ServiceBusMessageBatch(max_size_in_bytes=max_size_in_bytes or self._bus.max_batch_size_in_bytes)
+
+    async def close(self) -> None:
+        self.closed = True
+
+    async def __aenter__(self) -> "_InMemorySender":
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        await self.close()
+
+
+class _InMemorySession:
+
+    def __init__(self, receiver: "_InMemoryReceiver", session_id: str) -> None:
+        self._receiver = receiver
+        self.session_id = session_id
+
+    @property
+    def _lock(self) -> _SessionLock:
+        return self._receiver._subscription.sessions[self.session_id]
+
+    @property
+    def locked_until_utc(self) -> Optional[datetime]:
+        return self._lock.locked_until
+
+    async def renew_lock(self) -> datetime:
+        await self._receiver._bus._before('renew')
+        self._receiver._check_session()
+        lock = self._lock
+        lock.locked_until = datetime.now(timezone.utc) + timedelta(seconds=self._receiver._subscription.lock_duration)
+        return lock.locked_until
+
+    async def get_state(self) -> Optional[bytes]:
+        self._receiver._check_session()
+        return self._lock.state
+
+    async def set_state(self, state) -> None:
+        self._receiver._check_session()
+        self._lock.state = state.encode('utf-8') if isinstance(state, str) else state
+
+
+class _InMemoryReceiver:
+
+    def __init__(
+            self,
+            bus: "InMemoryServiceBus",
+            subscription: _Subscription,
+            *,
+            session_id: Optional[str] = None,
+            dead_letter: bool = False,
+            max_wait_time: Optional[float] = None,
+            **kwargs,
+    ) -> None:
+        self._bus = bus
+        self._subscription = subscription
+        self.entity_path = f"{subscription.topic}/Subscriptions/{subscription.name}"
+        self._requested_session_id = session_id
+        self._dead_letter = dead_letter
+        self._max_wait_time = max_wait_time
+        self.kwargs = kwargs
+        self.session: Optional[_InMemorySession] = None
+        self.closed = False
+
+    async def __aenter__(self) -> "_InMemoryReceiver":
+        if self._requested_session_id is not None and self.session is None:
+            await self._accept_session()
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        if self.session is not None:
+            lock = self._subscription.sessions.get(self.session.session_id)
+            if lock is not None and lock.owner is self:
+                lock.owner = None
+                lock.locked_until = None
+                self._subscription.notify()
+        self.closed = True
+
+    def _session_free(self, session_id: str, now: datetime) -> bool:
+        lock = self._subscription.sessions.get(session_id)
+        return lock is None or lock.owner is None or lock.locked_until <= now
+
+    async def _accept_session(self) -> None:
+        sub = self._subscription
+        if not sub.requires_session:
+            raise ServiceBusError(f"Subscription {sub.topic}/{sub.name} does not require sessions")
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + (self._max_wait_time or self._bus.default_max_wait_time)
+        while True:
+            now = datetime.now(timezone.utc)
+            if self._requested_session_id == NEXT_AVAILABLE_SESSION:
+                candidates = [
+                    (heap[0][0], session_id) for session_id, heap in sub.available.items()
+                    if heap and self._session_free(session_id, now)
+                ]
+                session_id = min(candidates)[1] if candidates else None
+            else:
+                session_id = self._requested_session_id
+                if not self._session_free(session_id, now):
+                    raise SessionCannotBeLockedError(message=f"Session {session_id} is locked by another receiver")
+            if session_id is not None:
+                break
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                raise OperationTimeoutError(message="No session available")
+            await sub.wait(remaining)
+
+        lock = sub.sessions.setdefault(session_id, _SessionLock())
+        lock.owner = self
+        lock.locked_until = now + timedelta(seconds=sub.lock_duration)
+        self.session = _InMemorySession(self, session_id)
+
+    def _check_session(self) -> None:
+        if self.session is None:
+            return
+        lock = self._subscription.sessions.get(self.session.session_id)
+        if lock is None or lock.owner is not self or lock.locked_until <= datetime.now(timezone.utc):
+            raise SessionLockLostError(message=f"Session lock lost: {self.session.session_id}")
+
+    def _take(self, max_message_count: int, now: datetime) -> list[InMemoryReceivedMessage]:
+        sub = self._subscription
+        if self._dead_letter:
+            heap = sub.dead_letter
+        else:
+            heap = sub.available.get(self.session.session_id if self.session is not None else None)
+        batch = []
+        while heap and len(batch) < max_message_count:
+            _, message = heapq.heappop(heap)
+            if not self._dead_letter:
+                message.lock_token = str(uuid.uuid4())
+                message.locked_until_utc = now + timedelta(seconds=sub.lock_duration)
+                sub.locked[message.lock_token] = message
+            batch.append(message)
+        sub.delivered += len(batch)
+        return batch
+
+    async def receive_messages(
+            self,
+            max_message_count: Optional[int] = 1,
+            max_wait_time: Optional[float] = None,
+    ) -> list[InMemoryReceivedMessage]:
+        """메세지를 Peek-lock으로 수신한다. `max_wait_time`초 동안 메세지가 없으면 빈 리스트를 반환한다."""
+        if self.closed:
+            raise ServiceBusConnectionError(message="Receiver is closed")
+        if self._requested_session_id is None and self._subscription.requires_session and not self._dead_letter:
+            raise ServiceBusError(
+                f"Subscription {self._subscription.topic}/{self._subscription.name} requires a session receiver"
+            )
+        await self._bus._before('receive')
+        self._check_session()
+        loop = asyncio.get_running_loop()
+        wait_time = max_wait_time or self._max_wait_time
+        deadline = None if wait_time is None else loop.time() + wait_time
+        while True:
+            now = datetime.now(timezone.utc)
+            next_expiry = self._subscription.expire_locks(now)
+            batch = self._take(max_message_count or 1, now)
+            if batch:
+                return batch
+            remaining = None if deadline is None else deadline - loop.time()
+            if remaining is not None and remaining <= 0:
+                return []
+            if next_expiry is not None:
+                until_expiry = (next_expiry - now).total_seconds()
+                remaining = until_expiry if remaining is None else min(remaining, until_expiry)
+            await self._subscription.wait(self._bus.default_max_wait_time if remaining is None else remaining)
+            if self.closed:
+                return []
+
+    def __aiter__(self) -> "_InMemoryReceiver":
+        return self
+
+    async def __anext__(self) -> InMemoryReceivedMessage:
+        batch = await self.receive_messages(1, max_wait_time=self._max_wait_time)
+        if not batch:
+            raise StopAsyncIteration
+        return batch[0]
+
+    def _unlock(self, message: InMemoryReceivedMessage) -> InMemoryReceivedMessage:
+        self._check_session()
+        locked = self._subscription.locked.get(message.lock_token) if message.lock_token else None
+        if locked is None or locked.locked_until_utc <= datetime.now(timezone.utc):
+            raise MessageLockLostError(message=f"Message lock lost: {message.message_id}")
+        del self._subscription.locked[message.lock_token]
+        return locked
+
+    async def complete_message(self, message: InMemoryReceivedMessage) -> None:
+        await self._bus._before('settle')
+        if self._dead_letter:
+            self._subscription.dead_letter = [(s, m) for s, m in self._subscription.dead_letter if m is not message]
+            heapq.heapify(self._subscription.dead_letter)
+            return
+        locked = self._unlock(message)
+        locked.lock_token = None
+        locked.locked_until_utc = None
+        self._subscription.completed += 1
+
+    async def abandon_message(self, message: InMemoryReceivedMessage) -> None:
+        await self._bus._before('settle')
+        self._subscription.release(self._unlock(message))
+        self._subscription.abandoned += 1
+
+    async def dead_letter_message(
+            self,
+            message: InMemoryReceivedMessage,
+            reason: Optional[str] = None,
+            error_description: Optional[str] = None,
+    ) -> None:
+        await self._bus._before('settle')
+        self._subscription.dead_letter_message(self._unlock(message), reason, error_description)
+
+    async def renew_message_lock(self, message: InMemoryReceivedMessage) -> datetime:
+        await self._bus._before('renew')
+        locked = self._unlock(message)
+        self._subscription.locked[locked.lock_token] = locked
+        locked.locked_until_utc = datetime.now(timezone.utc) + timedelta(seconds=self._subscription.lock_duration)
+        return locked.locked_until_utc
+
+
+class InMemoryServiceBus:
+
+    DEFAULT_MAX_WAIT_TIME = 5.0         # max_wait_time이 없을 때 세션 수락/대기 단위(초)
+    MAX_BATCH_SIZE_IN_BYTES = 256 * 1024
+
+    def __init__(
+            self,
+            *,
+            auto_create: bool = True,
+            latency: Union[float, tuple[float, float]] = 0.0,
+            failure_rate: float = 0.0,
+            failure_ops: Iterable[str] = ('send', 'receive', 'settle', 'renew'),
+            seed: Optional[int] = None,
+    ) -> None:
+        """프로세스 내에서 동작하는 Service Bus 대역(Stand-in)이다. `ServiceBusClient`(aio)와 같은 인터페이스를 제공한다.
+
+        - 토픽/구독: 구독마다 SQL 필터(`Region = 'Seoul'`) 또는 Correlation 필터를 가진다.
+        - Peek-lock: 수신한 메세지는 `lock_duration`초 동안 잠기고, complete/abandon/dead-letter/renew로 정산한다.
+          잠금이 만료되면 다시 전달되며, `max_delivery_count`회를 넘으면 데드레터 큐로 이동한다.
+        - 세션: `requires_session=True` 구독은 세션 단위로 잠기고 세션 내 순서가 유지된다. (세션 상태 포함)
+        - 장애 주입: 연산(send/receive/settle/renew)마다 `latency`초 지연과 `failure_rate` 확률의 예외를 넣을 수 있다.
+
+        `AzureServiceBusConnectorInstance(transport=bus)`로 넘기면 커넥터 코드를 그대로 로컬에서 실행할 수 있다.
+
+        Args:
+            auto_create (bool): 없는 토픽/구독을 사용하면 자동으로 만든다. (False면 MessagingEntityNotFoundError)
+            latency (float | tuple[float, float]): 연산마다 주입할 지연(초). 튜플이면 구간 내 균등 분포.
+            failure_rate (float): 연산이 실패할 확률. (0~1)
+            failure_ops (Iterable[str]): 실패를 주입할 연산 종류.
+            seed (Optional[int]): 지연/실패 난수 시드.
+
+        Examples:
+
+            ```python
+            bus = InMemoryServiceBus(latency=(0.002, 0.01))
+            for region in ("Seoul", "Honam"):
+                bus.create_subscription('emc-patient-alert', region.lower(), sql_filter=f"Region = '{region}'")
+
+            async with AzureServiceBusConnectorInstance(transport=bus) as connector:
+                await connector.send_to_topic('emc-patient-alert', [ServiceBusMessage('...', application_properties={"Region": "Seoul"})])
+                await connector.consume('emc-patient-alert', 'seoul', handler, idle_timeout=1)
+            ```
+        """
+        if not 0 <= failure_rate <= 1:
+            raise ValueError("failure_rate must be between 0 and 1")
+        self.auto_create = auto_create
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self.failure_ops = frozenset(failure_ops)
+        self.default_max_wait_time = self.DEFAULT_MAX_WAIT_TIME
+        self.max_batch_size_in_bytes = self.MAX_BATCH_SIZE_IN_BYTES
+        self._random = random.Random(seed)
+        self._topics: dict[str, dict[str, _Subscription]] = {}
+        self._sequence = count(1)
+        self._scheduled_faults: dict[str, list[BaseException]] = {}
+        self.closed = False
+
+        self._sent = 0
+        self._faults = 0
+
+    @classmethod
+    def from_connection_string(cls, conn_str: Optional[str] = None, **kwargs) -> "InMemoryServiceBus":
+        """`ServiceBusClient.from_connection_string`과 같은 형태의 생성자. 연결 문자열은 무시된다."""
+        return cls()
+
+    # ---- 엔티티 관리 ----
+
+    def create_topic(self, topic_name: str) -> None:
+        self._topics.setdefault(topic_name, {})
+
+    def create_subscription(
+            self,
+            topic_name: str,
+            subscription_name: str,
+            *,
+            sql_filter: Optional[str] = None,
+            correlation_filter: Optional[Mapping[str, Any]] = None,
+            requires_session: bool = False,
+            lock_duration: float = 30.0,
+            max_delivery_count: int = 10,
+    ) -> None:
+        """구독을 만든다. 필터가 없으면 모든 메세지를 받는다. (TrueFilter)
+
+        Args:
+            sql_filter (Optional[str]): SQL 필터 식. (`compile_sql_filter()` 참고)
+            correlation_filter (Optional[Mapping]): `{속성: 값}`이 모두 일치하는 메세지만 받는다. (`sys.` 시스템 속성 가능)
+            requires_session (bool): 세션 구독 여부.
+            lock_duration (float): 메세지/세션 잠금 시간(초).
+            max_delivery_count (int): 데드레터로 보내기 전 최대 전달 횟수.
+        """
+        if sql_filter is not None and correlation_filter is not None:
+            raise ValueError("Only one of sql_filter and correlation_filter can be set")
+        if sql_filter is not None:
+            match = compile_sql_filter(sql_filter)
+        elif correlation_filter is not None:
+            match = _correlation_filter(correlation_filter)
+        else:
+            match = lambda msg: True
+        self._topics.setdefault(topic_name, {})[subscription_name] = _Subscription(
+            topic_name,
+            subscription_name,
+            match,
+            requires_session=requires_session,
+            lock_duration=lock_duration,
+            max_delivery_count=max_delivery_count,
+        )
+
+    def _get_topic(self, topic_name: str) -> dict[str, _Subscription]:
+        subscriptions = self._topics.get(topic_name)
+        if subscriptions is None:
+            if not self.auto_create:
+                raise MessagingEntityNotFoundError(message=f"Topic not found: {topic_name}")
+            subscriptions = self._topics[topic_name] = {}
+        return subscriptions
+
+    def _get_subscription(self, topic_name: str, subscription_name: str) -> _Subscription:
+        subscription = self._get_topic(topic_name).get(subscription_name)
+        if subscription is None:
+            if not self.auto_create:
+                raise MessagingEntityNotFoundError(message=f"Subscription not found: {topic_name}/{subscription_name}")
+            self.create_subscription(topic_name, subscription_name)
+            subscription = self._topics[topic_name][subscription_name]
+        return subscription
+
+    # ---- 장애 주입 ----
+
+    def fail_next(self, op: str, error: Optional[BaseException] = None, *, times: int = 1) -> None:
+        """다음 `op` 연산(send/receive/settle/renew) `times`회를 `error`로 실패시킨다."""
+        errors = self._scheduled_faults.setdefault(op, [])
+        errors.extend([error or ServiceBusServerBusyError(message=f"Injected {op} fault")] * times)
+
+    async def _before(self, op: str) -> None:
+        latency = self.latency
+        if isinstance(latency, tuple):
+            latency = self._random.uniform(*latency)
+        if latency:
+            await asyncio.sleep(latency)
+        scheduled = self._scheduled_faults.get(op)
+        if scheduled:
+            self._faults += 1
+            raise scheduled.pop(0)
+        if self.failure_rate and op in self.failure_ops and self._random.random() < self.failure_rate:
+            self._faults += 1
+            raise ServiceBusServerBusyError(message=f"Injected {op} fault")
+
+    # ---- ServiceBusClient 인터페이스 ----
+
+    def _publish(self, topic_name: str, messages: list[ServiceBusMessage]) -> None:
+        subscriptions = self._get_topic(topic_name)
+        for message in messages:
+            self._sent += 1
+            for sub in subscriptions.values():
+                if not sub.match(message):
+                    continue
+                received = InMemoryReceivedMessage(message, next(self._sequence))
+                sub.enqueued += 1
+                if sub.requires_session and received.session_id is None:
+                    sub.dead_letter_message(received, "SessionIdIsMissing", "Message has no session_id.")
+                    continue
+                sub.push(received)
+
+    def get_topic_sender(self, topic_name: str, **kwargs) -> _InMemorySender:
+        self._get_topic(topic_name)
+        return _InMemorySender(self, topic_name)
+
+    def get_subscription_receiver(
+            self,
+            topic_name: str,
+            subscription_name: str,
+            *,
+            session_id: Optional[str] = None,
+            sub_queue: Optional[Union[ServiceBusSubQueue, str]] = None,
+            **kwargs,
+    ) -> _InMemoryReceiver:
+        if sub_queue is not None and ServiceBusSubQueue(sub_queue) != ServiceBusSubQueue.DEAD_LETTER:
+            raise ValueError(f"Unsupported sub_queue: {sub_queue}")
+        return _InMemoryReceiver(
+            self,
+            self._get_subscription(topic_name, subscription_name),
+            session_id=session_id,
+            dead_letter=sub_queue is not None,
+            **kwargs,
+        )
+
+    async def close(self) -> None:
+        self.closed = True
+
+    async def __aenter__(self) -> "InMemoryServiceBus":
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        await self.close()
+
+    # ---- 확인용 ----
+
+    def peek_dead_letters(self, topic_name: str, subscription_name: str) -> list[InMemoryReceivedMessage]:
+        """데드레터 큐의 메세지를 수신하지 않고 확인한다."""
+        return [m for _, m in sorted(self._get_subscription(topic_name, subscription_name).dead_letter)]
+
+    def get_stats(self) -> dict:
+        """토픽/구독별 활성·잠금·데드레터 메세지 수와 누적 카운터를 반환한다."""
+        return {
+            "sent": self._sent,
+            "injected_faults": self._faults,
+            "topics": {
+                topic: {name: sub.get_stats() for name, sub in subscriptions.items()}
+                for topic, subscriptions in self._topics.items()
+            },
+        }
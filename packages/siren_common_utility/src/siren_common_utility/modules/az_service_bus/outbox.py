@@ -0,0 +1,293 @@
+from azure.servicebus import ServiceBusMessage
+from azure.servicebus.amqp import AmqpMessageBodyType
+from azure.servicebus.exceptions import MessageSizeExceededError, ServiceBusAuthenticationError
+from collections import deque
+from datetime import datetime, timedelta
+from pathlib import Path
+from time import perf_counter
+import asyncio
+import base64
+import json
+import logging
+import random
+import struct
+import uuid
+
+from ._stats import summarize_latencies
+from ..spool import SegmentLog, SpoolRecord
+
+from typing import Awaitable, Callable, Iterable, Iterator, Optional, Union
+
+__all__ = (
+    'AzureServiceBusOutbox',
+    'decode_outbox_record',
+    'encode_outbox_record',
+)
+
+_META_LEN = struct.Struct('<I')
+_MESSAGE_FIELDS = (
+    'message_id', 'content_type', 'correlation_id', 'session_id', 'subject',
+    'reply_to', 'reply_to_session_id', 'to', 'partition_key',
+)
+# 전송을 재시도해도 성공할 수 없는 오류 (해당 레코드는 rejected 파일로 옮긴다)
+_POISON_ERRORS = (MessageSizeExceededError, ValueError, TypeError)
+REJECTED_NAME = "rejected.jsonl"
+
+
+def encode_outbox_record(topic_name: str, message: ServiceBusMessage) -> bytes:
+    """메세지를 spool 레코드로 직렬화한다. (`u32 meta 길이 + meta JSON + 본문`)
+
+    재전송 시 브로커의 Duplicate detection과 소비자의 중복 제거가 동작하도록,
+    `message_id`가 없으면 여기서 할당하여 함께 기록한다.
+    """
+    if message.body_type != AmqpMessageBodyType.DATA:
+        raise TypeError(f"Outbox supports data body messages only, got {message.body_type}")
+    if message.message_id is None:
+        message.message_id = uuid.uuid4().hex
+    meta = {"topic": topic_name}
+    for name in _MESSAGE_FIELDS:
+        value = getattr(message, name)
+        if value is not None:
+            meta[name] = value
+    if message.application_properties:
+        meta["properties"] = {
+            (k.decode('utf-8') if isinstance(k, bytes) else k): (v.decode('utf-8') if isinstance(v, bytes) else v)
+            for k, v in message.application_properties.items()
+        }
+    if message.time_to_live is not None:
+        meta["ttl"] = message.time_to_live.total_seconds()
+    if message.scheduled_enqueue_time_utc is not None:
+        meta["scheduled"] = message.scheduled_enqueue_time_utc.isoformat()
+    meta_bytes = json.dumps(meta, ensure_ascii=False, separators=(',', ':'), default=str).encode('utf-8')
+    return _META_LEN.pack(len(meta_bytes)) + meta_bytes + b"".join(message.body)
+
+
+def decode_outbox_record(payload: Union[bytes, memoryview]) -> tuple[str, ServiceBusMessage]:
+    """spool 레코드를 `(토픽 이름, ServiceBusMessage)`로 복원한다."""
+    meta_len = _META_LEN.unpack_from(payload)[0]
+    meta = json.loads(bytes(payload[_META_LEN.size:_META_LEN.size + meta_len]))
+    body = bytes(payload[_META_LEN.size + meta_len:])
+    kwargs = {name: meta[name] for name in _MESSAGE_FIELDS if name in meta}
+    if "ttl" in meta:
+        kwargs["time_to_live"] = timedelta(seconds=meta["ttl"])
+    if "scheduled" in meta:
+        kwargs["scheduled_enqueue_time_utc"] = datetime.fromisoformat(meta["scheduled"])
+    return meta["topic"], ServiceBusMessage(body, application_properties=meta.get("properties"), **kwargs)
+
+
+class AzureServiceBusOutbox:
+
+    LATENCY_WINDOW = 4096
+
+    def __init__(
+            self,
+            directory: Union[str, Path],
+            send: Callable[[str, list[ServiceBusMessage]], Awaitable[None]],
+            *,
+            max_batch_messages: int = 100,
+            segment_bytes: int = 16 * 1024 * 1024,
+            group_commit_ms: float = 2.0,
+            sync: bool = True,
+            retry_base_delay: float = 0.5,
+            retry_max_delay: float = 30.0,
+    ) -> None:
+        """토픽 전송을 로컬 디스크에 먼저 기록하는 Outbox이다. (Store-and-forward)
+
+        `append()`는 메세지를 `SegmentLog`에 기록(Group commit)한 뒤 바로 반환하고, 백그라운드 Drainer가
+        기록 순서대로 같은 토픽의 연속된 메세지를 최대 `max_batch_messages`개씩 묶어 전송한다.
+        브로커 장애 시에는 지수 백오프(Jitter 포함)로 재시도하므로 `append()`의 지연시간은 브로커 상태와 무관하다.
+
+        전송이 끝난 위치는 checkpoint로 기록되고, 프로세스가 중단되면 재시작 시 남은 레코드부터 다시 전송한다.
+        따라서 전송은 최소 1회(At-least-once)이며, `message_id`는 기록 시 고정되어 재전송에도 유지된다.
+        크기 초과 등 재시도로 해결되지 않는 메세지는 `rejected.jsonl`로 옮기고 건너뛴다.
+
+        Args:
+            directory (str | Path): spool 디렉토리.
+            send: 토픽 이름과 메세지 리스트를 받아 전송하는 코루틴 함수.
+            max_batch_messages (int): 한 번에 전송하는 최대 메세지 수.
+            segment_bytes (int): 세그먼트 파일 크기.
+            group_commit_ms (float): append를 모아 디스크에 반영하기까지 기다리는 시간(ms).
+            sync (bool): False면 msync를 생략한다. (`SegmentLog` 참고)
+            retry_base_delay (float): 첫 재시도 대기 시간(초).
+            retry_max_delay (float): 최대 재시도 대기 시간(초).
+
+        Examples:
+
+            ```python
+            outbox = AzureServiceBusOutbox("/var/spool/siren", send)
+            await outbox.start()
+            await outbox.append('emc-patient-alert', [ServiceBusMessage('...')])   # 디스크 기록 후 반환
+            await outbox.flush(timeout=10)      # 전송 완료 대기 (선택)
+            await outbox.aclose()
+            ```
+        """
+        self.directory = Path(directory)
+        self._send = send
+        self._max_batch_messages = max_batch_messages
+        self._retry_base_delay = retry_base_delay
+        self._retry_max_delay = retry_max_delay
+        self._log = SegmentLog(
+            self.directory, segment_bytes=segment_bytes, group_commit_ms=group_commit_ms, sync=sync,
+        )
+        self._task: Optional[asyncio.Task] = None
+        self._wakeup = asyncio.Event()
+        self._progress = asyncio.Event()
+
+        self._appended = 0
+        self._sent = 0
+        self._send_calls = 0
+        self._retries = 0
+        self._rejected = 0
+        self._last_error: Optional[str] = None
+        self._append_ms: deque[float] = deque(maxlen=self.LATENCY_WINDOW)
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    @property
+    def pending(self) -> int:
+        return self._log.pending
+
+    async def start(self) -> None:
+        """spool을 열고(크래시 복구) Drainer를 시작한다."""
+        if self.running:
+            return
+        self._log.open()
+        self._task = asyncio.create_task(self._run())
+
+    async def append(self, topic_name: str, messages: Iterable[ServiceBusMessage]) -> list[int]:
+        """메세지를 spool에 기록하고, 디스크에 반영되면 seq 리스트를 반환한다."""
+        started = perf_counter()
+        payloads = [encode_outbox_record(topic_name, message) for message in messages]
+        if not payloads:
+            return []
+        seqs = await self._log.append_many(payloads)
+        self._appended += len(seqs)
+        self._append_ms.append((perf_counter() - started) * 1000)
+        self._wakeup.set()
+        return seqs
+
+    async def flush(self, timeout: Optional[float] = None) -> bool:
+        """지금까지 기록된 메세지가 모두 전송될 때까지 기다린다. 시간 내에 끝나면 True."""
+        target = self._log.last_seq
+
+        async def _wait() -> None:
+            while self._log.acked_seq < target:
+                self._progress.clear()
+                await self._progress.wait()
+
+        try:
+            await asyncio.wait_for(_wait(), timeout)
+        except asyncio.TimeoutError:
+            return False
+        return True
+
+    async def aclose(self, drain_timeout: float = 0) -> None:
+        """Drainer를 멈추고 spool을 닫는다. 전송하지 못한 메세지는 디스크에 남아 다음 시작 때 전송된다.
+
+        Args:
+            drain_timeout (float): 닫기 전에 남은 메세지 전송을 기다리는 최대 시간(초).
+        """
+        if self.running and drain_timeout > 0 and self.pending:
+            if not await self.flush(drain_timeout):
+                logging.warning(f"Outbox closed with {self.pending} unsent messages in {self.directory}")
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self._log.close()
+
+    async def _run(self) -> None:
+        attempt = 0
+        while True:
+            records = self._log.read(self._log.acked_seq, self._max_batch_messages)
+            if not records:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+            try:
+                for topic_name, run in self._topic_runs(records):
+                    await self._send_run(topic_name, run)
+                attempt = 0
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                attempt += 1
+                self._retries += 1
+                self._last_error = f"{type(e).__name__}: {e}"
+                delay = min(self._retry_max_delay, self._retry_base_delay * 2 ** (attempt - 1))
+                delay *= random.uniform(0.5, 1.0)
+                logging.warning(f"Outbox send failed ({self._last_error}), retrying in {delay:.2f}s")
+                await asyncio.sleep(delay)
+
+    async def _send_run(self, topic_name: str, run: list[tuple[SpoolRecord, ServiceBusMessage]]) -> None:
+        messages = [message for _, message in run]
+        try:
+            self._send_calls += 1
+            await self._send(topic_name, messages)
+        except ServiceBusAuthenticationError:
+            raise
+        except _POISON_ERRORS as e:
+            if len(run) == 1:
+                self._reject(run[0][0], topic_name, f"{type(e).__name__}: {e}")
+                return
+            # 배치 중 일부가 원인일 수 있으므로 한 건씩 다시 보내 문제 메세지만 걸러낸다.
+            for entry in run:
+                await self._send_run(topic_name, [entry])
+            return
+        self._sent += len(run)
+        self._ack(run[-1][0].seq)
+
+    def _topic_runs(self, records: list[SpoolRecord]) -> Iterator[tuple[str, list]]:
+        # 기록 순서를 유지하며 같은 토픽의 연속된 레코드를 묶는다.
+        topic_name, run = None, []
+        for record in records:
+            try:
+                record_topic, message = decode_outbox_record(record.payload)
+            except Exception as e:
+                if run:
+                    yield topic_name, run
+                    topic_name, run = None, []
+                self._reject(record, None, f"Undecodable record: {type(e).__name__}: {e}")
+                continue
+            if run and record_topic != topic_name:
+                yield topic_name, run
+                run = []
+            topic_name = record_topic
+            run.append((record, message))
+        if run:
+            yield topic_name, run
+
+    def _ack(self, seq: int) -> None:
+        self._log.ack(seq)
+        self._progress.set()
+
+    def _reject(self, record: SpoolRecord, topic_name: Optional[str], reason: str) -> None:
+        self._rejected += 1
+        logging.error(f"Outbox rejected record seq={record.seq} topic={topic_name}: {reason}")
+        with open(self.directory / REJECTED_NAME, 'a', encoding='utf-8') as f:
+            f.write(json.dumps({
+                "seq": record.seq,
+                "topic": topic_name,
+                "reason": reason,
+                "record": base64.b64encode(record.payload).decode('ascii'),
+            }) + "\n")
+        self._ack(record.seq)
+
+    def get_stats(self) -> dict:
+        """기록/전송/재시도/거부 수, append 지연시간(ms), spool 상태를 반환한다."""
+        return {
+            "appended": self._appended,
+            "sent": self._sent,
+            "pending": self.pending,
+            "send_calls": self._send_calls,
+            "retries": self._retries,
+            "rejected": self._rejected,
+            "last_error": self._last_error,
+            "append_ms": summarize_latencies(self._append_ms),
+            "spool": self._log.get_stats(),
+        }
@@ -0,0 +1,357 @@
+from azure.servicebus import ServiceBusReceivedMessage
+from collections import deque
+from datetime import datetime, timezone
+from time import perf_counter
+import asyncio
+import logging
+
+from ._stats import summarize_latencies
+from .receiver import AzureServiceBusConsumerController, MessageHandler
+from ..telemetry import TELEMETRY
+
+from typing import TYPE_CHECKING, Any, Mapping, Optional
+if TYPE_CHECKING:
+    from azure.servicebus.aio import ServiceBusReceiver
+    from ..dedup import DedupStore
+
+__all__ = (
+    'AzureServiceBusPriorityConsumer',
+    'DEFAULT_PRIORITY',
+    'PRIORITIES',
+    'PRIORITY_PROPERTY',
+    'PRIORITY_WEIGHTS',
+    'message_priority',
+    'normalize_priority',
+    'priority_sql_filter',
+)
+
+# 우선순위 Lane (높은 순)
+PRIORITIES = ('critical', 'high', 'normal', 'low')
+DEFAULT_PRIORITY = 'normal'
+# 모든 Lane에 메세지가 쌓여 있을 때 처리 비율 (critical:high:normal:low = 8:4:2:1)
+PRIORITY_WEIGHTS = {'critical': 8, 'high': 4, 'normal': 2, 'low': 1}
+PRIORITY_PROPERTY = 'Priority'
+SEVERITY_PROPERTY = 'Severity'
+
+_ALIASES = {
+    'emergency': 'critical',
+    'urgent': 'critical',
+    'medium': 'normal',
+    'moderate': 'normal',
+    'routine': 'low',
+}
+
+
+def normalize_priority(value: Any) -> str:
+    """우선순위 값을 Lane 이름(`PRIORITIES`)으로 변환한다.
+
+    Lane 이름과 `Severity` 값(`"High"`, `"Medium"` 등, 대소문자 무시), Lane 순번(0=critical)을 받는다.
+    None이면 `DEFAULT_PRIORITY`.
+
+    Raises:
+        ValueError: 알 수 없는 값.
+    """
+    if value is None:
+        return DEFAULT_PRIORITY
+    if isinstance(value, bytes):
+        value = value.decode('utf-8', 'replace')
+    if isinstance(value, int) and not isinstance(value, bool):
+        if 0 <= value < len(PRIORITIES):
+            return PRIORITIES[value]
+    elif isinstance(value, str):
+        name = value.strip().lower()
+        name = _ALIASES.get(name, name)
+        if name in PRIORITIES:
+            return name
+    raise ValueError(f"Unknown priority: {value!r} (expected one of {PRIORITIES})")
+
+
+def _property(properties: Mapping, name: str) -> Any:
+    value = properties.get(name)
+    if value is None:
+        # 수신한 메세지의 application_properties 키는 bytes일 수 있다.
+        value = properties.get(name.encode())
+    return value
+
+
+def message_priority(message, default: str = DEFAULT_PRIORITY) -> str:
+    """메세지의 `Priority`(없으면 `Severity`) 속성으로 Lane을 구한다. 속성이 없거나 잘못되면 `default`."""
+    properties = getattr(message, 'application_properties', None) or {}
+    for name in (PRIORITY_PROPERTY, SEVERITY_PROPERTY):
+        value = _property(properties, name)
+        if value is not None:
+            try:
+                return normalize_priority(value)
+            except ValueError:
+                logging.debug(f"Ignoring invalid {name} property: {value!r}")
+    return default
+
+
+def priority_sql_filter(priority: Any) -> str:
+    """Lane별 구독의 SQL 필터. (예: `Priority = 'critical'`)"""
+    return f"{PRIORITY_PROPERTY} = '{normalize_priority(priority)}'"
+
+
+class _Lane:
+    __slots__ = (
+        'name', 'weight', 'receiver', 'entity', 'consumer', 'buffer', 'room', 'credit', 'in_flight', 'dispatched',
+        'queue_wait_ms',
+    )
+
+    def __init__(
+            self, name: str, weight: int, receiver: "ServiceBusReceiver", consumer: AzureServiceBusConsumerController,
+            window: int,
+    ) -> None:
+        self.name = name
+        self.weight = weight
+        self.receiver = receiver
+        self.entity = getattr(receiver, 'entity_path', None) or ''
+        self.consumer = consumer
+        self.buffer: deque[tuple[ServiceBusReceivedMessage, float]] = deque()
+        self.room = asyncio.Event()
+        self.room.set()
+        self.credit = 0
+        self.in_flight = 0
+        self.dispatched = 0
+        self.queue_wait_ms: deque[float] = deque(maxlen=window)
+
+
+class AzureServiceBusPriorityConsumer:
+
+    LATENCY_WINDOW = 4096
+    RECEIVE_MAX_WAIT_TIME = 5           # receive_messages 1회 대기 시간(초)
+
+    def __init__(
+            self,
+            receivers: Mapping[str, "ServiceBusReceiver"],
+            handler: MessageHandler,
+            *,
+            weights: Optional[Mapping[str, int]] = None,
+            max_concurrency: int = 8,
+            reserved_concurrency: int = 1,
+            prefetch: Optional[int] = None,
+            max_lock_renewal_duration: Optional[float] = 300,
+            dedup: Optional["DedupStore"] = None,
+    ) -> None:
+        """우선순위 Lane별 Receiver에서 메세지를 받아 가중 공정(Weighted fair) 순서로 핸들러를 실행하는 소비자이다.
+
+        Lane마다 최대 `prefetch`개의 메세지를 미리 받아두고, 핸들러 슬롯이 비면 메세지가 있는 Lane 중에서
+        Smooth weighted round-robin으로 다음 Lane을 고른다. 높은 Lane은 가중치만큼 더 자주 선택되고,
+        메세지가 없는 Lane의 몫은 다른 Lane이 가져가므로 낮은 Lane도 굶지 않는다.
+
+        가장 높은 Lane만 사용할 수 있는 슬롯을 `reserved_concurrency`개 남겨두어, 낮은 Lane이 과부하로
+        모든 슬롯을 차지해도 높은 Lane의 메세지는 바로 실행된다. 정산과 잠금 갱신, 중복 처리 방지는 Lane별
+        `AzureServiceBusConsumerController`와 같다.
+
+        Args:
+            receivers (Mapping[str, ServiceBusReceiver]): 우선순위 → 열려있는(async with) Receiver.
+            handler: 메세지를 처리할 코루틴 함수.
+            weights (Optional[Mapping[str, int]]): 우선순위별 가중치. 기본값은 `PRIORITY_WEIGHTS`.
+            max_concurrency (int): 전체 동시 핸들러 수.
+            reserved_concurrency (int): 가장 높은 Lane 전용 슬롯 수.
+            prefetch (Optional[int]): Lane별로 미리 받아둘 최대 메세지 수. 기본값은 `max_concurrency`.
+                받아둔 메세지의 잠금 시간도 흐르므로 잠금 시간 내에 처리할 수 있는 크기로 설정한다.
+            max_lock_renewal_duration (Optional[float]): 긴 핸들러의 잠금 자동 갱신 최대 시간(초).
+            dedup (Optional[DedupStore]): 중복 처리 방지 저장소.
+
+        Examples:
+
+            ```python
+            async with client.get_subscription_receiver('emc-patient-alert', 'relay-critical') as critical, \\
+                    client.get_subscription_receiver('emc-patient-alert', 'relay-normal') as normal:
+                consumer = AzureServiceBusPriorityConsumer(
+                    {'critical': critical, 'normal': normal}, handler, max_concurrency=16, reserved_concurrency=4
+                )
+                await consumer.run()
+                print(consumer.get_stats()["lanes"]["critical"]["queue_wait_ms"])
+            ```
+        """
+        if not receivers:
+            raise ValueError("at least one priority lane is required")
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be >= 1")
+        if not 0 <= reserved_concurrency < max_concurrency:
+            raise ValueError("reserved_concurrency must be >= 0 and < max_concurrency")
+        weights = {**PRIORITY_WEIGHTS, **{normalize_priority(k): v for k, v in (weights or {}).items()}}
+        lanes = {normalize_priority(name): receiver for name, receiver in receivers.items()}
+        self._lanes = [
+            _Lane(
+                name,
+                max(1, int(weights[name])),
+                lanes[name],
+                AzureServiceBusConsumerController(
+                    lanes[name],
+                    handler,
+                    max_concurrency=max_concurrency,
+                    max_lock_renewal_duration=max_lock_renewal_duration,
+                    dedup=dedup,
+                ),
+                self.LATENCY_WINDOW,
+            )
+            for name in PRIORITIES if name in lanes
+        ]
+        self._max_concurrency = max_concurrency
+        self._shared_concurrency = max_concurrency - reserved_concurrency
+        self._prefetch = prefetch or max_concurrency
+        self._in_flight = 0
+        self._tasks: set[asyncio.Task] = set()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._stopping = False
+        self._last_received = 0.0
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    async def run(
+            self,
+            stop: Optional[asyncio.Event] = None,
+            *,
+            max_wait_time: Optional[float] = None,
+            idle_timeout: Optional[float] = None,
+    ) -> None:
+        """Lane별 수신과 핸들러 실행을 시작한다.
+
+        `stop`이 set되거나 모든 Lane에 `idle_timeout`초 동안 메세지가 없으면 수신을 멈추고,
+        이미 받아둔 메세지까지 처리하여 정산한 뒤 반환한다.
+
+        Args:
+            stop (Optional[asyncio.Event]): 종료 신호.
+            max_wait_time (Optional[float]): receive_messages 1회 대기 시간(초).
+            idle_timeout (Optional[float]): 메세지가 없을 때 종료까지의 시간(초). None이면 계속 대기.
+        """
+        wait_time = max_wait_time or self.RECEIVE_MAX_WAIT_TIME
+        if idle_timeout is not None:
+            wait_time = min(wait_time, idle_timeout)
+        self._wakeup = asyncio.Event()
+        self._stopping = False
+        self._last_received = perf_counter()
+        fetchers = [
+            asyncio.create_task(self._fetch(lane, stop, wait_time, idle_timeout)) for lane in self._lanes
+        ]
+        watcher = asyncio.create_task(self._watch(stop)) if stop is not None else None
+        try:
+            while True:
+                lane = self._next_lane()
+                if lane is not None:
+                    self._dispatch(lane)
+                    continue
+                if all(f.done() for f in fetchers) and not any(lane.buffer for lane in self._lanes):
+                    break
+                self._wakeup.clear()
+                await self._wakeup.wait()
+        finally:
+            self._stopping = True
+            for task in (*fetchers, watcher):
+                if task is not None:
+                    task.cancel()
+            results = await asyncio.gather(*fetchers, return_exceptions=True)
+            if self._tasks:
+                await asyncio.gather(*self._tasks, return_exceptions=True)
+        for result in results:
+            if isinstance(result, Exception):
+                # 수신 오류는 `AzureServiceBusConsumerController.run()`과 같이 호출자에게 전달한다.
+                raise result
+
+    async def _watch(self, stop: asyncio.Event) -> None:
+        await stop.wait()
+        self._stopping = True
+        self._wakeup.set()
+
+    async def _fetch(
+            self,
+            lane: _Lane,
+            stop: Optional[asyncio.Event],
+            wait_time: float,
+            idle_timeout: Optional[float],
+    ) -> None:
+        try:
+            while not self._stopping and (stop is None or not stop.is_set()):
+                free = self._prefetch - len(lane.buffer)
+                if free <= 0:
+                    lane.room.clear()
+                    await lane.room.wait()
+                    continue
+                messages = await lane.receiver.receive_messages(max_message_count=free, max_wait_time=wait_time)
+                if not messages:
+                    if idle_timeout is not None and perf_counter() - self._last_received >= idle_timeout:
+                        break
+                    continue
+                self._last_received = received_at = perf_counter()
+                lane.buffer.extend((msg, received_at) for msg in messages)
+                self._wakeup.set()
+        except Exception:
+            self._stopping = True
+            raise
+        finally:
+            self._wakeup.set()
+
+    def _next_lane(self) -> Optional[_Lane]:
+        """메세지가 있고 슬롯을 사용할 수 있는 Lane 중 다음 Lane을 고른다. (Smooth weighted round-robin)"""
+        if self._in_flight >= self._max_concurrency:
+            return None
+        eligible = [
+            lane for index, lane in enumerate(self._lanes)
+            if lane.buffer and (index == 0 or self._in_flight < self._shared_concurrency)
+        ]
+        if not eligible:
+            return None
+        if len(eligible) == 1:
+            return eligible[0]
+        total = 0
+        chosen = None
+        for lane in eligible:
+            lane.credit += lane.weight
+            total += lane.weight
+            if chosen is None or lane.credit > chosen.credit:
+                chosen = lane
+        chosen.credit -= total
+        return chosen
+
+    def _dispatch(self, lane: _Lane) -> None:
+        msg, received_at = lane.buffer.popleft()
+        lane.room.set()
+        wait_s = perf_counter() - received_at
+        enqueued = getattr(msg, 'enqueued_time_utc', None)
+        if enqueued is not None:
+            # 브로커에 쌓여 있던 시간까지 포함한다.
+            wait_s = max(wait_s, (datetime.now(timezone.utc) - enqueued).total_seconds())
+        lane.queue_wait_ms.append(wait_s * 1000)
+        if TELEMETRY.enabled:
+            TELEMETRY.observe(
+                "siren_servicebus_queue_wait_seconds", wait_s, entity=lane.entity, priority=lane.name
+            )
+
+        self._in_flight += 1
+        lane.in_flight += 1
+        lane.dispatched += 1
+        task = lane.consumer.dispatch(msg, received_at)
+        self._tasks.add(task)
+        task.add_done_callback(lambda t, lane=lane: self._done(t, lane))
+
+    def _done(self, task: asyncio.Task, lane: _Lane) -> None:
+        self._tasks.discard(task)
+        self._in_flight -= 1
+        lane.in_flight -= 1
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    def get_stats(self) -> dict:
+        """Lane별 정산 카운터, 대기 메세지 수, 큐 대기시간(브로커 적재부터 핸들러 시작까지, ms)을 반환한다."""
+        lanes = {}
+        for lane in self._lanes:
+            stats = lane.consumer.get_stats()
+            stats.update(
+                weight=lane.weight,
+                buffered=len(lane.buffer),
+                in_flight=lane.in_flight,
+                dispatched=lane.dispatched,
+                queue_wait_ms=summarize_latencies(lane.queue_wait_ms),
+            )
+            lanes[lane.name] = stats
+        return {
+            "max_concurrency": self._max_concurrency,
+            "reserved_concurrency": self._max_concurrency - self._shared_concurrency,
+            "in_flight": self._in_flight,
+            "lanes": lanes,
+        }
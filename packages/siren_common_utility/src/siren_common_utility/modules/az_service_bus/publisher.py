@@ -0,0 +1,258 @@
+from azure.servicebus import ServiceBusMessage, ServiceBusMessageBatch
+from azure.servicebus.exceptions import ServiceBusAuthenticationError
+from collections import deque
+from time import perf_counter
+import asyncio
+import logging
+
+from ._stats import summarize_latencies
+from .sender_pool import ensure_message_id
+
+from typing import Awaitable, Callable, Optional
+
+__all__ = (
+    'AzureServiceBusBatchPublisher',
+)
+
+_STOP = object()
+
+
+class _PendingMessage:
+    __slots__ = ('topic_name', 'message', 'future', 'enqueued_at')
+
+    def __init__(self, topic_name: str, message: ServiceBusMessage, future: asyncio.Future) -> None:
+        self.topic_name = topic_name
+        self.message = message
+        self.future = future
+        self.enqueued_at = perf_counter()
+
+
+class _TopicLane:
+    __slots__ = ('batch', 'entries', 'deadline')
+
+    def __init__(self) -> None:
+        self.batch: Optional[ServiceBusMessageBatch] = None
+        self.entries: list[_PendingMessage] = []
+        self.deadline = 0.0
+
+
+class AzureServiceBusBatchPublisher:
+
+    LATENCY_WINDOW = 4096
+
+    def __init__(
+            self,
+            create_batch: Callable[[str], Awaitable[ServiceBusMessageBatch]],
+            send_batch: Callable[[str, ServiceBusMessageBatch], Awaitable[None]],
+            *,
+            linger_ms: float = 5.0,
+            max_batch_messages: int = 100,
+            max_pending: int = 10_000,
+            max_in_flight: int = 4,
+    ) -> None:
+        """토픽별로 메세지를 모아 배치로 전송하는 백그라운드 Publisher이다. (Micro-batching)
+
+        `publish()`는 메세지를 큐에 넣고 바로 Future를 반환한다. 백그라운드 태스크가
+        메세지를 토픽별 배치에 채우고, 아래 조건 중 하나를 만족하면 배치를 전송한다.
+
+        - 배치가 최대 크기(bytes)에 도달
+        - 배치의 메세지 수가 `max_batch_messages`에 도달
+        - 배치의 첫 메세지가 들어온 뒤 `linger_ms`가 경과 (Kafka `linger.ms`와 동일)
+
+        큐는 `max_pending`개로 제한되며, 가득 차면 `publish()`가 대기한다. (Backpressure)
+        전송 중인 배치가 `max_in_flight`개이면 큐 소비도 멈추므로 메모리 사용량이 제한된다.
+
+        Args:
+            create_batch: 토픽 이름을 받아 빈 배치를 만드는 코루틴 함수.
+            send_batch: 토픽 이름과 배치를 받아 전송하는 코루틴 함수.
+            linger_ms (float): 배치를 채우기 위해 기다리는 최대 시간(ms).
+            max_batch_messages (int): 배치당 최대 메세지 수.
+            max_pending (int): 전송 대기 큐의 최대 크기.
+            max_in_flight (int): 동시에 전송 중인 최대 배치 수.
+
+        Examples:
+
+            ```python
+            publisher = AzureServiceBusBatchPublisher(create_batch, send_batch, linger_ms=5)
+            await publisher.start()
+            future = await publisher.publish('emc-patient-alert', ServiceBusMessage('...'))
+            await future        # 전송 실패 시 예외 발생
+            await publisher.aclose()
+            ```
+        """
+        self._create_batch = create_batch
+        self._send_batch = send_batch
+        self._linger = linger_ms / 1000
+        self._max_batch_messages = max_batch_messages
+        self._max_pending = max_pending
+        self._max_in_flight = max_in_flight
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._in_flight: Optional[asyncio.Semaphore] = None
+        self._lanes: dict[str, _TopicLane] = {}
+        self._tasks: set[asyncio.Task] = set()
+        self._dispatcher: Optional[asyncio.Task] = None
+        self._closing = False
+
+        self._batches_sent = 0
+        self._messages_sent = 0
+        self._messages_failed = 0
+        self._latencies_ms: deque[float] = deque(maxlen=self.LATENCY_WINDOW)
+
+    @property
+    def running(self) -> bool:
+        return self._dispatcher is not None and not self._dispatcher.done()
+
+    async def start(self) -> None:
+        """백그라운드 배치 전송 태스크를 시작한다."""
+        if self.running:
+            return
+        if self._closing:
+            raise RuntimeError("Publisher is closed")
+        self._queue = asyncio.Queue(maxsize=self._max_pending)
+        self._in_flight = asyncio.Semaphore(self._max_in_flight)
+        self._dispatcher = asyncio.create_task(self._run())
+
+    async def publish(self, topic_name: str, message: ServiceBusMessage) -> asyncio.Future:
+        """메세지를 전송 큐에 넣고, 전송 결과를 담을 Future를 반환한다.
+
+        큐가 가득 찬 경우에만 대기한다. Future는 전송 성공 시 `None`, 실패 시 예외로 완료된다.
+        `message_id`가 없으면 재전송 시 중복을 걸러낼 수 있도록 고유 id를 할당한다.
+        """
+        if self._closing or not self.running:
+            raise RuntimeError("Publisher is not running")
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put(_PendingMessage(topic_name, ensure_message_id(message), future))
+        return future
+
+    async def flush(self) -> None:
+        """현재까지 publish된 메세지를 모두 전송하고 완료될 때까지 기다린다."""
+        if not self.running:
+            return
+        done = asyncio.get_running_loop().create_future()
+        await self._queue.put(done)
+        await done
+
+    async def aclose(self) -> None:
+        """새 메세지를 받지 않고, 남은 메세지를 모두 전송한 뒤 종료한다."""
+        if self._closing:
+            return
+        self._closing = True
+        if self._dispatcher is None:
+            return
+        if not self._dispatcher.done():
+            await self._queue.put(_STOP)
+        await self._dispatcher
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            deadline = min((lane.deadline for lane in self._lanes.values() if lane.entries), default=None)
+            try:
+                if deadline is None:
+                    item = await self._queue.get()
+                else:
+                    item = await asyncio.wait_for(self._queue.get(), max(0.0, deadline - loop.time()))
+            except TimeoutError:
+                item = None
+
+            if item is _STOP:
+                await self._flush_all()
+                return
+            if isinstance(item, asyncio.Future):
+                await self._flush_all()
+                if not item.done():
+                    item.set_result(None)
+                continue
+            if item is not None:
+                await self._add(item)
+            await self._flush_expired(loop.time())
+
+    async def _add(self, pending: _PendingMessage) -> None:
+        if pending.future.done():
+            # 호출자가 이미 취소한 메세지
+            return
+        lane = self._lanes.get(pending.topic_name)
+        if lane is None:
+            lane = self._lanes[pending.topic_name] = _TopicLane()
+        try:
+            if lane.batch is None:
+                lane.batch = await self._create_batch(pending.topic_name)
+                lane.deadline = asyncio.get_running_loop().time() + self._linger
+            try:
+                lane.batch.add_message(pending.message)
+            except ValueError:
+                # ServiceBusMessageBatch object reaches max_size.
+                if not lane.entries:
+                    raise
+                await self._flush_lane(pending.topic_name, lane)
+                lane.batch = await self._create_batch(pending.topic_name)
+                lane.deadline = asyncio.get_running_loop().time() + self._linger
+                lane.batch.add_message(pending.message)
+        except Exception as e:
+            self._messages_failed += 1
+            if not pending.future.done():
+                pending.future.set_exception(e)
+            return
+
+        lane.entries.append(pending)
+        if len(lane.entries) >= self._max_batch_messages:
+            await self._flush_lane(pending.topic_name, lane)
+
+    async def _flush_expired(self, now: float) -> None:
+        for topic_name, lane in self._lanes.items():
+            if lane.entries and lane.deadline <= now:
+                await self._flush_lane(topic_name, lane)
+
+    async def _flush_all(self) -> None:
+        for topic_name, lane in self._lanes.items():
+            if lane.entries:
+                await self._flush_lane(topic_name, lane)
+        if self._tasks:
+            await asyncio.gather(*list(self._tasks))
+
+    async def _flush_lane(self, topic_name: str, lane: _TopicLane) -> None:
+        batch, entries = lane.batch, lane.entries
+        lane.batch, lane.entries = None, []
+        # 전송 중인 배치가 가득 찬 경우 여기서 대기하며, 큐 소비도 함께 멈춘다.
+        await self._in_flight.acquire()
+        task = asyncio.create_task(self._send(topic_name, batch, entries))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _send(self, topic_name: str, batch: ServiceBusMessageBatch, entries: list[_PendingMessage]) -> None:
+        try:
+            await self._send_batch(topic_name, batch)
+        except Exception as e:
+            if isinstance(e, ServiceBusAuthenticationError):
+                logging.error(
+                    "ServiceBusAuthentication Error: "
+                    "Set credentials or topic name correctly!"
+                )
+            else:
+                logging.error(f"Failed to publish batch of {len(entries)} messages. Topic: {topic_name} error={e!r}")
+            self._messages_failed += len(entries)
+            for pending in entries:
+                if not pending.future.done():
+                    pending.future.set_exception(e)
+        else:
+            self._batches_sent += 1
+            self._messages_sent += len(entries)
+            now = perf_counter()
+            for pending in entries:
+                self._latencies_ms.append((now - pending.enqueued_at) * 1000)
+                if not pending.future.done():
+                    pending.future.set_result(None)
+        finally:
+            self._in_flight.release()
+
+    def get_stats(self) -> dict:
+        """배치 전송 통계와 publish부터 전송 완료까지의 지연시간을 반환한다."""
+        return {
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+            "batches_sent": self._batches_sent,
+            "messages_sent": self._messages_sent,
+            "messages_failed": self._messages_failed,
+            "avg_batch_size": (self._messages_sent / self._batches_sent) if self._batches_sent else None,
+            "publish_latency_ms": summarize_latencies(self._latencies_ms),
+        }
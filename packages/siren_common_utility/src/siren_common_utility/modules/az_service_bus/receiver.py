@@ -0,0 +1,287 @@
+from azure.servicebus import ServiceBusReceivedMessage
+from collections import deque
+from datetime import datetime, timezone
+from time import perf_counter
+import asyncio
+import logging
+
+from ._stats import summarize_latencies
+from ..telemetry import TELEMETRY
+
+from typing import TYPE_CHECKING, Awaitable, Callable, Optional
+if TYPE_CHECKING:
+    from azure.servicebus.aio import ServiceBusReceiver
+    from ..dedup import DedupStore
+
+__all__ = (
+    'AzureServiceBusConsumerController',
+    'DeadLetterMessage',
+    'MessageHandler',
+)
+
+MessageHandler = Callable[[ServiceBusReceivedMessage], Awaitable[None]]
+DedupKey = Callable[[ServiceBusReceivedMessage], Optional[str]]
+
+
+def _message_id_key(msg: ServiceBusReceivedMessage) -> Optional[str]:
+    return msg.message_id
+
+
+class DeadLetterMessage(Exception):
+    """핸들러에서 발생시키면 해당 메세지를 재시도 없이 Dead-letter 큐로 보낸다."""
+
+    def __init__(self, reason: str, error_description: Optional[str] = None) -> None:
+        super().__init__(reason)
+        self.reason = reason
+        self.error_description = error_description
+
+
+class AzureServiceBusConsumerController:
+
+    LATENCY_WINDOW = 4096
+    RECEIVE_MAX_WAIT_TIME = 5           # receive_messages 1회 대기 시간(초)
+    LOCK_RENEW_MARGIN = 10              # 잠금 만료 몇 초 전에 갱신할지
+    IN_FLIGHT_ABANDON_DELAY = 1.0       # 처리 중인 메세지의 재전달 사본을 되돌리기 전 대기 시간(초)
+
+    def __init__(
+            self,
+            receiver: "ServiceBusReceiver",
+            handler: MessageHandler,
+            *,
+            max_concurrency: int = 8,
+            max_lock_renewal_duration: Optional[float] = 300,
+            dedup: Optional["DedupStore"] = None,
+            dedup_key: DedupKey = _message_id_key,
+    ) -> None:
+        """Receiver에서 메세지를 배치로 받아 핸들러를 동시에 실행하는 소비자이다.
+
+        최대 `max_concurrency`개의 핸들러가 동시에 실행되며, 각 메세지는 핸들러가 끝나는
+        순서대로 개별 정산(Settlement)된다.
+
+        - 정상 종료: `complete_message`
+        - `DeadLetterMessage` 발생: `dead_letter_message`
+        - 그 외 예외: `abandon_message` (재전달)
+
+        핸들러가 오래 걸리면 잠금 만료 `LOCK_RENEW_MARGIN`초 전에 메세지 잠금을 갱신한다.
+        갱신은 수신 후 `max_lock_renewal_duration`초까지만 수행하며, None이면 갱신하지 않는다.
+
+        `dedup`을 지정하면 이미 처리한 메세지는 핸들러를 호출하지 않고 complete 한다.
+        첫 전달이 아직 처리 중인 사본(잠금 만료 후 재전달 등)은 첫 처리가 실패할 수 있으므로
+        `IN_FLIGHT_ABANDON_DELAY`초 뒤 abandon 하여 다시 전달되도록 한다.
+
+        Args:
+            receiver (ServiceBusReceiver): 열려있는(async with) Receiver 객체.
+            handler: 메세지를 처리할 코루틴 함수.
+            max_concurrency (int): 동시에 실행할 최대 핸들러 수.
+            max_lock_renewal_duration (Optional[float]): 잠금 갱신을 유지할 최대 시간(초).
+            dedup (Optional[DedupStore]): 중복 처리 방지 저장소. (`LocalDedupStore`, `SharedDedupStore`)
+            dedup_key: 메세지의 중복 판단 키를 반환하는 함수. 기본값은 `message_id`. None을 반환하면 검사하지 않는다.
+
+        Examples:
+
+            ```python
+            async def handler(msg):
+                await post_to_backend(str(msg))
+
+            async with servicebus_client.get_subscription_receiver(topic, sub, prefetch_count=32) as receiver:
+                consumer = AzureServiceBusConsumerController(receiver, handler, max_concurrency=16)
+                await consumer.run()
+            ```
+        """
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be >= 1")
+        self._receiver = receiver
+        self._handler = handler
+        self._max_concurrency = max_concurrency
+        self._max_lock_renewal_duration = max_lock_renewal_duration
+        self._tasks: set[asyncio.Task] = set()
+        self._entity = getattr(receiver, 'entity_path', None) or ''
+        self._dedup = dedup
+        self._dedup_key = dedup_key
+
+        self._received = 0
+        self._completed = 0
+        self._abandoned = 0
+        self._dead_lettered = 0
+        self._settle_errors = 0
+        self._duplicates = 0
+        self._in_flight_duplicates = 0
+        self._lock_renewals = 0
+        self._lock_renew_failures = 0
+        self._latencies_ms: deque[float] = deque(maxlen=self.LATENCY_WINDOW)
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._tasks)
+
+    async def run(
+            self,
+            stop: Optional[asyncio.Event] = None,
+            *,
+            max_wait_time: Optional[float] = None,
+            idle_timeout: Optional[float] = None,
+    ) -> None:
+        """메세지 수신 루프를 실행한다.
+
+        `stop`이 set되거나 `idle_timeout`초 동안 메세지가 없으면 수신을 멈추고,
+        실행 중인 핸들러의 정산이 끝날 때까지 기다린 뒤 반환한다.
+
+        Args:
+            stop (Optional[asyncio.Event]): 종료 신호.
+            max_wait_time (Optional[float]): receive_messages 1회 대기 시간(초).
+            idle_timeout (Optional[float]): 메세지가 없을 때 종료까지의 시간(초). None이면 계속 대기.
+        """
+        wait_time = max_wait_time or self.RECEIVE_MAX_WAIT_TIME
+        if idle_timeout is not None:
+            wait_time = min(wait_time, idle_timeout)
+        last_received = perf_counter()
+        try:
+            while stop is None or not stop.is_set():
+                free = self._max_concurrency - len(self._tasks)
+                if free <= 0:
+                    await asyncio.wait(self._tasks, return_when=asyncio.FIRST_COMPLETED)
+                    continue
+
+                messages = await self._receiver.receive_messages(
+                    max_message_count=free,
+                    max_wait_time=wait_time,
+                )
+                if not messages:
+                    if idle_timeout is not None and perf_counter() - last_received >= idle_timeout:
+                        break
+                    continue
+
+                last_received = perf_counter()
+                for msg in messages:
+                    self.dispatch(msg, last_received)
+        finally:
+            if self._tasks:
+                await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    def dispatch(self, msg: ServiceBusReceivedMessage, received_at: Optional[float] = None) -> asyncio.Task:
+        """수신한 메세지 하나의 처리(핸들러 실행과 정산)를 시작한다.
+
+        `run()` 대신 직접 수신하는 스케줄러(`AzureServiceBusPriorityConsumer`)에서 사용한다.
+        `received_at`(perf_counter)은 정산까지의 지연시간 기준 시각이다.
+        """
+        self._received += 1
+        task = asyncio.create_task(self._process(msg, perf_counter() if received_at is None else received_at))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    async def _process(self, msg: ServiceBusReceivedMessage, received_at: float) -> None:
+        key = self._dedup_key(msg) if self._dedup is not None else None
+        if key is not None:
+            claim = await self._dedup.try_claim(key)
+            if claim == self._dedup.IN_FLIGHT:
+                # 처리 중인 첫 전달이 실패하면 이 사본이 유일하게 남으므로 complete 하지 않는다.
+                logging.info(f"Message is still in flight, abandoning copy. message_id={msg.message_id}")
+                self._in_flight_duplicates += 1
+                await asyncio.sleep(self.IN_FLIGHT_ABANDON_DELAY)
+                outcome = "in_flight" if await self._settle(self._receiver.abandon_message(msg)) else "settle_error"
+                self._observe(outcome, received_at)
+                return
+            if claim != self._dedup.CLAIMED:
+                logging.info(f"Skipping duplicate message. message_id={msg.message_id}")
+                self._duplicates += 1
+                outcome = "duplicate" if await self._settle(self._receiver.complete_message(msg)) else "settle_error"
+                self._observe(outcome, received_at)
+                return
+        try:
+            with TELEMETRY.span("servicebus.process", entity=self._entity, message_id=msg.message_id):
+                await self._run_handler(msg)
+        except DeadLetterMessage as e:
+            if key is not None:
+                await self._dedup.release(key)
+            await self._settle(
+                self._receiver.dead_letter_message(
+                    msg, reason=e.reason, error_description=e.error_description
+                )
+            )
+            self._dead_lettered += 1
+            outcome = "dead_lettered"
+        except Exception:
+            logging.exception(f"Message handler failed, abandoning. message_id={msg.message_id}")
+            if key is not None:
+                await self._dedup.release(key)
+            await self._settle(self._receiver.abandon_message(msg))
+            self._abandoned += 1
+            outcome = "abandoned"
+        else:
+            if key is not None:
+                # 정산에 실패해 재전달되더라도 핸들러는 이미 끝났으므로 처리 완료로 기록한다.
+                await self._dedup.complete(key)
+            outcome = "completed"
+            if await self._settle(self._receiver.complete_message(msg)):
+                self._completed += 1
+            else:
+                outcome = "settle_error"
+        self._observe(outcome, received_at)
+
+    def _observe(self, outcome: str, received_at: float) -> None:
+        elapsed = perf_counter() - received_at
+        self._latencies_ms.append(elapsed * 1000)
+        if TELEMETRY.enabled:
+            TELEMETRY.observe("siren_servicebus_receive_to_settle_seconds", elapsed, entity=self._entity, outcome=outcome)
+
+    async def _run_handler(self, msg: ServiceBusReceivedMessage) -> None:
+        locked_until = getattr(msg, 'locked_until_utc', None)
+        if locked_until is None or self._max_lock_renewal_duration is None:
+            await self._handler(msg)
+            return
+
+        renew_deadline = perf_counter() + self._max_lock_renewal_duration
+        handler_task = asyncio.ensure_future(self._handler(msg))
+        try:
+            while True:
+                until_renew = (
+                    msg.locked_until_utc - datetime.now(timezone.utc)
+                ).total_seconds() - self.LOCK_RENEW_MARGIN
+                done, _ = await asyncio.wait({handler_task}, timeout=max(0.0, until_renew))
+                if done:
+                    break
+                if perf_counter() >= renew_deadline:
+                    # 최대 갱신 시간이 지나면 잠금이 만료되도록 두고 핸들러만 기다린다.
+                    await asyncio.wait({handler_task})
+                    break
+                try:
+                    await self._receiver.renew_message_lock(msg)
+                    self._lock_renewals += 1
+                    TELEMETRY.inc("siren_servicebus_lock_renewals_total", entity=self._entity, result="ok")
+                except Exception:
+                    self._lock_renew_failures += 1
+                    TELEMETRY.inc("siren_servicebus_lock_renewals_total", entity=self._entity, result="failed")
+                    logging.warning(f"Failed to renew message lock. message_id={msg.message_id}", exc_info=True)
+                    await asyncio.wait({handler_task})
+                    break
+        except asyncio.CancelledError:
+            handler_task.cancel()
+            raise
+        handler_task.result()
+
+    async def _settle(self, settlement: Awaitable[None]) -> bool:
+        try:
+            await settlement
+            return True
+        except Exception:
+            # 잠금 만료 등으로 정산에 실패하면 메세지는 Service Bus가 재전달한다.
+            self._settle_errors += 1
+            logging.warning("Failed to settle message", exc_info=True)
+            return False
+
+    def get_stats(self) -> dict:
+        """수신/정산 카운터와 수신부터 정산까지의 지연시간을 반환한다."""
+        return {
+            "received": self._received,
+            "in_flight": len(self._tasks),
+            "completed": self._completed,
+            "abandoned": self._abandoned,
+            "dead_lettered": self._dead_lettered,
+            "settle_errors": self._settle_errors,
+            "duplicates": self._duplicates,
+            "in_flight_duplicates": self._in_flight_duplicates,
+            "lock_renewals": self._lock_renewals,
+            "lock_renew_failures": self._lock_renew_failures,
+            "receive_to_settle_ms": summarize_latencies(self._latencies_ms),
+        }
@@ -1,15 +1,203 @@
-from azure.servicebus import ServiceBusMessage
+from azure.servicebus import ServiceBusMessage, ServiceBusMessageBatch
 from azure.servicebus.exceptions import ServiceBusAuthenticationError
+from time import perf_counter
+import asyncio
 import logging
 
-from typing import TYPE_CHECKING
+from ..telemetry import TELEMETRY
+from .sender_pool import ensure_message_id
+
+from typing import TYPE_CHECKING, AsyncIterable, Awaitable, Callable, Iterable, Optional, Union
 if TYPE_CHECKING:
     from azure.servicebus.aio import ServiceBusSender
 
 __all__ = (
     'AzureServiceBusSenderController',
+    'BatchSendReport',
+    'MessageSendResult',
+    'async_send_batches',
+    'instrumented_send',
 )
 
+MessageSource = Union[Iterable[ServiceBusMessage], AsyncIterable[ServiceBusMessage]]
+
+
+class MessageSendResult:
+    """배치 전송에서 메세지 한 건의 전송 결과."""
+    __slots__ = ('index', 'message_id', 'batch_index', 'ok', 'error')
+
+    def __init__(self, index: int, message_id: Optional[str]) -> None:
+        self.index = index
+        self.message_id = message_id
+        self.batch_index: Optional[int] = None
+        self.ok = False
+        self.error: Optional[BaseException] = None
+
+    def __repr__(self) -> str:
+        return (
+            f"MessageSendResult(index={self.index}, message_id={self.message_id}, "
+            f"batch_index={self.batch_index}, ok={self.ok}, error={self.error!r})"
+        )
+
+
+class BatchSendReport:
+    """`async_send_batches`의 결과. `results`는 입력 순서와 같다."""
+
+    def __init__(self) -> None:
+        self.results: list[MessageSendResult] = []
+        self.batch_count = 0
+
+    @property
+    def ok(self) -> bool:
+        return all(r.ok for r in self.results)
+
+    @property
+    def sent_count(self) -> int:
+        return sum(1 for r in self.results if r.ok)
+
+    @property
+    def failed(self) -> list[MessageSendResult]:
+        return [r for r in self.results if not r.ok]
+
+    def __repr__(self) -> str:
+        return (
+            f"BatchSendReport(messages={len(self.results)}, sent={self.sent_count}, "
+            f"failed={len(self.results) - self.sent_count}, batches={self.batch_count})"
+        )
+
+
+async def _aiter_messages(messages: MessageSource):
+    if hasattr(messages, '__aiter__'):
+        async for msg in messages:
+            yield msg
+    else:
+        for msg in messages:
+            yield msg
+
+
+async def async_send_batches(
+        create_batch: Callable[[], Awaitable[ServiceBusMessageBatch]],
+        send_batch: Callable[[ServiceBusMessageBatch], Awaitable[None]],
+        messages: MessageSource,
+        *,
+        max_in_flight: int = 1,
+) -> BatchSendReport:
+    """메세지를 최대 크기까지 채운 배치로 나누어 모두 전송한다.
+
+    배치가 가득 차면(`MessageSizeExceededError`) 즉시 전송을 예약하고 새 배치를 만든다.
+    동시에 전송 중인 배치는 최대 `max_in_flight`개이며, 이를 넘으면 입력 소비를 멈춘다.
+    `max_in_flight`가 1보다 크면 배치 간 전송 순서는 보장되지 않는다.
+
+    단일 메세지가 빈 배치에도 들어가지 않거나 배치 전송이 실패하면 해당 메세지만
+    실패로 기록하고 나머지는 계속 전송한다. 인증 오류는 전송을 중단하고 다시 발생시킨다.
+
+    Args:
+        create_batch: 비어있는 `ServiceBusMessageBatch`를 만드는 코루틴 함수.
+        send_batch: 배치를 전송하는 코루틴 함수.
+        messages: 리스트 등 Iterable 또는 AsyncIterable 메세지.
+        max_in_flight (int): 동시에 전송할 최대 배치 수.
+
+    Returns:
+        BatchSendReport: 메세지별 전송 결과.
+    """
+    if max_in_flight < 1:
+        raise ValueError("max_in_flight must be >= 1")
+    report = BatchSendReport()
+    in_flight = asyncio.Semaphore(max_in_flight)
+    tasks: list[asyncio.Task] = []
+    fatal: list[BaseException] = []
+
+    async def _send(batch: ServiceBusMessageBatch, entries: list[MessageSendResult]):
+        try:
+            await send_batch(batch)
+        except Exception as e:
+            if isinstance(e, ServiceBusAuthenticationError):
+                fatal.append(e)
+            logging.error(f"Failed to send batch of {len(entries)} messages: {e!r}")
+            for entry in entries:
+                entry.error = e
+        else:
+            for entry in entries:
+                entry.ok = True
+        finally:
+            in_flight.release()
+
+    async def _flush(batch: ServiceBusMessageBatch, entries: list[MessageSendResult]):
+        await in_flight.acquire()
+        for entry in entries:
+            entry.batch_index = report.batch_count
+        report.batch_count += 1
+        tasks.append(asyncio.create_task(_send(batch, entries)))
+
+    batch: Optional[ServiceBusMessageBatch] = None
+    entries: list[MessageSendResult] = []
+    try:
+        async for msg in _aiter_messages(messages):
+            if fatal:
+                break
+            msg = ensure_message_id(msg)
+            entry = MessageSendResult(len(report.results), getattr(msg, 'message_id', None))
+            report.results.append(entry)
+            if batch is None:
+                batch = await create_batch()
+            try:
+                batch.add_message(msg)
+            except ValueError as e:
+                # ServiceBusMessageBatch object reaches max_size.
+                if not entries:
+                    # 빈 배치에도 들어가지 않는 메세지
+                    entry.error = e
+                    continue
+                await _flush(batch, entries)
+                batch, entries = await create_batch(), []
+                try:
+                    batch.add_message(msg)
+                except ValueError as e:
+                    entry.error = e
+                    continue
+            entries.append(entry)
+
+        if entries and not fatal:
+            await _flush(batch, entries)
+    finally:
+        if tasks:
+            await asyncio.gather(*tasks)
+
+    if fatal:
+        logging.error(
+            "ServiceBusAuthentication Error: "
+            "Set credentials or topic name correctly!"
+        )
+        raise fatal[0]
+    return report
+
+
+async def instrumented_send(
+        send: Callable[[object], Awaitable[None]],
+        message: Union[ServiceBusMessage, list[ServiceBusMessage], ServiceBusMessageBatch],
+        topic: str,
+) -> None:
+    """`send(message)`를 실행하고 전송 지연, 메세지 수, 배치 채움 비율을 계측한다.
+
+    계측이 꺼져 있고(`TELEMETRY.enabled`) Span Hook도 없으면 `send(message)`만 호출한다.
+    """
+    if not TELEMETRY.enabled and not TELEMETRY.tracing:
+        await send(message)
+        return
+    count = 1 if isinstance(message, ServiceBusMessage) else len(message)
+    started = perf_counter()
+    with TELEMETRY.span("servicebus.send", topic=topic, messages=count):
+        try:
+            await send(message)
+        except Exception:
+            TELEMETRY.inc("siren_servicebus_send_errors_total", topic=topic)
+            raise
+    TELEMETRY.observe("siren_servicebus_send_seconds", perf_counter() - started, topic=topic)
+    TELEMETRY.inc("siren_servicebus_sent_messages_total", count, topic=topic)
+    if isinstance(message, ServiceBusMessageBatch) and message.max_size_in_bytes:
+        TELEMETRY.observe("siren_servicebus_batch_fill_ratio", message.size_in_bytes / message.max_size_in_bytes, topic=topic)
+
+
 class AzureServiceBusSenderController:
 
     def __init__(
@@ -39,11 +227,12 @@ class AzureServiceBusSenderController:
             ```
         """
         self._sender = sender
+        self._topic = getattr(sender, 'entity_name', None) or getattr(sender, 'topic_name', '') or ''
 
     async def async_send_single_message(self, message: ServiceBusMessage):
         try:
             # send the message to the topic
-            await self._sender.send_messages(message)
+            await instrumented_send(self._sender.send_messages, message, self._topic)
         except ServiceBusAuthenticationError:
             logging.error(
                 "ServiceBusAuthentication Error: "
@@ -57,8 +246,8 @@ class AzureServiceBusSenderController:
     ):
         try:
             # send the list of messages to the topic
-            await self._sender.send_messages(messages)
-            print(f"Sent a list of {len(messages)} messages")
+            await instrumented_send(self._sender.send_messages, messages, self._topic)
+            logging.debug(f"Sent a list of {len(messages)} messages")
         except ServiceBusAuthenticationError:
             logging.error(
                 "ServiceBusAuthentication Error: "
@@ -68,26 +257,18 @@ class AzureServiceBusSenderController:
 
     async def async_send_batch_message(
             self,
-            messages: list[ServiceBusMessage]
-    ):
-        try:
-            # Create a batch of messages
-            async with self._sender:
-                batch_message = await self._sender.create_message_batch()
-                for msg in messages:
-                    try:
-                        # Add a message to the batch
-                        batch_message.add_message(msg)
-                    except ValueError:
-                        # ServiceBusMessageBatch object reaches max_size.
-                        # New ServiceBusMessageBatch object can be created here to send more data.
-                        break
-                # Send the batch of messages to the topic
-                await self._sender.send_messages(batch_message)
-        except ServiceBusAuthenticationError:
-            logging.error(
-                "ServiceBusAuthentication Error: "
-                "Set credentials or topic name correctly!"
-            )
-            raise
+            messages: MessageSource
+    ) -> BatchSendReport:
+        """메세지를 최대 크기로 채운 배치들로 나누어 순서대로 전송한다.
+
+        넘겨받은 Sender는 닫지 않는다. 자세한 동작은 `async_send_batches`를 참고한다.
+
+        Returns:
+            BatchSendReport: 메세지별 전송 결과.
+        """
+        return await async_send_batches(
+            self._sender.create_message_batch,
+            lambda batch: instrumented_send(self._sender.send_messages, batch, self._topic),
+            messages,
+        )
 
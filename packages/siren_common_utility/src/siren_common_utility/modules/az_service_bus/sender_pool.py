@@ -0,0 +1,232 @@
+from azure.servicebus import ServiceBusMessage
+from azure.servicebus.exceptions import (
+    ServiceBusConnectionError,
+    ServiceBusCommunicationError,
+    OperationTimeoutError,
+)
+from collections import deque
+from contextlib import asynccontextmanager
+from time import monotonic, perf_counter
+import asyncio
+import logging
+import uuid
+
+from ._stats import summarize_latencies
+
+from typing import TYPE_CHECKING, AsyncIterator, Awaitable, Callable, Optional, TypeVar
+if TYPE_CHECKING:
+    from azure.servicebus.aio import ServiceBusClient, ServiceBusSender
+
+__all__ = (
+    'AzureServiceBusSenderPool',
+    'LINK_ERRORS',
+    'ensure_message_id',
+)
+
+T = TypeVar("T")
+
+# 링크(AMQP Link) 자체가 손상되었다고 판단하는 예외 목록.
+# 이 예외가 발생한 Sender는 풀로 돌아가지 않고 폐기된다.
+LINK_ERRORS = (
+    ServiceBusConnectionError,
+    ServiceBusCommunicationError,
+    OperationTimeoutError,
+)
+
+
+def ensure_message_id(message: T) -> T:
+    """`message_id`가 없는 `ServiceBusMessage`에 고유 id를 할당한다.
+
+    링크 오류 후 재전송된 메세지가 첫 전송과 같은 id를 갖도록 첫 시도 전에 호출한다.
+    (브로커의 Duplicate detection과 소비자의 `DedupStore`가 중복을 걸러낸다)
+    """
+    if isinstance(message, ServiceBusMessage) and message.message_id is None:
+        message.message_id = uuid.uuid4().hex
+    return message
+
+
+class _PooledSender:
+    __slots__ = ('sender', 'last_used', 'healthy')
+
+    def __init__(self, sender: "ServiceBusSender") -> None:
+        self.sender = sender
+        self.last_used = monotonic()
+        self.healthy = True
+
+
+class _TopicSlot:
+    __slots__ = ('idle', 'limit')
+
+    def __init__(self, max_senders: int) -> None:
+        self.idle: deque[_PooledSender] = deque()
+        self.limit = asyncio.Semaphore(max_senders)
+
+
+class AzureServiceBusSenderPool:
+
+    LATENCY_WINDOW = 1024
+    MIN_SWEEP_INTERVAL = 1.0            # 유휴 Sender 정리 주기의 하한(초)
+
+    def __init__(
+            self,
+            client: "ServiceBusClient",
+            *,
+            max_senders_per_topic: int = 4,
+            idle_timeout: float = 300.0,
+    ) -> None:
+        """토픽별 Sender(AMQP Link)를 재사용하는 풀이다.
+
+        Sender는 처음 필요할 때 생성되고, 사용이 끝나면 닫지 않고 풀에 반환된다.
+        `idle_timeout` 초 이상 사용되지 않은 Sender는 백그라운드 정리(`idle_timeout`의 절반 주기)에서만
+        닫히므로, 전송 경로에는 정리 비용이 없고 전송이 끊겨도 유휴 링크가 남지 않는다.
+        링크 오류(`LINK_ERRORS`)가 발생한 Sender는 폐기하고, 해당 토픽의 유휴 Sender도 모두 닫은 뒤
+        새 Sender로 1회 재시도한다.
+        재시도가 중복 전송이 되지 않도록 메세지에는 첫 시도 전에 `message_id`를 고정한다. (`ensure_message_id`)
+
+        Args:
+            client (ServiceBusClient): Sender를 생성할 클라이언트.
+            max_senders_per_topic (int): 토픽당 동시에 열 수 있는 Sender 수.
+            idle_timeout (float): 유휴 Sender를 정리하기까지의 시간(초).
+
+        Examples:
+
+            ```python
+            pool = AzureServiceBusSenderPool(client)
+            async with pool.acquire('emc-patient-alert') as sender:
+                await sender.send_messages(ServiceBusMessage('...'))
+            await pool.aclose()
+            ```
+        """
+        if max_senders_per_topic < 1:
+            raise ValueError("max_senders_per_topic must be >= 1")
+        self._client = client
+        self._max_senders = max_senders_per_topic
+        self._idle_timeout = idle_timeout
+        self._slots: dict[str, _TopicSlot] = {}
+        self._closed = False
+        self._sweeper: Optional[asyncio.Task] = None
+
+        self._links_opened = 0
+        self._links_closed = 0
+        self._links_evicted = 0
+        self._link_errors = 0
+        self._sends = 0
+        self._send_errors = 0
+        self._latencies_ms: deque[float] = deque(maxlen=self.LATENCY_WINDOW)
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def _get_slot(self, topic_name: str) -> _TopicSlot:
+        slot = self._slots.get(topic_name)
+        if slot is None:
+            slot = self._slots[topic_name] = _TopicSlot(self._max_senders)
+        return slot
+
+    async def _close_sender(self, pooled: _PooledSender) -> None:
+        self._links_closed += 1
+        try:
+            await pooled.sender.close()
+        except Exception:
+            logging.warning("Failed to close pooled sender", exc_info=True)
+
+    async def _evict_idle(self) -> None:
+        """`idle_timeout`을 넘긴 유휴 Sender를 모든 토픽에서 정리한다."""
+        deadline = monotonic() - self._idle_timeout
+        # 정리 도중 획득으로 새 토픽 슬롯이 추가될 수 있으므로 슬롯 목록을 복사해 순회한다.
+        for slot in list(self._slots.values()):
+            while slot.idle and slot.idle[0].last_used < deadline:
+                self._links_evicted += 1
+                await self._close_sender(slot.idle.popleft())
+
+    async def _sweep(self) -> None:
+        while not self._closed:
+            await asyncio.sleep(max(self.MIN_SWEEP_INTERVAL, self._idle_timeout / 2))
+            await self._evict_idle()
+
+    @asynccontextmanager
+    async def acquire(self, topic_name: str, *, fresh: bool = False) -> AsyncIterator["ServiceBusSender"]:
+        """토픽 Sender를 빌려온다. 블록을 벗어나면 풀에 반환된다.
+
+        블록 내부에서 `LINK_ERRORS`가 발생하면 해당 Sender는 반환되지 않고 닫힌다.
+        `fresh`가 True면 토픽의 유휴 Sender를 모두 닫고 새 Sender를 연다. (링크 오류 후 재시도용)
+        """
+        if self._closed:
+            raise RuntimeError("Sender pool is closed")
+        if self._sweeper is None:
+            self._sweeper = asyncio.create_task(self._sweep())
+        slot = self._get_slot(topic_name)
+        async with slot.limit:
+            if fresh:
+                # 같은 연결을 쓰던 유휴 링크도 끊어졌을 수 있으므로 재사용하지 않는다.
+                while slot.idle:
+                    await self._close_sender(slot.idle.popleft())
+            if slot.idle:
+                # 가장 최근에 사용된 링크를 우선 재사용한다. (LIFO)
+                pooled = slot.idle.pop()
+            else:
+                pooled = _PooledSender(self._client.get_topic_sender(topic_name=topic_name))
+                self._links_opened += 1
+                logging.debug(f"Opened sender link. Topic: {topic_name}")
+            try:
+                yield pooled.sender
+            except LINK_ERRORS:
+                pooled.healthy = False
+                self._link_errors += 1
+                raise
+            finally:
+                if pooled.healthy and not self._closed:
+                    pooled.last_used = monotonic()
+                    slot.idle.append(pooled)
+                else:
+                    await self._close_sender(pooled)
+
+    async def run(
+            self,
+            topic_name: str,
+            operation: Callable[["ServiceBusSender"], Awaitable[T]],
+    ) -> T:
+        """풀의 Sender로 `operation`을 수행하고 소요 시간을 기록한다.
+
+        링크 오류가 발생하면 토픽의 유휴 Sender를 버리고 새로 연 Sender로 한 번 더 시도한다. 타임아웃은 첫 전송이 브로커에 반영된 뒤에도
+        발생할 수 있으므로, `operation`이 보내는 메세지는 `message_id`가 고정되어 있어야 한다.
+        """
+        started = perf_counter()
+        try:
+            try:
+                async with self.acquire(topic_name) as sender:
+                    return await operation(sender)
+            except LINK_ERRORS:
+                logging.warning(f"Sender link error, retrying with a new link. Topic: {topic_name}")
+                async with self.acquire(topic_name, fresh=True) as sender:
+                    return await operation(sender)
+        except Exception:
+            self._send_errors += 1
+            raise
+        finally:
+            self._sends += 1
+            self._latencies_ms.append((perf_counter() - started) * 1000)
+
+    def get_stats(self) -> dict:
+        """풀 상태와 전송 지연시간 통계를 반환한다."""
+        return {
+            "links_opened": self._links_opened,
+            "links_closed": self._links_closed,
+            "links_evicted": self._links_evicted,
+            "link_errors": self._link_errors,
+            "idle_links": {topic: len(slot.idle) for topic, slot in self._slots.items()},
+            "sends": self._sends,
+            "send_errors": self._send_errors,
+            "send_latency_ms": summarize_latencies(self._latencies_ms),
+        }
+
+    async def aclose(self) -> None:
+        """풀에 남아있는 모든 Sender를 닫는다. 사용 중인 Sender는 반환 시점에 닫힌다."""
+        self._closed = True
+        if self._sweeper is not None:
+            self._sweeper.cancel()
+            await asyncio.gather(self._sweeper, return_exceptions=True)
+        for slot in self._slots.values():
+            while slot.idle:
+                await self._close_sender(slot.idle.popleft())
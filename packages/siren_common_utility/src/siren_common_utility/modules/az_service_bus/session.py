@@ -0,0 +1,225 @@
+from azure.servicebus.exceptions import OperationTimeoutError, SessionCannotBeLockedError
+from datetime import datetime, timezone
+from time import monotonic
+import asyncio
+import logging
+
+from .receiver import AzureServiceBusConsumerController, DeadLetterMessage, MessageHandler
+
+from typing import TYPE_CHECKING, Callable, Optional
+if TYPE_CHECKING:
+    from azure.servicebus.aio import ServiceBusReceiver
+    from ..dedup import DedupStore
+
+__all__ = (
+    'AzureServiceBusSessionMultiplexer',
+    'SessionWorkerState',
+)
+
+
+class SessionWorkerState:
+    """현재 처리 중인 세션 하나의 상태."""
+    __slots__ = ('session_id', 'accepted_at', 'lock_renewals', 'lock_lost', '_receiver', '_consumer')
+
+    def __init__(self, session_id: str, receiver: "ServiceBusReceiver", consumer: AzureServiceBusConsumerController) -> None:
+        self.session_id = session_id
+        self.accepted_at = monotonic()
+        self.lock_renewals = 0
+        self.lock_lost = False
+        self._receiver = receiver
+        self._consumer = consumer
+
+    def to_dict(self) -> dict:
+        stats = self._consumer.get_stats()
+        return {
+            "session_id": self.session_id,
+            "active_for_sec": monotonic() - self.accepted_at,
+            "received": stats["received"],
+            "completed": stats["completed"],
+            "abandoned": stats["abandoned"],
+            "dead_lettered": stats["dead_lettered"],
+            "in_flight": stats["in_flight"],
+            "lock_renewals": self.lock_renewals,
+            "lock_lost": self.lock_lost,
+        }
+
+
+class AzureServiceBusSessionMultiplexer:
+
+    LOCK_RENEW_MARGIN = 10          # 세션 잠금 만료 몇 초 전에 갱신할지
+    ERROR_BACKOFF = 1               # 세션 수신 오류 후 재시도 대기(초)
+
+    def __init__(
+            self,
+            open_session: Callable[[], "ServiceBusReceiver"],
+            handler: MessageHandler,
+            *,
+            max_sessions: int = 8,
+            session_idle_timeout: float = 10,
+            dedup: Optional["DedupStore"] = None,
+    ) -> None:
+        """여러 세션을 동시에 수락하여 처리하는 세션 소비자이다.
+
+        최대 `max_sessions`개의 워커가 각각 사용 가능한 세션 하나를 수락(Lock)하고,
+        해당 세션의 메세지를 **순서대로 하나씩** 처리한다. 세션 간에는 병렬로 처리되므로
+        처리량은 활성 세션(환자) 수에 비례하고, 세션 내 순서(correlation_id 흐름)는 유지된다.
+
+        세션에 `session_idle_timeout`초 동안 메세지가 없으면 세션을 반납하고 다음 세션을 수락한다.
+        세션 잠금은 만료 `LOCK_RENEW_MARGIN`초 전에 자동으로 갱신된다.
+
+        핸들러가 실패하면(`DeadLetterMessage` 제외) 메세지를 abandon 한 뒤 세션을 바로 반납한다.
+        이미 prefetch 된 다음 메세지가 실패한 메세지보다 먼저 처리되지 않도록, 세션 잠금을 풀어
+        실패한 메세지부터 다시 수락하게 한다.
+
+        Args:
+            open_session: 다음 사용 가능한 세션에 대한 Receiver를 생성하는 함수.
+                (`session_id=NEXT_AVAILABLE_SESSION`, 아직 열지 않은 상태)
+            handler: 메세지를 처리할 코루틴 함수.
+            max_sessions (int): 동시에 처리할 최대 세션 수.
+            session_idle_timeout (float): 유휴 세션을 반납하기까지의 시간(초).
+                세션 잠금 시간(Lock duration)보다 짧게 설정한다.
+            dedup (Optional[DedupStore]): 중복 처리 방지 저장소. (`message_id` 기준)
+        """
+        if max_sessions < 1:
+            raise ValueError("max_sessions must be >= 1")
+        self._open_session = open_session
+        self._handler = handler
+        self._max_sessions = max_sessions
+        self._session_idle_timeout = session_idle_timeout
+        self._dedup = dedup
+        self._sessions: dict[str, SessionWorkerState] = {}
+
+        self._sessions_accepted = 0
+        self._sessions_released = 0
+        self._session_errors = 0
+        self._failure_releases = 0
+        self._completed = 0
+
+    @property
+    def active_sessions(self) -> list[str]:
+        return list(self._sessions)
+
+    async def run(
+            self,
+            stop: Optional[asyncio.Event] = None,
+            *,
+            idle_timeout: Optional[float] = None,
+    ) -> None:
+        """세션 워커를 실행한다.
+
+        `stop`이 set되면 각 워커는 처리 중인 메세지를 정산한 뒤 세션을 반납하고 종료한다.
+        `idle_timeout`초 동안 수락할 세션이 없으면 해당 워커가 종료된다.
+        """
+        await asyncio.gather(*(
+            self._worker(stop, idle_timeout) for _ in range(self._max_sessions)
+        ))
+
+    async def _worker(self, stop: Optional[asyncio.Event], idle_timeout: Optional[float]) -> None:
+        last_active = monotonic()
+        while stop is None or not stop.is_set():
+            receiver = self._open_session()
+            try:
+                async with receiver:
+                    await self._serve(receiver, stop)
+                last_active = monotonic()
+            except (OperationTimeoutError, SessionCannotBeLockedError):
+                # 수락할 수 있는 세션이 없음
+                if idle_timeout is not None and monotonic() - last_active >= idle_timeout:
+                    return
+            except Exception:
+                self._session_errors += 1
+                logging.exception("Session worker failed, accepting next session")
+                await asyncio.sleep(self.ERROR_BACKOFF)
+
+    async def _serve(self, receiver: "ServiceBusReceiver", stop: Optional[asyncio.Event]) -> None:
+        session_id = receiver.session.session_id
+        session_stop = asyncio.Event()
+
+        async def handler(msg):
+            try:
+                await self._handler(msg)
+            except DeadLetterMessage:
+                raise
+            except Exception:
+                # abandon 후 수신을 멈추고 세션을 반납한다. (prefetch 된 다음 메세지가 앞지르지 않도록)
+                self._failure_releases += 1
+                session_stop.set()
+                raise
+
+        consumer = AzureServiceBusConsumerController(
+            receiver,
+            handler,
+            max_concurrency=1,                  # 세션 내 순서 보장
+            max_lock_renewal_duration=None,     # 세션 잠금으로 대신 갱신
+            dedup=self._dedup,
+        )
+        state = SessionWorkerState(session_id, receiver, consumer)
+        self._sessions[session_id] = state
+        self._sessions_accepted += 1
+        logging.debug(f"Session accepted: {session_id}")
+
+        keeper = asyncio.create_task(self._keep_session(receiver, state, session_stop, stop))
+        try:
+            await consumer.run(session_stop, idle_timeout=self._session_idle_timeout)
+        finally:
+            keeper.cancel()
+            self._completed += consumer.get_stats()["completed"]
+            del self._sessions[session_id]
+            self._sessions_released += 1
+            logging.debug(f"Session released: {session_id}")
+
+    async def _keep_session(
+            self,
+            receiver: "ServiceBusReceiver",
+            state: SessionWorkerState,
+            session_stop: asyncio.Event,
+            stop: Optional[asyncio.Event],
+    ) -> None:
+        """세션 잠금을 갱신하고, 전체 종료 신호를 세션 종료 신호로 전달한다."""
+        session = receiver.session
+        stop_wait = asyncio.ensure_future(stop.wait()) if stop is not None else None
+        try:
+            while True:
+                until_renew = (
+                    session.locked_until_utc - datetime.now(timezone.utc)
+                ).total_seconds() - self.LOCK_RENEW_MARGIN
+                if stop_wait is not None:
+                    done, _ = await asyncio.wait({stop_wait}, timeout=max(0.0, until_renew))
+                    if done:
+                        session_stop.set()
+                        return
+                else:
+                    await asyncio.sleep(max(0.0, until_renew))
+                try:
+                    await session.renew_lock()
+                    state.lock_renewals += 1
+                except Exception:
+                    state.lock_lost = True
+                    logging.warning(f"Failed to renew session lock. session_id={state.session_id}", exc_info=True)
+                    session_stop.set()
+                    return
+        finally:
+            if stop_wait is not None:
+                stop_wait.cancel()
+
+    async def get_session_state(self, session_id: str) -> bytes:
+        """처리 중인 세션의 Service Bus 세션 상태(Session state)를 조회한다."""
+        return await self._sessions[session_id]._receiver.session.get_state()
+
+    async def set_session_state(self, session_id: str, state: bytes | str) -> None:
+        """처리 중인 세션의 Service Bus 세션 상태(Session state)를 저장한다."""
+        await self._sessions[session_id]._receiver.session.set_state(state)
+
+    def get_stats(self) -> dict:
+        """활성 세션별 상태와 세션 수락/반납 카운터를 반환한다."""
+        sessions = {session_id: state.to_dict() for session_id, state in self._sessions.items()}
+        return {
+            "max_sessions": self._max_sessions,
+            "active_sessions": len(sessions),
+            "sessions_accepted": self._sessions_accepted,
+            "sessions_released": self._sessions_released,
+            "session_errors": self._session_errors,
+            "failure_releases": self._failure_releases,
+            "completed": self._completed + sum(s["completed"] for s in sessions.values()),
+            "sessions": sessions,
+        }
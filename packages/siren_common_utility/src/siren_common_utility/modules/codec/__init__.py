@@ -0,0 +1,3 @@
+from .encodings import *
+from .schema import *
+from .codec import *
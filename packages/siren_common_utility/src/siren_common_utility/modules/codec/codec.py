@@ -0,0 +1,139 @@
+import json
+
+from .encodings import CONTENT_TYPE_JSON, get_encoding
+from .schema import PatientAlert
+
+from typing import TYPE_CHECKING, Any, Iterable, Mapping, Optional, Union
+if TYPE_CHECKING:
+    from azure.servicebus import ServiceBusMessage
+
+__all__ = (
+    'PatientAlertCodec',
+    'RELAY_BODY_MODE_HEADER',
+    'RELAY_PROPERTIES_HEADER',
+    'decode_relay_request',
+    'message_body_bytes',
+)
+
+# Relay Function이 pass-through 모드로 본문을 그대로 전달할 때 붙이는 헤더
+RELAY_BODY_MODE_HEADER = "x-relay-body-mode"
+RELAY_PROPERTIES_HEADER = "x-topic-properties"
+
+Body = Union[bytes, bytearray, memoryview, str, Iterable[bytes]]
+
+
+def message_body_bytes(body: Body) -> Union[bytes, bytearray, memoryview]:
+    """메세지 본문을 bytes로 반환한다. (`ServiceBusMessage.body`의 generator는 이어붙인다)"""
+    if isinstance(body, (bytes, bytearray, memoryview)):
+        return body
+    if isinstance(body, str):
+        return body.encode('utf-8')
+    return b"".join(body)
+
+
+class PatientAlertCodec:
+
+    def __init__(self, encoding: str = "json") -> None:
+        """`PatientAlert`를 Service Bus 메세지 본문으로 인코딩/디코딩한다.
+
+        메세지에는 인코딩의 `content_type`을 설정하고, 디코딩할 때는 메세지의 `content_type`을 우선한다.
+        (Content-Type이 없는 기존 메세지는 JSON으로 본다)
+
+        Args:
+            encoding (str): 인코딩 이름(`json`, `msgpack`) 또는 Content-Type.
+
+        Examples:
+
+            ```python
+            codec = PatientAlertCodec("msgpack")
+            message = codec.to_message(alert, application_properties={"Region": "|Seoul|"})
+            await connector.send_to_topic("emc-patient-alert", [message])
+
+            alert = codec.from_message(received)
+            ```
+        """
+        self.encoding = get_encoding(encoding)
+
+    @property
+    def content_type(self) -> str:
+        return self.encoding.content_type
+
+    def encode(self, alert: Union[PatientAlert, Mapping[str, Any]]) -> bytes:
+        if not isinstance(alert, PatientAlert):
+            alert = PatientAlert.from_dict(alert)
+        return self.encoding.dumps(alert.to_dict())
+
+    def decode(self, body: Body, content_type: Optional[str] = None) -> PatientAlert:
+        """본문을 디코딩한다.
+
+        Raises:
+            ValueError: 본문 또는 필드 형식이 잘못됨.
+        """
+        encoding = get_encoding(content_type) if content_type else self.encoding
+        try:
+            data = encoding.loads(message_body_bytes(body))
+        except ValueError:
+            raise
+        except Exception as e:
+            # msgpack 등은 ValueError가 아닌 예외를 발생시킨다.
+            raise ValueError(f"Invalid {encoding.name} body: {e}") from e
+        return PatientAlert.from_dict(data)
+
+    def to_message(self, alert: Union[PatientAlert, Mapping[str, Any]], **message_kwargs) -> "ServiceBusMessage":
+        """`content_type`이 설정된 `ServiceBusMessage`를 만든다. `tenant_id`는 `TenantId` 속성에도 넣는다."""
+        from azure.servicebus import ServiceBusMessage
+
+        if not isinstance(alert, PatientAlert):
+            alert = PatientAlert.from_dict(alert)
+        properties = dict(message_kwargs.pop('application_properties', None) or {})
+        if alert.tenant_id is not None:
+            properties.setdefault("TenantId", alert.tenant_id)
+        return ServiceBusMessage(
+            self.encoding.dumps(alert.to_dict()),
+            content_type=self.content_type,
+            application_properties=properties or None,
+            **message_kwargs,
+        )
+
+    def from_message(self, message) -> PatientAlert:
+        """`ServiceBusReceivedMessage` 또는 Azure Functions `ServiceBusMessage`를 디코딩한다."""
+        body = message.get_body() if hasattr(message, 'get_body') else message.body
+        return self.decode(body, getattr(message, 'content_type', None) or CONTENT_TYPE_JSON)
+
+
+def decode_relay_request(
+        body: Union[bytes, bytearray, memoryview],
+        headers: Mapping[str, str],
+        codec: Optional[PatientAlertCodec] = None,
+) -> tuple[PatientAlert, dict]:
+    """Relay Function이 백엔드로 보낸 요청을 `(PatientAlert, 메타데이터)`로 디코딩한다.
+
+    - envelope 모드: `{"topic_body": "<JSON 문자열>", "topic_message_id": ..., ...}`
+    - pass-through 모드(`x-relay-body-mode: passthrough`): 본문은 원본 메세지 그대로이고,
+      메타데이터는 `x-message-id`, `x-correlation-id`, `x-session-id`, `x-topic-properties` 헤더에 있다.
+
+    Args:
+        body: HTTP 요청 본문.
+        headers: HTTP 요청 헤더. (대소문자 구분 없는 Mapping 권장)
+        codec (PatientAlertCodec): 디코더. 기본값은 JSON.
+    """
+    codec = codec or PatientAlertCodec()
+    lowered = {k.lower(): v for k, v in headers.items()}
+    if lowered.get(RELAY_BODY_MODE_HEADER) == "passthrough":
+        properties = lowered.get(RELAY_PROPERTIES_HEADER)
+        metadata = {
+            "message_id": lowered.get("x-message-id", ""),
+            "correlation_id": lowered.get("x-correlation-id", ""),
+            "session_id": lowered.get("x-session-id", ""),
+            "properties": json.loads(properties) if properties else {},
+        }
+        return codec.decode(body, lowered.get("content-type")), metadata
+
+    envelope = json.loads(bytes(body) if isinstance(body, memoryview) else body)
+    metadata = {
+        "message_id": envelope.get("topic_message_id", ""),
+        "correlation_id": envelope.get("topic_correlation_id", ""),
+        "session_id": envelope.get("topic_session_id", ""),
+        "properties": envelope.get("topic_properties") or {},
+    }
+    return codec.decode(envelope.get("topic_body", ""), CONTENT_TYPE_JSON), metadata
@@ -0,0 +1,100 @@
+import json
+
+from typing import Any, Union
+
+__all__ = (
+    'CONTENT_TYPE_JSON',
+    'CONTENT_TYPE_MSGPACK',
+    'JsonEncoding',
+    'MsgpackEncoding',
+    'get_encoding',
+    'register_encoding',
+)
+
+CONTENT_TYPE_JSON = "application/json"
+CONTENT_TYPE_MSGPACK = "application/msgpack"
+
+Buffer = Union[bytes, bytearray, memoryview]
+
+
+class JsonEncoding:
+    """UTF-8 JSON. `orjson`이 설치되어 있으면 사용하고, 없으면 표준 `json`을 공백 없이 사용한다.
+
+    한글은 `\\uXXXX`로 이스케이프하지 않으므로 증상 텍스트가 긴 메세지일수록 크기가 작아진다.
+    """
+    name = "json"
+    content_type = CONTENT_TYPE_JSON
+
+    def __init__(self) -> None:
+        try:
+            import orjson
+        except ImportError:
+            orjson = None
+        self.backend = "orjson" if orjson is not None else "json"
+        self._orjson = orjson
+
+    def dumps(self, obj: Any) -> bytes:
+        if self._orjson is not None:
+            return self._orjson.dumps(obj)
+        return json.dumps(obj, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+    def loads(self, data: Buffer) -> Any:
+        if self._orjson is not None:
+            return self._orjson.loads(data)
+        return json.loads(bytes(data) if isinstance(data, memoryview) else data)
+
+
+class MsgpackEncoding:
+    """MessagePack. (`msgpack` 패키지 필요)"""
+    name = "msgpack"
+    content_type = CONTENT_TYPE_MSGPACK
+
+    def __init__(self) -> None:
+        try:
+            import msgpack
+        except ImportError as e:
+            raise ImportError("MsgpackEncoding requires the 'msgpack' package") from e
+        self.backend = "msgpack"
+        self._msgpack = msgpack
+
+    def dumps(self, obj: Any) -> bytes:
+        return self._msgpack.packb(obj, use_bin_type=True)
+
+    def loads(self, data: Buffer) -> Any:
+        return self._msgpack.unpackb(data, raw=False)
+
+
+# 이름 / Content-Type → 인코딩 클래스 (인스턴스는 처음 사용할 때 만든다)
+_ENCODING_TYPES: dict[str, type] = {}
+_ENCODINGS: dict[str, object] = {}
+
+
+def register_encoding(encoding_type: type) -> type:
+    """`name`, `content_type`, `dumps()`, `loads()`를 가진 인코딩 클래스를 등록한다. (데코레이터로도 사용 가능)"""
+    _ENCODING_TYPES[encoding_type.name] = encoding_type
+    _ENCODING_TYPES[encoding_type.content_type] = encoding_type
+    for key in (encoding_type.name, encoding_type.content_type):
+        _ENCODINGS.pop(key, None)
+    return encoding_type
+
+
+def get_encoding(name: str = "json"):
+    """인코딩 이름(`json`, `msgpack`) 또는 Content-Type(`application/json; charset=utf-8`)으로 인코딩을 반환한다.
+
+    Raises:
+        ValueError: 등록되지 않은 인코딩.
+        ImportError: 인코딩에 필요한 패키지가 없음.
+    """
+    key = name.split(';', 1)[0].strip().lower()
+    encoding = _ENCODINGS.get(key)
+    if encoding is None:
+        encoding_type = _ENCODING_TYPES.get(key)
+        if encoding_type is None:
+            raise ValueError(f"Unknown encoding: {name}")
+        encoding = encoding_type()
+        _ENCODINGS[encoding_type.name] = _ENCODINGS[encoding_type.content_type] = encoding
+    return encoding
+
+
+register_encoding(JsonEncoding)
+register_encoding(MsgpackEncoding)
@@ -0,0 +1,96 @@
+from typing import Any, Mapping, Optional
+
+__all__ = (
+    'PATIENT_LOG_COLUMNS',
+    'PatientAlert',
+)
+
+# PATIENT_LOGS 컬럼 → 최대 길이 (VARCHAR2 크기, CLOB/TIMESTAMP는 None)
+PATIENT_LOG_COLUMNS = {
+    'RAW_TEXT': None,
+    'PATIENT_NAME': 50,
+    'AGE': 50,
+    'GENDER': 20,
+    'SYMPTOMS': None,
+    'VITAL_BP': 50,
+    'VITAL_TEMP': 50,
+    'VITAL_SPO2': 50,
+    'CONSCIOUSNESS': 50,
+    'DEPT_CODE': 20,
+    'CREATED_AT': None,
+}
+
+# PATIENT_LOGS에 없는 라우팅 필드
+_ROUTING_FIELDS = ('patient_id', 'tenant_id')
+_FIELDS = _ROUTING_FIELDS + tuple(column.lower() for column in PATIENT_LOG_COLUMNS)
+
+
+class PatientAlert:
+    """환자 이송 알림 메세지 스키마. 필드는 PATIENT_LOGS 컬럼(소문자)과 라우팅 필드(`patient_id`, `tenant_id`)이다.
+
+    모든 값은 문자열 또는 None이며, 숫자로 들어온 나이/활력징후는 문자열로 변환된다.
+    스키마에 없는 키는 `extra`에 보관되어 다시 인코딩할 때 그대로 유지된다.
+
+    Examples:
+
+        ```python
+        alert = PatientAlert(patient_id="p-1", age=67, vital_bp="90/60", consciousness="V", dept_code="D001")
+        alert.to_row()      # {'RAW_TEXT': None, ..., 'AGE': '67', 'DEPT_CODE': 'D001', ...}
+        ```
+    """
+    __slots__ = _FIELDS + ('extra',)
+    FIELDS = _FIELDS
+
+    def __init__(self, *, extra: Optional[dict] = None, **fields: Any) -> None:
+        unknown = set(fields) - set(_FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown PatientAlert fields: {sorted(unknown)}")
+        for name in _FIELDS:
+            setattr(self, name, _validate(name, fields.get(name)))
+        self.extra = dict(extra) if extra else {}
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> "PatientAlert":
+        """디코딩된 딕셔너리에서 생성한다. PATIENT_LOGS 컬럼명(대문자) 키도 허용한다."""
+        if not isinstance(data, Mapping):
+            raise ValueError(f"PatientAlert payload must be an object, got {type(data).__name__}")
+        fields, extra = {}, {}
+        for key, value in data.items():
+            name = key.lower() if isinstance(key, str) else key
+            if name in _FIELDS:
+                fields[name] = value
+            else:
+                extra[key] = value
+        return cls(extra=extra, **fields)
+
+    def to_dict(self) -> dict:
+        """None인 필드는 제외한다. (`extra` 키 포함)"""
+        result = {name: value for name in _FIELDS if (value := getattr(self, name)) is not None}
+        if self.extra:
+            result.update(self.extra)
+        return result
+
+    def to_row(self) -> dict:
+        """PATIENT_LOGS INSERT 바인드 변수. (`LOG_ID` 제외, 값이 없는 컬럼은 None)"""
+        return {column: getattr(self, column.lower()) for column in PATIENT_LOG_COLUMNS}
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, PatientAlert):
+            return NotImplemented
+        return self.to_dict() == other.to_dict()
+
+    def __repr__(self) -> str:
+        return f"PatientAlert(patient_id={self.patient_id}, dept_code={self.dept_code}, tenant_id={self.tenant_id})"
+
+
+def _validate(name: str, value: Any) -> Optional[str]:
+    if value is None:
+        return None
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        value = str(value)
+    elif not isinstance(value, str):
+        raise ValueError(f"PatientAlert.{name} must be a string, got {type(value).__name__}")
+    limit = PATIENT_LOG_COLUMNS.get(name.upper())
+    if limit is not None and len(value.encode('utf-8')) > limit:
+        raise ValueError(f"PatientAlert.{name} exceeds {limit} bytes")
+    return value
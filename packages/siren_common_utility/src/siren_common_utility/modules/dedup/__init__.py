@@ -0,0 +1,2 @@
+from .bloom import *
+from .store import *
@@ -0,0 +1,113 @@
+from hashlib import blake2b
+from math import ceil, exp, log
+from time import monotonic
+
+from typing import Callable
+
+__all__ = (
+    'TimeBucketedBloomFilter',
+)
+
+
+class TimeBucketedBloomFilter:
+
+    def __init__(
+            self,
+            capacity: int,
+            window: float,
+            *,
+            error_rate: float = 1e-6,
+            buckets: int = 6,
+            clock: Callable[[], float] = monotonic,
+    ) -> None:
+        """시간 구간별 Bloom 필터 링. 메모리 사용량은 생성 시 고정된다.
+
+        `window / buckets`초마다 새 구간에 키를 기록하고, 가장 오래된 구간은 비운다.
+        키는 최소 `window`초, 최대 `window * (1 + 1/buckets)`초 동안 조회된다.
+        키가 한 구간에 몰려도 목표 오탐률을 지키도록 각 구간을 `capacity` 크기로 만들고,
+        조회는 모든 구간을 검사하므로 구간별 오탐률은 `error_rate / (buckets + 1)`로 잡는다.
+
+        Args:
+            capacity (int): `window` 동안 기록할 것으로 예상되는 키 수.
+            window (float): 키 보존 시간(초).
+            error_rate (float): `capacity`만큼 기록했을 때의 목표 오탐률.
+            buckets (int): 구간 수. (많을수록 만료가 정확하고 메모리가 늘어난다)
+            clock: 현재 시각(초)을 반환하는 함수. (테스트용)
+        """
+        if capacity < 1 or window <= 0 or buckets < 1 or not 0 < error_rate < 1:
+            raise ValueError("capacity, window, buckets and error_rate must be positive (error_rate < 1)")
+        slots = buckets + 1
+        bucket_error = error_rate / slots
+        self._bits = max(64, ceil(-capacity * log(bucket_error) / (log(2) ** 2)))
+        self._hashes = max(1, round(self._bits / capacity * log(2)))
+        self._span = window / buckets
+        self._clock = clock
+        self._filters = [bytearray((self._bits + 7) // 8) for _ in range(slots)]
+        self._epochs = [-slots] * slots
+        self._counts = [0] * slots
+        self.capacity = capacity
+        self.window = window
+        self.error_rate = error_rate
+
+    @property
+    def memory_bytes(self) -> int:
+        return sum(len(f) for f in self._filters)
+
+    def _positions(self, key: str) -> list[int]:
+        digest = blake2b(key.encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        bits = self._bits
+        return [(h1 + i * h2) % bits for i in range(self._hashes)]
+
+    def _rotate(self) -> int:
+        """현재 구간 번호를 반환하고, 만료된 구간을 비운다."""
+        epoch = int(self._clock() // self._span)
+        slots = len(self._filters)
+        slot = epoch % slots
+        if self._epochs[slot] != epoch:
+            self._filters[slot] = bytearray(len(self._filters[slot]))
+            self._epochs[slot] = epoch
+            self._counts[slot] = 0
+        return epoch
+
+    def add(self, key: str) -> None:
+        epoch = self._rotate()
+        slot = epoch % len(self._filters)
+        bits = self._filters[slot]
+        for position in self._positions(key):
+            bits[position >> 3] |= 1 << (position & 7)
+        self._counts[slot] += 1
+
+    def __contains__(self, key: str) -> bool:
+        epoch = self._rotate()
+        positions = self._positions(key)
+        oldest = epoch - len(self._filters) + 1
+        for bits, bucket_epoch in zip(self._filters, self._epochs):
+            if bucket_epoch < oldest:
+                continue
+            if all(bits[p >> 3] & (1 << (p & 7)) for p in positions):
+                return True
+        return False
+
+    def estimated_false_positive_rate(self) -> float:
+        """현재 기록된 키 수 기준의 조회 오탐률 추정치."""
+        epoch = self._rotate()
+        oldest = epoch - len(self._filters) + 1
+        miss = 1.0
+        for count, bucket_epoch in zip(self._counts, self._epochs):
+            if bucket_epoch >= oldest and count:
+                miss *= 1 - (1 - exp(-self._hashes * count / self._bits)) ** self._hashes
+        return 1 - miss
+
+    def get_stats(self) -> dict:
+        epoch = self._rotate()
+        oldest = epoch - len(self._filters) + 1
+        return {
+            "keys": sum(c for c, e in zip(self._counts, self._epochs) if e >= oldest),
+            "buckets": len(self._filters),
+            "bits_per_bucket": self._bits,
+            "hashes": self._hashes,
+            "memory_bytes": self.memory_bytes,
+            "estimated_false_positive_rate": self.estimated_false_positive_rate(),
+        }
@@ -0,0 +1,325 @@
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from time import monotonic
+import logging
+
+from .bloom import TimeBucketedBloomFilter
+
+from typing import Callable, Optional
+
+__all__ = (
+    'DedupStore',
+    'InMemorySharedBackend',
+    'LocalDedupStore',
+    'SharedDedupStore',
+)
+
+_IN_FLIGHT = 0
+_DONE = 1
+
+
+class DedupStore(ABC):
+    """중복 처리 방지 저장소의 인터페이스.
+
+    처리 전에 `claim(key)`으로 키를 선점하고, 성공하면 `complete(key)`, 실패하면 `release(key)`를 호출한다.
+    실패한 메세지는 키가 풀리므로 재전달되면 다시 처리된다.
+
+    선점에 실패한 이유가 필요하면 `try_claim(key)`을 사용한다. 처리 완료된 키(`DUPLICATE`)는 버려도 되지만,
+    다른 곳에서 처리 중인 키(`IN_FLIGHT`)는 그 처리가 실패할 수 있으므로 버리지 않고 나중에 다시 시도해야 한다.
+    """
+    CLAIMED = "claimed"
+    DUPLICATE = "duplicate"
+    IN_FLIGHT = "in_flight"
+
+    @abstractmethod
+    async def try_claim(self, key: str) -> str:
+        """처음 보는 키면 선점하고 `CLAIMED`, 처리 완료된 키면 `DUPLICATE`, 처리 중인 키면 `IN_FLIGHT`."""
+
+    async def claim(self, key: str) -> bool:
+        """처음 보는 키면 선점하고 True, 이미 처리했거나 처리 중이면 False."""
+        return await self.try_claim(key) == self.CLAIMED
+
+    @abstractmethod
+    async def complete(self, key: str) -> None:
+        """처리가 끝난 키로 기록한다. (TTL 동안 중복으로 판단)"""
+
+    @abstractmethod
+    async def release(self, key: str) -> None:
+        """선점을 해제한다. (다음 전달 때 다시 처리)"""
+
+    @abstractmethod
+    def get_stats(self) -> dict:
+        """선점/중복 카운터를 반환한다."""
+
+
+class LocalDedupStore(DedupStore):
+
+    # 정확 구간 항목 하나의 대략적인 메모리(키 문자열, 튜플, OrderedDict 노드)
+    EXACT_ENTRY_BYTES = 200
+
+    def __init__(
+            self,
+            capacity: int = 100_000,
+            ttl: float = 600,
+            *,
+            exact_capacity: int = 10_000,
+            error_rate: float = 1e-6,
+            buckets: int = 6,
+            lease: float = 60,
+            clock: Callable[[], float] = monotonic,
+    ) -> None:
+        """프로세스 내 중복 처리 방지 저장소. (LRU + TTL, 고정 메모리)
+
+        최근 `exact_capacity`개의 키는 정확한 맵(LRU + TTL)에 보관하고, 처리 완료된 키는
+        시간 구간별 Bloom 필터(`TimeBucketedBloomFilter`)에도 기록한다. 맵에서 밀려난 키는
+        `ttl` 동안 필터로 판단하므로, 맵 크기와 관계없이 메모리 사용량이 고정된다.
+
+        필터는 오탐(처음 보는 키를 중복으로 판단)이 있을 수 있으므로 `error_rate`를 충분히 낮게 잡는다.
+        현재 오탐률 추정치는 `get_stats()["filter"]`에서 확인한다.
+
+        Args:
+            capacity (int): `ttl` 동안 처리할 것으로 예상되는 키 수. (필터 크기)
+            ttl (float): 처리 완료된 키를 중복으로 판단하는 시간(초).
+            exact_capacity (int): 정확한 맵의 최대 항목 수.
+            error_rate (float): `capacity`만큼 기록했을 때의 목표 오탐률.
+            buckets (int): 필터 구간 수.
+            lease (float): 선점(claim) 후 완료/해제 없이 유지되는 최대 시간(초). 지나면 다시 처리할 수 있다.
+            clock: 현재 시각(초)을 반환하는 함수. (테스트용)
+
+        Examples:
+
+            ```python
+            dedup = LocalDedupStore(ttl=600)
+            await az_service_bus_instance.consume('emc-patient-alert', 'gangwon', handler, dedup=dedup)
+            print(dedup.get_stats())
+            ```
+        """
+        if exact_capacity < 1:
+            raise ValueError("exact_capacity must be >= 1")
+        self._ttl = ttl
+        self._lease = lease
+        self._exact_capacity = exact_capacity
+        self._clock = clock
+        self._exact: OrderedDict[str, tuple[float, int]] = OrderedDict()
+        self._filter = TimeBucketedBloomFilter(
+            capacity, ttl, error_rate=error_rate, buckets=buckets, clock=clock,
+        )
+
+        self._claimed = 0
+        self._duplicates_exact = 0
+        self._duplicates_filter = 0
+        self._in_flight_rejections = 0
+        self._evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._exact)
+
+    def _lookup(self, key: str) -> Optional[int]:
+        item = self._exact.get(key)
+        if item is None:
+            return None
+        expires_at, state = item
+        if expires_at <= self._clock():
+            del self._exact[key]
+            return None
+        return state
+
+    def _put(self, key: str, state: int, ttl: float) -> None:
+        self._exact[key] = (self._clock() + ttl, state)
+        self._exact.move_to_end(key)
+        while len(self._exact) > self._exact_capacity:
+            self._exact.popitem(last=False)
+            self._evictions += 1
+
+    def try_claim_nowait(self, key: str) -> str:
+        state = self._lookup(key)
+        if state == _DONE:
+            self._duplicates_exact += 1
+            return self.DUPLICATE
+        if state == _IN_FLIGHT:
+            self._in_flight_rejections += 1
+            return self.IN_FLIGHT
+        if key in self._filter:
+            self._duplicates_filter += 1
+            return self.DUPLICATE
+        self._put(key, _IN_FLIGHT, self._lease)
+        self._claimed += 1
+        return self.CLAIMED
+
+    def claim_nowait(self, key: str) -> bool:
+        return self.try_claim_nowait(key) == self.CLAIMED
+
+    def complete_nowait(self, key: str) -> None:
+        self._put(key, _DONE, self._ttl)
+        self._filter.add(key)
+
+    def release_nowait(self, key: str) -> None:
+        if self._lookup(key) == _IN_FLIGHT:
+            del self._exact[key]
+
+    async def try_claim(self, key: str) -> str:
+        return self.try_claim_nowait(key)
+
+    async def complete(self, key: str) -> None:
+        self.complete_nowait(key)
+
+    async def release(self, key: str) -> None:
+        self.release_nowait(key)
+
+    def get_stats(self) -> dict:
+        """선점/중복 카운터, 메모리 사용량(추정), 필터 오탐률 추정치를 반환한다."""
+        filter_stats = self._filter.get_stats()
+        return {
+            "claimed": self._claimed,
+            "duplicates": self._duplicates_exact + self._duplicates_filter,
+            "duplicates_exact": self._duplicates_exact,
+            "duplicates_filter": self._duplicates_filter,
+            "in_flight_rejections": self._in_flight_rejections,
+            "exact_entries": len(self._exact),
+            "exact_evictions": self._evictions,
+            "memory_bytes": filter_stats["memory_bytes"] + len(self._exact) * self.EXACT_ENTRY_BYTES,
+            "filter": filter_stats,
+        }
+
+
+class InMemorySharedBackend:
+
+    def __init__(self, *, clock: Callable[[], float] = monotonic) -> None:
+        """`SharedDedupStore`용 공유 백엔드의 프로세스 내 대체 구현이다. (Redis `SET NX PX`, `DEL` 호환)
+
+        여러 커넥터/Function 인스턴스가 같은 객체를 공유하면 로컬에서 분산 환경의 중복 제거를 재현할 수 있다.
+        """
+        self._clock = clock
+        self._items: dict[str, tuple[Optional[float], bytes]] = {}
+
+    def _alive(self, name: str) -> bool:
+        item = self._items.get(name)
+        if item is None:
+            return False
+        if item[0] is not None and item[0] <= self._clock():
+            del self._items[name]
+            return False
+        return True
+
+    async def set(self, name: str, value, *, ex: Optional[float] = None, px: Optional[int] = None, nx: bool = False):
+        if nx and self._alive(name):
+            return None
+        ttl = px / 1000 if px is not None else ex
+        if isinstance(value, str):
+            value = value.encode('utf-8')
+        self._items[name] = (self._clock() + ttl if ttl is not None else None, value)
+        return True
+
+    async def get(self, name: str) -> Optional[bytes]:
+        return self._items[name][1] if self._alive(name) else None
+
+    async def delete(self, *names: str) -> int:
+        return sum(self._items.pop(name, None) is not None for name in names)
+
+    def __len__(self) -> int:
+        return sum(self._alive(name) for name in list(self._items))
+
+
+class SharedDedupStore(DedupStore):
+
+    def __init__(
+            self,
+            client,
+            *,
+            prefix: str = "siren:dedup:",
+            ttl: float = 600,
+            lease: float = 60,
+            local: Optional[LocalDedupStore] = None,
+    ) -> None:
+        """여러 인스턴스가 공유하는 중복 처리 방지 저장소. (Redis 호환 클라이언트 어댑터)
+
+        `client`는 `await set(name, value, nx=True, px=ms)`, `await get(name)`, `await delete(name)`를 지원하면 된다.
+        (`redis.asyncio.Redis` 또는 로컬 대체 구현 `InMemorySharedBackend`)
+        `local`을 지정하면 로컬 저장소에서 먼저 걸러 공유 백엔드 왕복을 줄인다.
+
+        공유 백엔드 오류 시에는 처리를 막지 않고(Fail-open) 중복 가능성을 감수한다. (`backend_errors`)
+
+        Args:
+            client: Redis 호환 비동기 클라이언트.
+            prefix (str): 키 접두어.
+            ttl (float): 처리 완료된 키 보존 시간(초).
+            lease (float): 선점 유지 시간(초).
+            local (Optional[LocalDedupStore]): 앞단 로컬 저장소.
+
+        Examples:
+
+            ```python
+            backend = redis.asyncio.Redis.from_url(REDIS_URL)     # 또는 InMemorySharedBackend()
+            dedup = SharedDedupStore(backend, local=LocalDedupStore(ttl=600))
+            ```
+        """
+        self._client = client
+        self._prefix = prefix
+        self._ttl_ms = int(ttl * 1000)
+        self._lease_ms = int(lease * 1000)
+        self._local = local
+
+        self._claimed = 0
+        self._duplicates_local = 0
+        self._duplicates_shared = 0
+        self._in_flight_rejections = 0
+        self._backend_errors = 0
+
+    async def try_claim(self, key: str) -> str:
+        if self._local is not None:
+            state = self._local.try_claim_nowait(key)
+            if state != self.CLAIMED:
+                if state == self.DUPLICATE:
+                    self._duplicates_local += 1
+                else:
+                    self._in_flight_rejections += 1
+                return state
+        try:
+            acquired = await self._client.set(self._prefix + key, b"0", nx=True, px=self._lease_ms)
+            # 선점 중이면 b"0", 처리 완료면 b"1". (그 사이 만료되었으면 처리 중으로 보고 나중에 다시 시도한다)
+            state = self.CLAIMED if acquired else (
+                self.DUPLICATE if await self._client.get(self._prefix + key) == b"1" else self.IN_FLIGHT
+            )
+        except Exception:
+            self._backend_errors += 1
+            logging.warning(f"Dedup backend claim failed, processing anyway. key={key}", exc_info=True)
+            state = self.CLAIMED
+        if state != self.CLAIMED:
+            if state == self.DUPLICATE:
+                self._duplicates_shared += 1
+            else:
+                self._in_flight_rejections += 1
+            if self._local is not None:
+                self._local.release_nowait(key)
+            return state
+        self._claimed += 1
+        return state
+
+    async def complete(self, key: str) -> None:
+        if self._local is not None:
+            self._local.complete_nowait(key)
+        try:
+            await self._client.set(self._prefix + key, b"1", px=self._ttl_ms)
+        except Exception:
+            self._backend_errors += 1
+            logging.warning(f"Dedup backend complete failed. key={key}", exc_info=True)
+
+    async def release(self, key: str) -> None:
+        if self._local is not None:
+            self._local.release_nowait(key)
+        try:
+            await self._client.delete(self._prefix + key)
+        except Exception:
+            self._backend_errors += 1
+            logging.warning(f"Dedup backend release failed. key={key}", exc_info=True)
+
+    def get_stats(self) -> dict:
+        return {
+            "claimed": self._claimed,
+            "duplicates": self._duplicates_local + self._duplicates_shared,
+            "duplicates_local": self._duplicates_local,
+            "duplicates_shared": self._duplicates_shared,
+            "in_flight_rejections": self._in_flight_rejections,
+            "backend_errors": self._backend_errors,
+            "local": self._local.get_stats() if self._local is not None else None,
+        }
@@ -0,0 +1,6 @@
+from .seed import *
+from .columnar import *
+from .index import *
+from .departments import *
+from .spatial import *
+from .delta import *
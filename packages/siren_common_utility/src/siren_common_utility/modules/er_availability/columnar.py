@@ -0,0 +1,241 @@
+from pathlib import Path
+import json
+import logging
+
+import numpy as np
+
+from .seed import SEED_SQL_FILES, iter_insert_rows
+
+from typing import Iterable, Iterator, Mapping, Optional, Union
+
+__all__ = (
+    'ColumnTable',
+    'build_seed_snapshot',
+    'load_snapshot',
+    'read_seed_columns',
+    'write_snapshot',
+)
+
+SNAPSHOT_VERSION = 1
+MANIFEST_NAME = "manifest.json"
+
+
+class _ColumnBuilder:
+    """값을 하나씩 받아 타입(int/float/str)을 추론하며 쌓는다."""
+    __slots__ = ('values', 'has_str', 'has_float', 'has_null')
+
+    def __init__(self) -> None:
+        self.values: list = []
+        self.has_str = False
+        self.has_float = False
+        self.has_null = False
+
+    def append(self, value) -> None:
+        if value is None:
+            self.has_null = True
+        elif isinstance(value, str):
+            self.has_str = True
+        elif isinstance(value, float):
+            self.has_float = True
+        self.values.append(value)
+
+    def build(self) -> np.ndarray:
+        values = self.values
+        if self.has_str or not values or all(v is None for v in values):
+            return np.array([v if v is None or isinstance(v, str) else str(v) for v in values], dtype=object)
+        if self.has_float or self.has_null:
+            return np.array([np.nan if v is None else v for v in values], dtype=np.float64)
+        return np.array(values, dtype=np.int64)
+
+
+class ColumnTable:
+
+    def __init__(self, name: str, columns: Mapping[str, np.ndarray], *, encoded: Optional[Mapping] = None) -> None:
+        """테이블 하나를 컬럼별 NumPy 배열로 보관한다.
+
+        - 정수 컬럼: int64
+        - 실수 또는 NULL이 있는 숫자 컬럼: float64 (NULL은 NaN)
+        - 문자열 컬럼: object 배열 (NULL은 None)
+
+        스냅샷에서 읽은 문자열 컬럼은 사전 인코딩(codes + values) 상태로 두었다가,
+        `column()`으로 처음 접근할 때 디코딩한다. `encoded()`는 디코딩 없이 바로 사용할 수 있다.
+        """
+        self.name = name
+        self._columns: dict[str, np.ndarray] = dict(columns)
+        self._encoded: dict[str, tuple[np.ndarray, np.ndarray]] = dict(encoded or {})
+        names = list(self._columns) + [c for c in self._encoded if c not in self._columns]
+        self._names = tuple(names)
+        lengths = {len(self._columns[c]) if c in self._columns else len(self._encoded[c][0]) for c in names}
+        if len(lengths) > 1:
+            raise ValueError(f"Columns of {name} have different lengths: {lengths}")
+        self._length = lengths.pop() if lengths else 0
+
+    @property
+    def columns(self) -> tuple[str, ...]:
+        return self._names
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __contains__(self, column: str) -> bool:
+        return column in self._names
+
+    def column(self, name: str) -> np.ndarray:
+        array = self._columns.get(name)
+        if array is None:
+            codes, values = self._encoded[name]
+            # 코드 -1(NULL)은 values 끝에 추가한 None을 가리킨다.
+            lookup = np.append(np.asarray(values, dtype=object), None)
+            array = self._columns[name] = lookup[codes]
+        return array
+
+    def is_string(self, name: str) -> bool:
+        return name in self._encoded or self._columns[name].dtype == object
+
+    def encoded(self, name: str) -> tuple[np.ndarray, np.ndarray]:
+        """문자열 컬럼을 (int32 codes, 고유값 배열)로 반환한다. NULL의 코드는 -1이다."""
+        pair = self._encoded.get(name)
+        if pair is None:
+            array = self._columns[name]
+            if array.dtype != object:
+                raise TypeError(f"{self.name}.{name} is not a string column")
+            is_null = np.fromiter((v is None for v in array), bool, len(array))
+            values, codes = np.unique(array[~is_null].astype(str), return_inverse=True)
+            full = np.full(len(array), -1, np.int32)
+            full[~is_null] = codes
+            pair = self._encoded[name] = (full, values)
+        return pair
+
+    def iter_rows(self) -> Iterator[dict]:
+        """`{컬럼: 값}` 딕셔너리를 하나씩 반환한다. (`read_seed_table()`과 같은 형태)"""
+        lists = []
+        for name in self._names:
+            array = self.column(name)
+            if array.dtype == np.float64:
+                lists.append([None if v != v else v for v in array.tolist()])
+            else:
+                lists.append(array.tolist())
+        for values in zip(*lists):
+            yield dict(zip(self._names, values))
+
+
+def read_seed_columns(*paths: Union[str, Path], tables: Optional[Iterable[str]] = None) -> dict[str, ColumnTable]:
+    """시드 SQL 파일을 스트리밍으로 파싱하여 테이블별 `ColumnTable`을 만든다.
+
+    파일 내용은 문장 단위로만 메모리에 올라가고, 값은 바로 컬럼별 리스트에 쌓인다.
+    같은 테이블이 여러 파일에 있으면(예: 날짜별 STG 덤프) 순서대로 이어붙인다.
+
+    Args:
+        paths: 시드 SQL 파일 경로.
+        tables (Optional[Iterable[str]]): 지정하면 해당 테이블만 읽는다.
+    """
+    wanted = {t.upper() for t in tables} if tables is not None else None
+    builders: dict[str, dict[str, _ColumnBuilder]] = {}
+    for path in paths:
+        for table, columns, row in iter_insert_rows(path):
+            if wanted is not None and table not in wanted:
+                continue
+            table_builders = builders.get(table)
+            if table_builders is None:
+                table_builders = builders[table] = {c: _ColumnBuilder() for c in columns}
+            elif len(columns) != len(table_builders) or any(c not in table_builders for c in columns):
+                raise ValueError(f"INSERT INTO {table} has different columns: {columns} ({path})")
+            for column, value in zip(columns, row):
+                table_builders[column].append(value)
+    return {
+        table: ColumnTable(table, {c: b.build() for c, b in table_builders.items()})
+        for table, table_builders in builders.items()
+    }
+
+
+def write_snapshot(tables: Mapping[str, ColumnTable], path: Union[str, Path]) -> Path:
+    """테이블들을 컬럼별 `.npy` 파일과 `manifest.json`으로 저장한다.
+
+    문자열 컬럼은 고정 길이 유니코드 고유값(`values.npy`)과 int32 코드(`codes.npy`)로 사전 인코딩한다.
+    """
+    path = Path(path)
+    path.mkdir(parents=True, exist_ok=True)
+    manifest = {"version": SNAPSHOT_VERSION, "tables": {}}
+    for table_name, table in tables.items():
+        columns = {}
+        for column in table.columns:
+            prefix = f"{table_name}.{column}"
+            if table.is_string(column):
+                codes, values = table.encoded(column)
+                np.save(path / f"{prefix}.codes.npy", codes.astype(np.int32, copy=False))
+                np.save(path / f"{prefix}.values.npy", np.asarray(values, dtype=str))
+                columns[column] = {"kind": "str"}
+            else:
+                array = table.column(column)
+                np.save(path / f"{prefix}.npy", array)
+                columns[column] = {"kind": "float" if array.dtype == np.float64 else "int"}
+        manifest["tables"][table_name] = {"rows": len(table), "columns": columns}
+    # manifest는 마지막에 써서, 중간에 실패한 스냅샷을 읽지 않도록 한다.
+    tmp = path / (MANIFEST_NAME + ".tmp")
+    tmp.write_text(json.dumps(manifest, ensure_ascii=False, indent=2), encoding='utf-8')
+    tmp.replace(path / MANIFEST_NAME)
+    return path
+
+
+def load_snapshot(
+        path: Union[str, Path],
+        *,
+        tables: Optional[Iterable[str]] = None,
+        mmap: bool = True,
+) -> dict[str, ColumnTable]:
+    """`write_snapshot()`으로 저장한 스냅샷을 읽는다.
+
+    `mmap=True`이면 배열을 메모리 맵(`mmap_mode='r'`)으로 열기 때문에 실제 데이터는 접근할 때 읽힌다.
+    """
+    path = Path(path)
+    manifest = json.loads((path / MANIFEST_NAME).read_text(encoding='utf-8'))
+    if manifest.get("version") != SNAPSHOT_VERSION:
+        raise ValueError(f"Unsupported snapshot version: {manifest.get('version')}")
+    wanted = {t.upper() for t in tables} if tables is not None else None
+    mmap_mode = 'r' if mmap else None
+    result = {}
+    for table_name, meta in manifest["tables"].items():
+        if wanted is not None and table_name not in wanted:
+            continue
+        columns, encoded = {}, {}
+        for column, info in meta["columns"].items():
+            prefix = f"{table_name}.{column}"
+            if info["kind"] == "str":
+                encoded[column] = (
+                    np.load(path / f"{prefix}.codes.npy", mmap_mode=mmap_mode),
+                    np.load(path / f"{prefix}.values.npy", mmap_mode=mmap_mode),
+                )
+            else:
+                columns[column] = np.load(path / f"{prefix}.npy", mmap_mode=mmap_mode)
+        # manifest의 컬럼 순서를 유지한다.
+        ordered = {c: columns[c] for c in meta["columns"] if c in columns}
+        result[table_name] = ColumnTable(table_name, ordered, encoded={c: encoded[c] for c in meta["columns"] if c in encoded})
+    return result
+
+
+def build_seed_snapshot(
+        sql_dir: Union[str, Path],
+        out_dir: Union[str, Path],
+        *,
+        extra_files: Iterable[str] = (),
+) -> Path:
+    """저장소의 시드 SQL(azure/oracle_db/sql)을 파싱하여 스냅샷으로 저장한다.
+
+    Args:
+        sql_dir (str | Path): 시드 SQL 디렉토리.
+        out_dir (str | Path): 스냅샷을 저장할 디렉토리.
+        extra_files (Iterable[str]): 함께 저장할 파일 이름. (예: `2_ER_AVAILABILITY_STG_202512261050.sql`)
+
+    Examples:
+
+        ```python
+        build_seed_snapshot('azure/oracle_db/sql', '.cache/er_snapshot')
+        index = ErAvailabilityIndex.from_snapshot('.cache/er_snapshot')
+        ```
+    """
+    sql_dir = Path(sql_dir)
+    files = [sql_dir / name for name in SEED_SQL_FILES.values()]
+    files += [sql_dir / name for name in extra_files]
+    tables = read_seed_columns(*files)
+    logging.info(f"Writing seed snapshot: {', '.join(f'{t}({len(c)})' for t, c in tables.items())}")
+    return write_snapshot(tables, out_dir)
@@ -0,0 +1,387 @@
+from pathlib import Path
+import asyncio
+import hashlib
+import json
+import logging
+
+import numpy as np
+
+from .columnar import ColumnTable, read_seed_columns
+from .index import ErAvailabilityIndex
+from .seed import SEED_SQL_FILES
+
+from typing import TYPE_CHECKING, Callable, Iterable, Mapping, Optional, Union
+if TYPE_CHECKING:
+    from azure.servicebus import ServiceBusMessage
+
+__all__ = (
+    'AvailabilityDelta',
+    'ER_AVAILABILITY_MERGE_SQL',
+    'ErAvailabilityDeltaFeed',
+    'latest_availability',
+    'oracle_availability_merge',
+)
+
+DELTA_MESSAGE_KIND = "ErAvailabilityDelta"
+
+# 변경된 행만 배열 바인드(executemany)로 한 번에 반영한다. (PK: HPID, HVIDATE)
+ER_AVAILABILITY_MERGE_SQL = (
+    "MERGE INTO {table} T "
+    "USING (SELECT :HPID AS HPID, :HVIDATE AS HVIDATE, :HVEC AS HVEC FROM DUAL) S "
+    "ON (T.HPID = S.HPID AND T.HVIDATE = S.HVIDATE) "
+    "WHEN MATCHED THEN UPDATE SET T.HVEC = S.HVEC "
+    "WHEN NOT MATCHED THEN INSERT (HPID, HVIDATE, HVEC) VALUES (S.HPID, S.HVIDATE, S.HVEC)"
+)
+
+Columns = tuple[np.ndarray, np.ndarray, np.ndarray]
+
+
+def _as_columns(hpid: Iterable, hvidate: Iterable, hvec: Iterable) -> Columns:
+    hpid = np.asarray(hpid if isinstance(hpid, np.ndarray) else list(hpid), dtype=str)
+    hvidate = np.asarray(hvidate if isinstance(hvidate, np.ndarray) else list(hvidate), dtype=str)
+    hvec = np.asarray(hvec if isinstance(hvec, np.ndarray) else list(hvec), dtype=object)
+    # HVEC가 NULL(None 또는 NaN)이면 0으로 본다. (ErAvailabilityIndex.apply와 동일)
+    if hvec.dtype == object:
+        hvec = np.array([0 if v is None or v != v else v for v in hvec.tolist()], dtype=np.float64)
+    hvec = np.nan_to_num(hvec.astype(np.float64, copy=False), nan=0).astype(np.int64)
+    if not (len(hpid) == len(hvidate) == len(hvec)):
+        raise ValueError("HPID, HVIDATE, HVEC must have the same length")
+    return hpid, hvidate, hvec
+
+
+def latest_availability(hpid: Iterable, hvidate: Iterable, hvec: Iterable) -> Columns:
+    """HPID별로 HVIDATE가 가장 최신인 행만 남겨 HPID 순으로 정렬된 컬럼 배열을 반환한다."""
+    hpid, hvidate, hvec = _as_columns(hpid, hvidate, hvec)
+    if not len(hpid):
+        return hpid, hvidate, hvec
+    order = np.lexsort((hvidate, hpid))
+    hpid, hvidate, hvec = hpid[order], hvidate[order], hvec[order]
+    last = np.ones(len(hpid), dtype=bool)
+    last[:-1] = hpid[1:] != hpid[:-1]
+    return hpid[last], hvidate[last], hvec[last]
+
+
+class AvailabilityDelta:
+    """스냅샷 하나와 현재 상태의 차이. 모든 배열은 HPID 순으로 정렬되어 있다.
+
+    - changed / added: (HPID, HVIDATE, HVEC) 배열
+    - removed: HPID 배열 (전체 스냅샷에 없는 병원)
+    - updated: 현재 상태보다 새로운 기존 병원의 행 (changed + HVEC는 같고 HVIDATE만 새로워진 행)
+      HVIDATE만 새로워진 행은 상태에만 반영하고 전송/DB 반영하지 않는다.
+    """
+    __slots__ = ('changed', 'added', 'removed', 'updated', 'staged', 'watermark')
+
+    def __init__(self, changed: Columns, added: Columns, removed: np.ndarray, updated: Columns, *,
+                 staged: int = 0, watermark: Optional[str] = None) -> None:
+        self.changed = changed
+        self.added = added
+        self.removed = removed
+        self.updated = updated
+        self.staged = staged
+        self.watermark = watermark
+
+    def __len__(self) -> int:
+        return len(self.changed[0]) + len(self.added[0]) + len(self.removed)
+
+    def __bool__(self) -> bool:
+        return len(self) > 0
+
+    def merge_rows(self) -> list[dict]:
+        """ER_AVAILABILITY에 반영할 행. (`ER_AVAILABILITY_MERGE_SQL`의 바인드 변수)"""
+        return [
+            {"HPID": hpid, "HVIDATE": hvidate, "HVEC": hvec}
+            for columns in (self.changed, self.added)
+            for hpid, hvidate, hvec in zip(*(c.tolist() for c in columns))
+        ]
+
+    def by_region(self, regions: Mapping[str, Optional[str]]) -> dict[Optional[str], dict]:
+        """REGION별로 `{"changed": [[hpid, hvidate, hvec], ...], "added": [...], "removed": [hpid, ...]}`를 만든다."""
+        grouped: dict[Optional[str], dict] = {}
+
+        def _group(region):
+            group = grouped.get(region)
+            if group is None:
+                group = grouped[region] = {"changed": [], "added": [], "removed": []}
+            return group
+
+        for key in ("changed", "added"):
+            for hpid, hvidate, hvec in zip(*(c.tolist() for c in getattr(self, key))):
+                _group(regions.get(hpid))[key].append([hpid, hvidate, hvec])
+        for hpid in self.removed.tolist():
+            _group(regions.get(hpid))["removed"].append(hpid)
+        return grouped
+
+    def get_stats(self) -> dict:
+        return {
+            "staged": self.staged,
+            "changed": len(self.changed[0]),
+            "added": len(self.added[0]),
+            "removed": len(self.removed),
+            "refreshed": len(self.updated[0]) - len(self.changed[0]),
+            "watermark": self.watermark,
+        }
+
+
+def oracle_availability_merge(pool, *, table: str = "ER_USER.ER_AVAILABILITY") -> Callable[[list[dict]], None]:
+    """python-oracledb 커넥션 풀로 델타 행을 ER_AVAILABILITY에 MERGE 하는 함수를 만든다. (`publish(merge=...)`)"""
+    sql = ER_AVAILABILITY_MERGE_SQL.format(table=table)
+
+    def merge(rows: list[dict]) -> None:
+        with pool.acquire() as connection:
+            with connection.cursor() as cursor:
+                cursor.executemany(sql, rows)
+            connection.commit()
+
+    return merge
+
+
+class ErAvailabilityDeltaFeed:
+
+    MAX_ENTRIES_PER_MESSAGE = 2000     # 메세지 하나에 담는 최대 항목 수 (초과 시 나누어 전송)
+
+    def __init__(
+            self,
+            hospital_regions: Mapping[str, Optional[str]],
+            current: Optional[Columns] = None,
+    ) -> None:
+        """ER_AVAILABILITY_STG 스냅샷과 현재 상태(ER_AVAILABILITY의 HPID별 최신 값)를 비교하여
+        변경/추가/제거된 병원만 REGION별 델타 메세지로 전송하는 Change-data feed이다.
+
+        상태는 HPID 순으로 정렬된 컬럼 배열(HPID, HVIDATE, HVEC)로 보관하고, 스냅샷과의 비교는
+        `np.searchsorted`로 정렬 위치를 맞춘 뒤 배열 단위로 수행한다. 메세지 크기, DB 반영 행 수,
+        소비자 처리량은 병원 수가 아니라 변경 수에 비례한다.
+
+        - changed: 스냅샷의 HVIDATE가 더 새롭고 HVEC가 다름
+        - added: 현재 상태에 없는 병원
+        - removed: 전체 스냅샷(`full_snapshot=True`)에 없는 병원
+        - HVEC는 같고 HVIDATE만 새로워진 병원은 상태만 갱신하고 전송/DB 반영하지 않는다.
+        - 현재 값보다 오래된 스냅샷 행은 무시한다.
+
+        Args:
+            hospital_regions (Mapping[str, str]): HPID → REGION. (HOSPITAL_MASTER)
+            current: 현재 상태 (HPID, HVIDATE, HVEC) 배열. HPID 중복 시 최신 값을 사용한다.
+
+        Examples:
+
+            ```python
+            feed = ErAvailabilityDeltaFeed.from_seed_sql('azure/oracle_db/sql')
+
+            cursor.execute("SELECT HPID, HVIDATE, HVEC FROM ER_USER.ER_AVAILABILITY_STG")
+            hpid, hvidate, hvec = zip(*cursor.fetchall())
+            report = await feed.publish(
+                connector, 'er-availability', hpid, hvidate, hvec,
+                merge=oracle_availability_merge(pool),
+            )
+            ```
+        """
+        self._regions = dict(hospital_regions)
+        self._hpid, self._hvidate, self._hvec = latest_availability(*(current or ((), (), ())))
+        self._sequence = 0
+        self._published_messages = 0
+        self._published_entries = 0
+        self._merged_rows = 0
+        self._snapshots = 0
+
+    @classmethod
+    def from_tables(
+            cls,
+            tables: Mapping[str, ColumnTable],
+            *,
+            availability_table: str = "ER_AVAILABILITY",
+    ) -> "ErAvailabilityDeltaFeed":
+        """`ColumnTable`(HOSPITAL_MASTER, HOSPITAL_ID_MAP, ER_AVAILABILITY)로 만든다."""
+        id_map = tables.get("HOSPITAL_ID_MAP")
+        hospitals = ErAvailabilityIndex.from_rows(
+            tables["HOSPITAL_MASTER"].iter_rows(),
+            id_map.iter_rows() if id_map is not None else (),
+        ).hospitals()
+        current = None
+        table = tables.get(availability_table)
+        if table is not None:
+            current = (table.column("HPID"), table.column("HVIDATE"), table.column("HVEC"))
+        return cls({h.hpid: h.region for h in hospitals}, current)
+
+    @classmethod
+    def from_seed_sql(cls, sql_dir: Union[str, Path]) -> "ErAvailabilityDeltaFeed":
+        """저장소의 시드 SQL(azure/oracle_db/sql)로 만든다. (오프라인 테스트용)"""
+        sql_dir = Path(sql_dir)
+        tables = read_seed_columns(*(
+            sql_dir / SEED_SQL_FILES[name] for name in ("HOSPITAL_MASTER", "HOSPITAL_ID_MAP", "ER_AVAILABILITY")
+        ))
+        return cls.from_tables(tables)
+
+    @property
+    def watermark(self) -> Optional[str]:
+        """현재 상태의 가장 최신 HVIDATE."""
+        return max(self._hvidate.tolist()) if len(self._hvidate) else None
+
+    def __len__(self) -> int:
+        return len(self._hpid)
+
+    def get(self, hpid: str) -> Optional[tuple[str, int]]:
+        """HPID의 현재 (HVIDATE, HVEC)."""
+        pos = int(np.searchsorted(self._hpid, hpid))
+        if pos < len(self._hpid) and self._hpid[pos] == hpid:
+            return str(self._hvidate[pos]), int(self._hvec[pos])
+        return None
+
+    def diff(self, hpid: Iterable, hvidate: Iterable, hvec: Iterable, *, full_snapshot: bool = True) -> AvailabilityDelta:
+        """스냅샷과 현재 상태의 차이를 계산한다. 상태는 변경하지 않는다. (`commit()`으로 반영)
+
+        Args:
+            hpid, hvidate, hvec: 스냅샷 컬럼. (`ColumnTable.column()` 또는 리스트)
+            full_snapshot (bool): 전체 스냅샷이면 True. False(증분)면 removed를 계산하지 않는다.
+        """
+        s_hpid, s_hvidate, s_hvec = latest_availability(hpid, hvidate, hvec)
+        c_hpid, c_hvidate, c_hvec = self._hpid, self._hvidate, self._hvec
+
+        if len(c_hpid):
+            pos = np.minimum(np.searchsorted(c_hpid, s_hpid), len(c_hpid) - 1)
+            found = c_hpid[pos] == s_hpid
+            newer = found & (s_hvidate > c_hvidate[pos])
+            hvec_changed = newer & (s_hvec != c_hvec[pos])
+        else:
+            pos = np.zeros(len(s_hpid), dtype=np.intp)
+            found = newer = hvec_changed = np.zeros(len(s_hpid), dtype=bool)
+        added = ~found
+
+        if full_snapshot:
+            present = np.zeros(len(c_hpid), dtype=bool)
+            present[pos[found]] = True
+            removed = c_hpid[~present]
+        else:
+            removed = c_hpid[:0]
+
+        watermark = max(s_hvidate.tolist()) if len(s_hvidate) else None
+        return AvailabilityDelta(
+            (s_hpid[hvec_changed], s_hvidate[hvec_changed], s_hvec[hvec_changed]),
+            (s_hpid[added], s_hvidate[added], s_hvec[added]),
+            removed,
+            (s_hpid[newer], s_hvidate[newer], s_hvec[newer]),
+            staged=len(s_hpid),
+            watermark=watermark,
+        )
+
+    def commit(self, delta: AvailabilityDelta) -> None:
+        """델타를 현재 상태에 반영한다. (HVIDATE만 새로워진 행 포함)"""
+        n_hpid, n_hvidate, n_hvec = delta.updated
+        hpid, hvidate, hvec = self._hpid, self._hvidate, self._hvec
+        if len(n_hpid):
+            pos = np.searchsorted(hpid, n_hpid)
+            hvidate = hvidate.astype(np.result_type(hvidate, n_hvidate))
+            hvidate[pos] = n_hvidate
+            hvec = hvec.copy()
+            hvec[pos] = n_hvec
+        if len(delta.removed):
+            keep = ~np.isin(hpid, delta.removed)
+            hpid, hvidate, hvec = hpid[keep], hvidate[keep], hvec[keep]
+        a_hpid, a_hvidate, a_hvec = delta.added
+        if len(a_hpid):
+            hpid = np.concatenate((hpid, a_hpid))
+            hvidate = np.concatenate((hvidate, a_hvidate))
+            hvec = np.concatenate((hvec, a_hvec))
+            order = np.argsort(hpid, kind='stable')
+            hpid, hvidate, hvec = hpid[order], hvidate[order], hvec[order]
+        self._hpid, self._hvidate, self._hvec = hpid, hvidate, hvec
+
+    def build_messages(self, delta: AvailabilityDelta) -> list["ServiceBusMessage"]:
+        """REGION별 델타 메세지를 만든다. (`Region` 속성 `|Region|`, REGION이 없는 병원은 `|Unknown|`)
+
+        본문: `{"seq", "watermark", "changed": [[hpid, hvidate, hvec]], "added": [...], "removed": [hpid]}`
+        항목이 `MAX_ENTRIES_PER_MESSAGE`를 넘으면 여러 메세지로 나눈다. (`Part`, `Parts` 속성)
+        `message_id`는 (REGION, 워터마크, 부분, 항목 해시)로 정해지므로 같은 델타를 재전송하면 중복 제거되고,
+        워터마크가 같아도(오래된 행만 바뀐 경우) 내용이 다른 델타는 별개의 메세지가 된다.
+        """
+        from azure.servicebus import ServiceBusMessage
+
+        self._sequence += 1
+        messages = []
+        for region, group in sorted(delta.by_region(self._regions).items(), key=lambda item: item[0] or ""):
+            region = region or "Unknown"
+            entries = [(key, entry) for key in ("changed", "added", "removed") for entry in group[key]]
+            chunks = [
+                entries[i:i + self.MAX_ENTRIES_PER_MESSAGE]
+                for i in range(0, len(entries), self.MAX_ENTRIES_PER_MESSAGE)
+            ]
+            for part, chunk in enumerate(chunks, 1):
+                content = {"changed": [], "added": [], "removed": []}
+                for key, entry in chunk:
+                    content[key].append(entry)
+                # seq는 재전송마다 바뀌므로 항목만으로 식별한다.
+                digest = hashlib.sha256(
+                    json.dumps(content, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+                ).hexdigest()[:16]
+                body = {"seq": self._sequence, "watermark": delta.watermark, **content}
+                messages.append(ServiceBusMessage(
+                    json.dumps(body, ensure_ascii=False, separators=(',', ':')),
+                    content_type="application/json",
+                    message_id=f"er-delta:{region}:{delta.watermark}:{part}:{digest}",
+                    application_properties={
+                        "Region": f"|{region}|",
+                        "Kind": DELTA_MESSAGE_KIND,
+                        "Part": part,
+                        "Parts": len(chunks),
+                    },
+                ))
+        return messages
+
+    async def publish(
+            self,
+            connector,
+            topic_name: str,
+            hpid: Iterable,
+            hvidate: Iterable,
+            hvec: Iterable,
+            *,
+            full_snapshot: bool = True,
+            merge: Optional[Callable[[list[dict]], None]] = None,
+    ) -> dict:
+        """스냅샷의 차이를 계산하여 ER_AVAILABILITY에 반영(`merge`)하고 델타 메세지를 배치 전송한다.
+
+        DB 반영과 전송이 모두 성공한 경우에만 상태를 갱신한다. 실패하면 다음 호출에서 같은 델타가 다시
+        계산되며, MERGE와 `message_id`가 멱등이므로 중복 반영/전송되지 않는다.
+
+        Args:
+            connector (AzureServiceBusConnectorInstance): `send_batch_to_topic()`으로 전송한다.
+            topic_name (str): 전송 토픽.
+            hpid, hvidate, hvec: 스냅샷 컬럼.
+            full_snapshot (bool): 전체 스냅샷 여부. (`diff()` 참고)
+            merge: 델타 행(`AvailabilityDelta.merge_rows()`)을 DB에 반영하는 함수. 별도 스레드에서 실행된다.
+                (`oracle_availability_merge(pool)`)
+
+        Returns:
+            dict: 델타 통계와 `messages`, `merged_rows`.
+
+        Raises:
+            RuntimeError: 일부 메세지 전송 실패.
+        """
+        delta = self.diff(hpid, hvidate, hvec, full_snapshot=full_snapshot)
+        report = delta.get_stats()
+        report.update(messages=0, merged_rows=0)
+        if delta:
+            rows = delta.merge_rows()
+            if merge is not None and rows:
+                await asyncio.to_thread(merge, rows)
+                report["merged_rows"] = len(rows)
+            messages = self.build_messages(delta)
+            result = await connector.send_batch_to_topic(topic_name, messages)
+            if not result.ok:
+                raise RuntimeError(f"Failed to publish {len(result.failed)} of {len(messages)} ER availability delta messages")
+            report["messages"] = len(messages)
+            self._published_messages += len(messages)
+            self._published_entries += len(delta)
+            self._merged_rows += report["merged_rows"]
+        self.commit(delta)
+        self._snapshots += 1
+        logging.info(f"ER availability delta published: {report}")
+        return report
+
+    def get_stats(self) -> dict:
+        return {
+            "hospitals": len(self._hpid),
+            "watermark": self.watermark,
+            "snapshots": self._snapshots,
+            "published_messages": self._published_messages,
+            "published_entries": self._published_entries,
+            "merged_rows": self._merged_rows,
+        }
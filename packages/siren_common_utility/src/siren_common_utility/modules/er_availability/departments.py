@@ -0,0 +1,358 @@
+from pathlib import Path
+import logging
+import threading
+
+import numpy as np
+
+from .columnar import ColumnTable, load_snapshot, read_seed_columns
+from .index import ErHospital
+from .seed import SEED_SQL_FILES
+
+from typing import Iterable, Mapping, Optional, Union
+
+__all__ = (
+    'ErDepartmentIndex',
+)
+
+
+def _as_tuple(value: Union[str, Iterable[str], None]) -> tuple[str, ...]:
+    if value is None:
+        return ()
+    if isinstance(value, str):
+        return (value,)
+    return tuple(value)
+
+
+class _DeptSnapshot:
+    __slots__ = ('hpids', 'rows', 'depts', 'cols', 'counts', 'regions', 'bitmaps', 'region_bitmaps')
+
+    def __init__(
+            self,
+            hpids: tuple[str, ...],
+            depts: tuple[str, ...],
+            counts: np.ndarray,
+            regions: np.ndarray,
+    ) -> None:
+        self.hpids = hpids
+        self.rows = {hpid: i for i, hpid in enumerate(hpids)}
+        self.depts = depts
+        self.cols = {dept: j for j, dept in enumerate(depts)}
+        self.counts = counts
+        self.regions = regions
+        # 진료과목별 "전문의 1명 이상" 병원 비트맵 (D × ceil(H/8) uint8)
+        self.bitmaps = np.packbits(counts.T > 0, axis=1) if counts.size else np.zeros((len(depts), 0), np.uint8)
+        self.region_bitmaps = {
+            region: np.packbits(regions == region)
+            for region in np.unique(regions) if region
+        }
+
+
+class ErDepartmentIndex:
+
+    def __init__(self, hospitals: Iterable[ErHospital] = ()) -> None:
+        """HOSPITAL_DEPT_SPECIALIST를 병원 × 진료과목 전문의 수 배열과 진료과목별 비트맵으로 유지하는 인덱스이다.
+
+        - `counts`: (병원 수 × 진료과목 수) int32 배열
+        - 진료과목별 비트맵: 전문의가 1명 이상인 병원을 1로 표시 (`np.packbits`)
+        - REGION별 비트맵
+
+        "REGION R에서 진료과목 {A, B}의 전문의가 각각 n명 이상인 병원" 조회는
+        조인 없이 비트맵 AND(`n == 1`) 또는 `counts` 비교(`n > 1`)로 벡터 연산된다.
+
+        `apply()`는 변경된 행만 반영한 새 배열을 만든 뒤 참조를 교체하므로 조회는 잠금 없이 수행된다.
+
+        Args:
+            hospitals (Iterable[ErHospital]): YKIHO → HPID 매핑과 REGION에 사용할 병원 목록.
+
+        Examples:
+
+            ```python
+            departments = ErDepartmentIndex.from_seed_sql('azure/oracle_db/sql')
+            # 호남에서 신경외과(06), 마취통증의학과(09) 전문의가 2명 이상인 병원
+            departments.capable(['06', '09'], min_specialists=2, region='Honam')
+            ```
+        """
+        self._hospitals: dict[str, ErHospital] = {}
+        self._hpid_by_ykiho: dict[str, str] = {}
+        self._names: dict[str, str] = {}
+        self._write_lock = threading.Lock()
+        self._snapshot = _DeptSnapshot((), (), np.zeros((0, 0), np.int32), np.array([], dtype=object))
+        self.load_hospitals(hospitals)
+
+    @classmethod
+    def from_seed_sql(cls, sql_dir: Union[str, Path], hospitals: Optional[Iterable[ErHospital]] = None) -> "ErDepartmentIndex":
+        """시드 SQL(HOSPITAL_MASTER, HOSPITAL_ID_MAP, HOSPITAL_DEPT_SPECIALIST)로 인덱스를 만든다."""
+        sql_dir = Path(sql_dir)
+        names = ("HOSPITAL_DEPT_SPECIALIST",) if hospitals is not None else (
+            "HOSPITAL_MASTER", "HOSPITAL_ID_MAP", "HOSPITAL_DEPT_SPECIALIST"
+        )
+        tables = read_seed_columns(*(sql_dir / SEED_SQL_FILES[name] for name in names))
+        return cls.from_tables(tables, hospitals)
+
+    @classmethod
+    def from_tables(
+            cls,
+            tables: Mapping[str, ColumnTable],
+            hospitals: Optional[Iterable[ErHospital]] = None,
+    ) -> "ErDepartmentIndex":
+        """`ColumnTable`(HOSPITAL_DEPT_SPECIALIST, 필요하면 HOSPITAL_MASTER/HOSPITAL_ID_MAP)로 인덱스를 만든다."""
+        if hospitals is None:
+            id_map = tables.get("HOSPITAL_ID_MAP")
+            hpid_by_ykiho = {
+                row["YKIHO"]: row["HPID"] for row in (id_map.iter_rows() if id_map is not None else ())
+            }
+            hospitals = [
+                ErHospital.from_row({**row, "HPID": row.get("HPID") or hpid_by_ykiho.get(row["YKIHO"])})
+                for row in tables["HOSPITAL_MASTER"].iter_rows()
+                if row.get("HPID") or row["YKIHO"] in hpid_by_ykiho
+            ]
+        index = cls(hospitals)
+        index.apply_table(tables["HOSPITAL_DEPT_SPECIALIST"])
+        return index
+
+    @classmethod
+    def from_snapshot(cls, path: Union[str, Path], hospitals: Optional[Iterable[ErHospital]] = None) -> "ErDepartmentIndex":
+        """`build_seed_snapshot()`/`write_snapshot()`으로 저장한 스냅샷(메모리 맵)으로 인덱스를 만든다."""
+        return cls.from_tables(load_snapshot(path), hospitals)
+
+    def load_hospitals(self, hospitals: Iterable[ErHospital]) -> None:
+        """병원 정보(YKIHO, REGION)를 추가/교체한다."""
+        hospitals = list(hospitals)
+        if not hospitals:
+            return
+        with self._write_lock:
+            for hospital in hospitals:
+                self._hospitals[hospital.hpid] = hospital
+                if hospital.ykiho:
+                    self._hpid_by_ykiho[hospital.ykiho] = hospital.hpid
+            snapshot = self._snapshot
+            hpids = snapshot.hpids + tuple(h for h in dict.fromkeys(h.hpid for h in hospitals) if h not in snapshot.rows)
+            counts = np.zeros((len(hpids), len(snapshot.depts)), np.int32)
+            counts[:len(snapshot.hpids)] = snapshot.counts
+            self._snapshot = _DeptSnapshot(hpids, snapshot.depts, counts, self._regions_of(hpids))
+
+    def _regions_of(self, hpids: tuple[str, ...]) -> np.ndarray:
+        return np.array(
+            [(self._hospitals[h].region or '') if h in self._hospitals else '' for h in hpids],
+            dtype=object,
+        )
+
+    def apply(self, rows: Iterable[tuple[str, str, Optional[int]]]) -> int:
+        """(YKIHO 또는 HPID, 진료과목코드, 전문의 수) 행을 반영하고 반영된 행 수를 반환한다.
+
+        처음 보는 병원/진료과목은 배열에 추가되며, 기존 셀은 값만 교체된다.
+        """
+        with self._write_lock:
+            snapshot = self._snapshot
+            updates: dict[tuple[str, str], int] = {}
+            unknown = 0
+            for key, dept, count in rows:
+                hpid = self._hpid_by_ykiho.get(key, key if key in self._hospitals else None)
+                if hpid is None:
+                    unknown += 1
+                    continue
+                updates[(hpid, str(dept))] = int(count or 0)
+            if unknown:
+                logging.debug(f"Skipped {unknown} department rows for unknown hospitals")
+            if not updates:
+                return 0
+
+            new_hpids = tuple(dict.fromkeys(h for h, _ in updates if h not in snapshot.rows))
+            new_depts = tuple(sorted({d for _, d in updates if d not in snapshot.cols}))
+            hpids = snapshot.hpids + new_hpids
+            depts = snapshot.depts + new_depts
+            if new_hpids or new_depts:
+                counts = np.zeros((len(hpids), len(depts)), np.int32)
+                counts[:len(snapshot.hpids), :len(snapshot.depts)] = snapshot.counts
+            else:
+                counts = snapshot.counts.copy()
+            rows_of = {hpid: i for i, hpid in enumerate(hpids)}
+            cols_of = {dept: j for j, dept in enumerate(depts)}
+            index = np.array([(rows_of[h], cols_of[d]) for h, d in updates], dtype=np.intp)
+            counts[index[:, 0], index[:, 1]] = np.fromiter(updates.values(), np.int32, len(updates))
+            regions = self._regions_of(hpids) if new_hpids else snapshot.regions
+            self._snapshot = _DeptSnapshot(hpids, depts, counts, regions)
+            return len(updates)
+
+    def apply_rows(self, rows: Iterable[Mapping]) -> int:
+        """HOSPITAL_DEPT_SPECIALIST 행(`{YKIHO, DGSBJTCD, DGSBJTCDNM, DTLSDRCNT}`)을 반영한다."""
+        def _iter():
+            for row in rows:
+                if row.get("DGSBJTCDNM"):
+                    self._names[row["DGSBJTCD"]] = row["DGSBJTCDNM"]
+                yield row["YKIHO"], row["DGSBJTCD"], row.get("DTLSDRCNT")
+        return self.apply(_iter())
+
+    def apply_table(self, table: ColumnTable) -> int:
+        """HOSPITAL_DEPT_SPECIALIST `ColumnTable`을 한 번에 반영한다.
+
+        YKIHO/진료과목 코드는 고유값 단위로만 매핑하고, 셀 갱신은 배열 인덱싱으로 수행한다.
+        """
+        ykiho_codes, ykihos = table.encoded("YKIHO")
+        dept_codes, depts = table.encoded("DGSBJTCD")
+        values = np.nan_to_num(np.asarray(table.column("DTLSDRCNT"), dtype=np.float64)).astype(np.int32)
+        if "DGSBJTCDNM" in table:
+            name_codes, names = table.encoded("DGSBJTCDNM")
+            _, first = np.unique(dept_codes, return_index=True)
+            for i in first:
+                if dept_codes[i] >= 0 and name_codes[i] >= 0:
+                    self._names[str(depts[dept_codes[i]])] = str(names[name_codes[i]])
+
+        with self._write_lock:
+            snapshot = self._snapshot
+            new_depts = tuple(sorted({str(d) for d in depts} - set(snapshot.cols)))
+            all_depts = snapshot.depts + new_depts
+            cols_of = {dept: j for j, dept in enumerate(all_depts)}
+            row_of_ykiho = np.array([
+                snapshot.rows.get(self._hpid_by_ykiho.get(str(y), str(y)), -1) for y in ykihos
+            ] + [-1], dtype=np.intp)
+            col_of_dept = np.array([cols_of[str(d)] for d in depts] + [-1], dtype=np.intp)
+            # 코드 -1(NULL)은 마지막 항목(-1)을 가리킨다.
+            rows = row_of_ykiho[ykiho_codes]
+            cols = col_of_dept[dept_codes]
+            valid = (rows >= 0) & (cols >= 0)
+            if not valid.all():
+                logging.debug(f"Skipped {int((~valid).sum())} department rows for unknown hospitals")
+
+            counts = np.zeros((len(snapshot.hpids), len(all_depts)), np.int32)
+            counts[:, :len(snapshot.depts)] = snapshot.counts
+            counts[rows[valid], cols[valid]] = values[valid]
+            self._snapshot = _DeptSnapshot(snapshot.hpids, all_depts, counts, snapshot.regions)
+            return int(valid.sum())
+
+    @property
+    def departments(self) -> dict[str, Optional[str]]:
+        """`{진료과목코드: 진료과목명}`"""
+        return {dept: self._names.get(dept) for dept in self._snapshot.depts}
+
+    def __len__(self) -> int:
+        return len(self._snapshot.hpids)
+
+    def count(self, hpid: str, dept: str) -> int:
+        """병원의 진료과목 전문의 수를 반환한다."""
+        snapshot = self._snapshot
+        i, j = snapshot.rows.get(hpid), snapshot.cols.get(dept)
+        if i is None or j is None:
+            return 0
+        return int(snapshot.counts[i, j])
+
+    def counts_for(self, hpid: str) -> dict[str, int]:
+        """병원의 `{진료과목코드: 전문의 수}` (0명인 과목 제외)"""
+        snapshot = self._snapshot
+        i = snapshot.rows.get(hpid)
+        if i is None:
+            return {}
+        row = snapshot.counts[i]
+        return {snapshot.depts[j]: int(row[j]) for j in np.flatnonzero(row)}
+
+    def _mask(
+            self,
+            snapshot: _DeptSnapshot,
+            depts: tuple[str, ...],
+            min_specialists: int,
+            regions: tuple[str, ...],
+    ) -> Optional[np.ndarray]:
+        """조건을 만족하는 병원의 packbits 비트맵. 만족할 수 없으면 None."""
+        size = len(snapshot.hpids)
+        bits = np.full((size + 7) // 8, 0xFF, np.uint8)
+        if regions:
+            region_bits = [snapshot.region_bitmaps[r] for r in regions if r in snapshot.region_bitmaps]
+            if not region_bits:
+                return None
+            bits &= np.bitwise_or.reduce(region_bits)
+        if depts:
+            cols = [snapshot.cols.get(d) for d in depts]
+            if any(j is None for j in cols):
+                return None if min_specialists > 0 else bits
+            if min_specialists <= 1:
+                bits &= np.bitwise_and.reduce(snapshot.bitmaps[cols], axis=0)
+            else:
+                bits &= np.packbits(np.all(snapshot.counts[:, cols] >= min_specialists, axis=1))
+        return bits
+
+    def capable(
+            self,
+            depts: Union[str, Iterable[str]],
+            min_specialists: int = 1,
+            *,
+            region: Union[str, Iterable[str], None] = None,
+    ) -> list[str]:
+        """진료과목 `depts`의 전문의가 각각 `min_specialists`명 이상인 병원의 HPID를 반환한다.
+
+        Args:
+            depts (str | Iterable[str]): 진료과목 코드(DGSBJTCD). PATIENT_LOGS.DEPT_CODE와 같은 값.
+            min_specialists (int): 진료과목별 최소 전문의 수.
+            region (str | Iterable[str] | None): 지정하면 해당 REGION의 병원만 반환한다.
+        """
+        snapshot = self._snapshot
+        bits = self._mask(snapshot, _as_tuple(depts), min_specialists, _as_tuple(region))
+        if bits is None:
+            return []
+        hpids = snapshot.hpids
+        return [hpids[i] for i in np.flatnonzero(np.unpackbits(bits, count=len(hpids)))]
+
+    def capable_by_region(
+            self,
+            depts: Union[str, Iterable[str]],
+            min_specialists: int = 1,
+            *,
+            regions: Union[str, Iterable[str], None] = None,
+    ) -> dict[str, list[str]]:
+        """`{REGION: [HPID, ...]}` 형태로 조건을 만족하는 병원을 반환한다. 병원이 없는 REGION은 제외된다."""
+        snapshot = self._snapshot
+        depts = _as_tuple(depts)
+        regions = _as_tuple(regions) or tuple(sorted(snapshot.region_bitmaps))
+        result = {}
+        for region in regions:
+            bits = self._mask(snapshot, depts, min_specialists, (region,))
+            if bits is None:
+                continue
+            rows = np.flatnonzero(np.unpackbits(bits, count=len(snapshot.hpids)))
+            if rows.size:
+                result[region] = [snapshot.hpids[i] for i in rows]
+        return result
+
+    def narrow_alert_properties(
+            self,
+            region_filter: str,
+            depts: Union[str, Iterable[str], None],
+            min_specialists: int = 1,
+    ) -> Optional[dict[str, str]]:
+        """알림 메세지의 `Region` 필터(`|Seoul|Honam|`)를 진료 가능한 병원이 있는 REGION으로 줄인다.
+
+        Service Bus 메세지의 `application_properties`로 그대로 사용할 수 있는 딕셔너리를 반환한다.
+
+        - `Region`: 진료 가능한 병원이 있는 REGION만 남긴 필터
+        - `TargetHpids`: 진료 가능한 병원 HPID 목록 (`|A1500016|A1500003|`)
+
+        진료과목이 없으면 `Region`만 그대로 반환하고, 진료 가능한 병원이 하나도 없으면 None을 반환한다.
+
+        Examples:
+
+            ```python
+            properties = departments.narrow_alert_properties('|Seoul|Honam|', patient.dept_code)
+            if properties is not None:
+                await connector.publish('emc-patient-alert', ServiceBusMessage(body, application_properties=properties))
+            ```
+        """
+        regions = tuple(r for r in region_filter.split('|') if r)
+        depts = _as_tuple(depts)
+        if not depts:
+            return {"Region": region_filter}
+        capable = self.capable_by_region(depts, min_specialists, regions=regions)
+        if not capable:
+            return None
+        hpids = [hpid for region in capable for hpid in capable[region]]
+        return {
+            "Region": "|" + "|".join(capable) + "|",
+            "TargetHpids": "|" + "|".join(hpids) + "|",
+        }
+
+    def get_stats(self) -> dict:
+        snapshot = self._snapshot
+        return {
+            "hospitals": len(snapshot.hpids),
+            "departments": len(snapshot.depts),
+            "counts_bytes": int(snapshot.counts.nbytes),
+            "bitmap_bytes": int(snapshot.bitmaps.nbytes),
+        }
@@ -0,0 +1,356 @@
+from bisect import bisect_right
+from pathlib import Path
+import logging
+import threading
+
+from .columnar import ColumnTable, load_snapshot, read_seed_columns
+from .seed import SEED_SQL_FILES
+
+from typing import Callable, Iterable, Mapping, Optional, Union
+
+__all__ = (
+    'ErAvailabilityIndex',
+    'ErHospital',
+    'ErStatus',
+    'STG_DELTA_QUERY',
+)
+
+# refresh()에 전달할 fetch 함수에서 사용할 조회 쿼리. (HPID별 최신 행)
+# HVIDATE는 병원마다 보고 시각이 달라 전역 워터마크로 자르면 늦게 보고한 병원의 행을 놓치므로,
+# 병원별 최신 행을 가져오고 이미 반영한 행은 apply()가 HPID별 HVIDATE 비교로 건너뛴다.
+STG_DELTA_QUERY = (
+    "SELECT HPID, HVIDATE, HVEC FROM ("
+    "SELECT HPID, HVIDATE, HVEC, ROW_NUMBER() OVER (PARTITION BY HPID ORDER BY HVIDATE DESC) AS RN "
+    "FROM ER_USER.ER_AVAILABILITY_STG"
+    ") WHERE RN = 1"
+)
+
+
+class ErHospital:
+    """HOSPITAL_MASTER 행 하나. (HOSPITAL_ID_MAP으로 HPID/YKIHO를 보정한 값)"""
+    __slots__ = ('hpid', 'ykiho', 'name', 'province', 'district', 'x_pos', 'y_pos', 'telno', 'region')
+
+    def __init__(
+            self,
+            hpid: str,
+            ykiho: Optional[str] = None,
+            name: Optional[str] = None,
+            province: Optional[str] = None,
+            district: Optional[str] = None,
+            x_pos: Optional[float] = None,
+            y_pos: Optional[float] = None,
+            telno: Optional[str] = None,
+            region: Optional[str] = None,
+    ) -> None:
+        self.hpid = hpid
+        self.ykiho = ykiho
+        self.name = name
+        self.province = province
+        self.district = district
+        self.x_pos = x_pos
+        self.y_pos = y_pos
+        self.telno = telno
+        self.region = region
+
+    @classmethod
+    def from_row(cls, row: Mapping) -> "ErHospital":
+        return cls(
+            hpid=row["HPID"],
+            ykiho=row.get("YKIHO"),
+            name=row.get("HOSPITAL_NM"),
+            province=row.get("PROVINCE"),
+            district=row.get("DISTRICT"),
+            x_pos=row.get("X_POS"),
+            y_pos=row.get("Y_POS"),
+            telno=row.get("TELNO"),
+            region=row.get("REGION"),
+        )
+
+    def to_dict(self) -> dict:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+class ErStatus:
+    """병원 하나의 최신 응급실 가용 병상 정보. 생성 후 변경하지 않는다."""
+    __slots__ = ('hpid', 'hvidate', 'hvec', 'hospital')
+
+    def __init__(self, hpid: str, hvidate: str, hvec: int, hospital: Optional[ErHospital]) -> None:
+        self.hpid = hpid
+        self.hvidate = hvidate
+        self.hvec = hvec
+        self.hospital = hospital
+
+    @property
+    def region(self) -> Optional[str]:
+        return self.hospital.region if self.hospital is not None else None
+
+    def to_dict(self) -> dict:
+        data = self.hospital.to_dict() if self.hospital is not None else {"hpid": self.hpid}
+        data["hvidate"] = self.hvidate
+        data["hvec"] = self.hvec
+        return data
+
+
+class _RegionPartition:
+    __slots__ = ('statuses', 'neg_hvec')
+
+    def __init__(self, statuses: Iterable[ErStatus]) -> None:
+        # HVEC 내림차순. 같은 HVEC는 HPID 순으로 고정한다.
+        self.statuses = tuple(sorted(statuses, key=lambda s: (-s.hvec, s.hpid)))
+        self.neg_hvec = tuple(-s.hvec for s in self.statuses)
+
+    def count_at_least(self, min_beds: int) -> int:
+        return bisect_right(self.neg_hvec, -min_beds)
+
+
+class _Snapshot:
+    __slots__ = ('by_hpid', 'regions', 'watermark')
+
+    def __init__(self, by_hpid: dict, regions: dict, watermark: Optional[str]) -> None:
+        self.by_hpid: dict[str, ErStatus] = by_hpid
+        self.regions: dict[str, _RegionPartition] = regions
+        self.watermark = watermark
+
+
+_EMPTY_PARTITION = _RegionPartition(())
+
+
+class ErAvailabilityIndex:
+
+    def __init__(self, hospitals: Iterable[ErHospital] = ()) -> None:
+        """HPID별 최신 응급실 가용 병상(HVEC)을 REGION별로 나누어 메모리에 유지하는 인덱스이다.
+
+        병원 정보(HOSPITAL_MASTER + HOSPITAL_ID_MAP)는 한 번만 조인해 두고,
+        `apply()`/`refresh()`로 `HVIDATE`가 병원별 현재 값보다 새로운 행만 반영한다.
+
+        읽기는 잠금 없이 수행된다. 갱신은 변경된 REGION의 정렬 결과만 새로 만든 뒤
+        스냅샷 참조를 한 번에 교체(Copy-on-write)하므로, 조회 중에 갱신이 일어나도
+        조회는 항상 일관된 스냅샷을 본다.
+
+        - HPID 조회: O(1)
+        - REGION별 HVEC 상위 K개: O(K)
+        - REGION별 `min_beds` 이상 병원 수: O(log N)
+
+        Args:
+            hospitals (Iterable[ErHospital]): 인덱스에 포함할 병원 목록.
+
+        Examples:
+
+            ```python
+            index = ErAvailabilityIndex.from_seed_sql('azure/oracle_db/sql')
+            index.top_k('Honam', 5)                 # 병상이 많은 순으로 5개
+            index.get('A1500016').hvec
+
+            # 운영 환경: STG 테이블에서 증분 반영
+            def fetch(watermark):
+                cursor.execute(STG_DELTA_QUERY)
+                return cursor.fetchall()
+
+            index.refresh(fetch)
+            ```
+        """
+        self._hospitals: dict[str, ErHospital] = {}
+        self._write_lock = threading.Lock()
+        self._snapshot = _Snapshot({}, {}, None)
+        self._applied = 0
+        self._skipped = 0
+        self.load_hospitals(hospitals)
+
+    @classmethod
+    def from_rows(
+            cls,
+            master_rows: Iterable[Mapping],
+            id_map_rows: Iterable[Mapping] = (),
+    ) -> "ErAvailabilityIndex":
+        """HOSPITAL_MASTER 행과 HOSPITAL_ID_MAP 행을 조인하여 인덱스를 만든다.
+
+        HOSPITAL_MASTER의 HPID가 비어있으면 HOSPITAL_ID_MAP의 YKIHO로 채운다.
+        """
+        hpid_by_ykiho = {row["YKIHO"]: row["HPID"] for row in id_map_rows}
+        hospitals = []
+        for row in master_rows:
+            hpid = row.get("HPID") or hpid_by_ykiho.get(row.get("YKIHO"))
+            if not hpid:
+                continue
+            hospital = ErHospital.from_row({**row, "HPID": hpid})
+            hospitals.append(hospital)
+        return cls(hospitals)
+
+    @classmethod
+    def from_seed_sql(
+            cls,
+            sql_dir: Union[str, Path],
+            *,
+            availability_files: Optional[Iterable[str]] = None,
+    ) -> "ErAvailabilityIndex":
+        """저장소의 Oracle 시드 SQL(azure/oracle_db/sql)로 인덱스를 만든다. (오프라인 테스트용)
+
+        Args:
+            sql_dir (str | Path): 시드 SQL 디렉토리.
+            availability_files (Optional[Iterable[str]]): 가용 병상으로 반영할 파일 이름 목록.
+                None이면 `2_ER_AVAILABILITY.sql`을 반영한다.
+        """
+        sql_dir = Path(sql_dir)
+        if availability_files is None:
+            availability_files = (SEED_SQL_FILES["ER_AVAILABILITY"],)
+        tables = read_seed_columns(
+            sql_dir / SEED_SQL_FILES["HOSPITAL_MASTER"],
+            sql_dir / SEED_SQL_FILES["HOSPITAL_ID_MAP"],
+            *(sql_dir / name for name in availability_files),
+        )
+        return cls.from_tables(
+            tables,
+            availability_tables=[t for t in tables if t.startswith("ER_AVAILABILITY")],
+        )
+
+    @classmethod
+    def from_tables(
+            cls,
+            tables: Mapping[str, ColumnTable],
+            *,
+            availability_tables: Iterable[str] = ("ER_AVAILABILITY",),
+    ) -> "ErAvailabilityIndex":
+        """`ColumnTable`(HOSPITAL_MASTER, HOSPITAL_ID_MAP, ER_AVAILABILITY*)로 인덱스를 만든다."""
+        id_map = tables.get("HOSPITAL_ID_MAP")
+        index = cls.from_rows(
+            tables["HOSPITAL_MASTER"].iter_rows(),
+            id_map.iter_rows() if id_map is not None else (),
+        )
+        for name in availability_tables:
+            table = tables.get(name)
+            if table is not None:
+                index.apply(zip(
+                    table.column("HPID").tolist(),
+                    table.column("HVIDATE").tolist(),
+                    table.column("HVEC").tolist(),
+                ))
+        return index
+
+    @classmethod
+    def from_snapshot(cls, path: Union[str, Path], **kwargs) -> "ErAvailabilityIndex":
+        """`build_seed_snapshot()`/`write_snapshot()`으로 저장한 스냅샷(메모리 맵)으로 인덱스를 만든다."""
+        return cls.from_tables(load_snapshot(path), **kwargs)
+
+    def load_hospitals(self, hospitals: Iterable[ErHospital]) -> None:
+        """병원 정보를 추가/교체한다. 이미 반영된 가용 병상 정보의 병원/REGION도 함께 갱신된다."""
+        hospitals = list(hospitals)
+        if not hospitals:
+            return
+        with self._write_lock:
+            for hospital in hospitals:
+                self._hospitals[hospital.hpid] = hospital
+            snapshot = self._snapshot
+            by_hpid = {
+                hpid: ErStatus(hpid, status.hvidate, status.hvec, self._hospitals.get(hpid))
+                for hpid, status in snapshot.by_hpid.items()
+            }
+            self._snapshot = _Snapshot(by_hpid, self._build_regions(by_hpid.values()), snapshot.watermark)
+
+    @staticmethod
+    def _build_regions(statuses: Iterable[ErStatus]) -> dict[str, _RegionPartition]:
+        grouped: dict[str, list[ErStatus]] = {}
+        for status in statuses:
+            if status.region is not None:
+                grouped.setdefault(status.region, []).append(status)
+        return {region: _RegionPartition(items) for region, items in grouped.items()}
+
+    def apply(self, rows: Iterable[tuple[str, str, Optional[int]]]) -> int:
+        """(HPID, HVIDATE, HVEC) 행을 반영하고 반영된 행 수를 반환한다.
+
+        해당 병원의 현재 값보다 오래된(같은 HVIDATE 포함) 행은 건너뛴다. HVIDATE는 병원마다 보고 시각이
+        다르므로 워터마크로 자르지 않는다. (`YYYYMMDDHHMMSS` 문자열이므로 문자열 비교로 순서를 판단한다)
+        """
+        with self._write_lock:
+            snapshot = self._snapshot
+            changed: dict[str, ErStatus] = {}
+            new_watermark = snapshot.watermark
+            skipped = 0
+            for hpid, hvidate, hvec in rows:
+                hvidate = str(hvidate)
+                current = changed.get(hpid) or snapshot.by_hpid.get(hpid)
+                if current is not None and hvidate <= current.hvidate:
+                    skipped += 1
+                    continue
+                # HVEC가 NULL(None 또는 NaN)이면 0으로 본다.
+                hvec = int(hvec) if hvec is not None and hvec == hvec else 0
+                changed[hpid] = ErStatus(hpid, hvidate, hvec, self._hospitals.get(hpid))
+                if new_watermark is None or hvidate > new_watermark:
+                    new_watermark = hvidate
+            self._skipped += skipped
+            if not changed:
+                return 0
+
+            by_hpid = {**snapshot.by_hpid, **changed}
+            touched = {status.region for status in changed.values()}
+            touched.update(
+                snapshot.by_hpid[hpid].region for hpid in changed if hpid in snapshot.by_hpid
+            )
+            touched.discard(None)
+            regions = dict(snapshot.regions)
+            if touched:
+                rebuilt = self._build_regions(s for s in by_hpid.values() if s.region in touched)
+                for region in touched:
+                    regions[region] = rebuilt.get(region, _EMPTY_PARTITION)
+            self._snapshot = _Snapshot(by_hpid, regions, new_watermark)
+            self._applied += len(changed)
+            logging.debug(f"Applied {len(changed)} ER availability rows. watermark={new_watermark}")
+            return len(changed)
+
+    def refresh(self, fetch_rows: Callable[[Optional[str]], Iterable[tuple[str, str, Optional[int]]]]) -> int:
+        """`fetch_rows(watermark)`로 가져온 행을 반영한다. (`STG_DELTA_QUERY` 참고)
+
+        `watermark`는 참고용이다. 병원마다 HVIDATE가 다르므로 조회의 하한으로 사용하면 안 된다.
+        """
+        return self.apply(fetch_rows(self.watermark))
+
+    @property
+    def watermark(self) -> Optional[str]:
+        """지금까지 반영한 가장 최신 HVIDATE. (모든 병원 중 최대값이며, 병원별 최신 여부는 `apply()`가 판단한다)"""
+        return self._snapshot.watermark
+
+    @property
+    def regions(self) -> list[str]:
+        return sorted(self._snapshot.regions)
+
+    def __len__(self) -> int:
+        return len(self._snapshot.by_hpid)
+
+    def __contains__(self, hpid: str) -> bool:
+        return hpid in self._snapshot.by_hpid
+
+    def get(self, hpid: str) -> Optional[ErStatus]:
+        """HPID의 최신 가용 병상 정보를 반환한다."""
+        return self._snapshot.by_hpid.get(hpid)
+
+    def hospitals(self) -> list[ErHospital]:
+        """인덱스에 등록된 모든 병원 정보를 반환한다."""
+        return list(self._hospitals.values())
+
+    def hospital(self, hpid: str) -> Optional[ErHospital]:
+        """HPID의 병원 정보를 반환한다. (가용 병상 정보가 없어도 반환)"""
+        return self._hospitals.get(hpid)
+
+    def top_k(self, region: str, k: int, *, min_beds: int = 0) -> list[ErStatus]:
+        """REGION에서 HVEC가 큰 순으로 최대 `k`개를 반환한다."""
+        partition = self._snapshot.regions.get(region, _EMPTY_PARTITION)
+        return list(partition.statuses[:min(k, partition.count_at_least(min_beds))])
+
+    def available(self, region: str, min_beds: int = 1) -> list[ErStatus]:
+        """REGION에서 HVEC가 `min_beds` 이상인 병원을 HVEC 내림차순으로 반환한다."""
+        partition = self._snapshot.regions.get(region, _EMPTY_PARTITION)
+        return list(partition.statuses[:partition.count_at_least(min_beds)])
+
+    def count_available(self, region: str, min_beds: int = 1) -> int:
+        """REGION에서 HVEC가 `min_beds` 이상인 병원 수를 반환한다."""
+        return self._snapshot.regions.get(region, _EMPTY_PARTITION).count_at_least(min_beds)
+
+    def get_stats(self) -> dict:
+        snapshot = self._snapshot
+        return {
+            "hospitals": len(self._hospitals),
+            "statuses": len(snapshot.by_hpid),
+            "regions": {region: len(p.statuses) for region, p in snapshot.regions.items()},
+            "watermark": snapshot.watermark,
+            "applied": self._applied,
+            "skipped": self._skipped,
+        }
@@ -0,0 +1,120 @@
+from functools import lru_cache
+from pathlib import Path
+import re
+
+from typing import Iterator, Optional, Union
+
+__all__ = (
+    'SEED_SQL_FILES',
+    'iter_insert_rows',
+    'read_seed_table',
+)
+
+# 테이블별 시드 SQL 파일 (azure/oracle_db/sql)
+SEED_SQL_FILES = {
+    "HOSPITAL_MASTER": "2_HOSPITAL_MASTER.sql",
+    "HOSPITAL_ID_MAP": "3_HOSPITAL_ID_MAP.sql",
+    "ER_AVAILABILITY": "2_ER_AVAILABILITY.sql",
+    "HOSPITAL_DEPT_SPECIALIST": "3_HOSPITAL_DEPT_SPECIALIST.sql",
+}
+
+_INSERT_RE = re.compile(
+    r'\s*INSERT\s+INTO\s+(?:"?\w+"?\.)?"?(\w+)"?\s*\(([^)]*)\)\s*VALUES\s*',
+    re.IGNORECASE,
+)
+_VALUE = r"('(?:[^']|'')*'|NULL|[-+]?\d+(?:\.\d*)?(?:[eE][-+]?\d+)?)"
+_GAP_RE = re.compile(r"[\s,;]*")
+
+
+@lru_cache(maxsize=32)
+def _row_regex(width: int) -> re.Pattern:
+    """컬럼 수에 맞춘 `( v1, v2, ... )` 한 행 전체를 매칭하는 정규식."""
+    values = r"\s*,\s*".join([_VALUE] * width)
+    return re.compile(r"\(\s*" + values + r"\s*\)", re.IGNORECASE)
+
+
+def _convert(token: str) -> Union[str, int, float, None]:
+    if token[0] == "'":
+        return token[1:-1].replace("''", "'")
+    if token.upper() == 'NULL':
+        return None
+    if '.' in token or 'e' in token or 'E' in token:
+        return float(token)
+    return int(token)
+
+
+def _iter_statements(path: Path) -> Iterator[str]:
+    """파일을 한 줄씩 읽어 `;`로 끝나는 문장 단위로 반환한다. (문자열 내부의 `;`는 무시)"""
+    lines: list[str] = []
+    quotes = 0
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            lines.append(line)
+            quotes += line.count("'")
+            if quotes % 2 == 0 and line.rstrip().endswith(';'):
+                yield ''.join(lines)
+                lines.clear()
+                quotes = 0
+    if lines and ''.join(lines).strip():
+        yield ''.join(lines)
+
+
+def _parse_insert(statement: str) -> Optional[tuple[str, tuple[str, ...], list[tuple]]]:
+    match = _INSERT_RE.match(statement)
+    if match is None:
+        return None
+    table = match.group(1).upper()
+    columns = tuple(c.strip().strip('"').upper() for c in match.group(2).split(','))
+    rows = []
+    pos = match.end()
+    for row in _row_regex(len(columns)).finditer(statement, pos):
+        if _GAP_RE.fullmatch(statement, pos, row.start()) is None:
+            raise ValueError(f"Unsupported row in INSERT INTO {table}: {statement[pos:pos + 80]!r}")
+        rows.append(tuple(_convert(token) for token in row.groups()))
+        pos = row.end()
+    if _GAP_RE.fullmatch(statement, pos) is None:
+        raise ValueError(f"Unsupported row in INSERT INTO {table}: {statement[pos:pos + 80]!r}")
+    return table, columns, rows
+
+
+def iter_insert_rows(path: Union[str, Path]) -> Iterator[tuple[str, tuple[str, ...], tuple]]:
+    """`INSERT INTO ... (cols) VALUES (...), (...);` 형식의 시드 SQL에서 행을 하나씩 읽는다.
+
+    파일 전체를 메모리에 올리지 않고 문장 단위로 파싱한다.
+    문자열은 `str`, 숫자는 `int`/`float`, `NULL`은 `None`으로 변환된다.
+
+    Args:
+        path (str | Path): 시드 SQL 파일 경로.
+
+    Returns:
+        (테이블 이름, 컬럼 이름 튜플, 값 튜플)을 반환하는 Iterator.
+    """
+    for statement in _iter_statements(Path(path)):
+        parsed = _parse_insert(statement)
+        if parsed is None:
+            continue
+        table, columns, rows = parsed
+        for row in rows:
+            yield table, columns, row
+
+
+def read_seed_table(path: Union[str, Path], table: Optional[str] = None) -> list[dict]:
+    """시드 SQL 파일의 행을 `{컬럼: 값}` 딕셔너리 리스트로 반환한다.
+
+    Args:
+        path (str | Path): 시드 SQL 파일 경로.
+        table (Optional[str]): 지정하면 해당 테이블의 행만 반환한다.
+
+    Examples:
+
+        ```python
+        rows = read_seed_table('azure/oracle_db/sql/2_HOSPITAL_MASTER.sql')
+        rows[0]["REGION"]       # 'Honam'
+        ```
+    """
+    table = table.upper() if table else None
+    return [
+        dict(zip(columns, row))
+        for name, columns, row in iter_insert_rows(path)
+        if table is None or name == table
+    ]
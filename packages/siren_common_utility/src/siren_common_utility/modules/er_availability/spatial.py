@@ -0,0 +1,226 @@
+from math import asin, cos, floor, radians, sin, sqrt
+from pathlib import Path
+import heapq
+
+from .columnar import load_snapshot
+from .departments import ErDepartmentIndex
+from .index import ErAvailabilityIndex, ErHospital, ErStatus
+
+from typing import AbstractSet, Iterable, Optional, Union
+
+__all__ = (
+    'ErCandidate',
+    'ErSpatialIndex',
+    'haversine_km',
+)
+
+EARTH_RADIUS_KM = 6371.0088
+_KM_PER_DEG_LAT = 111.195
+
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """두 좌표(위도, 경도) 사이의 대원 거리(km)를 반환한다."""
+    dlat = radians(lat2 - lat1)
+    dlon = radians(lon2 - lon1)
+    a = sin(dlat / 2) ** 2 + cos(radians(lat1)) * cos(radians(lat2)) * sin(dlon / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * asin(min(1.0, sqrt(a)))
+
+
+class ErCandidate:
+    """`nearest_ers()` 결과 하나. 직선 거리 순으로 정렬된다."""
+    __slots__ = ('hospital', 'status', 'distance_km')
+
+    def __init__(self, hospital: ErHospital, status: Optional[ErStatus], distance_km: float) -> None:
+        self.hospital = hospital
+        self.status = status
+        self.distance_km = distance_km
+
+    @property
+    def hpid(self) -> str:
+        return self.hospital.hpid
+
+    @property
+    def hvec(self) -> Optional[int]:
+        return self.status.hvec if self.status is not None else None
+
+    def to_dict(self) -> dict:
+        data = self.hospital.to_dict()
+        data["hvec"] = self.hvec
+        data["hvidate"] = self.status.hvidate if self.status is not None else None
+        data["distance_km"] = round(self.distance_km, 3)
+        return data
+
+
+class ErSpatialIndex:
+
+    def __init__(
+            self,
+            availability: ErAvailabilityIndex,
+            *,
+            departments: Optional[ErDepartmentIndex] = None,
+            cell_deg: float = 0.1,
+    ) -> None:
+        """병원 좌표(HOSPITAL_MASTER.X_POS/Y_POS)에 대한 격자(Grid) 공간 인덱스이다.
+
+        위도/경도를 `cell_deg` 크기의 셀로 나누어 병원을 넣어두고, 검색 좌표의 셀부터
+        바깥쪽 링(Ring)으로 넓혀가며 haversine 거리를 계산한다. 다음 링까지의 최소 거리가
+        현재 K번째 후보보다 멀어지면 검색을 멈추므로, 지역 전체가 아닌 주변 셀만 확인한다.
+
+        가용 병상(HVEC)은 조회 시점에 `availability`에서 읽으므로 인덱스를 다시 만들 필요가 없다.
+
+        Args:
+            availability (ErAvailabilityIndex): 병원 정보와 가용 병상 인덱스.
+            departments (Optional[ErDepartmentIndex]): 진료과목별 전문의 수 인덱스.
+                `nearest_ers(dept=...)` 필터에 사용한다.
+            cell_deg (float): 격자 셀 크기(도). 0.1도는 약 11km(위도)이다.
+
+        Examples:
+
+            ```python
+            spatial = ErSpatialIndex.from_seed_sql('azure/oracle_db/sql')
+            # 구급차 주변 5개 응급실 (병상 1개 이상, 신경외과(06) 전문의 보유)
+            for candidate in spatial.nearest_ers(35.16, 126.85, 5, min_beds=1, dept='06'):
+                print(candidate.hospital.name, candidate.distance_km, candidate.hvec)
+            ```
+        """
+        if cell_deg <= 0:
+            raise ValueError("cell_deg must be > 0")
+        self._availability = availability
+        self._departments = departments
+        self._cell_deg = cell_deg
+        self._cells: dict[tuple[int, int], list[tuple[float, float, ErHospital]]] = {}
+        self._bounds: Optional[tuple[int, int, int, int]] = None
+        self.add_hospitals(availability.hospitals())
+
+    @classmethod
+    def from_seed_sql(cls, sql_dir: Union[str, Path], **kwargs) -> "ErSpatialIndex":
+        """시드 SQL로 가용 병상 인덱스와 진료과목 인덱스를 읽어 공간 인덱스를 만든다."""
+        availability = ErAvailabilityIndex.from_seed_sql(sql_dir)
+        departments = ErDepartmentIndex.from_seed_sql(sql_dir, availability.hospitals())
+        return cls(availability, departments=departments, **kwargs)
+
+    @classmethod
+    def from_snapshot(cls, path: Union[str, Path], **kwargs) -> "ErSpatialIndex":
+        """스냅샷(메모리 맵)으로 가용 병상 인덱스와 진료과목 인덱스를 읽어 공간 인덱스를 만든다."""
+        tables = load_snapshot(path)
+        availability = ErAvailabilityIndex.from_tables(tables)
+        departments = ErDepartmentIndex.from_tables(tables, availability.hospitals())
+        return cls(availability, departments=departments, **kwargs)
+
+    def _cell(self, lat: float, lon: float) -> tuple[int, int]:
+        return floor(lat / self._cell_deg), floor(lon / self._cell_deg)
+
+    def add_hospitals(self, hospitals: Iterable[ErHospital]) -> None:
+        """병원을 격자에 추가한다. 좌표가 없는 병원은 건너뛴다."""
+        for hospital in hospitals:
+            if hospital.x_pos is None or hospital.y_pos is None:
+                continue
+            lat, lon = float(hospital.y_pos), float(hospital.x_pos)
+            row, col = self._cell(lat, lon)
+            self._cells.setdefault((row, col), []).append((lat, lon, hospital))
+            if self._bounds is None:
+                self._bounds = (row, row, col, col)
+            else:
+                r0, r1, c0, c1 = self._bounds
+                self._bounds = (min(r0, row), max(r1, row), min(c0, col), max(c1, col))
+
+    def __len__(self) -> int:
+        return sum(len(items) for items in self._cells.values())
+
+    def _matches(
+            self,
+            hospital: ErHospital,
+            status: Optional[ErStatus],
+            region: Optional[str],
+            min_beds: int,
+            capable: Optional[AbstractSet[str]],
+    ) -> bool:
+        if region is not None and hospital.region != region:
+            return False
+        if min_beds > 0 and (status is None or status.hvec < min_beds):
+            return False
+        if capable is not None and hospital.hpid not in capable:
+            return False
+        return True
+
+    def _ring(self, center: tuple[int, int], radius: int) -> Iterable[tuple[int, int]]:
+        row, col = center
+        if radius == 0:
+            yield center
+            return
+        for c in range(col - radius, col + radius + 1):
+            yield row - radius, c
+            yield row + radius, c
+        for r in range(row - radius + 1, row + radius):
+            yield r, col - radius
+            yield r, col + radius
+
+    def nearest_ers(
+            self,
+            lat: float,
+            lon: float,
+            k: int = 5,
+            *,
+            min_beds: int = 0,
+            dept: Union[str, Iterable[str], None] = None,
+            min_specialists: int = 1,
+            region: Optional[str] = None,
+            max_distance_km: Optional[float] = None,
+    ) -> list[ErCandidate]:
+        """좌표에서 직선 거리가 가까운 응급실을 최대 `k`개 반환한다.
+
+        주행 시간 API 호출 전에 후보를 줄이는 용도(Pre-filter)로 사용한다.
+
+        Args:
+            lat (float): 위도.
+            lon (float): 경도.
+            k (int): 최대 결과 수.
+            min_beds (int): 최소 가용 병상 수(HVEC). 0이면 가용 병상 정보가 없는 병원도 포함한다.
+            dept (str | Iterable[str] | None): 필요한 진료과목 코드(DGSBJTCD). 여러 개면 모두 만족해야 한다.
+            min_specialists (int): 진료과목별 최소 전문의 수.
+            region (Optional[str]): 지정하면 해당 REGION의 병원만 반환한다.
+            max_distance_km (Optional[float]): 최대 직선 거리(km).
+
+        Returns:
+            거리 오름차순의 `ErCandidate` 리스트.
+        """
+        if k <= 0 or self._bounds is None:
+            return []
+        depts = (dept,) if isinstance(dept, str) else tuple(dept or ())
+        capable = None
+        if depts:
+            if self._departments is None:
+                raise ValueError("departments index is required for dept filter")
+            # 진료 가능한 병원 집합은 비트맵 연산으로 한 번만 구한다.
+            capable = frozenset(self._departments.capable(depts, min_specialists, region=region))
+        center = self._cell(lat, lon)
+        r0, r1, c0, c1 = self._bounds
+        max_radius = max(center[0] - r0, r1 - center[0], center[1] - c0, c1 - center[1], 0)
+
+        best: list[tuple[float, str, ErCandidate]] = []     # (-거리) 최대 힙
+        for radius in range(max_radius + 1):
+            if radius > 0:
+                # 링 `radius`에 있는 병원은 검색 좌표에서 최소 (radius - 1)칸 떨어져 있다.
+                lat_edge = min(89.9, abs(lat) + radius * self._cell_deg)
+                min_cell_km = self._cell_deg * _KM_PER_DEG_LAT * min(1.0, cos(radians(lat_edge)))
+                bound = (radius - 1) * min_cell_km
+                if max_distance_km is not None and bound > max_distance_km:
+                    break
+                if len(best) == k and bound > -best[0][0]:
+                    break
+            for cell in self._ring(center, radius):
+                for h_lat, h_lon, hospital in self._cells.get(cell, ()):
+                    distance = haversine_km(lat, lon, h_lat, h_lon)
+                    if max_distance_km is not None and distance > max_distance_km:
+                        continue
+                    if len(best) == k and distance >= -best[0][0]:
+                        continue
+                    status = self._availability.get(hospital.hpid)
+                    if not self._matches(hospital, status, region, min_beds, capable):
+                        continue
+                    item = (-distance, hospital.hpid, ErCandidate(hospital, status, distance))
+                    if len(best) < k:
+                        heapq.heappush(best, item)
+                    else:
+                        heapq.heapreplace(best, item)
+        return [item[2] for item in sorted(best, key=lambda item: (-item[0], item[1]))]
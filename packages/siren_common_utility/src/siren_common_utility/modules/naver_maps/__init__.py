@@ -0,0 +1,2 @@
+from .cache import *
+from .client import *
@@ -0,0 +1,117 @@
+from collections import OrderedDict
+from time import monotonic
+import asyncio
+
+from typing import Awaitable, Callable, Generic, Hashable, Optional, TypeVar
+
+__all__ = (
+    'AsyncTtlLruCache',
+)
+
+T = TypeVar("T")
+
+_MISSING = object()
+
+
+class AsyncTtlLruCache(Generic[T]):
+
+    def __init__(
+            self,
+            maxsize: int = 10_000,
+            ttl: float = 300.0,
+            *,
+            clock: Callable[[], float] = monotonic,
+    ) -> None:
+        """TTL과 최대 크기(LRU)를 가진 비동기 캐시이다.
+
+        `get_or_load()`는 같은 키로 동시에 들어온 요청을 하나의 로더 호출로 합친다. (Request coalescing)
+        로더가 실패하면 결과를 캐시하지 않고, 대기 중인 호출자 모두에게 같은 예외가 전달된다.
+
+        Args:
+            maxsize (int): 최대 항목 수. 넘으면 가장 오래 사용되지 않은 항목부터 제거한다.
+            ttl (float): 항목 유효 시간(초).
+            clock: 현재 시각(초)을 반환하는 함수. (테스트용)
+        """
+        if maxsize < 1:
+            raise ValueError("maxsize must be >= 1")
+        self._maxsize = maxsize
+        self._ttl = ttl
+        self._clock = clock
+        self._items: OrderedDict[Hashable, tuple[float, T]] = OrderedDict()
+        self._in_flight: dict[Hashable, asyncio.Future] = {}
+
+        self._hits = 0
+        self._misses = 0
+        self._coalesced = 0
+        self._evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def get(self, key: Hashable, default=None):
+        """만료되지 않은 값을 반환한다. 없으면 `default`."""
+        item = self._items.get(key)
+        if item is None:
+            return default
+        expires_at, value = item
+        if expires_at <= self._clock():
+            del self._items[key]
+            return default
+        self._items.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: T, ttl: Optional[float] = None) -> None:
+        self._items[key] = (self._clock() + (self._ttl if ttl is None else ttl), value)
+        self._items.move_to_end(key)
+        while len(self._items) > self._maxsize:
+            self._items.popitem(last=False)
+            self._evictions += 1
+
+    def invalidate(self, key: Hashable) -> None:
+        self._items.pop(key, None)
+
+    def clear(self) -> None:
+        self._items.clear()
+
+    async def get_or_load(self, key: Hashable, loader: Callable[[], Awaitable[T]]) -> T:
+        """캐시된 값을 반환하고, 없으면 `loader()`를 호출하여 결과를 캐시한다."""
+        value = self.get(key, _MISSING)
+        if value is not _MISSING:
+            self._hits += 1
+            return value
+
+        pending = self._in_flight.get(key)
+        if pending is not None:
+            self._coalesced += 1
+            return await asyncio.shield(pending)
+
+        self._misses += 1
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+        try:
+            value = await loader()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # 대기자가 없으면 "exception was never retrieved" 경고를 막는다.
+            future.exception()
+            raise
+        else:
+            self.set(key, value)
+            future.set_result(value)
+            return value
+        finally:
+            del self._in_flight[key]
+
+    def get_stats(self) -> dict:
+        lookups = self._hits + self._misses + self._coalesced
+        return {
+            "size": len(self._items),
+            "hits": self._hits,
+            "misses": self._misses,
+            "coalesced": self._coalesced,
+            "evictions": self._evictions,
+            "hit_ratio": (self._hits + self._coalesced) / lookups if lookups else None,
+        }
@@ -0,0 +1,289 @@
+from collections import deque
+from time import perf_counter
+import asyncio
+import logging
+import os
+
+import aiohttp
+
+from .cache import AsyncTtlLruCache
+from ..az_service_bus._stats import summarize_latencies
+
+from typing import TYPE_CHECKING, Optional, Sequence
+if TYPE_CHECKING:
+    from ..er_availability import ErAvailabilityIndex
+
+__all__ = (
+    'NaverMapsClient',
+    'NaverMapsError',
+    'RouteSummary',
+)
+
+LatLon = tuple[float, float]
+
+_MISSING = object()
+
+
+class NaverMapsError(Exception):
+    """Naver Maps API가 HTTP 오류를 반환한 경우 발생한다."""
+
+    def __init__(self, status: int, message: str) -> None:
+        super().__init__(f"Naver Maps API error {status}: {message}")
+        self.status = status
+        self.message = message
+
+
+class RouteSummary:
+    """Directions API의 `route.{option}[0].summary`에서 필요한 값."""
+    __slots__ = ('distance_m', 'duration_ms', 'toll_fare', 'fuel_price')
+
+    def __init__(self, distance_m: int, duration_ms: int, toll_fare: int = 0, fuel_price: int = 0) -> None:
+        self.distance_m = distance_m
+        self.duration_ms = duration_ms
+        self.toll_fare = toll_fare
+        self.fuel_price = fuel_price
+
+    @property
+    def distance_km(self) -> float:
+        return self.distance_m / 1000
+
+    @property
+    def duration_min(self) -> float:
+        return self.duration_ms / 1000 / 60
+
+    def to_dict(self) -> dict:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+class NaverMapsClient:
+
+    BASE_URL = "https://maps.apigw.ntruss.com"
+    DRIVING_PATH = "/map-direction/v1/driving"
+    GEOCODE_PATH = "/map-geocode/v2/geocode"
+    REVERSE_GEOCODE_PATH = "/map-reversegeocode/v2/gc"
+    LATENCY_WINDOW = 1024
+
+    def __init__(
+            self,
+            client_id: str,
+            client_secret: str,
+            *,
+            base_url: Optional[str] = None,
+            hospitals: Optional["ErAvailabilityIndex"] = None,
+            max_concurrency: int = 8,
+            timeout: float = 10.0,
+            route_ttl: float = 300.0,
+            geocode_ttl: float = 86_400.0,
+            cache_size: int = 10_000,
+            cell_deg: float = 0.001,
+    ) -> None:
+        """Naver Maps(Directions 5, Geocoding) API 비동기 클라이언트이다.
+
+        - 요청은 하나의 aiohttp 세션(커넥션 풀)을 공유하고, `max_concurrency`개까지 동시에 보낸다.
+        - 경로 결과는 (출발 셀, 도착 셀, option) 키로 `route_ttl`초 동안 캐시한다.
+          좌표는 `cell_deg`(기본 0.001도, 약 100m) 격자에 맞춰(Snap) 요청하므로 가까운 위치의 요청이 캐시를 공유한다.
+        - 같은 키의 요청이 동시에 들어오면 API는 한 번만 호출된다.
+        - 지오코딩/역지오코딩 결과는 `geocode_ttl`초 동안 캐시한다.
+
+        Args:
+            client_id (str): `X-NCP-APIGW-API-KEY-ID`
+            client_secret (str): `X-NCP-APIGW-API-KEY`
+            base_url (Optional[str]): API 주소. (테스트 시 로컬 서버 주소)
+            hospitals (Optional[ErAvailabilityIndex]): `eta_matrix()`에서 HPID의 좌표를 찾을 인덱스.
+            max_concurrency (int): 동시에 보낼 최대 요청 수.
+            timeout (float): 요청 타임아웃(초).
+            route_ttl (float): 경로 캐시 유효 시간(초). 실시간 교통 반영 주기에 맞춘다.
+            geocode_ttl (float): 지오코딩 캐시 유효 시간(초).
+            cache_size (int): 캐시별 최대 항목 수.
+            cell_deg (float): 좌표 Snap 격자 크기(도).
+
+        Examples:
+
+            ```python
+            async with NaverMapsClient.from_env(hospitals=availability) as naver:
+                candidates = spatial.nearest_ers(lat, lon, 5, min_beds=1)
+                [row] = await naver.eta_matrix([(lat, lon)], [c.hpid for c in candidates])
+                fastest = min(zip(candidates, row), key=lambda x: x[1].duration_ms if x[1] else float('inf'))
+            ```
+        """
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be >= 1")
+        self._headers = {
+            "X-NCP-APIGW-API-KEY-ID": client_id,
+            "X-NCP-APIGW-API-KEY": client_secret,
+        }
+        self._base_url = (base_url or self.BASE_URL).rstrip('/')
+        self._hospitals = hospitals
+        self._max_concurrency = max_concurrency
+        self._timeout = aiohttp.ClientTimeout(total=timeout)
+        self._cell_deg = cell_deg
+        self._routes: AsyncTtlLruCache[Optional[RouteSummary]] = AsyncTtlLruCache(cache_size, route_ttl)
+        self._geocodes: AsyncTtlLruCache[dict] = AsyncTtlLruCache(cache_size, geocode_ttl)
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+        self._requests = 0
+        self._errors = 0
+        self._latencies_ms: deque[float] = deque(maxlen=self.LATENCY_WINDOW)
+
+    @classmethod
+    def from_env(cls, **kwargs) -> "NaverMapsClient":
+        """환경변수 `NAVER_API_CLIENT_ID`, `NAVER_API_SECRET_KEY`로 클라이언트를 만든다."""
+        client_id = os.getenv('NAVER_API_CLIENT_ID')
+        client_secret = os.getenv('NAVER_API_SECRET_KEY')
+        if not client_id or not client_secret:
+            raise ValueError("NAVER_API_CLIENT_ID and NAVER_API_SECRET_KEY must be set")
+        return cls(client_id, client_secret, **kwargs)
+
+    async def __aenter__(self) -> "NaverMapsClient":
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(limit=self._max_concurrency, keepalive_timeout=30)
+            self._session = aiohttp.ClientSession(
+                connector=connector, timeout=self._timeout, headers=self._headers
+            )
+            self._semaphore = asyncio.Semaphore(self._max_concurrency)
+        return self._session
+
+    async def _get_json(self, path: str, params: dict) -> dict:
+        session = self._get_session()
+        async with self._semaphore:
+            started = perf_counter()
+            self._requests += 1
+            try:
+                async with session.get(self._base_url + path, params=params) as resp:
+                    if resp.status != 200:
+                        raise NaverMapsError(resp.status, await resp.text())
+                    return await resp.json(content_type=None)
+            except Exception:
+                self._errors += 1
+                raise
+            finally:
+                self._latencies_ms.append((perf_counter() - started) * 1000)
+
+    def _snap(self, point: LatLon) -> tuple[int, int]:
+        return round(point[0] / self._cell_deg), round(point[1] / self._cell_deg)
+
+    def _cell_center(self, cell: tuple[int, int]) -> str:
+        # Naver API 좌표 순서는 "경도,위도"
+        return f"{cell[1] * self._cell_deg:.7f},{cell[0] * self._cell_deg:.7f}"
+
+    async def driving(
+            self,
+            start: LatLon,
+            goal: LatLon,
+            *,
+            option: str = "trafast",
+    ) -> Optional[RouteSummary]:
+        """출발지에서 도착지까지의 주행 거리/시간을 반환한다. 경로가 없으면 None.
+
+        Args:
+            start (tuple[float, float]): 출발지 (위도, 경도).
+            goal (tuple[float, float]): 도착지 (위도, 경도).
+            option (str): 경로 옵션. (`trafast`: 실시간 빠른길, `tracomfort`, `traoptimal` 등)
+        """
+        start_cell, goal_cell = self._snap(start), self._snap(goal)
+
+        async def load() -> Optional[RouteSummary]:
+            data = await self._get_json(self.DRIVING_PATH, {
+                "start": self._cell_center(start_cell),
+                "goal": self._cell_center(goal_cell),
+                "option": option,
+            })
+            if data.get("code") != 0:
+                logging.debug(f"No driving route. code={data.get('code')} message={data.get('message')}")
+                return None
+            summary = data["route"][option][0]["summary"]
+            return RouteSummary(
+                summary["distance"],
+                summary["duration"],
+                summary.get("tollFare", 0),
+                summary.get("fuelPrice", 0),
+            )
+
+        return await self._routes.get_or_load((start_cell, goal_cell, option), load)
+
+    def _hospital_location(self, hpid: str) -> Optional[LatLon]:
+        if self._hospitals is None:
+            raise ValueError("hospitals index is required to resolve HPID coordinates")
+        hospital = self._hospitals.hospital(hpid)
+        if hospital is None or hospital.x_pos is None or hospital.y_pos is None:
+            return None
+        return float(hospital.y_pos), float(hospital.x_pos)
+
+    async def eta_matrix(
+            self,
+            origins: Sequence[LatLon],
+            hospital_ids: Sequence[str],
+            *,
+            option: str = "trafast",
+    ) -> list[list[Optional[RouteSummary]]]:
+        """출발지 × 병원(HPID)의 주행 거리/시간 행렬을 반환한다.
+
+        캐시에 있는 값은 바로 채우고, 없는 값만 최대 `max_concurrency`개씩 동시에 요청한다.
+        좌표가 없는 병원, 경로가 없는 조합, 요청이 실패한 조합은 None이 된다.
+
+        Returns:
+            `matrix[i][j]`: `origins[i]`에서 `hospital_ids[j]`까지의 `RouteSummary`.
+        """
+        goals = [self._hospital_location(hpid) for hpid in hospital_ids]
+        matrix: list[list[Optional[RouteSummary]]] = [[None] * len(goals) for _ in origins]
+        missing: list[tuple[int, int, LatLon, LatLon]] = []
+        for i, origin in enumerate(origins):
+            start_cell = self._snap(origin)
+            for j, goal in enumerate(goals):
+                if goal is None:
+                    continue
+                cached = self._routes.get((start_cell, self._snap(goal), option), _MISSING)
+                if cached is _MISSING:
+                    missing.append((i, j, origin, goal))
+                else:
+                    matrix[i][j] = cached
+
+        if missing:
+            results = await asyncio.gather(
+                *(self.driving(origin, goal, option=option) for _, _, origin, goal in missing),
+                return_exceptions=True,
+            )
+            for (i, j, _, _), result in zip(missing, results):
+                if isinstance(result, BaseException):
+                    logging.warning(f"Failed to get driving route for {hospital_ids[j]}: {result!r}")
+                    continue
+                matrix[i][j] = result
+        return matrix
+
+    async def geocode(self, query: str, **params) -> dict:
+        """주소 문자열을 좌표로 변환한다. (`map-geocode/v2/geocode` 응답 JSON)"""
+        key = ("geocode", " ".join(query.split()), tuple(sorted(params.items())))
+        return await self._geocodes.get_or_load(
+            key, lambda: self._get_json(self.GEOCODE_PATH, {"query": query, **params})
+        )
+
+    async def reverse_geocode(self, point: LatLon, *, orders: str = "admcode") -> dict:
+        """좌표(위도, 경도)를 주소로 변환한다. (`map-reversegeocode/v2/gc` 응답 JSON)"""
+        cell = self._snap(point)
+        return await self._geocodes.get_or_load(
+            ("reverse", cell, orders),
+            lambda: self._get_json(self.REVERSE_GEOCODE_PATH, {
+                "coords": self._cell_center(cell), "output": "json", "orders": orders,
+            }),
+        )
+
+    def get_stats(self) -> dict:
+        return {
+            "requests": self._requests,
+            "errors": self._errors,
+            "request_latency_ms": summarize_latencies(self._latencies_ms),
+            "route_cache": self._routes.get_stats(),
+            "geocode_cache": self._geocodes.get_stats(),
+        }
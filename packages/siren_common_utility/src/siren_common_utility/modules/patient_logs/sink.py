@@ -0,0 +1,238 @@
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from time import perf_counter
+import asyncio
+import logging
+
+from .store import PatientLogStore
+from ..az_service_bus import DeadLetterMessage
+from ..az_service_bus._stats import summarize_latencies
+from ..codec import PatientAlert, PatientAlertCodec
+
+from typing import Any, Mapping, Optional, Union
+
+__all__ = (
+    'PatientLogSink',
+)
+
+
+class PatientLogSink:
+
+    LATENCY_WINDOW = 4096
+
+    def __init__(
+            self,
+            store: PatientLogStore,
+            *,
+            codec: Optional[PatientAlertCodec] = None,
+            max_batch_rows: int = 500,
+            linger_ms: float = 50,
+            max_pending_rows: int = 5000,
+            max_in_flight: int = 2,
+    ) -> None:
+        """환자 알림을 모아 PATIENT_LOGS에 배치 INSERT 하는 Sink이다. (Array bind)
+
+        `write()`는 행을 버퍼에 넣고, 버퍼가 `max_batch_rows`에 도달하거나 첫 행이 들어온 뒤 `linger_ms`가
+        지나면 `store.insert_many()`(executemany)로 한 번에 기록한다. 기록은 전용 스레드에서 최대 `max_in_flight`개까지
+        동시에 실행되며, 모든 슬롯이 사용 중이면 그동안 들어온 행은 다음 배치에 합쳐진다.
+
+        `write()`는 해당 행이 커밋된 뒤 반환하므로, 핸들러(`handle`)로 사용하면 메세지는 행이 기록된 후에만
+        complete 된다. 기록 대기 행은 `max_pending_rows`개로 제한되고, 가득 차면 `write()`가 대기한다. (Backpressure)
+
+        배치가 특정 행 때문에 실패하면(`store.DATA_ERRORS`) 행 단위로 다시 기록하여 문제 행만 실패시킨다.
+        그 외 오류(연결 끊김 등)는 배치의 모든 행을 실패시키고, 메세지는 abandon 되어 재전달된다.
+
+        Args:
+            store (PatientLogStore): 저장소. (`OraclePatientLogStore`, `SQLitePatientLogStore`) Sink가 닫지 않는다.
+            codec (Optional[PatientAlertCodec]): 메세지 디코더. 기본값은 JSON.
+            max_batch_rows (int): 배치당 최대 행 수.
+            linger_ms (float): 배치를 채우기 위해 기다리는 최대 시간(ms).
+            max_pending_rows (int): 기록 대기 중인 최대 행 수.
+            max_in_flight (int): 동시에 실행되는 최대 배치 수. (커넥션 풀 크기 이하로 설정)
+
+        Examples:
+
+            ```python
+            sink = PatientLogSink(OraclePatientLogStore(pool), max_batch_rows=500, linger_ms=50)
+            await sink.consume(connector, 'emc-patient-alert', 'patient-logs')
+            await sink.aclose()
+            print(sink.get_stats())
+            ```
+        """
+        self._store = store
+        self._codec = codec or PatientAlertCodec()
+        self._max_batch_rows = max_batch_rows
+        self._linger = linger_ms / 1000
+        self._max_pending_rows = max_pending_rows
+        self._max_in_flight = max_in_flight
+
+        self._buffer: list[tuple[dict, asyncio.Future]] = []
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._flush_slots: Optional[asyncio.Semaphore] = None
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._flush_scheduled = False
+        self._tasks: set[asyncio.Task] = set()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._closed = False
+
+        self._pending = 0
+        self._rows_written = 0
+        self._rows_failed = 0
+        self._batches = 0
+        self._batch_errors = 0
+        self._row_fallbacks = 0
+        self._invalid_messages = 0
+        self._batch_rows: deque[int] = deque(maxlen=self.LATENCY_WINDOW)
+        self._flush_ms: deque[float] = deque(maxlen=self.LATENCY_WINDOW)
+
+    async def write(self, alert: Union[PatientAlert, Mapping[str, Any]]) -> None:
+        """알림 한 건을 기록하고, 커밋되면 반환한다.
+
+        Raises:
+            ValueError: 필드 형식이 잘못됨.
+            Exception: 저장소 오류. (`store.DATA_ERRORS`면 해당 행의 문제)
+        """
+        if not isinstance(alert, PatientAlert):
+            alert = PatientAlert.from_dict(alert)
+        await self._write_row(self._store.bind_row(alert.to_row()))
+
+    async def handle(self, message) -> None:
+        """`consume()` 핸들러. 잘못된 메세지와 저장소가 거부한 행은 Dead-letter로 보낸다."""
+        try:
+            row = self._store.bind_row(self._codec.from_message(message).to_row())
+        except ValueError as e:
+            self._invalid_messages += 1
+            raise DeadLetterMessage("InvalidPatientAlert", str(e)) from e
+        try:
+            await self._write_row(row)
+        except self._store.DATA_ERRORS as e:
+            raise DeadLetterMessage("PatientLogRejected", str(e)) from e
+
+    async def consume(self, connector, topic_name: str, subscription_name: str, **consume_kwargs) -> dict:
+        """`connector.consume()`로 구독의 알림을 기록한다.
+
+        배치가 채워지도록 `max_concurrency` 기본값은 `max_batch_rows * max_in_flight`(최대 `max_pending_rows`)이다.
+        """
+        consume_kwargs.setdefault(
+            'max_concurrency', min(self._max_pending_rows, self._max_batch_rows * self._max_in_flight)
+        )
+        return await connector.consume(topic_name, subscription_name, self.handle, **consume_kwargs)
+
+    async def _write_row(self, row: dict) -> None:
+        if self._closed:
+            raise RuntimeError("PatientLogSink is closed")
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self._max_pending_rows)
+            self._flush_slots = asyncio.Semaphore(self._max_in_flight)
+        await self._slots.acquire()
+        self._pending += 1
+        try:
+            future = asyncio.get_running_loop().create_future()
+            self._buffer.append((row, future))
+            if len(self._buffer) >= self._max_batch_rows:
+                self._schedule_flush()
+            elif self._timer is None and not self._flush_scheduled:
+                self._timer = asyncio.get_running_loop().call_later(self._linger, self._schedule_flush)
+            await future
+        finally:
+            self._pending -= 1
+            self._slots.release()
+
+    def _schedule_flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        # 슬롯을 기다리는 flush가 있으면 그 flush가 시작될 때 버퍼를 가져간다.
+        if self._flush_scheduled or not self._buffer:
+            return
+        self._flush_scheduled = True
+        task = asyncio.ensure_future(self._flush())
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _flush(self) -> None:
+        async with self._flush_slots:
+            self._flush_scheduled = False
+            entries = self._buffer[:self._max_batch_rows]
+            del self._buffer[:self._max_batch_rows]
+            if len(self._buffer) >= self._max_batch_rows:
+                self._schedule_flush()
+            elif self._buffer and self._timer is None:
+                self._timer = asyncio.get_running_loop().call_later(self._linger, self._schedule_flush)
+            if not entries:
+                return
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(self._max_in_flight, thread_name_prefix="patient-log-sink")
+
+            started = perf_counter()
+            try:
+                errors = await asyncio.get_running_loop().run_in_executor(
+                    self._executor, self._insert, [row for row, _ in entries]
+                )
+            except Exception as e:
+                errors = [e] * len(entries)
+            self._batches += 1
+            self._batch_rows.append(len(entries))
+            self._flush_ms.append((perf_counter() - started) * 1000)
+
+            for (_, future), error in zip(entries, errors):
+                if error is None:
+                    self._rows_written += 1
+                    if not future.done():
+                        future.set_result(None)
+                else:
+                    self._rows_failed += 1
+                    if not future.done():
+                        future.set_exception(error)
+
+    def _insert(self, rows: list[dict]) -> list[Optional[BaseException]]:
+        try:
+            self._store.insert_many(rows)
+            return [None] * len(rows)
+        except self._store.DATA_ERRORS as e:
+            if len(rows) == 1:
+                return [e]
+            self._row_fallbacks += 1
+            logging.warning(f"PATIENT_LOGS batch of {len(rows)} rows rejected ({e}), retrying row by row")
+        except Exception as e:
+            self._batch_errors += 1
+            logging.warning(f"PATIENT_LOGS batch of {len(rows)} rows failed: {type(e).__name__}: {e}")
+            return [e] * len(rows)
+
+        errors = []
+        for row in rows:
+            try:
+                self._store.insert_many([row])
+                errors.append(None)
+            except Exception as e:
+                errors.append(e)
+        return errors
+
+    async def flush(self) -> None:
+        """버퍼의 행을 바로 기록하고, 진행 중인 기록이 모두 끝날 때까지 기다린다."""
+        while self._buffer or self._tasks:
+            self._schedule_flush()
+            await asyncio.gather(*list(self._tasks), return_exceptions=True)
+
+    async def aclose(self) -> None:
+        """남은 행을 기록하고 기록 스레드를 정리한다. 저장소는 닫지 않는다."""
+        self._closed = True
+        await self.flush()
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def get_stats(self) -> dict:
+        """기록/실패 행 수, 배치 크기, 배치 기록 시간(ms), 대기 행 수를 반환한다."""
+        batch_rows = list(self._batch_rows)
+        return {
+            "pending": self._pending,
+            "rows_written": self._rows_written,
+            "rows_failed": self._rows_failed,
+            "invalid_messages": self._invalid_messages,
+            "batches": self._batches,
+            "batch_errors": self._batch_errors,
+            "row_fallbacks": self._row_fallbacks,
+            "avg_batch_rows": round(sum(batch_rows) / len(batch_rows), 1) if batch_rows else None,
+            "flush_ms": summarize_latencies(self._flush_ms),
+        }
@@ -0,0 +1,145 @@
+from abc import ABC, abstractmethod
+from datetime import datetime
+from pathlib import Path
+import sqlite3
+import threading
+
+from ..codec import PATIENT_LOG_COLUMNS
+
+from typing import Any, Union
+
+__all__ = (
+    'OraclePatientLogStore',
+    'PatientLogStore',
+    'SQLitePatientLogStore',
+    'patient_logs_insert_sql',
+)
+
+# 길이 제한이 없는 문자열 컬럼 (CLOB)
+_LOB_COLUMNS = tuple(c for c, limit in PATIENT_LOG_COLUMNS.items() if limit is None and c != 'CREATED_AT')
+
+
+def patient_logs_insert_sql(table: str = "PATIENT_LOGS") -> str:
+    """PATIENT_LOGS INSERT 문. (`LOG_ID`는 IDENTITY, `CREATED_AT`이 없으면 CURRENT_TIMESTAMP)
+
+    이름 기반 바인드(`:RAW_TEXT`)를 사용하므로 Oracle과 SQLite에서 같은 문장을 사용한다.
+    """
+    columns = ", ".join(PATIENT_LOG_COLUMNS)
+    values = ", ".join(
+        "COALESCE(:CREATED_AT, CURRENT_TIMESTAMP)" if c == 'CREATED_AT' else f":{c}" for c in PATIENT_LOG_COLUMNS
+    )
+    return f"INSERT INTO {table} ({columns}) VALUES ({values})"
+
+
+class PatientLogStore(ABC):
+    """PATIENT_LOGS 저장소의 인터페이스. `PatientLogSink`가 별도 스레드에서 호출한다.
+
+    `insert_many(rows)`는 모든 행을 하나의 트랜잭션으로 기록하고 커밋한 뒤 반환한다.
+    `DATA_ERRORS`는 특정 행 때문에 실패한 경우의 예외로, Sink는 이때만 행 단위로 다시 기록하여 문제 행을 걸러낸다.
+    """
+    DATA_ERRORS: tuple[type[BaseException], ...] = ()
+
+    def bind_row(self, row: dict) -> dict:
+        """`PatientAlert.to_row()`를 바인드 변수로 변환한다. 값이 잘못되면 ValueError."""
+        return row
+
+    @abstractmethod
+    def insert_many(self, rows: list[dict]) -> None:
+        """모든 행을 하나의 트랜잭션으로 기록하고 커밋한다."""
+
+    def close(self) -> None:
+        pass
+
+
+class OraclePatientLogStore(PatientLogStore):
+
+    def __init__(self, pool, *, table: str = "PATIENT_LOGS") -> None:
+        """python-oracledb 커넥션 풀을 사용하는 PATIENT_LOGS 저장소이다.
+
+        행들은 `executemany`의 배열 바인드로 한 번의 왕복에 기록된다. CLOB 컬럼(`RAW_TEXT`, `SYMPTOMS`)은
+        `DB_TYPE_LONG`으로 바인드하여 행마다 임시 LOB을 만들지 않는다.
+
+        Args:
+            pool: `oracledb.create_pool(...)`로 만든 커넥션 풀.
+            table (str): 테이블 이름. (예: `ER_USER.PATIENT_LOGS`)
+
+        Examples:
+
+            ```python
+            pool = oracledb.create_pool(user=..., password=..., dsn=..., min=1, max=4)
+            sink = PatientLogSink(OraclePatientLogStore(pool))
+            ```
+        """
+        try:
+            import oracledb
+        except ImportError as e:
+            raise ImportError("OraclePatientLogStore requires the 'oracledb' package") from e
+        self._oracledb = oracledb
+        self._pool = pool
+        self._sql = patient_logs_insert_sql(table)
+        self.DATA_ERRORS = (oracledb.IntegrityError, oracledb.DataError)
+
+    def bind_row(self, row: dict) -> dict:
+        created_at = row.get('CREATED_AT')
+        if isinstance(created_at, str):
+            # TIMESTAMP 컬럼은 세션 NLS 형식에 의존하지 않도록 datetime으로 바인드한다.
+            row = {**row, 'CREATED_AT': datetime.fromisoformat(created_at)}
+        return row
+
+    def insert_many(self, rows: list[dict]) -> None:
+        oracledb = self._oracledb
+        with self._pool.acquire() as connection:
+            with connection.cursor() as cursor:
+                cursor.setinputsizes(
+                    CREATED_AT=oracledb.DB_TYPE_TIMESTAMP,
+                    **{column: oracledb.DB_TYPE_LONG for column in _LOB_COLUMNS},
+                )
+                cursor.executemany(self._sql, rows)
+            connection.commit()
+
+
+class SQLitePatientLogStore(PatientLogStore):
+
+    DATA_ERRORS = (sqlite3.IntegrityError, sqlite3.DataError)
+
+    def __init__(self, path: Union[str, Path] = ":memory:", *, table: str = "PATIENT_LOGS") -> None:
+        """Oracle 없이 테스트/벤치마크하기 위한 SQLite PATIENT_LOGS 저장소이다.
+
+        테이블이 없으면 PATIENT_LOGS와 같은 컬럼으로 만든다. 파일 경로를 지정하면 WAL 모드를 사용한다.
+
+        Args:
+            path (str | Path): DB 파일 경로. 기본값은 메모리 DB.
+            table (str): 테이블 이름.
+        """
+        self._table = table
+        self._sql = patient_logs_insert_sql(table)
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(str(path), check_same_thread=False)
+        if str(path) != ":memory:":
+            self._connection.execute("PRAGMA journal_mode=WAL")
+        columns = ", ".join(
+            f"{c} TEXT DEFAULT CURRENT_TIMESTAMP" if c == 'CREATED_AT' else f"{c} TEXT" for c in PATIENT_LOG_COLUMNS
+        )
+        with self._connection:
+            self._connection.execute(
+                f"CREATE TABLE IF NOT EXISTS {table} (LOG_ID INTEGER PRIMARY KEY AUTOINCREMENT, {columns})"
+            )
+
+    def insert_many(self, rows: list[dict]) -> None:
+        with self._lock, self._connection:
+            self._connection.executemany(self._sql, rows)
+
+    def fetch_rows(self, where: str = "", params: Any = ()) -> list[dict]:
+        """기록된 행을 `LOG_ID` 순서로 반환한다. (확인용)"""
+        with self._lock:
+            cursor = self._connection.execute(f"SELECT * FROM {self._table} {where} ORDER BY LOG_ID", params)
+            names = [d[0] for d in cursor.description]
+            return [dict(zip(names, values)) for values in cursor.fetchall()]
+
+    def count(self) -> int:
+        with self._lock:
+            return self._connection.execute(f"SELECT COUNT(*) FROM {self._table}").fetchone()[0]
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
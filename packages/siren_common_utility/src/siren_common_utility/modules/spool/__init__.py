@@ -0,0 +1 @@
+from .segment_log import *
@@ -0,0 +1,2 @@
+from .metrics import *
+from .exporters import *
\ No newline at end of file
@@ -0,0 +1,111 @@
+from .metrics import TELEMETRY, MetricsRegistry, SpanRecord
+
+from typing import TYPE_CHECKING, Optional
+if TYPE_CHECKING:
+    from aiohttp import web
+
+__all__ = (
+    'OpenTelemetrySpanHook',
+    'PROMETHEUS_CONTENT_TYPE',
+    'prometheus_handler',
+    'render_prometheus',
+    'start_prometheus_server',
+)
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _labels(names: tuple, values: tuple, extra: Optional[tuple] = None) -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra is not None:
+        pairs.append(f'{extra[0]}="{extra[1]}"')
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value: float) -> str:
+    if value == float('inf'):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+def render_prometheus(registry: Optional[MetricsRegistry] = None) -> str:
+    """레지스트리를 Prometheus 텍스트 형식(0.0.4)으로 변환한다. 기본값은 `TELEMETRY.registry`."""
+    registry = registry or TELEMETRY.registry
+    if registry is None:
+        return ""
+    lines = []
+    for family in registry.collect():
+        lines.append(f"# HELP {family.name} {family.help}")
+        lines.append(f"# TYPE {family.name} {family.kind}")
+        for key, child in sorted(family.children.items()):
+            if family.kind == "counter":
+                lines.append(f"{family.name}{_labels(family.labelnames, key)} {_number(child.value)}")
+                continue
+            cumulative = 0
+            for bound, count in zip(family.buckets + (float('inf'),), child.counts):
+                cumulative += count
+                labels = _labels(family.labelnames, key, ("le", _number(bound)))
+                lines.append(f"{family.name}_bucket{labels} {cumulative}")
+            lines.append(f"{family.name}_sum{_labels(family.labelnames, key)} {_number(child.sum)}")
+            lines.append(f"{family.name}_count{_labels(family.labelnames, key)} {child.count}")
+    return "\n".join(lines) + "\n"
+
+
+def prometheus_handler(registry: Optional[MetricsRegistry] = None):
+    """aiohttp 라우트에 등록할 `/metrics` 핸들러를 만든다."""
+    from aiohttp import web
+
+    async def handler(request: "web.Request") -> "web.Response":
+        return web.Response(
+            body=render_prometheus(registry).encode('utf-8'),
+            headers={"Content-Type": PROMETHEUS_CONTENT_TYPE},
+        )
+    return handler
+
+
+async def start_prometheus_server(
+        port: int = 9464,
+        host: str = "0.0.0.0",
+        *,
+        registry: Optional[MetricsRegistry] = None,
+) -> "web.AppRunner":
+    """`http://{host}:{port}/metrics` 엔드포인트를 시작한다. 종료 시 `await runner.cleanup()`."""
+    from aiohttp import web
+
+    app = web.Application()
+    app.router.add_get("/metrics", prometheus_handler(registry))
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    await web.TCPSite(runner, host, port).start()
+    return runner
+
+
+class OpenTelemetrySpanHook:
+
+    def __init__(self, tracer_provider=None, *, instrumentation_name: str = "siren_common_utility") -> None:
+        """종료된 구간을 OpenTelemetry Span으로 내보내는 Span Hook이다. (`opentelemetry-api` 필요)
+
+        Examples:
+
+            ```python
+            TELEMETRY.add_span_hook(OpenTelemetrySpanHook())
+            ```
+        """
+        try:
+            from opentelemetry import trace
+        except ImportError as e:
+            raise ImportError("OpenTelemetrySpanHook requires the 'opentelemetry-api' package") from e
+        self._trace = trace
+        self._tracer = trace.get_tracer(instrumentation_name, tracer_provider=tracer_provider)
+
+    def __call__(self, span: SpanRecord) -> None:
+        attributes = {k: v for k, v in span.attributes.items() if isinstance(v, (str, bool, int, float))}
+        otel_span = self._tracer.start_span(span.name, start_time=span.start_ns, attributes=attributes)
+        if span.error is not None:
+            otel_span.record_exception(span.error)
+            otel_span.set_status(self._trace.Status(self._trace.StatusCode.ERROR, str(span.error)))
+        otel_span.end(end_time=span.end_ns)
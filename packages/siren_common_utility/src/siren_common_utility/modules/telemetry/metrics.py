@@ -0,0 +1,270 @@
+from bisect import bisect_left
+from time import perf_counter, time_ns
+import logging
+import threading
+
+from typing import Callable, Optional, Sequence
+
+__all__ = (
+    'DEFAULT_BUCKETS',
+    'MetricsRegistry',
+    'RATIO_BUCKETS',
+    'SpanRecord',
+    'TELEMETRY',
+    'Telemetry',
+)
+
+# 초 단위 지연 히스토그램 버킷 (1ms ~ 10s)
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# 비율(0~1) 히스토그램 버킷
+RATIO_BUCKETS = (0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9, 1.0)
+
+# 계측 지점에서 사용하는 기본 메트릭 (종류, 이름, 설명, 라벨, 버킷)
+_DEFAULT_METRICS = (
+    ("histogram", "siren_servicebus_send_seconds", "Service Bus send_messages latency.", ("topic",), DEFAULT_BUCKETS),
+    ("counter", "siren_servicebus_sent_messages_total", "Messages sent to Service Bus.", ("topic",), None),
+    ("counter", "siren_servicebus_send_errors_total", "Failed Service Bus send_messages calls.", ("topic",), None),
+    ("histogram", "siren_servicebus_batch_fill_ratio", "Batch size in bytes / max batch size.", ("topic",), RATIO_BUCKETS),
+    ("histogram", "siren_servicebus_receive_to_settle_seconds", "Time from receive to settlement.", ("entity", "outcome"), DEFAULT_BUCKETS),
+    ("counter", "siren_servicebus_lock_renewals_total", "Message lock renewals.", ("entity", "result"), None),
+    ("histogram", "siren_servicebus_queue_wait_seconds", "Time from enqueue to handler start per priority lane.", ("entity", "priority"), DEFAULT_BUCKETS),
+    ("histogram", "siren_relay_http_seconds", "Relay backend POST latency.", ("target", "status"), DEFAULT_BUCKETS),
+    ("counter", "siren_relay_http_requests_total", "Relay backend POST requests.", ("target", "status"), None),
+    ("counter", "siren_relay_retries_total", "Relay backend POST retries.", ("target",), None),
+    ("histogram", "siren_relay_slot_wait_seconds", "Relay wait for a concurrency slot per priority.", ("priority",), DEFAULT_BUCKETS),
+    ("counter", "siren_relay_circuit_rejections_total", "Relay requests rejected by an open circuit.", ("target",), None),
+    ("counter", "siren_relay_duplicates_total", "Relay deliveries skipped as duplicates.", ("target",), None),
+)
+
+
+class _CounterChild:
+    __slots__ = ('value',)
+
+    def __init__(self) -> None:
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.value += amount
+
+
+class _HistogramChild:
+    __slots__ = ('buckets', 'counts', 'sum', 'count')
+
+    def __init__(self, buckets: tuple[float, ...]) -> None:
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)     # 마지막은 +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class _MetricFamily:
+    __slots__ = ('kind', 'name', 'help', 'labelnames', 'buckets', 'children', '_lock')
+
+    def __init__(
+            self,
+            kind: str,
+            name: str,
+            help: str,
+            labelnames: Sequence[str],
+            buckets: Optional[Sequence[float]] = None,
+    ) -> None:
+        self.kind = kind
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets)) if buckets is not None else None
+        self.children: dict[tuple[str, ...], object] = {}
+        self._lock = threading.Lock()
+
+    def labels(self, **labels):
+        key = tuple(str(labels.get(name, '')) for name in self.labelnames)
+        child = self.children.get(key)
+        if child is None:
+            with self._lock:
+                child = self.children.get(key)
+                if child is None:
+                    child = _HistogramChild(self.buckets) if self.kind == "histogram" else _CounterChild()
+                    self.children[key] = child
+        return child
+
+
+class MetricsRegistry:
+
+    def __init__(self) -> None:
+        """카운터와 히스토그램을 보관하는 레지스트리. (`render_prometheus()`로 내보낸다)
+
+        라벨 조합별 값은 처음 기록할 때 만들어진다.
+        """
+        self._families: dict[str, _MetricFamily] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, kind: str, name: str, help: str, labelnames: Sequence[str], buckets=None) -> _MetricFamily:
+        with self._lock:
+            family = self._families.get(name)
+            if family is None:
+                family = self._families[name] = _MetricFamily(kind, name, help, labelnames, buckets)
+            elif family.kind != kind:
+                raise ValueError(f"Metric {name} is already registered as {family.kind}")
+            return family
+
+    def counter(self, name: str, help: str = "", labelnames: Sequence[str] = ()) -> _MetricFamily:
+        return self._register("counter", name, help, labelnames)
+
+    def histogram(
+            self,
+            name: str,
+            help: str = "",
+            labelnames: Sequence[str] = (),
+            buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> _MetricFamily:
+        return self._register("histogram", name, help, labelnames, buckets)
+
+    def get(self, name: str) -> Optional[_MetricFamily]:
+        return self._families.get(name)
+
+    def collect(self) -> list[_MetricFamily]:
+        return list(self._families.values())
+
+    def snapshot(self) -> dict:
+        """`{메트릭: {라벨 문자열: 값}}` 형태의 현재 값. 히스토그램은 `{count, sum}`."""
+        result = {}
+        for family in self.collect():
+            values = {}
+            for key, child in list(family.children.items()):
+                label = ",".join(f"{n}={v}" for n, v in zip(family.labelnames, key))
+                if family.kind == "histogram":
+                    values[label] = {"count": child.count, "sum": child.sum}
+                else:
+                    values[label] = child.value
+            result[family.name] = values
+        return result
+
+
+class SpanRecord:
+    """종료된 구간(Span) 정보. Span Hook에 전달된다."""
+    __slots__ = ('name', 'attributes', 'start_ns', 'end_ns', 'duration_s', 'error', '_started', '_hooks')
+
+    def __init__(self, name: str, attributes: dict, hooks: tuple) -> None:
+        self.name = name
+        self.attributes = attributes
+        self.start_ns = time_ns()
+        self.end_ns: Optional[int] = None
+        self.duration_s: Optional[float] = None
+        self.error: Optional[BaseException] = None
+        self._started = perf_counter()
+        self._hooks = hooks
+
+    def set_attribute(self, key: str, value) -> None:
+        self.attributes[key] = value
+
+    def __enter__(self) -> "SpanRecord":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.duration_s = perf_counter() - self._started
+        self.end_ns = self.start_ns + int(self.duration_s * 1e9)
+        self.error = exc
+        for hook in self._hooks:
+            try:
+                hook(self)
+            except Exception:
+                logging.debug(f"Span hook failed: {hook!r}", exc_info=True)
+
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def set_attribute(self, key: str, value) -> None:
+        pass
+
+    def __enter__(self) -> "_NoopSpan":
+        return self
+
+    def __exit__(self, *args) -> None:
+        pass
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+class Telemetry:
+
+    def __init__(self) -> None:
+        """패키지 전체의 계측 지점(Counter, Histogram, Span)을 모으는 진입점이다.
+
+        `enable()` 전에는 `enabled`가 False이고 Span Hook이 없으면 `span()`은 공유 No-op 객체를 반환하므로,
+        계측 코드는 `if TELEMETRY.enabled:` 속성 확인 한 번의 비용만 든다.
+
+        Examples:
+
+            ```python
+            from siren_common_utility.modules.telemetry import TELEMETRY, render_prometheus
+
+            registry = TELEMETRY.enable()
+            ...
+            print(render_prometheus(registry))
+            ```
+        """
+        self.enabled = False
+        self.registry: Optional[MetricsRegistry] = None
+        self._span_hooks: tuple[Callable[[SpanRecord], None], ...] = ()
+
+    def enable(self, registry: Optional[MetricsRegistry] = None) -> MetricsRegistry:
+        """메트릭 수집을 시작하고 레지스트리를 반환한다. 기본 메트릭이 등록된다."""
+        registry = registry or self.registry or MetricsRegistry()
+        for kind, name, help, labelnames, buckets in _DEFAULT_METRICS:
+            if kind == "histogram":
+                registry.histogram(name, help, labelnames, buckets)
+            else:
+                registry.counter(name, help, labelnames)
+        self.registry = registry
+        self.enabled = True
+        return registry
+
+    def disable(self) -> None:
+        """메트릭 수집을 멈춘다. (레지스트리 값은 유지된다)"""
+        self.enabled = False
+
+    def _family(self, kind: str, name: str, labels: dict) -> _MetricFamily:
+        family = self.registry.get(name)
+        if family is None:
+            # 기본 목록에 없는 메트릭은 처음 기록할 때 라벨 이름으로 등록한다.
+            if kind == "histogram":
+                family = self.registry.histogram(name, "", sorted(labels))
+            else:
+                family = self.registry.counter(name, "", sorted(labels))
+        return family
+
+    def inc(self, name: str, amount: float = 1.0, **labels) -> None:
+        if self.enabled:
+            self._family("counter", name, labels).labels(**labels).inc(amount)
+
+    def observe(self, name: str, value: float, **labels) -> None:
+        if self.enabled:
+            self._family("histogram", name, labels).labels(**labels).observe(value)
+
+    @property
+    def tracing(self) -> bool:
+        return bool(self._span_hooks)
+
+    def add_span_hook(self, hook: Callable[[SpanRecord], None]) -> None:
+        """구간이 끝날 때마다 `hook(SpanRecord)`를 호출한다. (예: `OpenTelemetrySpanHook`)"""
+        self._span_hooks = self._span_hooks + (hook,)
+
+    def remove_span_hook(self, hook: Callable[[SpanRecord], None]) -> None:
+        self._span_hooks = tuple(h for h in self._span_hooks if h != hook)
+
+    def span(self, name: str, **attributes):
+        """`with TELEMETRY.span("servicebus.send", topic=topic):` 형태로 구간을 측정한다."""
+        hooks = self._span_hooks
+        if not hooks:
+            return _NOOP_SPAN
+        return SpanRecord(name, attributes, hooks)
+
+
+TELEMETRY = Telemetry()
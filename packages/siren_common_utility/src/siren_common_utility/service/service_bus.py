@@ -3,37 +3,92 @@ __all__ = (
 )
 
 from azure.servicebus.aio import ServiceBusClient
-from azure.servicebus import ServiceBusMessage
-from typing import Optional, AsyncGenerator
+from azure.servicebus import ServiceBusMessage, NEXT_AVAILABLE_SESSION
+from typing import Any, Optional, AsyncGenerator, AsyncIterable, Iterable, Mapping, Union
 from azure.servicebus import ServiceBusReceivedMessage
-from typing import Optional
+from pathlib import Path
 
+from contextlib import AsyncExitStack
+import asyncio
 import logging
 
 try:
-    from ..modules.az_service_bus import AzureServiceBusSenderController
+    from ..modules.az_service_bus import (
+        AzureServiceBusBatchPublisher,
+        AzureServiceBusConsumerController,
+        AzureServiceBusOutbox,
+        AzureServiceBusPriorityConsumer,
+        AzureServiceBusSenderController,
+        AzureServiceBusSenderPool,
+        AzureServiceBusSessionMultiplexer,
+        BatchSendReport,
+        MessageHandler,
+        PRIORITY_PROPERTY,
+        async_send_batches,
+        ensure_message_id,
+        instrumented_send,
+        normalize_priority,
+    )
+    from ..modules.dedup import DedupStore
 except ImportError:
     import sys
     from pathlib import Path
     sys.path.append(
         str(Path(__file__).parent.parent)
     )
-    from modules.az_service_bus import AzureServiceBusSenderController
+    from modules.az_service_bus import (
+        AzureServiceBusBatchPublisher,
+        AzureServiceBusConsumerController,
+        AzureServiceBusOutbox,
+        AzureServiceBusPriorityConsumer,
+        AzureServiceBusSenderController,
+        AzureServiceBusSenderPool,
+        AzureServiceBusSessionMultiplexer,
+        BatchSendReport,
+        MessageHandler,
+        PRIORITY_PROPERTY,
+        async_send_batches,
+        ensure_message_id,
+        instrumented_send,
+        normalize_priority,
+    )
+    from modules.dedup import DedupStore
 
 
 class AzureServiceBusConnectorInstance:
     """Azure Service Bus에 연결하고 토픽과 Subscription 작업을 수행한다."""
     CONN_RETRY = 3
     CONN_LOGGING = False
+    SENDER_POOL_SIZE = 4          # 토픽당 최대 Sender(Link) 수
+    SENDER_IDLE_TIMEOUT = 300     # 유휴 Sender 정리 시간(초)
+    PUBLISH_LINGER_MS = 5         # publish() 배치 대기 시간(ms)
+    PUBLISH_MAX_BATCH = 100       # publish() 배치당 최대 메세지 수
+    PUBLISH_MAX_PENDING = 10_000  # publish() 대기 큐 크기
+    CONSUME_MAX_CONCURRENCY = 8   # consume() 동시 핸들러 수
+    SESSION_ACCEPT_TIMEOUT = 5    # consume_sessions() 세션 수락 대기 시간(초)
+    OUTBOX_SEGMENT_BYTES = 16 * 1024 * 1024   # Outbox 세그먼트 파일 크기
+    OUTBOX_GROUP_COMMIT_MS = 2    # Outbox append를 모아 디스크에 반영하는 시간(ms)
+    OUTBOX_MAX_BATCH = 100        # Outbox 전송 배치당 최대 메세지 수
+    OUTBOX_CLOSE_DRAIN_TIMEOUT = 5    # aclose() 시 Outbox 전송을 기다리는 시간(초)
+    PRIORITY_TOPIC_FORMAT: Optional[str] = None   # 우선순위별 토픽 이름 (예: "{topic}-{priority}"). None이면 같은 토픽
+    PRIORITY_IMMEDIATE = ('critical',)    # publish()에서 배치 대기 없이 바로 전송하는 우선순위
+    PRIORITY_RESERVED_CONCURRENCY = 1     # consume_priority()에서 가장 높은 Lane 전용 슬롯 수
 
     def __init__(
             self,
-            ns_connection_string: str,
+            ns_connection_string: Optional[str] = None,
+            *,
+            transport=None,
+            outbox_dir: Optional[Union[str, Path]] = None,
     ) -> None:
         """Service Bus에 대한 서비스 구현 클래스이다.
 
         Args:
             ns_connection_string (str): 네임스페이스 연결 문자열을 입력한다. (RootManageSharedAccessKey)
+            transport: `ServiceBusClient`(aio) 대신 사용할 클라이언트 객체.
+                `InMemoryServiceBus`를 넘기면 네임스페이스 없이 로컬에서 테스트/벤치마크할 수 있다.
+            outbox_dir (str | Path): 지정하면 `send_to_topic()`이 메세지를 이 디렉토리의 Outbox에
+                기록한 뒤 바로 반환하고, 백그라운드에서 전송한다. (`AzureServiceBusOutbox`)
 
         Examples:
         ```python
@@ -65,18 +120,122 @@ class AzureServiceBusConnectorInstance:
 
         ```
 
+        Sender는 토픽별로 풀링되어 재사용되므로, 사용이 끝나면 `aclose()`를 호출하거나
+        `async with` 블록으로 사용한다.
+
+        ```python
+            async with AzureServiceBusConnectorInstance(namespace) as az_service_bus_instance:
+                await az_service_bus_instance.send_to_topic(topic, messages=[...])
+                print(az_service_bus_instance.get_stats())
+        ```
+
+        네임스페이스 없이 실행하려면 프로세스 내 브로커를 Transport로 사용한다.
+
+        ```python
+            bus = InMemoryServiceBus()
+            bus.create_subscription('emc-patient-alert', 'seoul', sql_filter="Region = 'Seoul'")
+            async with AzureServiceBusConnectorInstance(transport=bus) as az_service_bus_instance:
+                ...
+        ```
+
         """
         self.__ns_connection_string = ns_connection_string
-        self._client = ServiceBusClient.from_connection_string(
-            conn_str=self.__ns_connection_string, 
-            retry_total=self.CONN_RETRY,
-            logging_enable=self.CONN_LOGGING
+        if transport is not None:
+            self._client = transport
+        elif ns_connection_string:
+            self._client = ServiceBusClient.from_connection_string(
+                conn_str=self.__ns_connection_string, 
+                retry_total=self.CONN_RETRY,
+                logging_enable=self.CONN_LOGGING
+            )
+        else:
+            raise ValueError("ns_connection_string or transport is required")
+        self._sender_pool = AzureServiceBusSenderPool(
+            self._client,
+            max_senders_per_topic=self.SENDER_POOL_SIZE,
+            idle_timeout=self.SENDER_IDLE_TIMEOUT,
+        )
+        self._publisher: Optional[AzureServiceBusBatchPublisher] = None
+        self._consumers: dict[str, Union[AzureServiceBusConsumerController, AzureServiceBusPriorityConsumer]] = {}
+        self._session_consumers: dict[str, AzureServiceBusSessionMultiplexer] = {}
+        self._immediate_sends: set[asyncio.Task] = set()
+        self._outbox: Optional[AzureServiceBusOutbox] = None
+        if outbox_dir is not None:
+            self._outbox = AzureServiceBusOutbox(
+                outbox_dir,
+                self._send_messages,
+                max_batch_messages=self.OUTBOX_MAX_BATCH,
+                segment_bytes=self.OUTBOX_SEGMENT_BYTES,
+                group_commit_ms=self.OUTBOX_GROUP_COMMIT_MS,
+            )
+
+    async def __aenter__(self) -> "AzureServiceBusConnectorInstance":
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        """대기 중인 publish() 메세지를 전송한 뒤, 풀링된 Sender와 클라이언트 연결을 모두 닫는다.
+
+        Outbox는 `OUTBOX_CLOSE_DRAIN_TIMEOUT`초 동안 전송을 기다리고, 남은 메세지는 디스크에 보관한다.
+        """
+        if self._outbox is not None:
+            await self._outbox.aclose(self.OUTBOX_CLOSE_DRAIN_TIMEOUT)
+        if self._publisher is not None:
+            await self._publisher.aclose()
+        if self._immediate_sends:
+            await asyncio.gather(*self._immediate_sends, return_exceptions=True)
+        await self._sender_pool.aclose()
+        await self._client.close()
+
+    def get_stats(self) -> dict:
+        """Sender 풀 통계(열린 링크 수, 전송 지연시간 등)를 반환한다."""
+        stats = {
+            "sender_pool": self._sender_pool.get_stats(),
+        }
+        if self._publisher is not None:
+            stats["publisher"] = self._publisher.get_stats()
+        if self._outbox is not None:
+            stats["outbox"] = self._outbox.get_stats()
+        if self._consumers:
+            stats["consumers"] = {key: c.get_stats() for key, c in self._consumers.items()}
+        if self._session_consumers:
+            stats["session_consumers"] = {key: c.get_stats() for key, c in self._session_consumers.items()}
+        return stats
+
+    async def _create_batch(self, topic_name: str):
+        async with self._sender_pool.acquire(topic_name) as sender:
+            return await sender.create_message_batch()
+
+    async def _send_batch(self, topic_name: str, batch) -> None:
+        await self._sender_pool.run(
+            topic_name, lambda sender: instrumented_send(sender.send_messages, batch, topic_name)
+        )
+
+    async def _send_messages(self, topic_name: str, messages: list[ServiceBusMessage]) -> None:
+        await self._sender_pool.run(
+            topic_name, lambda sender: instrumented_send(sender.send_messages, messages, topic_name)
         )
 
+    def _route_priority(self, topic_name: str, priority: Any) -> tuple[str, str]:
+        """우선순위의 (전송 토픽, Lane 이름). `PRIORITY_TOPIC_FORMAT`이 있으면 Lane별 토픽으로 보낸다."""
+        priority = normalize_priority(priority)
+        if self.PRIORITY_TOPIC_FORMAT:
+            topic_name = self.PRIORITY_TOPIC_FORMAT.format(topic=topic_name, priority=priority)
+        return topic_name, priority
+
+    @staticmethod
+    def _set_priority(message: ServiceBusMessage, priority: str) -> ServiceBusMessage:
+        message.application_properties = {**(message.application_properties or {}), PRIORITY_PROPERTY: priority}
+        return message
+
     async def send_to_topic(
             self, 
             topic_name: str,
-            messages: list[ServiceBusMessage]
+            messages: list[ServiceBusMessage],
+            *,
+            priority: Any = None,
     ):
         """해당 토픽으로 메세지를 전송한다.
 
@@ -98,15 +257,368 @@ class AzureServiceBusConnectorInstance:
                 '예시 환자에 대한 응답 데이터 답변',
                 correlation_id='39mde-dj39d-0e9dz....'  # message_id는 자동으로 할당된다.
             )
+
+            priority: 우선순위 Lane. (`"critical"`, `"high"`, `"normal"`, `"low"` 또는 `Severity` 값)
+                메세지에 `Priority` 속성을 설정하고, `PRIORITY_TOPIC_FORMAT`이 있으면 Lane별 토픽으로 보낸다.
+                구독은 `priority_sql_filter("critical")` 형태의 필터로 Lane을 나눌 수 있다.
+
+        `outbox_dir`이 지정된 경우에는 메세지를 Outbox에 기록(디스크 반영)한 뒤 반환하며,
+        브로커 전송은 백그라운드에서 이루어진다. (`flush_outbox()`로 전송 완료를 기다릴 수 있다)
             
         """
-        logging.info(f"Service Bus Client Connected! Topic: {topic_name}")
-        # Topic에 대해 Sender를 얻는다.
-        sender = self._client.get_topic_sender(topic_name=topic_name)
-        
-        async with sender:
-            sender_controller = AzureServiceBusSenderController(sender)
-            await sender_controller.async_send_a_list_of_messages(messages)
+        if priority is not None:
+            topic_name, priority = self._route_priority(topic_name, priority)
+            messages = [self._set_priority(message, priority) for message in messages]
+        if self._outbox is not None:
+            if not self._outbox.running:
+                await self._outbox.start()
+            await self._outbox.append(topic_name, messages)
+            return
+        logging.debug(f"Sending to topic: {topic_name}")
+        # 재시도가 중복 전송이 되지 않도록 첫 시도 전에 message_id를 고정한다.
+        messages = [ensure_message_id(message) for message in messages]
+        # Topic에 대해 풀링된 Sender를 얻는다. (링크 오류 시 새 Sender로 재시도)
+        await self._sender_pool.run(
+            topic_name,
+            lambda sender: AzureServiceBusSenderController(sender).async_send_a_list_of_messages(messages)
+        )
+
+
+    async def flush_outbox(self, timeout: Optional[float] = None) -> bool:
+        """Outbox에 기록된 메세지가 모두 전송될 때까지 기다린다. 시간 내에 끝나면(또는 Outbox가 없으면) True."""
+        if self._outbox is None:
+            return True
+        if not self._outbox.running:
+            await self._outbox.start()
+        return await self._outbox.flush(timeout)
+
+
+    async def send_batch_to_topic(
+            self,
+            topic_name: str,
+            messages: Union[Iterable[ServiceBusMessage], AsyncIterable[ServiceBusMessage]],
+            *,
+            max_in_flight: Optional[int] = None,
+            priority: Any = None,
+    ) -> BatchSendReport:
+        """대량의 메세지를 최대 크기로 채운 배치들로 나누어 토픽에 전송한다.
+
+        메세지 수에 제한이 없으며, 배치는 풀링된 Sender를 통해 최대 `max_in_flight`개까지
+        동시에 전송된다. 일부 배치가 실패해도 나머지는 전송되고, 결과는 메세지별로 반환된다.
+
+        Args:
+            topic_name (str): 전송할 토픽 이름.
+            messages: 메세지 리스트 또는 AsyncIterable.
+            max_in_flight (Optional[int]): 동시 전송 배치 수. 기본값은 `SENDER_POOL_SIZE`.
+            priority: 우선순위 Lane. (`send_to_topic()` 참고)
+
+        Returns:
+            BatchSendReport: 메세지별 전송 결과. `report.ok`, `report.failed`로 확인한다.
+
+        Examples:
+
+            ```python
+            report = await az_service_bus_instance.send_batch_to_topic(
+                'er-availability', messages=[ServiceBusMessage(...) for row in rows]
+            )
+            if not report.ok:
+                retry = [rows[r.index] for r in report.failed]
+            ```
+        """
+        if priority is not None:
+            topic_name, priority = self._route_priority(topic_name, priority)
+            if isinstance(messages, AsyncIterable):
+                messages = (self._set_priority(message, priority) async for message in messages)
+            else:
+                messages = (self._set_priority(message, priority) for message in messages)
+        return await async_send_batches(
+            lambda: self._create_batch(topic_name),
+            lambda batch: self._send_batch(topic_name, batch),
+            messages,
+            max_in_flight=max_in_flight or self.SENDER_POOL_SIZE,
+        )
+
+
+    async def start_publisher(
+            self,
+            *,
+            linger_ms: Optional[float] = None,
+            max_batch_messages: Optional[int] = None,
+            max_pending: Optional[int] = None,
+    ) -> AzureServiceBusBatchPublisher:
+        """`publish()`에서 사용하는 백그라운드 배치 Publisher를 시작한다.
+
+        호출하지 않으면 첫 `publish()` 시점에 클래스 기본값(`PUBLISH_*`)으로 시작된다.
+        """
+        if self._publisher is None:
+            self._publisher = AzureServiceBusBatchPublisher(
+                self._create_batch,
+                self._send_batch,
+                linger_ms=self.PUBLISH_LINGER_MS if linger_ms is None else linger_ms,
+                max_batch_messages=max_batch_messages or self.PUBLISH_MAX_BATCH,
+                max_pending=max_pending or self.PUBLISH_MAX_PENDING,
+                max_in_flight=self.SENDER_POOL_SIZE,
+            )
+        await self._publisher.start()
+        return self._publisher
+
+    async def publish(self, topic_name: str, message: ServiceBusMessage, *, priority: Any = None) -> asyncio.Future:
+        """메세지를 배치 전송 큐에 넣고 바로 Future를 반환한다. (Micro-batching)
+
+        같은 토픽의 메세지는 `PUBLISH_LINGER_MS` 동안 모아 하나의 배치로 전송된다.
+        큐가 가득 찬 경우(`PUBLISH_MAX_PENDING`)에만 대기한다.
+
+        `priority`가 `PRIORITY_IMMEDIATE`에 속하면 큐와 배치 대기를 거치지 않고 바로 전송한다.
+        (일반 알림이 쌓여 있어도 뒤에서 기다리지 않는다)
+
+        Returns:
+            asyncio.Future: 전송 성공 시 None, 실패 시 예외로 완료된다.
+
+        Examples:
+
+            ```python
+            future = await az_service_bus_instance.publish(
+                'emc-patient-alert',
+                ServiceBusMessage(body, application_properties={"Region": region})
+            )
+            await future
+            ```
+        """
+        if priority is not None:
+            topic_name, priority = self._route_priority(topic_name, priority)
+            self._set_priority(message, priority)
+            if priority in self.PRIORITY_IMMEDIATE:
+                # 풀의 링크 오류 재시도가 중복 전송이 되지 않도록 첫 시도 전에 message_id를 고정한다.
+                ensure_message_id(message)
+                task = asyncio.ensure_future(self._send_messages(topic_name, [message]))
+                self._immediate_sends.add(task)
+                task.add_done_callback(self._immediate_sends.discard)
+                return task
+        if self._publisher is None or not self._publisher.running:
+            await self.start_publisher()
+        return await self._publisher.publish(topic_name, message)
+
+
+    async def consume(
+            self,
+            topic_name: str,
+            subscription_name: str,
+            handler: MessageHandler,
+            *,
+            max_concurrency: Optional[int] = None,
+            prefetch: Optional[int] = None,
+            stop: Optional[asyncio.Event] = None,
+            idle_timeout: Optional[float] = None,
+            max_lock_renewal_duration: Optional[float] = 300,
+            receiver_max_wait_time: Optional[float] = None,
+            receiver_additional_kwargs: Optional[dict] = None,
+            dedup: Optional[DedupStore] = None,
+    ) -> dict:
+        """구독의 메세지를 배치로 수신하여 핸들러를 동시에 실행한다.
+
+        `listening_subscribe_from_topic`과 달리 메세지를 하나씩 직렬로 처리하지 않는다.
+        최대 `max_concurrency`개의 핸들러가 동시에 실행되고, 각 메세지는 핸들러가 끝나는
+        즉시 개별로 정산된다. (정상: complete, `DeadLetterMessage`: dead-letter, 그 외 예외: abandon)
+
+        Args:
+            topic_name (str): 수신 토픽 이름.
+            subscription_name (str): 수신 구독 이름.
+            handler: `async def handler(msg)` 형태의 메세지 처리 함수.
+            max_concurrency (Optional[int]): 동시 핸들러 수. 기본값은 `CONSUME_MAX_CONCURRENCY`.
+            prefetch (Optional[int]): Receiver의 prefetch_count. 기본값은 `max_concurrency`.
+            stop (Optional[asyncio.Event]): set되면 수신을 멈추고 처리 중인 메세지를 정산한 뒤 반환한다.
+            idle_timeout (Optional[float]): 메세지가 없을 때 종료까지의 시간(초).
+            max_lock_renewal_duration (Optional[float]): 긴 핸들러의 잠금 자동 갱신 최대 시간(초).
+            dedup (Optional[DedupStore]): 지정하면 이미 처리한 `message_id`는 핸들러 없이 complete 한다.
+
+        Returns:
+            dict: 소비자 통계. (`get_stats()["consumers"]`에서도 확인할 수 있다.)
+
+        Examples:
+
+            ```python
+            async def handler(msg):
+                await notify_center(str(msg))
+
+            await az_service_bus_instance.consume(
+                'emc-patient-alert', 'gangwon', handler, max_concurrency=32, prefetch=64
+            )
+            ```
+        """
+        max_concurrency = max_concurrency or self.CONSUME_MAX_CONCURRENCY
+        receiver_kwargs = receiver_additional_kwargs or {}
+        receiver_kwargs.setdefault('prefetch_count', prefetch or max_concurrency)
+
+        receiver = self._client.get_subscription_receiver(
+            topic_name=topic_name,
+            subscription_name=subscription_name,
+            **receiver_kwargs
+        )
+        consumer = AzureServiceBusConsumerController(
+            receiver,
+            handler,
+            max_concurrency=max_concurrency,
+            max_lock_renewal_duration=max_lock_renewal_duration,
+            dedup=dedup,
+        )
+        self._consumers[f"{topic_name}/{subscription_name}"] = consumer
+        async with receiver:
+            logging.info(f"Subscribe [{subscription_name}] consume 시작... (max_concurrency={max_concurrency})")
+            await consumer.run(stop, max_wait_time=receiver_max_wait_time, idle_timeout=idle_timeout)
+        return consumer.get_stats()
+
+
+    async def consume_priority(
+            self,
+            topic_name: str,
+            subscriptions: Mapping[str, str],
+            handler: MessageHandler,
+            *,
+            weights: Optional[Mapping[str, int]] = None,
+            max_concurrency: Optional[int] = None,
+            reserved_concurrency: Optional[int] = None,
+            prefetch: Optional[int] = None,
+            stop: Optional[asyncio.Event] = None,
+            idle_timeout: Optional[float] = None,
+            max_lock_renewal_duration: Optional[float] = 300,
+            receiver_max_wait_time: Optional[float] = None,
+            receiver_additional_kwargs: Optional[dict] = None,
+            dedup: Optional[DedupStore] = None,
+    ) -> dict:
+        """우선순위 Lane별 구독을 함께 수신하여, 높은 Lane부터 가중 공정 순서로 핸들러를 실행한다.
+
+        슬롯이 비면 메세지가 있는 Lane 중 가중치(`weights`, 기본 critical:high:normal:low = 8:4:2:1) 비율로
+        다음 메세지를 고르므로 높은 Lane이 먼저 처리되면서도 낮은 Lane이 굶지 않는다. 가장 높은 Lane은
+        `reserved_concurrency`개의 전용 슬롯을 가지므로, 일반 알림이 몰려도 바로 실행된다.
+        `PRIORITY_TOPIC_FORMAT`이 있으면 Lane마다 해당 우선순위 토픽의 구독을 수신한다.
+
+        Args:
+            topic_name (str): 수신 토픽 이름.
+            subscriptions (Mapping[str, str]): 우선순위 → 구독 이름.
+            handler: `async def handler(msg)` 형태의 메세지 처리 함수.
+            weights (Optional[Mapping[str, int]]): 우선순위별 가중치.
+            max_concurrency (Optional[int]): 전체 동시 핸들러 수. 기본값은 `CONSUME_MAX_CONCURRENCY`.
+            reserved_concurrency (Optional[int]): 가장 높은 Lane 전용 슬롯 수. 기본값은 `PRIORITY_RESERVED_CONCURRENCY`.
+            prefetch (Optional[int]): Lane별로 미리 받아둘 메세지 수. 기본값은 `max_concurrency`.
+            stop (Optional[asyncio.Event]): set되면 수신을 멈추고 받아둔 메세지까지 정산한 뒤 반환한다.
+            idle_timeout (Optional[float]): 모든 Lane에 메세지가 없을 때 종료까지의 시간(초).
+            max_lock_renewal_duration (Optional[float]): 긴 핸들러의 잠금 자동 갱신 최대 시간(초).
+            dedup (Optional[DedupStore]): 지정하면 이미 처리한 `message_id`는 핸들러 없이 complete 한다.
+
+        Returns:
+            dict: Lane별 정산 통계와 큐 대기시간(`lanes[priority]["queue_wait_ms"]`의 p50/p95/p99/max).
+
+        Examples:
+
+            ```python
+            await az_service_bus_instance.consume_priority(
+                'emc-patient-alert',
+                {'critical': 'gangwon-critical', 'normal': 'gangwon-normal', 'low': 'gangwon-low'},
+                handler,
+                max_concurrency=32,
+                reserved_concurrency=8,
+            )
+            ```
+        """
+        max_concurrency = max_concurrency or self.CONSUME_MAX_CONCURRENCY
+        if reserved_concurrency is None:
+            reserved_concurrency = min(self.PRIORITY_RESERVED_CONCURRENCY, max_concurrency - 1)
+        prefetch = prefetch or max_concurrency
+        receiver_kwargs = dict(receiver_additional_kwargs or {})
+        receiver_kwargs.setdefault('prefetch_count', prefetch)
+
+        async with AsyncExitStack() as stack:
+            receivers = {}
+            for priority, subscription_name in subscriptions.items():
+                lane_topic, priority = self._route_priority(topic_name, priority)
+                receivers[priority] = await stack.enter_async_context(self._client.get_subscription_receiver(
+                    topic_name=lane_topic,
+                    subscription_name=subscription_name,
+                    **receiver_kwargs
+                ))
+            consumer = AzureServiceBusPriorityConsumer(
+                receivers,
+                handler,
+                weights=weights,
+                max_concurrency=max_concurrency,
+                reserved_concurrency=reserved_concurrency,
+                prefetch=prefetch,
+                max_lock_renewal_duration=max_lock_renewal_duration,
+                dedup=dedup,
+            )
+            key = f"{topic_name}/" + ",".join(f"{p}:{s}" for p, s in subscriptions.items())
+            self._consumers[key] = consumer
+            logging.info(
+                f"Subscribe {dict(subscriptions)} priority consume 시작... "
+                f"(max_concurrency={max_concurrency}, reserved={reserved_concurrency})"
+            )
+            await consumer.run(stop, max_wait_time=receiver_max_wait_time, idle_timeout=idle_timeout)
+        return consumer.get_stats()
+
+
+    async def consume_sessions(
+            self,
+            topic_name: str,
+            subscription_name: str,
+            handler: MessageHandler,
+            *,
+            max_sessions: int = 8,
+            session_idle_timeout: float = 10,
+            prefetch: int = 16,
+            stop: Optional[asyncio.Event] = None,
+            idle_timeout: Optional[float] = None,
+            receiver_additional_kwargs: Optional[dict] = None,
+            dedup: Optional[DedupStore] = None,
+    ) -> dict:
+        """세션 구독에서 최대 `max_sessions`개의 세션을 동시에 수락하여 처리한다.
+
+        세션마다 전용 워커가 메세지를 순서대로 처리하므로 환자(세션)별 알림/응답 순서는 유지되고,
+        서로 다른 세션은 병렬로 처리된다. `session_idle_timeout`초 동안 메세지가 없는 세션은
+        반납되고 다음 사용 가능한 세션을 수락한다.
+
+        Args:
+            topic_name (str): 수신 토픽 이름.
+            subscription_name (str): 세션이 활성화된 구독 이름.
+            handler: `async def handler(msg)` 형태의 메세지 처리 함수.
+            max_sessions (int): 동시에 처리할 최대 세션 수.
+            session_idle_timeout (float): 유휴 세션 반납 시간(초).
+            prefetch (int): 세션 Receiver의 prefetch_count. 핸들러가 실패하면 세션을 반납하므로
+                prefetch 된 메세지가 실패한 메세지를 앞지르지 않는다.
+            stop (Optional[asyncio.Event]): set되면 처리 중인 메세지를 정산하고 모든 세션을 반납한다.
+            idle_timeout (Optional[float]): 수락할 세션이 없을 때 워커 종료까지의 시간(초).
+            dedup (Optional[DedupStore]): 지정하면 이미 처리한 `message_id`는 핸들러 없이 complete 한다.
+
+        Returns:
+            dict: 세션 소비자 통계. (`get_stats()["session_consumers"]`에서 활성 세션 상태 확인)
+
+        Examples:
+
+            ```python
+            await az_service_bus_instance.consume_sessions(
+                'emc-center-response', 'field', handler, max_sessions=32
+            )
+            ```
+        """
+        receiver_kwargs = receiver_additional_kwargs or {}
+        receiver_kwargs.setdefault('prefetch_count', prefetch)
+        receiver_kwargs.setdefault('max_wait_time', self.SESSION_ACCEPT_TIMEOUT)
+
+        multiplexer = AzureServiceBusSessionMultiplexer(
+            lambda: self._client.get_subscription_receiver(
+                topic_name=topic_name,
+                subscription_name=subscription_name,
+                session_id=NEXT_AVAILABLE_SESSION,
+                **receiver_kwargs
+            ),
+            handler,
+            max_sessions=max_sessions,
+            session_idle_timeout=session_idle_timeout,
+            dedup=dedup,
+        )
+        self._session_consumers[f"{topic_name}/{subscription_name}"] = multiplexer
+        logging.info(f"Subscribe [{subscription_name}] session consume 시작... (max_sessions={max_sessions})")
+        await multiplexer.run(stop, idle_timeout=idle_timeout)
+        return multiplexer.get_stats()
 
 
     async def listening_subscribe_from_topic(
@@ -116,7 +628,8 @@ class AzureServiceBusConnectorInstance:
         session_id: Optional[str] = None,
         receiver_max_wait_time: Optional[float]=None,
         # receiver_max_message_count: Optional[int]=1,
-        receiver_additional_kwargs: Optional[dict]=None
+        receiver_additional_kwargs: Optional[dict]=None,
+        dedup: Optional[DedupStore]=None,
     ) -> AsyncGenerator[ServiceBusReceivedMessage, None]:
         """
         Azure Service Bus Topic 구독으로부터 메시지를 실시간으로 스트리밍한다.  
@@ -132,6 +645,8 @@ class AzureServiceBusConnectorInstance:
             topic_name (str): 수신 토픽 이름.
             subscription_name (str): 수신 구독 이름.
             session_id (Optional[str]): 특정 세션 ID. None일 경우 사용 가능한 세션을 자동으로 할당.
+            dedup (Optional[DedupStore]): 지정하면 이미 처리한 `message_id`는 yield 하지 않고 complete 한다.
+                (처리 도중 반복이 중단되면 선점을 해제하여 재전달 시 다시 yield 한다)
 
         Examples:
 
@@ -182,16 +697,34 @@ class AzureServiceBusConnectorInstance:
                 )
 
             async with receiver:
-                print(f"Subscribe [{subscription_name}] 스트리밍 시작...")
+                logging.info(f"Subscribe [{subscription_name}] 스트리밍 시작...")
                 async for msg in receiver:
+                    key = msg.message_id if dedup is not None else None
+                    claim = await dedup.try_claim(key) if key is not None else DedupStore.CLAIMED
+                    if claim == DedupStore.IN_FLIGHT:
+                        # 첫 전달이 아직 처리 중이면 완료하지 않고 되돌린다. (첫 처리가 실패하면 이 사본이 필요하다)
+                        logging.info(f"Message is still in flight, abandoning copy. message_id={key}")
+                        await receiver.abandon_message(msg)
+                        continue
+                    if claim != DedupStore.CLAIMED:
+                        logging.info(f"Skipping duplicate message. message_id={key}")
+                        await receiver.complete_message(msg)
+                        continue
                     # 외부(Caller)로 메시지를 전달
-                    yield msg
+                    try:
+                        yield msg
+                    except BaseException:
+                        if key is not None:
+                            await dedup.release(key)
+                        raise
                     # 주의: yield 이후에 코드를 배치하면 외부 처리가 끝난 후 실행
                     # 외부에서 에러 없이 처리되었다고 가정하고 메시지를 완료 처리
+                    if key is not None:
+                        await dedup.complete(key)
                     await receiver.complete_message(msg)
 
         except Exception as e:
-            print(f"Service Bus 수신 중 오류 발생: {e}")
+            logging.error(f"Service Bus 수신 중 오류 발생: {e!r}")
             raise e
 
     #--------------------------------------------------
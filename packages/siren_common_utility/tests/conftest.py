@@ -0,0 +1,40 @@
+from pathlib import Path
+
+import pytest
+
+from siren_common_utility import AzureServiceBusConnectorInstance
+from siren_common_utility.service import service_bus
+
+from utils.fake_service_bus import FakeServiceBusClient
+
+FAKE_CONNECTION_STR = (
+    "Endpoint=sb://fake.servicebus.windows.net/;"
+    "SharedAccessKeyName=RootManageSharedAccessKey;SharedAccessKey=fake"
+)
+
+# 저장소에 포함된 Oracle 시드 SQL (azure/oracle_db/sql)
+SEED_SQL_DIR = Path(__file__).resolve().parents[3] / "azure" / "oracle_db" / "sql"
+
+
+@pytest.fixture
+def fake_client(monkeypatch):
+    """커넥터가 생성하는 ServiceBusClient를 Fake 객체로 교체한다."""
+    client = FakeServiceBusClient()
+    monkeypatch.setattr(
+        service_bus.ServiceBusClient, "from_connection_string",
+        lambda *args, **kwargs: client
+    )
+    return client
+
+
+@pytest.fixture
+async def connector(fake_client):
+    async with AzureServiceBusConnectorInstance(FAKE_CONNECTION_STR) as instance:
+        yield instance
+
+
+@pytest.fixture(scope="session")
+def seed_sql_dir():
+    if not SEED_SQL_DIR.is_dir():
+        pytest.skip("Oracle seed SQL is not available")
+    return SEED_SQL_DIR
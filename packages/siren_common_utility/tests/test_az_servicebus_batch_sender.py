@@ -0,0 +1,71 @@
+import pytest
+
+from azure.servicebus import ServiceBusMessage
+from azure.servicebus.exceptions import ServiceBusAuthenticationError, ServiceBusServerBusyError
+from siren_common_utility.modules.az_service_bus import AzureServiceBusSenderController
+
+from utils.fake_service_bus import FakeSender
+
+
+def _messages(n, size=40):
+    return [ServiceBusMessage(f'{i:04d}'.ljust(size, 'x')) for i in range(n)]
+
+
+async def test_batch_message_splits_into_multiple_batches_without_loss():
+    sender = FakeSender('er-availability', batch_max_size=1024)
+    messages = _messages(100)
+
+    report = await AzureServiceBusSenderController(sender).async_send_batch_message(messages)
+
+    assert report.ok
+    assert report.batch_count > 1
+    assert sender.send_calls == report.batch_count
+    assert [m.message_id for m in sender.sent] == [m.message_id for m in messages]
+    assert not sender.closed
+
+
+async def test_batch_message_accepts_async_iterable():
+    sender = FakeSender('er-availability', batch_max_size=1024)
+
+    async def _stream():
+        for msg in _messages(30):
+            yield msg
+
+    report = await AzureServiceBusSenderController(sender).async_send_batch_message(_stream())
+
+    assert report.sent_count == 30
+    assert len(sender.sent) == 30
+
+
+async def test_oversized_and_failed_batches_are_reported_per_message():
+    sender = FakeSender('er-availability', batch_max_size=1024)
+    sender.fail_with.append(ServiceBusServerBusyError(message="busy"))
+    messages = _messages(10) + [ServiceBusMessage('y' * 4096)] + _messages(10)
+
+    report = await AzureServiceBusSenderController(sender).async_send_batch_message(messages)
+
+    failed = {r.index for r in report.failed}
+    assert 10 in failed
+    assert report.results[10].batch_index is None
+    first_batch = {r.index for r in report.results if r.batch_index == 0}
+    assert first_batch <= failed
+    assert report.sent_count == len(messages) - len(failed)
+
+
+async def test_authentication_error_is_raised():
+    sender = FakeSender('er-availability')
+    sender.fail_with.append(ServiceBusAuthenticationError(message="denied"))
+
+    with pytest.raises(ServiceBusAuthenticationError):
+        await AzureServiceBusSenderController(sender).async_send_batch_message(_messages(3))
+
+
+async def test_connector_send_batch_to_topic_uses_pooled_senders(connector, fake_client):
+    fake_client.batch_max_size = 1024
+
+    report = await connector.send_batch_to_topic('er-availability', _messages(200), max_in_flight=3)
+
+    assert report.ok
+    assert report.batch_count > 3
+    assert len(fake_client.sent_messages('er-availability')) == 200
+    assert connector.get_stats()["sender_pool"]["links_opened"] <= 3
@@ -0,0 +1,80 @@
+import asyncio
+
+from siren_common_utility.modules.az_service_bus import (
+    AzureServiceBusConsumerController,
+    DeadLetterMessage,
+)
+
+from utils.fake_service_bus import FakeReceivedMessage, FakeReceiver
+
+
+async def test_consume_runs_handlers_concurrently(connector, fake_client):
+    fake_client.subscriptions[('emc-patient-alert', 'gangwon')] = [
+        FakeReceivedMessage(f'alert {i}') for i in range(40)
+    ]
+    running = 0
+    peak = 0
+
+    async def handler(msg):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.02)
+        running -= 1
+
+    stats = await connector.consume(
+        'emc-patient-alert', 'gangwon', handler, max_concurrency=10, prefetch=20, idle_timeout=0.05
+    )
+
+    receiver = fake_client.receivers[0]
+    assert receiver.kwargs['prefetch_count'] == 20
+    assert len(receiver.completed) == 40
+    assert stats["completed"] == 40
+    assert peak == 10
+    assert connector.get_stats()["consumers"]["emc-patient-alert/gangwon"]["received"] == 40
+
+
+async def test_messages_are_settled_independently_and_out_of_order():
+    messages = [FakeReceivedMessage(i) for i in range(4)]
+    receiver = FakeReceiver(list(messages))
+
+    async def handler(msg):
+        await asyncio.sleep(0.04 - msg.body * 0.01)
+        if msg.body == 1:
+            raise RuntimeError("backend down")
+        if msg.body == 2:
+            raise DeadLetterMessage("InvalidPayload", "missing Region")
+
+    consumer = AzureServiceBusConsumerController(receiver, handler, max_concurrency=4)
+    await consumer.run(idle_timeout=0.05)
+
+    assert [m.body for m in receiver.completed] == [3, 0]
+    assert [m.body for m in receiver.abandoned] == [1]
+    assert receiver.dead_lettered == [(messages[2], "InvalidPayload", "missing Region")]
+
+
+async def test_long_handler_renews_message_lock():
+    message = FakeReceivedMessage('slow', lock_duration=0.05)
+    receiver = FakeReceiver([message])
+    consumer = AzureServiceBusConsumerController(receiver, lambda msg: asyncio.sleep(0.1))
+    consumer.LOCK_RENEW_MARGIN = 0.02
+
+    await consumer.run(idle_timeout=0.01)
+
+    assert receiver.renewed >= 2
+    assert consumer.get_stats()["lock_renewals"] == receiver.renewed
+    assert receiver.completed == [message]
+
+
+async def test_stop_event_drains_in_flight_handlers():
+    receiver = FakeReceiver([FakeReceivedMessage(i) for i in range(3)])
+    stop = asyncio.Event()
+
+    async def handler(msg):
+        stop.set()
+        await asyncio.sleep(0.02)
+
+    consumer = AzureServiceBusConsumerController(receiver, handler, max_concurrency=3)
+    await asyncio.wait_for(consumer.run(stop), timeout=1)
+
+    assert len(receiver.completed) == 3
@@ -11,6 +11,8 @@ try:
 except:
     pass
 
+from siren_common_utility.modules.az_service_bus import InMemoryServiceBus
+
 from utils.service_bus import start_subscribe_listening_loop
 
 load_dotenv()
@@ -18,11 +20,14 @@ load_dotenv()
 
 NS_CONNECTION_STR = os.getenv("AZURE_SERVICE_BUS_NS_CONNECTION_STR")
 
-# Environment variable checking
-assert bool(NS_CONNECTION_STR)
-
 # Init
-AZ_SERVICEBUS_INSTANCE = AzureServiceBusConnectorInstance(NS_CONNECTION_STR)
+if NS_CONNECTION_STR:
+    AZ_SERVICEBUS_INSTANCE = AzureServiceBusConnectorInstance(NS_CONNECTION_STR)
+else:
+    # 연결 문자열이 없으면 프로세스 내 브로커로 실행한다. (azure/service_bus/Setup_ServiceBus.md의 권역 필터)
+    _bus = InMemoryServiceBus()
+    _bus.create_subscription('emc-patient-alert', 'gangwon', sql_filter="Region = 'Gangwon'")
+    AZ_SERVICEBUS_INSTANCE = AzureServiceBusConnectorInstance(transport=_bus)
 
 
 async def test_az_servicebus_pub_to_emc_patient_alert():
@@ -0,0 +1,136 @@
+import asyncio
+
+import pytest
+from azure.servicebus import NEXT_AVAILABLE_SESSION, ServiceBusMessage, ServiceBusSubQueue
+from azure.servicebus.exceptions import MessageLockLostError, ServiceBusConnectionError
+
+from siren_common_utility import AzureServiceBusConnectorInstance
+from siren_common_utility.modules.az_service_bus import (
+    DeadLetterMessage,
+    InMemoryServiceBus,
+    compile_sql_filter,
+)
+
+
+def _alert(body, region, **kwargs):
+    return ServiceBusMessage(body, application_properties={"Region": region}, **kwargs)
+
+
+def test_sql_filter_expressions():
+    seoul = _alert('a', 'Seoul', correlation_id='c-1')
+    multi = _alert('b', '|Seoul|Honam|')
+    missing = ServiceBusMessage('c')
+
+    assert compile_sql_filter("Region = 'Seoul'")(seoul)
+    assert not compile_sql_filter("Region = 'Seoul'")(multi)
+    assert compile_sql_filter("Region LIKE '%|Honam|%'")(multi)
+    assert compile_sql_filter("region IN ('Jeju', 'Seoul') AND sys.CorrelationId = 'c-1'")(seoul)
+    assert compile_sql_filter("Region IS NULL OR NOT EXISTS(Region)")(missing)
+    # NULL 비교는 UNKNOWN이므로 NOT을 붙여도 매칭되지 않는다.
+    assert not compile_sql_filter("NOT (Region = 'Seoul')")(missing)
+    with pytest.raises(ValueError):
+        compile_sql_filter("Region = ")
+
+
+async def test_connector_fans_out_by_region_filter():
+    bus = InMemoryServiceBus()
+    for region in ('Seoul', 'Honam'):
+        bus.create_subscription('emc-patient-alert', region.lower(), sql_filter=f"Region LIKE '%|{region}|%'")
+
+    async with AzureServiceBusConnectorInstance(transport=bus) as connector:
+        await connector.send_to_topic('emc-patient-alert', [
+            _alert('to seoul', '|Seoul|'),
+            _alert('to both', '|Seoul|Honam|'),
+        ])
+        report = await connector.send_batch_to_topic(
+            'emc-patient-alert', [_alert(f'honam {i}', '|Honam|') for i in range(50)]
+        )
+        assert report.ok
+
+        received = []
+
+        async def handler(msg):
+            received.append(str(msg))
+
+        stats = await connector.consume('emc-patient-alert', 'seoul', handler, idle_timeout=0.05)
+
+    assert sorted(received) == ['to both', 'to seoul']
+    assert stats["completed"] == 2
+    topic_stats = bus.get_stats()["topics"]["emc-patient-alert"]
+    assert topic_stats["seoul"]["completed"] == 2
+    assert topic_stats["honam"]["active"] == 51
+
+
+async def test_lock_expiry_abandon_and_dead_letter():
+    bus = InMemoryServiceBus()
+    bus.create_subscription('alerts', 'sub', lock_duration=0.05, max_delivery_count=2)
+    await bus.get_topic_sender('alerts').send_messages([_alert('expire', 'Seoul'), _alert('bad', 'Seoul')])
+    receiver = bus.get_subscription_receiver('alerts', 'sub', max_wait_time=0.2)
+
+    first = await receiver.receive_messages(2)
+    await receiver.dead_letter_message(first[1], reason="InvalidPayload")
+    await asyncio.sleep(0.06)
+    with pytest.raises(MessageLockLostError):
+        await receiver.complete_message(first[0])
+
+    # 잠금 만료 후 재전달, abandon으로 최대 전달 횟수 초과 → 데드레터
+    [again] = await receiver.receive_messages(1)
+    assert again.message_id == first[0].message_id and again.delivery_count == 1
+    await receiver.abandon_message(again)
+    assert await receiver.receive_messages(1, max_wait_time=0.01) == []
+
+    dead = bus.get_subscription_receiver('alerts', 'sub', sub_queue=ServiceBusSubQueue.DEAD_LETTER)
+    reasons = sorted(m.dead_letter_reason for m in await dead.receive_messages(10, max_wait_time=0.01))
+    assert reasons == ['InvalidPayload', 'MaxDeliveryCountExceeded']
+    assert bus.get_stats()["topics"]["alerts"]["sub"]["lock_expirations"] == 1
+
+
+async def test_sessions_keep_order_and_are_exclusive():
+    bus = InMemoryServiceBus()
+    bus.create_subscription('emc-center-response', 'field', requires_session=True)
+    await bus.get_topic_sender('emc-center-response').send_messages([
+        ServiceBusMessage(f'{patient}-{i}', session_id=patient)
+        for i in range(5) for patient in ('p1', 'p2', 'p3')
+    ])
+
+    first = bus.get_subscription_receiver('emc-center-response', 'field', session_id=NEXT_AVAILABLE_SESSION)
+    async with first:
+        assert first.session.session_id == 'p1'
+        second = bus.get_subscription_receiver('emc-center-response', 'field', session_id=NEXT_AVAILABLE_SESSION)
+        async with second:
+            assert second.session.session_id == 'p2'
+        await first.session.set_state('triaged')
+
+    seen: dict[str, list[str]] = {}
+
+    async def handler(msg):
+        seen.setdefault(msg.session_id, []).append(str(msg))
+
+    async with AzureServiceBusConnectorInstance(transport=bus) as connector:
+        await connector.consume_sessions(
+            'emc-center-response', 'field', handler,
+            max_sessions=3, session_idle_timeout=0.05, idle_timeout=0.05,
+            receiver_additional_kwargs={'max_wait_time': 0.05},
+        )
+
+    assert seen == {p: [f'{p}-{i}' for i in range(5)] for p in ('p1', 'p2', 'p3')}
+    assert bus._topics['emc-center-response']['field'].sessions['p1'].state == b'triaged'
+
+
+async def test_injected_faults_and_consumer_settlement():
+    bus = InMemoryServiceBus(latency=(0.0, 0.002), seed=7)
+    bus.create_subscription('alerts', 'sub')
+    # 링크 오류는 Sender 풀이 새 Sender로 재시도한다.
+    bus.fail_next('send', ServiceBusConnectionError(message="link detached"))
+
+    async def handler(msg):
+        if str(msg) == 'poison':
+            raise DeadLetterMessage("InvalidPayload")
+
+    async with AzureServiceBusConnectorInstance(transport=bus) as connector:
+        await connector.send_to_topic('alerts', [_alert('ok', 'Seoul'), _alert('poison', 'Seoul')])
+        stats = await connector.consume('alerts', 'sub', handler, idle_timeout=0.05)
+
+    assert stats["completed"] == 1 and stats["dead_lettered"] == 1
+    assert [str(m) for m in bus.peek_dead_letters('alerts', 'sub')] == ['poison']
+    assert bus.get_stats()["injected_faults"] == 1
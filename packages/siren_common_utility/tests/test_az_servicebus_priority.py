@@ -0,0 +1,153 @@
+import asyncio
+
+import pytest
+from azure.servicebus import ServiceBusMessage
+
+from siren_common_utility import AzureServiceBusConnectorInstance
+from siren_common_utility.bench import find_relay_app, load_relay_app
+from siren_common_utility.modules.az_service_bus import (
+    InMemoryServiceBus,
+    message_priority,
+    normalize_priority,
+    priority_sql_filter,
+)
+
+LANES = {'critical': 'relay-critical', 'normal': 'relay-normal', 'low': 'relay-low'}
+
+
+def _bus() -> InMemoryServiceBus:
+    bus = InMemoryServiceBus()
+    for priority, subscription in LANES.items():
+        bus.create_subscription('emc-patient-alert', subscription, sql_filter=priority_sql_filter(priority))
+    return bus
+
+
+def _alert(name: str, **properties) -> ServiceBusMessage:
+    return ServiceBusMessage(name, application_properties={"Region": "|Seoul|", **properties})
+
+
+def test_priority_normalization():
+    assert normalize_priority("High") == "high"
+    assert normalize_priority(b"URGENT") == "critical"
+    assert normalize_priority(0) == "critical"
+    assert normalize_priority(None) == "normal"
+    with pytest.raises(ValueError):
+        normalize_priority("whenever")
+
+    assert message_priority(_alert("a", Severity="High")) == "high"
+    assert message_priority(_alert("a", Priority="low", Severity="High")) == "low"
+    assert message_priority(_alert("a", Severity="unknown")) == "normal"
+    assert priority_sql_filter("Critical") == "Priority = 'critical'"
+
+
+async def test_critical_lane_skips_routine_backlog():
+    started: list[str] = []
+
+    async def handler(msg):
+        started.append(str(msg))
+        await asyncio.sleep(0.005)
+
+    async with AzureServiceBusConnectorInstance(transport=_bus()) as connector:
+        await connector.send_to_topic('emc-patient-alert', [_alert(f"low-{i}") for i in range(120)], priority="low")
+        consumer = asyncio.create_task(connector.consume_priority(
+            'emc-patient-alert', LANES, handler, max_concurrency=4, reserved_concurrency=1, idle_timeout=0.1,
+        ))
+        await asyncio.sleep(0.05)
+        await connector.send_to_topic('emc-patient-alert', [_alert(f"critical-{i}") for i in range(5)], priority="critical")
+        stats = await consumer
+
+    first_critical = started.index("critical-0")
+    # 쌓여 있던 일반 알림 뒤에서 기다리지 않고 바로 실행된다.
+    assert max(started.index(f"critical-{i}") for i in range(5)) - first_critical < 10
+    assert first_critical < len(started) - 50
+    critical, low = stats["lanes"]["critical"], stats["lanes"]["low"]
+    assert critical["completed"] == 5 and low["completed"] == 120
+    assert critical["queue_wait_ms"]["max"] < low["queue_wait_ms"]["p50"]
+    assert stats["reserved_concurrency"] == 1
+
+
+async def test_weighted_fair_order_does_not_starve_low_lane():
+    started: list[str] = []
+
+    async def handler(msg):
+        started.append(str(msg).split("-")[0])
+        await asyncio.sleep(0.001)
+
+    async with AzureServiceBusConnectorInstance(transport=_bus()) as connector:
+        await connector.send_to_topic('emc-patient-alert', [_alert(f"low-{i}") for i in range(40)], priority="low")
+        await connector.send_to_topic('emc-patient-alert', [_alert(f"critical-{i}") for i in range(40)], priority="critical")
+        await connector.consume_priority(
+            'emc-patient-alert', LANES, handler,
+            max_concurrency=1, reserved_concurrency=0, prefetch=4, idle_timeout=0.1,
+        )
+
+    # 기본 가중치 critical:low = 8:1
+    window = started[4:40]
+    assert 3 <= window.count("low") <= 6
+    assert started.count("low") == started.count("critical") == 40
+
+
+async def test_priority_routing_to_lane_topics():
+    bus = InMemoryServiceBus()
+    for lane in ("critical", "high"):
+        bus.create_subscription(f'emc-patient-alert-{lane}', 'relay')
+
+    class Connector(AzureServiceBusConnectorInstance):
+        PRIORITY_TOPIC_FORMAT = "{topic}-{priority}"
+
+    async with Connector(transport=bus) as connector:
+        await connector.send_to_topic('emc-patient-alert', [_alert("arrest")], priority="High")
+        future = await connector.publish('emc-patient-alert', _alert("stemi"), priority="critical")
+        await future
+        # critical은 배치 Publisher를 거치지 않는다.
+        assert connector._publisher is None
+
+        received = {}
+
+        async def handler(msg):
+            received[str(msg)] = msg.application_properties["Priority"]
+
+        await connector.consume_priority(
+            'emc-patient-alert', {'critical': 'relay', 'high': 'relay'}, handler, idle_timeout=0.05,
+        )
+
+    assert received == {"arrest": "high", "stemi": "critical"}
+
+
+async def test_relay_limiter_reserves_slots_and_wakes_higher_priority_first():
+    if find_relay_app() is None:
+        pytest.skip("relay function app is not available")
+    pytest.importorskip("azure.functions")
+    relay = load_relay_app(find_relay_app())
+    assert relay._message_priority({"Severity": "High"}) == "high"
+    assert relay._highest_priority(["low", "critical", "normal"]) == "critical"
+
+    limiter = relay._PriorityLimiter(3, 1)
+    await limiter.acquire("normal")
+    await limiter.acquire("normal")
+    # 남은 1개는 예약 슬롯이므로 normal은 기다리고 high는 바로 얻는다.
+    normal = asyncio.create_task(limiter.acquire("normal"))
+    await asyncio.sleep(0)
+    assert not normal.done()
+    await asyncio.wait_for(limiter.acquire("high"), 0.1)
+
+    order = []
+
+    async def wait(priority):
+        await limiter.acquire(priority)
+        order.append(priority)
+
+    waiters = [asyncio.create_task(wait(p)) for p in ("low", "critical")]
+    await asyncio.sleep(0)
+    limiter.release()           # high → critical 먼저
+    await asyncio.sleep(0)
+    assert order == ["critical"] and not normal.done()
+    limiter.release()
+    await asyncio.sleep(0)
+    # 공유 슬롯이 비어야 normal → low 순서로 얻는다.
+    assert not normal.done()
+    limiter.release()
+    limiter.release()
+    await asyncio.wait_for(asyncio.gather(normal, *waiters), 0.1)
+    assert order == ["critical", "low"]
+    assert limiter.to_dict() == {"limit": 3, "reserved": 1, "in_flight": 2, "waiting": {}}
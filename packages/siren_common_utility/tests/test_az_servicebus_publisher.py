@@ -0,0 +1,65 @@
+import asyncio
+
+import pytest
+from azure.servicebus import ServiceBusMessage
+from azure.servicebus.exceptions import ServiceBusServerBusyError
+
+
+async def test_publish_coalesces_messages_into_batches(connector, fake_client):
+    fake_client.batch_max_size = 256 * 1024
+    await connector.start_publisher(linger_ms=20)
+
+    futures = [
+        await connector.publish('emc-patient-alert', ServiceBusMessage(f'alert {i}'))
+        for i in range(200)
+    ]
+    await asyncio.gather(*futures)
+
+    stats = connector.get_stats()
+    assert stats["publisher"]["messages_sent"] == 200
+    assert stats["publisher"]["batches_sent"] <= 200 // connector.PUBLISH_MAX_BATCH + 2
+    assert stats["sender_pool"]["sends"] == stats["publisher"]["batches_sent"]
+    assert len(fake_client.sent_messages('emc-patient-alert')) == 200
+
+
+async def test_single_message_is_sent_after_linger(connector, fake_client):
+    future = await connector.publish('emc-patient-alert', ServiceBusMessage('alone'))
+
+    await asyncio.wait_for(future, timeout=1)
+    assert len(fake_client.sent_messages()) == 1
+
+
+async def test_failed_batch_fails_only_its_callers(connector, fake_client):
+    fake_client.sender_failures.append(ServiceBusServerBusyError(message="throttled"))
+    await connector.start_publisher(linger_ms=1)
+
+    first = await connector.publish('emc-patient-alert', ServiceBusMessage('first'))
+    with pytest.raises(ServiceBusServerBusyError):
+        await first
+    second = await connector.publish('emc-patient-alert', ServiceBusMessage('second'))
+    await second
+
+    assert connector.get_stats()["publisher"]["messages_failed"] == 1
+
+
+async def test_queue_applies_backpressure_and_aclose_flushes(connector, fake_client):
+    fake_client.send_gate = asyncio.Event()
+    await connector.start_publisher(linger_ms=1, max_batch_messages=1, max_pending=2)
+
+    futures = []
+
+    async def _producer():
+        for i in range(20):
+            futures.append(await connector.publish('emc-patient-alert', ServiceBusMessage(str(i))))
+
+    producer = asyncio.create_task(_producer())
+    await asyncio.sleep(0.05)
+    assert not producer.done()
+    assert len(futures) < 20
+
+    fake_client.send_gate.set()
+    await producer
+    await connector.aclose()
+
+    assert all(f.done() and f.exception() is None for f in futures)
+    assert len(fake_client.sent_messages()) == 20
@@ -0,0 +1,134 @@
+import asyncio
+
+from azure.servicebus import ServiceBusMessage
+from azure.servicebus.exceptions import OperationTimeoutError, ServiceBusConnectionError
+
+from siren_common_utility.modules.az_service_bus import AzureServiceBusSenderPool
+from utils.fake_service_bus import FakeServiceBusClient
+
+
+def _without_id(body):
+    """`message_id`가 없는 메세지. (SDK 버전에 따라 생성 시 자동 할당되지 않는다)"""
+    message = ServiceBusMessage(body)
+    message.message_id = None
+    return message
+
+
+async def test_sender_link_is_reused_across_sends(connector, fake_client):
+    for i in range(20):
+        await connector.send_to_topic(
+            'emc-patient-alert', messages=[ServiceBusMessage(f'alert {i}')]
+        )
+
+    stats = connector.get_stats()["sender_pool"]
+    assert stats["links_opened"] == 1
+    assert stats["sends"] == 20
+    assert stats["send_latency_ms"]["p50"] is not None
+    assert len(fake_client.sent_messages('emc-patient-alert')) == 20
+
+
+async def test_concurrent_sends_are_bounded_by_pool_size(connector, fake_client):
+    await asyncio.gather(*(
+        connector.send_to_topic('emc-patient-alert', messages=[ServiceBusMessage(str(i))])
+        for i in range(50)
+    ))
+
+    assert connector.get_stats()["sender_pool"]["links_opened"] <= connector.SENDER_POOL_SIZE
+    assert len(fake_client.sent_messages()) == 50
+
+
+async def test_link_error_recreates_sender_transparently(connector, fake_client):
+    fake_client.sender_failures.append(ServiceBusConnectionError(message="link detached"))
+
+    await connector.send_to_topic('emc-patient-alert', messages=[ServiceBusMessage('retry me')])
+
+    stats = connector.get_stats()["sender_pool"]
+    assert stats["link_errors"] == 1
+    assert stats["links_opened"] == 2
+    assert fake_client.senders[0].closed
+    assert len(fake_client.sent_messages()) == 1
+
+
+async def test_retried_timeout_resends_with_pinned_message_id(connector, fake_client):
+    fake_client.sender_failures.append(OperationTimeoutError(message="send timed out"))
+    pinned = ServiceBusMessage('pinned', message_id='alert-1')
+
+    await connector.send_to_topic('emc-patient-alert', messages=[_without_id('retry me'), pinned])
+
+    sent = fake_client.sent_messages('emc-patient-alert')
+    assert connector.get_stats()["sender_pool"]["link_errors"] == 1
+    assert len(sent) == 2
+    assert sent[0].message_id is not None
+    assert sent[1].message_id == 'alert-1'
+
+
+async def test_immediate_publish_pins_message_id_before_retry(connector, fake_client):
+    fake_client.sender_failures.append(OperationTimeoutError(message="send timed out"))
+
+    future = await connector.publish('emc-patient-alert', _without_id('stemi'), priority='critical')
+    await future
+
+    [sent] = fake_client.sent_messages('emc-patient-alert')
+    assert connector.get_stats()["sender_pool"]["link_errors"] == 1
+    assert sent.message_id is not None
+
+
+async def test_batch_results_carry_assigned_message_ids(connector, fake_client):
+    report = await connector.send_batch_to_topic(
+        'emc-patient-alert', [_without_id(str(i)) for i in range(3)]
+    )
+
+    ids = [result.message_id for result in report.results]
+    assert None not in ids
+    assert ids == [m.message_id for m in fake_client.sent_messages('emc-patient-alert')]
+
+
+async def test_send_path_does_not_evict_idle_senders(connector, fake_client):
+    connector._sender_pool._idle_timeout = 0
+
+    await connector.send_to_topic('emc-patient-alert', messages=[ServiceBusMessage('a')])
+    await connector.send_to_topic('emc-patient-alert', messages=[ServiceBusMessage('b')])
+
+    # 유휴 링크 정리는 백그라운드에서만 수행한다.
+    stats = connector.get_stats()["sender_pool"]
+    assert stats["links_evicted"] == 0 and stats["links_opened"] == 1
+    assert not fake_client.senders[0].closed
+
+
+async def test_link_error_retry_discards_stale_idle_senders():
+    client = FakeServiceBusClient()
+    pool = AzureServiceBusSenderPool(client)
+    async with pool.acquire('emc-patient-alert'):
+        async with pool.acquire('emc-patient-alert'):
+            pass
+    outer, inner = client.senders
+    outer.fail_with.append(ServiceBusConnectionError(message="link detached"))
+
+    await pool.run('emc-patient-alert', lambda sender: sender.send_messages(ServiceBusMessage('retry me')))
+
+    # 가장 최근에 반환된 링크(outer)가 실패하면 남은 유휴 링크(inner)도 버리고 새 링크로 재시도한다.
+    assert outer.closed and inner.closed
+    assert len(client.senders) == 3 and len(client.senders[2].sent) == 1
+    await pool.aclose()
+
+
+async def test_aclose_closes_pooled_senders(connector, fake_client):
+    await connector.send_to_topic('emc-center-response', messages=[ServiceBusMessage('x')])
+    await connector.aclose()
+
+    assert all(s.closed for s in fake_client.senders)
+    assert fake_client.closed
+
+
+async def test_idle_sender_is_swept_without_further_sends():
+    client = FakeServiceBusClient()
+    pool = AzureServiceBusSenderPool(client, idle_timeout=0.02)
+    pool.MIN_SWEEP_INTERVAL = 0.01
+
+    await pool.run('emc-patient-alert', lambda sender: sender.send_messages(ServiceBusMessage('a')))
+    await asyncio.sleep(0.1)
+
+    assert client.senders[0].closed
+    assert pool.get_stats()["links_evicted"] == 1
+    await pool.aclose()
+    assert pool._sweeper.done()
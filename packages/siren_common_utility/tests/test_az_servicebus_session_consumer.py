@@ -0,0 +1,126 @@
+import asyncio
+from collections import defaultdict
+
+from azure.servicebus import NEXT_AVAILABLE_SESSION
+
+from siren_common_utility.modules.az_service_bus import AzureServiceBusSessionMultiplexer
+
+from utils.fake_service_bus import FakeReceivedMessage, FakeServiceBusClient, FakeSessionReceiver
+
+
+def _session_messages(sessions, per_session):
+    return [
+        FakeReceivedMessage((f'patient-{s}', i), session_id=f'patient-{s}')
+        for i in range(per_session) for s in range(sessions)
+    ]
+
+
+async def test_sessions_are_processed_in_parallel_and_in_order(connector, fake_client):
+    fake_client.subscriptions[('emc-center-response', 'field')] = _session_messages(6, 5)
+    seen = defaultdict(list)
+    running = 0
+    peak = 0
+
+    async def handler(msg):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        seen[msg.session_id].append(msg.body[1])
+        running -= 1
+
+    stats = await connector.consume_sessions(
+        'emc-center-response', 'field', handler,
+        max_sessions=3, session_idle_timeout=0.03, idle_timeout=0.05,
+    )
+
+    assert peak == 3
+    assert len(seen) == 6
+    assert all(order == list(range(5)) for order in seen.values())
+    assert stats["sessions_accepted"] == 6
+    assert stats["completed"] == 30
+    assert stats["active_sessions"] == 0
+    assert not fake_client.locked_sessions
+
+
+async def test_session_lock_is_renewed_and_state_exposed():
+    client = FakeServiceBusClient()
+    client.session_lock_duration = 0.05
+    client.subscriptions[('t', 's')] = [FakeReceivedMessage('slow', session_id='patient-1')]
+    stop = asyncio.Event()
+    multiplexer = None
+
+    async def handler(msg):
+        await multiplexer.set_session_state(msg.session_id, b'ack-sent')
+        await asyncio.sleep(0.12)
+        stop.set()
+
+    multiplexer = AzureServiceBusSessionMultiplexer(
+        lambda: client.get_subscription_receiver('t', 's', session_id='patient-1'),
+        handler,
+        max_sessions=1,
+    )
+    multiplexer.LOCK_RENEW_MARGIN = 0.02
+
+    run = asyncio.create_task(multiplexer.run(stop))
+    await asyncio.sleep(0.08)
+    session = multiplexer.get_stats()["sessions"]["patient-1"]
+    assert session["in_flight"] == 1
+    assert session["lock_renewals"] >= 1
+    await asyncio.wait_for(run, timeout=1)
+
+    assert client.session_states['patient-1'] == b'ack-sent'
+    assert multiplexer.get_stats()["completed"] == 1
+
+
+class PrefetchingSessionReceiver(FakeSessionReceiver):
+    """prefetch_count만큼 미리 받아두고, abandon 되거나 세션이 반납되면 메세지를 순서대로 되돌린다."""
+
+    def __init__(self, client, messages, prefetch_count):
+        super().__init__(client, messages, NEXT_AVAILABLE_SESSION)
+        self.prefetch_count = prefetch_count
+        self.buffer = []
+
+    async def receive_messages(self, max_message_count=1, max_wait_time=None):
+        if not self.buffer:
+            self.buffer = await super().receive_messages(self.prefetch_count, max_wait_time)
+        batch, self.buffer = self.buffer[:max_message_count], self.buffer[max_message_count:]
+        return batch
+
+    def _put_back(self, messages):
+        self.messages.extend(messages)
+        self.messages.sort(key=lambda m: m.body[1])
+
+    async def abandon_message(self, message):
+        await super().abandon_message(message)
+        self._put_back([message])
+
+    async def close(self):
+        self._put_back(self.buffer)
+        self.buffer = []
+        await super().close()
+
+
+async def test_failed_message_is_not_overtaken_by_prefetched_messages():
+    client = FakeServiceBusClient()
+    client.subscriptions[('t', 's')] = _session_messages(1, 5)
+    seen = []
+    failed = set()
+
+    async def handler(msg):
+        if msg.body[1] == 1 and not failed:
+            failed.add(msg.body[1])
+            raise RuntimeError("backend down")
+        seen.append(msg.body[1])
+
+    multiplexer = AzureServiceBusSessionMultiplexer(
+        lambda: PrefetchingSessionReceiver(client, client.subscriptions[('t', 's')], prefetch_count=16),
+        handler,
+        max_sessions=1,
+        session_idle_timeout=0.03,
+    )
+    await multiplexer.run(idle_timeout=0.05)
+
+    assert seen == [0, 1, 2, 3, 4]
+    stats = multiplexer.get_stats()
+    assert stats["failure_releases"] == 1 and stats["sessions_accepted"] == 2
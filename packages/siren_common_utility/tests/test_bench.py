@@ -0,0 +1,61 @@
+import copy
+import json
+
+import pytest
+
+from siren_common_utility.bench import BenchConfig, compare_reports, find_relay_app, run_benchmarks
+from siren_common_utility.bench.__main__ import main
+
+
+async def test_run_benchmarks_reports_every_sweep_point():
+    config = BenchConfig(
+        scenarios=["publish", "pubsub", "listen"],
+        messages=40, sizes=[128], concurrency=[1, 4], batch_sizes=[1, 8],
+    )
+    report = await run_benchmarks(config)
+
+    keys = [(r["scenario"], r["params"]) for r in report["results"]]
+    assert len(keys) == 4 + 2 + 1
+    for result in report["results"]:
+        assert result["messages"] == 40 and result["errors"] == 0
+        assert result["msgs_per_s"] > 0
+        assert set(result["latency_ms"]) == {"p50", "p95", "p99", "max", "mean"}
+        assert result["cpu_s"] >= 0
+    json.dumps(report)
+
+
+async def test_relay_fanout_against_mock_backend():
+    if find_relay_app() is None:
+        pytest.skip("relay function app is not available")
+    pytest.importorskip("azure.functions")
+    config = BenchConfig(
+        scenarios=["relay"], relay_messages=20, sizes=[128], concurrency=[4], fanout=[3], backend_latency_ms=1,
+    )
+    report = await run_benchmarks(config)
+
+    [result] = report["results"]
+    assert result["params"] == {"size": 128, "fanout": 3, "concurrency": 4}
+    assert result["posts"] == 60 and result["errors"] == 0
+
+
+def test_compare_reports_flags_regressions(tmp_path, capsys):
+    baseline = {"results": [{
+        "scenario": "publish", "params": {"size": 256, "concurrency": 8},
+        "msgs_per_s": 1000.0, "latency_ms": {"p99": 10.0},
+    }]}
+    slower = copy.deepcopy(baseline)
+    slower["results"][0]["msgs_per_s"] = 800.0
+    same = copy.deepcopy(baseline)
+    same["results"][0]["latency_ms"]["p99"] = 10.5
+
+    [row] = compare_reports(baseline, slower, threshold=0.1)
+    assert row["regression"] and row["msgs_per_s"] == (1000.0, 800.0, -0.2)
+    assert not compare_reports(baseline, same, threshold=0.1)[0]["regression"]
+
+    # CLI: 저장한 리포트와 비교한다.
+    output = tmp_path / "bench.json"
+    args = ["--scenarios", "publish", "--messages", "20", "--sizes", "64", "--concurrency", "1", "--batch-sizes", "5"]
+    assert main(args + ["--output", str(output)]) == 0
+    assert main(args + ["--compare", str(output), "--threshold", "1000"]) == 0
+    report = json.loads(capsys.readouterr().out)
+    assert report["comparison"][0]["key"] == "publish[batch_size=5,concurrency=1,size=64]"
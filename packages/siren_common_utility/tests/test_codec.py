@@ -0,0 +1,110 @@
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from siren_common_utility import AzureServiceBusConnectorInstance
+from siren_common_utility.bench import MockRegionalBackend, find_relay_app, load_relay_app
+from siren_common_utility.modules.az_service_bus import InMemoryServiceBus
+from siren_common_utility.modules.codec import (
+    PatientAlert,
+    PatientAlertCodec,
+    decode_relay_request,
+    get_encoding,
+)
+
+SYMPTOMS = "흉통 및 호흡곤란, 식은땀. 30분 전 발생하였고 니트로글리세린 설하 투여 후에도 지속됨. " * 8
+
+
+def _alert(**fields) -> PatientAlert:
+    return PatientAlert(
+        patient_id="p-1", tenant_id="field-7", patient_name="홍길동", age=67, gender="M",
+        symptoms=SYMPTOMS, vital_bp="90/60", vital_temp=36.8, vital_spo2="91", consciousness="V",
+        dept_code="D001", **fields,
+    )
+
+
+def test_schema_mirrors_patient_logs_and_validates():
+    alert = PatientAlert.from_dict({**_alert().to_dict(), "DEPT_CODE": "D002", "triage_level": 2})
+
+    assert alert.age == "67" and alert.vital_temp == "36.8"
+    assert alert.extra == {"triage_level": 2}
+    row = alert.to_row()
+    assert list(row) == [
+        'RAW_TEXT', 'PATIENT_NAME', 'AGE', 'GENDER', 'SYMPTOMS', 'VITAL_BP', 'VITAL_TEMP',
+        'VITAL_SPO2', 'CONSCIOUSNESS', 'DEPT_CODE', 'CREATED_AT',
+    ]
+    assert row['DEPT_CODE'] == "D002" and row['RAW_TEXT'] is None
+    with pytest.raises(ValueError):
+        PatientAlert(dept_code="D" * 21)
+    with pytest.raises(ValueError):
+        PatientAlert(vital_bp=["90", "60"])
+    with pytest.raises(ValueError):
+        PatientAlertCodec().decode(b"[1, 2]")
+
+
+def test_encodings_round_trip_and_shrink_payload():
+    alert = _alert()
+    encoded = PatientAlertCodec().encode(alert)
+
+    assert PatientAlertCodec().decode(memoryview(encoded)) == alert
+    # 기존 방식(json.dumps 기본값)은 한글을 \uXXXX로 이스케이프한다.
+    assert len(encoded) < len(json.dumps(alert.to_dict()).encode()) * 0.6
+    assert get_encoding("application/json; charset=utf-8") is get_encoding("json")
+    with pytest.raises(ValueError):
+        get_encoding("text/xml")
+
+
+def test_msgpack_encoding():
+    pytest.importorskip("msgpack")
+    alert = _alert()
+    packed = PatientAlertCodec("msgpack").encode(alert)
+    assert len(packed) < len(PatientAlertCodec().encode(alert))
+    assert PatientAlertCodec().decode(packed, "application/msgpack") == alert
+
+
+async def test_message_content_type_over_connector():
+    codec = PatientAlertCodec()
+    bus = InMemoryServiceBus()
+    bus.create_subscription('emc-center-response', 'field', sql_filter="TenantId = 'field-7'")
+    received = []
+
+    async def handler(msg):
+        received.append((msg.content_type, codec.from_message(msg)))
+
+    async with AzureServiceBusConnectorInstance(transport=bus) as connector:
+        await connector.send_to_topic('emc-center-response', [codec.to_message(_alert(), session_id="p-1")])
+        await connector.consume('emc-center-response', 'field', handler, idle_timeout=0.05)
+
+    assert received == [("application/json", _alert())]
+
+
+async def test_relay_passthrough_forwards_body_bytes():
+    if find_relay_app() is None:
+        pytest.skip("relay function app is not available")
+    pytest.importorskip("azure.functions")
+    relay = load_relay_app(find_relay_app())
+    relay._bound_loop = None
+    body = PatientAlertCodec().encode(_alert())
+    message = SimpleNamespace(content_type="application/json", session_id="p-1")
+    properties = {"Region": "|Seoul|Honam|"}
+
+    async with MockRegionalBackend(latency_ms=0, record=True) as backend:
+        headers = {"x-message-id": "m-1", "x-correlation-id": "c-1", **relay._passthrough_headers(message, properties)}
+        envelope = relay._encode_payload({"topic_body": body.decode(), "topic_message_id": "m-1"})
+        for region, payload, region_headers in (
+            ("Seoul", body, headers),
+            ("Honam", envelope, {"Content-Type": "application/json"}),
+        ):
+            result = await relay._post_to_region(
+                relay._get_http_session(), backend.url_for(region), region_headers, payload, "m-1", region,
+            )
+            assert result["ok"]
+        await relay._http_session.close()
+
+    (_, seoul_headers, seoul_body), (_, honam_headers, honam_body) = backend.received
+    assert seoul_body == body
+    alert, metadata = decode_relay_request(seoul_body, seoul_headers)
+    assert alert == _alert()
+    assert metadata == {"message_id": "m-1", "correlation_id": "c-1", "session_id": "p-1", "properties": properties}
+    assert decode_relay_request(honam_body, honam_headers)[0] == _alert()
@@ -0,0 +1,184 @@
+import asyncio
+
+import pytest
+from azure.servicebus import ServiceBusMessage
+
+from siren_common_utility import AzureServiceBusConnectorInstance
+from siren_common_utility.bench import MockRegionalBackend, find_relay_app, load_relay_app
+from siren_common_utility.modules.az_service_bus import AzureServiceBusConsumerController, InMemoryServiceBus
+from siren_common_utility.modules.dedup import (
+    DedupStore,
+    InMemorySharedBackend,
+    LocalDedupStore,
+    SharedDedupStore,
+    TimeBucketedBloomFilter,
+)
+
+from utils.fake_service_bus import FakeReceivedMessage, FakeReceiver
+
+
+class FakeClock:
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_bloom_filter_window_and_false_positive_rate():
+    clock = FakeClock()
+    bloom = TimeBucketedBloomFilter(10_000, window=60, error_rate=1e-3, buckets=4, clock=clock)
+    for i in range(10_000):
+        bloom.add(f"m-{i}")
+
+    assert all(f"m-{i}" in bloom for i in range(0, 10_000, 97))
+    false_positives = sum(f"other-{i}" in bloom for i in range(20_000))
+    assert false_positives / 20_000 < 5e-3
+    assert 0 < bloom.estimated_false_positive_rate() < 5e-3
+    size = bloom.memory_bytes
+
+    clock.now = 59.0
+    assert "m-1" in bloom
+    clock.now = 76.0
+    assert "m-1" not in bloom
+    assert bloom.get_stats()["keys"] == 0 and bloom.memory_bytes == size
+
+
+async def test_local_store_claim_complete_release():
+    clock = FakeClock()
+    dedup = LocalDedupStore(1000, ttl=60, exact_capacity=2, lease=5, clock=clock)
+
+    assert await dedup.claim("a")
+    assert not await dedup.claim("a")          # 처리 중
+    await dedup.release("a")
+    assert await dedup.claim("a")
+    await dedup.complete("a")
+    assert not await dedup.claim("a")
+    for key in ("b", "c"):
+        assert await dedup.claim(key)
+        await dedup.complete(key)
+    # 정확 맵에서 밀려난 키는 필터로 판단한다.
+    assert len(dedup) == 2 and not await dedup.claim("a")
+
+    assert await dedup.claim("d")
+    clock.now = 6                               # 선점 만료
+    assert await dedup.claim("d")
+    clock.now = 80                              # TTL 만료
+    assert await dedup.claim("a")
+
+    stats = dedup.get_stats()
+    assert stats["duplicates_exact"] == 1 and stats["duplicates_filter"] == 1
+    assert stats["in_flight_rejections"] == 1
+    assert stats["memory_bytes"] >= stats["filter"]["memory_bytes"] > 0
+
+
+async def test_shared_store_across_instances():
+    backend = InMemorySharedBackend()
+    first = SharedDedupStore(backend, ttl=60, local=LocalDedupStore(100, ttl=60))
+    second = SharedDedupStore(backend, ttl=60)
+
+    assert await first.claim("m-1")
+    assert not await second.claim("m-1")
+    await first.release("m-1")
+    assert await second.claim("m-1")
+    await second.complete("m-1")
+    assert not await first.claim("m-1")
+    assert await backend.get("siren:dedup:m-1") == b"1"
+    assert first.get_stats()["duplicates_shared"] == 1
+
+
+async def test_claim_distinguishes_in_flight_from_done():
+    backend = InMemorySharedBackend()
+    first = SharedDedupStore(backend, ttl=60, local=LocalDedupStore(100, ttl=60))
+    second = SharedDedupStore(backend, ttl=60)
+
+    assert await first.try_claim("m-1") == DedupStore.CLAIMED
+    assert await first.try_claim("m-1") == DedupStore.IN_FLIGHT      # 로컬에서 처리 중
+    assert await second.try_claim("m-1") == DedupStore.IN_FLIGHT     # 다른 인스턴스에서 처리 중
+    await first.complete("m-1")
+    assert await first.try_claim("m-1") == DedupStore.DUPLICATE
+    assert await second.try_claim("m-1") == DedupStore.DUPLICATE
+    assert second.get_stats()["in_flight_rejections"] == 1
+    assert second.get_stats()["duplicates_shared"] == 1
+
+
+async def test_consumer_abandons_copy_while_first_delivery_in_flight():
+    class Consumer(AzureServiceBusConsumerController):
+        IN_FLIGHT_ABANDON_DELAY = 0
+
+    first, copy = FakeReceivedMessage("a"), FakeReceivedMessage("a")
+    copy.message_id = first.message_id
+    receiver = FakeReceiver([first, copy])
+    release = asyncio.Event()
+
+    async def handler(msg):
+        await release.wait()
+        raise RuntimeError("backend down")
+
+    consumer = Consumer(receiver, handler, dedup=LocalDedupStore(100, ttl=60))
+    run = asyncio.create_task(consumer.run(idle_timeout=0.05))
+    while not receiver.abandoned:
+        await asyncio.sleep(0.001)
+    # 첫 전달이 끝나기 전에 재전달 사본을 complete 하면 첫 처리가 실패했을 때 메세지가 사라진다.
+    assert receiver.abandoned == [copy] and receiver.completed == []
+    release.set()
+    await run
+
+    assert receiver.abandoned == [copy, first] and receiver.completed == []
+    stats = consumer.get_stats()
+    assert stats["in_flight_duplicates"] == 1 and stats["duplicates"] == 0
+
+
+async def test_consumer_skips_redelivered_messages():
+    bus = InMemoryServiceBus()
+    bus.create_subscription('alerts', 'sub')
+    dedup = LocalDedupStore(100, ttl=60)
+    handled = []
+
+    async def handler(msg):
+        handled.append(str(msg))
+
+    messages = [ServiceBusMessage(body, message_id=mid) for mid, body in (("m-1", "a"), ("m-2", "b"), ("m-1", "a"))]
+    async with AzureServiceBusConnectorInstance(transport=bus) as connector:
+        await connector.send_to_topic('alerts', messages)
+        stats = await connector.consume('alerts', 'sub', handler, max_concurrency=1, idle_timeout=0.05, dedup=dedup)
+        await connector.send_to_topic('alerts', [ServiceBusMessage("b", message_id="m-2")])
+        listened = []
+        async for msg in connector.listening_subscribe_from_topic(
+            'alerts', 'sub', receiver_max_wait_time=0.05, dedup=dedup,
+        ):
+            listened.append(msg)
+
+    assert sorted(handled) == ["a", "b"] and listened == []
+    assert stats["duplicates"] == 1 and stats["completed"] == 2
+    assert bus.get_stats()["topics"]["alerts"]["sub"]["active"] == 0
+
+
+async def test_relay_drops_duplicates_before_http():
+    if find_relay_app() is None:
+        pytest.skip("relay function app is not available")
+    pytest.importorskip("azure.functions")
+    relay = load_relay_app(find_relay_app())
+    if relay._dedup is None:
+        relay._dedup = LocalDedupStore()
+    relay._bound_loop = None
+
+    async with MockRegionalBackend(latency_ms=0, error_rate=0) as backend:
+        async def deliver(region):
+            key = relay._idempotency_key("m-1", region)
+            return await relay._post_once(key, lambda: relay._post_to_region(
+                relay._get_http_session(), backend.url_for(region), {}, {"topic_body": "{}"}, "m-1", region,
+            ), target=region, region=region)
+
+        first = [await deliver(r) for r in ("Seoul", "Honam")]
+        again = [await deliver(r) for r in ("Seoul", "Honam", "Gangwon")]
+        # 다른 호출에서 전달 중인 키는 성공으로 보지 않고 재전송 대상으로 돌려준다.
+        assert await relay._dedup.claim(relay._idempotency_key("m-1", "Incheon"))
+        in_flight = await deliver("Incheon")
+        await relay._http_session.close()
+
+    assert not in_flight["ok"] and in_flight["retryable"] and in_flight["in_flight"]
+    assert all(r["ok"] for r in first + again)
+    assert [r.get("duplicate", False) for r in again] == [True, True, False]
+    assert dict(backend.requests) == {"Seoul": 1, "Honam": 1, "Gangwon": 1}
@@ -0,0 +1,153 @@
+import json
+import sqlite3
+
+from siren_common_utility import AzureServiceBusConnectorInstance
+from siren_common_utility.modules.az_service_bus import InMemoryServiceBus
+from siren_common_utility.modules.er_availability import (
+    ER_AVAILABILITY_MERGE_SQL,
+    ErAvailabilityDeltaFeed,
+    latest_availability,
+    read_seed_columns,
+)
+
+REGIONS = {"A": "Seoul", "B": "Seoul", "C": "Honam", "D": "Honam", "E": "Honam"}
+
+
+def _small_feed() -> ErAvailabilityDeltaFeed:
+    return ErAvailabilityDeltaFeed(REGIONS, (
+        ["A", "B", "C", "E", "A"],
+        ["20251226010000", "20251226010000", "20251226010000", "20251226010000", "20251226000000"],
+        [5, 3, 7, 2, 9],
+    ))
+
+
+def test_latest_availability_keeps_newest_row_per_hpid():
+    hpid, hvidate, hvec = latest_availability(["B", "A", "B", "A"], ["2", "1", "3", "0"], [1, None, 3, 4.0])
+
+    assert hpid.tolist() == ["A", "B"]
+    assert hvidate.tolist() == ["1", "3"]
+    assert hvec.tolist() == [0, 3]
+
+
+def test_diff_emits_only_changes():
+    feed = _small_feed()
+    assert feed.get("A") == ("20251226010000", 5)
+
+    snapshot = (
+        ["A", "A", "B", "C", "D"],
+        ["20251226020000", "20251226000000", "20251226020000", "20251226000000", "20251226020000"],
+        [6, 1, 3, 1, 4],
+    )
+    delta = feed.diff(*snapshot)
+
+    assert delta.get_stats() == {
+        "staged": 4, "changed": 1, "added": 1, "removed": 1, "refreshed": 1, "watermark": "20251226020000",
+    }
+    assert delta.by_region(REGIONS) == {
+        "Seoul": {"changed": [["A", "20251226020000", 6]], "added": [], "removed": []},
+        "Honam": {"changed": [], "added": [["D", "20251226020000", 4]], "removed": ["E"]},
+    }
+    assert delta.merge_rows() == [
+        {"HPID": "A", "HVIDATE": "20251226020000", "HVEC": 6},
+        {"HPID": "D", "HVIDATE": "20251226020000", "HVEC": 4},
+    ]
+    assert not feed.diff(*snapshot, full_snapshot=False).removed.size
+
+    feed.commit(delta)
+    assert len(feed) == 4 and feed.get("E") is None
+    assert feed.get("B") == ("20251226020000", 3)
+    assert feed.get("C") == ("20251226010000", 7)
+    assert not feed.diff(*snapshot)
+
+
+async def test_publish_sends_region_deltas_and_merges_changed_rows(seed_sql_dir):
+    feed = ErAvailabilityDeltaFeed.from_seed_sql(seed_sql_dir)
+    stg = read_seed_columns(seed_sql_dir / "2_ER_AVAILABILITY_STG_202512261050.sql")["ER_AVAILABILITY_STG"]
+    hpid = stg.column("HPID").tolist()
+    hvidate = stg.column("HVIDATE").tolist()
+    hvec = stg.column("HVEC").tolist()
+
+    bus = InMemoryServiceBus()
+    for region in ("Seoul", "Honam", "Jeju"):
+        bus.create_subscription("er-availability", region.lower(), sql_filter=f"Region LIKE '%|{region}|%'")
+    db = sqlite3.connect(":memory:", check_same_thread=False)
+    db.execute("CREATE TABLE ER_AVAILABILITY (HPID TEXT, HVIDATE TEXT, HVEC INTEGER, PRIMARY KEY (HPID, HVIDATE))")
+
+    def merge(rows):
+        with db:
+            db.executemany(
+                "INSERT INTO ER_AVAILABILITY VALUES (:HPID, :HVIDATE, :HVEC) "
+                "ON CONFLICT (HPID, HVIDATE) DO UPDATE SET HVEC = excluded.HVEC", rows,
+            )
+
+    async with AzureServiceBusConnectorInstance(transport=bus) as connector:
+        # 변경 없는 스냅샷은 아무것도 보내지 않는다.
+        report = await feed.publish(connector, "er-availability", hpid, hvidate, hvec, merge=merge)
+        assert report["messages"] == 0 and report["merged_rows"] == 0
+
+        # Seoul 2곳, Honam 1곳의 HVEC만 바꾼 새 스냅샷
+        latest = {h: (d, v) for h, d, v in zip(*(c.tolist() for c in latest_availability(hpid, hvidate, hvec)))}
+        seoul = [h for h in sorted(latest) if feed._regions.get(h) == "Seoul"]
+        honam = [h for h in sorted(latest) if feed._regions.get(h) == "Honam"]
+        changed = seoul[:2] + honam[:1]
+        for h in changed:
+            d, v = latest[h]
+            hpid.append(h)
+            hvidate.append(str(int(d) + 100))
+            hvec.append(v + 1)
+        report = await feed.publish(connector, "er-availability", hpid, hvidate, hvec, merge=merge)
+
+        assert report["changed"] == 3 and report["added"] == report["removed"] == 0
+        assert report["merged_rows"] == 3 and report["messages"] == 2
+        assert db.execute("SELECT COUNT(*) FROM ER_AVAILABILITY").fetchone()[0] == 3
+
+        received = []
+
+        async def handler(msg):
+            received.append((msg.application_properties["Region"], json.loads(str(msg))))
+
+        for region in ("seoul", "honam", "jeju"):
+            await connector.consume("er-availability", region, handler, idle_timeout=0.05)
+
+        # 같은 스냅샷을 다시 보내도 델타가 없다.
+        report = await feed.publish(connector, "er-availability", hpid, hvidate, hvec, merge=merge)
+        assert report["messages"] == 0
+
+    assert sorted((region, [e[0] for e in body["changed"]]) for region, body in received) == [
+        ("|Honam|", honam[:1]), ("|Seoul|", seoul[:2]),
+    ]
+    assert all(not body["added"] and not body["removed"] for _, body in received)
+    assert feed.get_stats()["published_entries"] == 3
+
+
+def test_build_messages_splits_large_regions():
+    class SmallFeed(ErAvailabilityDeltaFeed):
+        MAX_ENTRIES_PER_MESSAGE = 2
+
+    feed = SmallFeed(REGIONS)
+    delta = feed.diff(list(REGIONS), ["1"] * 5, [1, 2, 3, 4, 5])
+    messages = feed.build_messages(delta)
+
+    parts = [(m.application_properties["Region"], m.application_properties["Part"], m.application_properties["Parts"])
+             for m in messages]
+    assert parts == [("|Honam|", 1, 2), ("|Honam|", 2, 2), ("|Seoul|", 1, 1)]
+    assert len({m.message_id for m in messages}) == 3
+    assert ER_AVAILABILITY_MERGE_SQL.format(table="ER_AVAILABILITY").startswith("MERGE INTO ER_AVAILABILITY")
+
+
+def test_message_id_distinguishes_deltas_with_same_watermark():
+    feed = _small_feed()
+    first = feed.diff(["A", "B", "C", "E"], ["20251226020000", "20251226010000", "20251226010000", "20251226010000"],
+                      [6, 3, 7, 2])
+    first_ids = [m.message_id for m in feed.build_messages(first)]
+    # 같은 델타를 다시 만들면(전송 실패 후 재시도) 같은 message_id로 중복 제거된다.
+    assert [m.message_id for m in feed.build_messages(first)] == first_ids
+    feed.commit(first)
+
+    # 다음 스냅샷에서 오래된 행(B)만 바뀌면 워터마크는 그대로이다.
+    second = feed.diff(["A", "B", "C", "E"], ["20251226020000", "20251226015000", "20251226010000", "20251226010000"],
+                       [6, 1, 7, 2])
+    assert second.watermark == first.watermark
+    second_ids = [m.message_id for m in feed.build_messages(second)]
+    assert first_ids == [i for i in first_ids if i.startswith("er-delta:Seoul:")] and len(second_ids) == 1
+    assert not set(first_ids) & set(second_ids)
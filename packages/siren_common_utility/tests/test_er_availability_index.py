@@ -0,0 +1,116 @@
+import threading
+
+from siren_common_utility.modules.er_availability import (
+    ErAvailabilityIndex,
+    ErHospital,
+    iter_insert_rows,
+    read_seed_table,
+)
+
+
+def _small_index():
+    return ErAvailabilityIndex([
+        ErHospital('H1', region='Honam'),
+        ErHospital('H2', region='Honam'),
+        ErHospital('H3', region='Honam'),
+        ErHospital('S1', region='Seoul'),
+    ])
+
+
+def test_seed_parser_handles_quotes_and_nulls(tmp_path):
+    sql = tmp_path / "seed.sql"
+    sql.write_text(
+        "INSERT INTO ER_USER.HOSPITAL_MASTER (HPID,HOSPITAL_NM,X_POS,TELNO) VALUES\n"
+        "\t ('A1','St. John''s; ER',126.5,NULL),\n"
+        "\t ('A2','둘째 병원',-1,'02-000');\n",
+        encoding='utf-8',
+    )
+    rows = list(iter_insert_rows(sql))
+
+    assert [r[0] for r in rows] == ['HOSPITAL_MASTER', 'HOSPITAL_MASTER']
+    assert rows[0][2] == ('A1', "St. John's; ER", 126.5, None)
+    assert rows[1][2] == ('A2', '둘째 병원', -1, '02-000')
+
+
+def test_top_k_and_lookup_follow_latest_hvidate():
+    index = _small_index()
+    index.apply([
+        ('H1', '20251226010000', 3),
+        ('H2', '20251226010100', 9),
+        ('H3', '20251226010200', 0),
+        ('S1', '20251226010300', 5),
+    ])
+
+    assert [s.hpid for s in index.top_k('Honam', 2)] == ['H2', 'H1']
+    assert index.count_available('Honam', min_beds=1) == 2
+    assert [s.hpid for s in index.available('Honam', 4)] == ['H2']
+
+    # 병원별로 현재 값보다 새로운 행만 반영된다.
+    assert index.apply([('H1', '20251226010300', 99), ('H1', '20251226010400', 12)]) == 1
+    assert index.get('H1').hvec == 12
+    assert index.watermark == '20251226010400'
+    assert [s.hpid for s in index.top_k('Honam', 3)] == ['H1', 'H2', 'H3']
+    # 변경되지 않은 REGION의 파티션은 그대로 재사용된다.
+    assert index.top_k('Seoul', 1)[0].hvec == 5
+
+
+def test_late_reporting_hospital_is_not_skipped_by_newer_hospitals():
+    index = _small_index()
+    index.apply([('H1', '20251226011010', 5), ('H2', '20251226010501', 3)])
+
+    # H2의 새 행은 H1의 HVIDATE(전체 워터마크)보다 오래되었지만 H2 기준으로는 최신이다.
+    assert index.apply([('H2', '20251226010800', 9), ('H1', '20251226010900', 1)]) == 1
+    assert index.get('H2').hvec == 9
+    assert index.get('H1').hvec == 5
+    assert index.watermark == '20251226011010'
+    assert [s.hpid for s in index.top_k('Honam', 2)] == ['H2', 'H1']
+
+
+def test_refresh_passes_watermark_to_fetch():
+    index = _small_index()
+    seen = []
+
+    def fetch(watermark):
+        seen.append(watermark)
+        return [('H1', '20251226010000', 1)] if watermark is None else []
+
+    assert index.refresh(fetch) == 1
+    assert index.refresh(fetch) == 0
+    assert seen == [None, '20251226010000']
+
+
+def test_readers_see_consistent_snapshots_during_refresh():
+    index = _small_index()
+    stop = threading.Event()
+    errors = []
+
+    def reader():
+        while not stop.is_set():
+            top = index.top_k('Honam', 3)
+            if [s.hvec for s in top] != sorted((s.hvec for s in top), reverse=True):
+                errors.append(top)
+
+    thread = threading.Thread(target=reader)
+    thread.start()
+    for i in range(500):
+        index.apply([(f'H{i % 3 + 1}', f'2025122601{i:04d}', (i * 7) % 13)])
+    stop.set()
+    thread.join()
+
+    assert not errors
+
+
+def test_index_from_seed_sql(seed_sql_dir):
+    stg = '2_ER_AVAILABILITY_STG_202512261050.sql'
+    index = ErAvailabilityIndex.from_seed_sql(seed_sql_dir, availability_files=[stg])
+
+    master = read_seed_table(seed_sql_dir / '2_HOSPITAL_MASTER.sql')
+    assert index.get_stats()["hospitals"] == len(master)
+    # STG 덤프에는 같은 행이 중복되어 있지만 HPID별로 한 번만 반영된다.
+    stg_hpids = {row["HPID"] for row in read_seed_table(seed_sql_dir / stg)}
+    assert len(index) == len(stg_hpids)
+
+    top = index.top_k('Honam', 5)
+    assert len(top) == 5
+    assert all(s.region == 'Honam' for s in top)
+    assert top[0].hvec == max(s.hvec for s in index.available('Honam', 0))
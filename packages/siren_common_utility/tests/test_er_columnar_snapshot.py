@@ -0,0 +1,61 @@
+import numpy as np
+
+from siren_common_utility.modules.er_availability import (
+    SEED_SQL_FILES,
+    ErAvailabilityIndex,
+    ErDepartmentIndex,
+    ErSpatialIndex,
+    build_seed_snapshot,
+    load_snapshot,
+    read_seed_columns,
+    read_seed_table,
+    write_snapshot,
+)
+
+
+def test_snapshot_round_trip_keeps_types_and_nulls(tmp_path):
+    sql = tmp_path / "seed.sql"
+    sql.write_text(
+        "INSERT INTO ER_USER.HOSPITAL_MASTER (HPID,HOSPITAL_NM,X_POS,BEDS,TELNO) VALUES\n"
+        "\t ('A1','St. John''s; ER',126.5,3,NULL),\n"
+        "\t ('A2','둘째 병원',NULL,4,'02-000');\n"
+        "INSERT INTO ER_USER.HOSPITAL_MASTER (HPID,HOSPITAL_NM,X_POS,BEDS,TELNO) VALUES\n"
+        "\t ('A3','셋째',127,5,'02-000');\n",
+        encoding='utf-8',
+    )
+    tables = read_seed_columns(sql)
+    table = tables["HOSPITAL_MASTER"]
+    assert len(table) == 3
+    assert table.column("BEDS").dtype == np.int64
+    assert table.column("X_POS").dtype == np.float64
+    assert list(table.iter_rows()) == read_seed_table(sql)
+
+    write_snapshot(tables, tmp_path / "snap")
+    loaded = load_snapshot(tmp_path / "snap")["HOSPITAL_MASTER"]
+    assert isinstance(loaded.column("BEDS"), np.memmap)
+    codes, values = loaded.encoded("TELNO")
+    assert codes.tolist() == [-1, 0, 0] and values.tolist() == ['02-000']
+    assert list(loaded.iter_rows()) == read_seed_table(sql)
+
+
+def test_seed_snapshot_builds_same_indexes_as_sql(seed_sql_dir, tmp_path):
+    snapshot_dir = build_seed_snapshot(seed_sql_dir, tmp_path / "snap")
+    tables = load_snapshot(snapshot_dir)
+    assert set(tables) == set(SEED_SQL_FILES)
+    assert list(tables["HOSPITAL_MASTER"].iter_rows()) == read_seed_table(seed_sql_dir / SEED_SQL_FILES["HOSPITAL_MASTER"])
+
+    expected = ErAvailabilityIndex.from_seed_sql(seed_sql_dir)
+    loaded = ErAvailabilityIndex.from_snapshot(snapshot_dir)
+    assert loaded.watermark == expected.watermark
+    for region in expected.regions:
+        assert [(s.hpid, s.hvec) for s in loaded.top_k(region, 10)] == [(s.hpid, s.hvec) for s in expected.top_k(region, 10)]
+
+    expected_depts = ErDepartmentIndex.from_seed_sql(seed_sql_dir)
+    loaded_depts = ErDepartmentIndex.from_snapshot(snapshot_dir)
+    assert loaded_depts.departments == expected_depts.departments
+    for hpid in [h.hpid for h in expected.hospitals()][::25]:
+        assert loaded_depts.counts_for(hpid) == expected_depts.counts_for(hpid)
+    assert loaded_depts.capable(['06', '09'], 2, region='Honam') == expected_depts.capable(['06', '09'], 2, region='Honam')
+
+    spatial = ErSpatialIndex.from_snapshot(snapshot_dir)
+    assert spatial.nearest_ers(35.16, 126.85, 3, dept='06')
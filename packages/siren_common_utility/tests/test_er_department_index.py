@@ -0,0 +1,70 @@
+from siren_common_utility.modules.er_availability import (
+    ErDepartmentIndex,
+    ErHospital,
+    read_seed_table,
+)
+
+
+def _index():
+    index = ErDepartmentIndex([
+        ErHospital('H1', ykiho='Y1', region='Honam'),
+        ErHospital('H2', ykiho='Y2', region='Honam'),
+        ErHospital('H3', ykiho='Y3', region='Seoul'),
+    ])
+    index.apply([
+        ('Y1', '06', 2), ('Y1', '09', 1),
+        ('Y2', '06', 1), ('Y2', '09', 4),
+        ('Y3', '06', 5), ('Y3', '09', 5),
+    ])
+    return index
+
+
+def test_capable_combines_departments_regions_and_thresholds():
+    index = _index()
+
+    assert index.capable(['06', '09']) == ['H1', 'H2', 'H3']
+    assert index.capable(['06', '09'], 2) == ['H3']
+    assert index.capable('06', 2, region='Honam') == ['H1']
+    assert index.capable('24') == []
+    assert index.capable_by_region('09', 2) == {'Honam': ['H2'], 'Seoul': ['H3']}
+
+
+def test_apply_updates_cells_incrementally():
+    index = _index()
+    before = index._snapshot
+
+    index.apply([('Y2', '06', 0), ('H1', '24', 1)])
+
+    assert index.capable('06', region='Honam') == ['H1']
+    assert index.count('H1', '24') == 1
+    assert index.counts_for('H2') == {'09': 4}
+    # 이전 스냅샷은 변경되지 않는다. (조회 중인 스레드 보호)
+    assert before.counts[before.rows['H2'], before.cols['06']] == 1
+
+
+def test_narrow_alert_properties_drops_regions_without_capable_centers():
+    index = _index()
+
+    assert index.narrow_alert_properties('|Seoul|Honam|', '09', 3) == {
+        "Region": "|Seoul|Honam|",
+        "TargetHpids": "|H3|H2|",
+    }
+    assert index.narrow_alert_properties('|Seoul|Honam|', ['06', '09'], 2) == {
+        "Region": "|Seoul|",
+        "TargetHpids": "|H3|",
+    }
+    assert index.narrow_alert_properties('|Honam|', '06', 9) is None
+    assert index.narrow_alert_properties('|Honam|', None) == {"Region": "|Honam|"}
+
+
+def test_department_index_from_seed_sql(seed_sql_dir):
+    index = ErDepartmentIndex.from_seed_sql(seed_sql_dir)
+    rows = read_seed_table(seed_sql_dir / '3_HOSPITAL_DEPT_SPECIALIST.sql')
+
+    assert index.departments['24'] == '응급의학과'
+    expected = {
+        row["YKIHO"] for row in rows
+        if row["DGSBJTCD"] == '06' and row["DTLSDRCNT"] >= 3
+    }
+    capable = index.capable('06', 3)
+    assert len(capable) == len(expected & set(index._hpid_by_ykiho))
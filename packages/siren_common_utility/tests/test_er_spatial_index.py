@@ -0,0 +1,70 @@
+import random
+
+from siren_common_utility.modules.er_availability import (
+    ErAvailabilityIndex,
+    ErDepartmentIndex,
+    ErHospital,
+    ErSpatialIndex,
+    haversine_km,
+)
+
+
+def _brute_force(availability, lat, lon, k, min_beds=0):
+    candidates = []
+    for hospital in availability.hospitals():
+        status = availability.get(hospital.hpid)
+        if min_beds and (status is None or status.hvec < min_beds):
+            continue
+        candidates.append((haversine_km(lat, lon, hospital.y_pos, hospital.x_pos), hospital.hpid))
+    return [hpid for _, hpid in sorted(candidates)[:k]]
+
+
+def test_haversine_seoul_to_busan():
+    assert 320 < haversine_km(37.5665, 126.9780, 35.1796, 129.0756) < 330
+
+
+def test_nearest_matches_brute_force_on_random_points():
+    rng = random.Random(7)
+    hospitals = [
+        ErHospital(f'H{i}', x_pos=rng.uniform(126.0, 129.5), y_pos=rng.uniform(34.0, 38.5), region='R')
+        for i in range(300)
+    ]
+    availability = ErAvailabilityIndex(hospitals)
+    availability.apply((h.hpid, '20251226010000', rng.randint(0, 5)) for h in hospitals)
+    spatial = ErSpatialIndex(availability, cell_deg=0.05)
+
+    for _ in range(50):
+        lat, lon = rng.uniform(33.0, 39.0), rng.uniform(125.5, 130.0)
+        got = [c.hpid for c in spatial.nearest_ers(lat, lon, 5, min_beds=2)]
+        assert got == _brute_force(availability, lat, lon, 5, min_beds=2)
+
+
+def test_nearest_filters_by_beds_department_and_distance():
+    availability = ErAvailabilityIndex([
+        ErHospital('NEAR', x_pos=126.90, y_pos=35.16, region='Honam'),
+        ErHospital('MID', x_pos=126.95, y_pos=35.20, region='Honam'),
+        ErHospital('FAR', x_pos=127.50, y_pos=35.80, region='Honam'),
+    ])
+    availability.apply([
+        ('NEAR', '20251226010000', 0),
+        ('MID', '20251226010000', 4),
+        ('FAR', '20251226010000', 9),
+    ])
+    departments = ErDepartmentIndex(availability.hospitals())
+    departments.apply([('MID', '06', 0), ('FAR', '06', 3)])
+    spatial = ErSpatialIndex(availability, departments=departments)
+
+    assert [c.hpid for c in spatial.nearest_ers(35.16, 126.90, 3)] == ['NEAR', 'MID', 'FAR']
+    assert [c.hpid for c in spatial.nearest_ers(35.16, 126.90, 3, min_beds=1)] == ['MID', 'FAR']
+    assert [c.hpid for c in spatial.nearest_ers(35.16, 126.90, 3, dept='06')] == ['FAR']
+    assert [c.hpid for c in spatial.nearest_ers(35.16, 126.90, 3, max_distance_km=10)] == ['NEAR', 'MID']
+
+
+def test_nearest_ers_from_seed_sql(seed_sql_dir):
+    spatial = ErSpatialIndex.from_seed_sql(seed_sql_dir)
+
+    # 광주광역시 서구 부근
+    result = spatial.nearest_ers(35.156, 126.868, 3, min_beds=1, dept='01')
+    assert len(result) == 3
+    assert result[0].hospital.province == '광주광역시'
+    assert [c.distance_km for c in result] == sorted(c.distance_km for c in result)
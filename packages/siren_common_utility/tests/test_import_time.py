@@ -0,0 +1,71 @@
+from pathlib import Path
+import json
+import logging
+import logging.handlers
+import os
+import subprocess
+import sys
+
+import siren_common_utility
+
+SRC_DIR = Path(__file__).resolve().parents[1] / "src"
+
+# Function / FastAPI 콜드 스타트 예산 (Azure SDK를 불러오지 않은 상태의 import 시간)
+IMPORT_BUDGET_SEC = 0.25
+
+PROBE = """
+import json, logging, sys, time
+started = time.perf_counter()
+import siren_common_utility
+elapsed = time.perf_counter() - started
+before = sorted(m for m in sys.modules if m.startswith(("azure", "aiohttp", "numpy")))
+root_handlers = len(logging.getLogger().handlers)
+siren_common_utility.AzureServiceBusConnectorInstance
+print(json.dumps({
+    "elapsed": elapsed,
+    "heavy": before,
+    "root_handlers": root_handlers,
+    "loaded_on_access": "azure.servicebus.aio" in sys.modules,
+}))
+"""
+
+
+def _probe(tmp_path, **env) -> dict:
+    result = subprocess.run(
+        [sys.executable, "-c", PROBE],
+        cwd=tmp_path,
+        env={**os.environ, "PYTHONPATH": str(SRC_DIR), **env},
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def test_import_is_lazy_and_does_not_configure_logging(tmp_path):
+    # 첫 실행은 .pyc 생성 비용이 포함되므로 두 번째 측정값을 사용한다.
+    _probe(tmp_path)
+    probe = _probe(tmp_path)
+
+    assert probe["heavy"] == []
+    assert probe["root_handlers"] == 0
+    assert probe["loaded_on_access"]
+    assert probe["elapsed"] < IMPORT_BUDGET_SEC, f"import took {probe['elapsed']:.3f}s"
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_opt_in_queue_logger_writes_file(tmp_path):
+    log_file = tmp_path / "siren.log"
+    root = logging.getLogger()
+    level = root.level
+    listener = siren_common_utility.set_default_logger(log_file=str(log_file), stream=False)
+    try:
+        assert any(isinstance(h, logging.handlers.QueueHandler) for h in root.handlers)
+        logging.getLogger("siren.test").info("queued line")
+    finally:
+        siren_common_utility.stop_default_logger()
+        root.setLevel(level)
+
+    assert listener._thread is None
+    assert not any(isinstance(h, logging.handlers.QueueHandler) for h in root.handlers)
+    assert "queued line" in log_file.read_text(encoding="utf-8")
@@ -0,0 +1,95 @@
+import asyncio
+
+import pytest
+
+from siren_common_utility.modules.er_availability import ErAvailabilityIndex, ErHospital
+from siren_common_utility.modules.naver_maps import AsyncTtlLruCache, NaverMapsClient, NaverMapsError
+
+from utils.fake_naver_maps import FakeNaverMapsServer
+
+ORIGIN = (35.1562, 126.8688)
+
+
+@pytest.fixture
+async def naver_server():
+    server = FakeNaverMapsServer(delay=0.01)
+    await server.start()
+    yield server
+    await server.close()
+
+
+@pytest.fixture
+async def naver(naver_server):
+    hospitals = ErAvailabilityIndex([
+        ErHospital('A1500016', x_pos=126.8688164, y_pos=35.1562166),
+        ErHospital('A1500003', x_pos=126.897925, y_pos=35.185676),
+        ErHospital('A1500007', x_pos=126.8747341, y_pos=35.2134937),
+        ErHospital('NOPOS'),
+    ])
+    async with NaverMapsClient(
+        "fake-id", "fake-secret", base_url=naver_server.base_url, hospitals=hospitals, max_concurrency=2
+    ) as client:
+        yield client
+
+
+async def test_cache_expires_and_evicts():
+    now = [0.0]
+    cache = AsyncTtlLruCache(maxsize=2, ttl=10, clock=lambda: now[0])
+    cache.set('a', 1)
+    cache.set('b', 2)
+    cache.get('a')
+    cache.set('c', 3)           # 가장 오래 사용되지 않은 'b' 제거
+
+    assert cache.get('b') is None
+    assert cache.get('a') == 1
+    now[0] = 11
+    assert cache.get('a') is None
+
+
+async def test_identical_requests_are_coalesced_and_cached(naver, naver_server):
+    goal = (35.185676, 126.897925)
+    first = await asyncio.gather(*(naver.driving(ORIGIN, goal) for _ in range(10)))
+    # 100m 이내의 출발지는 같은 셀로 스냅되어 캐시를 공유한다.
+    again = await naver.driving((ORIGIN[0] + 0.0001, ORIGIN[1] - 0.0001), goal)
+
+    assert len(naver_server.driving_calls()) == 1
+    assert all(r is first[0] for r in first)
+    assert again is first[0]
+    assert first[0].distance_m > 0
+    stats = naver.get_stats()["route_cache"]
+    assert stats["misses"] == 1 and stats["coalesced"] == 9 and stats["hits"] == 1
+
+
+async def test_eta_matrix_fills_from_cache_first(naver, naver_server):
+    ids = ['A1500016', 'A1500003', 'A1500007', 'NOPOS']
+    await naver.driving(ORIGIN, (35.185676, 126.897925))
+
+    [row] = await naver.eta_matrix([ORIGIN], ids)
+
+    # 캐시된 1건과 좌표가 없는 병원을 제외한 2건만 요청한다.
+    assert len(naver_server.driving_calls()) == 3
+    assert row[0] is None           # 출발지 == 도착지 (경로 없음)
+    assert row[1] is not None and row[2] is not None
+    assert row[3] is None
+
+
+async def test_failed_requests_are_not_cached(naver, naver_server):
+    naver_server.fail_status = 429
+    with pytest.raises(NaverMapsError):
+        await naver.driving(ORIGIN, (35.2, 126.9))
+    [row] = await naver.eta_matrix([ORIGIN], ['A1500003'])
+    assert row == [None]
+
+    naver_server.fail_status = None
+    assert await naver.driving(ORIGIN, (35.2, 126.9)) is not None
+    assert naver.get_stats()["errors"] == 2
+
+
+async def test_geocode_lookups_are_cached(naver, naver_server):
+    first = await naver.geocode("광주광역시 서구  상무대로 1")
+    second = await naver.geocode("광주광역시 서구 상무대로 1")
+    await naver.reverse_geocode(ORIGIN)
+    await naver.reverse_geocode((ORIGIN[0] + 0.0001, ORIGIN[1]))
+
+    assert first is second
+    assert len(naver_server.calls) == 2
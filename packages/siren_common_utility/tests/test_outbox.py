@@ -0,0 +1,187 @@
+import asyncio
+import json
+import mmap
+import struct
+from datetime import timedelta
+
+import pytest
+from azure.servicebus import ServiceBusMessage
+from azure.servicebus.exceptions import MessageSizeExceededError, ServiceBusConnectionError
+
+from siren_common_utility import AzureServiceBusConnectorInstance
+from siren_common_utility.bench import BenchConfig, run_benchmarks
+from siren_common_utility.modules.az_service_bus import (
+    AzureServiceBusOutbox,
+    InMemoryServiceBus,
+    decode_outbox_record,
+    encode_outbox_record,
+)
+from siren_common_utility.modules.spool import SegmentLog
+
+
+class FakeBroker:
+
+    def __init__(self, failures: int = 0) -> None:
+        self.failures = failures
+        self.sent: list[tuple[str, ServiceBusMessage]] = []
+        self.calls = 0
+
+    async def send(self, topic_name, messages):
+        self.calls += 1
+        if self.failures:
+            self.failures -= 1
+            raise ServiceBusConnectionError(message="broker unavailable")
+        if any(len(b"".join(m.body)) > 1000 for m in messages):
+            raise MessageSizeExceededError(message="too large")
+        self.sent.extend((topic_name, m) for m in messages)
+
+
+def test_outbox_record_round_trip():
+    message = ServiceBusMessage(
+        '{"patient_id": "p-1"}', application_properties={"Region": "|Seoul|", "Priority": 1},
+        correlation_id="c-1", session_id="s-1", content_type="application/json",
+        time_to_live=timedelta(minutes=5),
+    )
+    topic, restored = decode_outbox_record(encode_outbox_record("emc-patient-alert", message))
+
+    assert topic == "emc-patient-alert"
+    assert message.message_id and restored.message_id == message.message_id
+    assert str(restored) == '{"patient_id": "p-1"}'
+    assert restored.application_properties == {"Region": "|Seoul|", "Priority": 1}
+    assert (restored.correlation_id, restored.session_id, restored.content_type) == ("c-1", "s-1", "application/json")
+    assert restored.time_to_live == timedelta(minutes=5)
+
+
+async def test_segment_log_recovers_after_torn_write(tmp_path):
+    log = SegmentLog(tmp_path, segment_bytes=64 * 1024)
+    log.open()
+    assert await log.append_many([b"a" * 100, b"b" * 100, b"c" * 100]) == [1, 2, 3]
+    segment = log._segments[-1]
+    path, torn_at = segment.path, segment.write_pos
+    log.close()
+
+    # 크래시로 헤더만 기록되고 본문은 일부만 기록된 레코드
+    with open(path, 'r+b') as f:
+        f.seek(torn_at)
+        f.write(struct.pack('<IIQ', 100, 12345, 4) + b"d" * 10)
+
+    log = SegmentLog(tmp_path, segment_bytes=64 * 1024)
+    log.open()
+    assert log.last_seq == 3
+    assert log.get_stats()["torn_records"] == 1
+    assert log.get_stats()["recovered"] == 3
+    assert await log.append(b"e" * 100) == 4
+    assert [(r.seq, r.payload[:1]) for r in log.read(0, 10)] == [(1, b"a"), (2, b"b"), (3, b"c"), (4, b"e")]
+    log.close()
+
+
+async def test_segment_log_ack_truncates_segments_and_persists(tmp_path):
+    log = SegmentLog(tmp_path, segment_bytes=mmap.PAGESIZE)
+    log.open()
+    for i in range(20):
+        await log.append(bytes([i]) * 1000)
+    assert log.get_stats()["segments"] > 3
+    with pytest.raises(ValueError):
+        await log.append(b"x" * mmap.PAGESIZE)
+
+    records = log.read(0, 12)
+    assert [r.seq for r in records] == list(range(1, 13))
+    log.ack(records[-1].seq)
+    remaining = log.get_stats()["segments"]
+    assert remaining < 5 and len(list(tmp_path.glob("*.seg"))) == remaining
+    log.close()
+
+    log = SegmentLog(tmp_path, segment_bytes=mmap.PAGESIZE)
+    log.open()
+    assert (log.acked_seq, log.last_seq, log.pending) == (12, 20, 8)
+    assert [r.payload[0] for r in log.read(log.acked_seq, 100)] == list(range(12, 20))
+    log.close()
+
+
+async def test_outbox_append_returns_while_broker_is_down(tmp_path):
+    broker = FakeBroker(failures=3)
+    outbox = AzureServiceBusOutbox(tmp_path, broker.send, max_batch_messages=10, retry_base_delay=0.01)
+    await outbox.start()
+
+    for i in range(25):
+        await outbox.append("alerts", [ServiceBusMessage(f"m-{i}")])
+    assert outbox.get_stats()["appended"] == 25
+
+    assert await outbox.flush(timeout=5)
+    stats = outbox.get_stats()
+    await outbox.aclose()
+
+    assert [str(m) for _, m in broker.sent] == [f"m-{i}" for i in range(25)]
+    assert stats["retries"] == 3 and stats["pending"] == 0
+    assert stats["spool"]["commits"] >= 1
+
+
+async def test_outbox_resends_unacknowledged_messages_after_restart(tmp_path):
+    down = FakeBroker(failures=10_000)
+    outbox = AzureServiceBusOutbox(tmp_path, down.send, retry_base_delay=0.01)
+    await outbox.start()
+    await outbox.append("alerts", [ServiceBusMessage(f"m-{i}") for i in range(5)])
+    await outbox.append("other", [ServiceBusMessage("o-1")])
+    message_ids = [decode_outbox_record(r.payload)[1].message_id for r in outbox._log.read(0, 10)]
+    await outbox.aclose(drain_timeout=0.05)
+    assert not down.sent
+
+    broker = FakeBroker()
+    outbox = AzureServiceBusOutbox(tmp_path, broker.send)
+    await outbox.start()
+    assert outbox.get_stats()["spool"]["recovered"] == 6
+    assert await outbox.flush(timeout=5)
+    await outbox.aclose()
+
+    assert [(t, str(m)) for t, m in broker.sent] == [("alerts", f"m-{i}") for i in range(5)] + [("other", "o-1")]
+    assert [m.message_id for _, m in broker.sent] == message_ids
+    # 같은 토픽의 연속된 메세지는 한 번에 전송된다.
+    assert broker.calls == 2
+
+
+async def test_outbox_rejects_poison_messages(tmp_path):
+    broker = FakeBroker()
+    outbox = AzureServiceBusOutbox(tmp_path, broker.send)
+    await outbox.start()
+    await outbox.append("alerts", [ServiceBusMessage("ok-1"), ServiceBusMessage("x" * 2000), ServiceBusMessage("ok-2")])
+    assert await outbox.flush(timeout=5)
+    stats = outbox.get_stats()
+    await outbox.aclose()
+
+    assert [str(m) for _, m in broker.sent] == ["ok-1", "ok-2"]
+    assert stats["rejected"] == 1
+    rejected = [json.loads(line) for line in (tmp_path / "rejected.jsonl").read_text().splitlines()]
+    assert rejected[0]["seq"] == 2 and "MessageSizeExceededError" in rejected[0]["reason"]
+
+
+async def test_connector_send_to_topic_with_outbox(tmp_path):
+    bus = InMemoryServiceBus()
+    bus.create_subscription('emc-patient-alert', 'seoul', sql_filter="Region LIKE '%|Seoul|%'")
+    bus.fail_next('send', ServiceBusConnectionError(message="link detached"), times=2)
+
+    async with AzureServiceBusConnectorInstance(transport=bus, outbox_dir=tmp_path) as connector:
+        connector._outbox._retry_base_delay = 0.01
+        await connector.send_to_topic('emc-patient-alert', [
+            ServiceBusMessage(f'alert {i}', application_properties={"Region": "|Seoul|"}, correlation_id=f"c-{i}")
+            for i in range(10)
+        ])
+        assert await connector.flush_outbox(timeout=5)
+
+        received = []
+
+        async def handler(msg):
+            received.append((str(msg), msg.correlation_id))
+
+        await connector.consume('emc-patient-alert', 'seoul', handler, idle_timeout=0.05)
+        stats = connector.get_stats()["outbox"]
+
+    assert sorted(received) == sorted((f'alert {i}', f"c-{i}") for i in range(10))
+    assert stats["sent"] == 10 and stats["pending"] == 0
+
+
+async def test_bench_outbox_scenario():
+    report = await run_benchmarks(BenchConfig(scenarios=["outbox"], messages=50, sizes=[128], concurrency=[4]))
+
+    [result] = report["results"]
+    assert result["scenario"] == "outbox" and result["errors"] == 0
+    assert result["msgs_per_s"] > 0 and result["commits"] >= 1
@@ -0,0 +1,128 @@
+import asyncio
+import sqlite3
+import threading
+
+import pytest
+from azure.servicebus import ServiceBusMessage
+
+from siren_common_utility import AzureServiceBusConnectorInstance
+from siren_common_utility.bench import BenchConfig, run_benchmarks
+from siren_common_utility.modules.az_service_bus import InMemoryServiceBus
+from siren_common_utility.modules.codec import PatientAlert, PatientAlertCodec
+from siren_common_utility.modules.patient_logs import PatientLogSink, SQLitePatientLogStore
+
+
+def _alert(i: int, **fields) -> PatientAlert:
+    fields = {
+        "patient_id": f"p-{i}", "patient_name": f"환자{i}", "age": 60 + i % 30, "symptoms": "흉통 및 호흡곤란 " * 20,
+        "vital_bp": "90/60", "consciousness": "V", "dept_code": "D001", **fields,
+    }
+    return PatientAlert(**fields)
+
+
+class RecordingStore(SQLitePatientLogStore):
+
+    def __init__(self, *, fail_times: int = 0, gate: threading.Event = None) -> None:
+        super().__init__()
+        self.fail_times = fail_times
+        self.gate = gate
+        self.calls: list[int] = []
+
+    def insert_many(self, rows):
+        if self.gate is not None:
+            self.gate.wait(5)
+        self.calls.append(len(rows))
+        if self.fail_times:
+            self.fail_times -= 1
+            raise sqlite3.OperationalError("database is locked")
+        if any(row['PATIENT_NAME'] == "reject" for row in rows):
+            raise sqlite3.IntegrityError("CHECK constraint failed")
+        super().insert_many(rows)
+
+
+async def test_sink_batches_rows_by_size_and_linger():
+    store = RecordingStore()
+    sink = PatientLogSink(store, max_batch_rows=100, linger_ms=20)
+
+    await asyncio.gather(*(sink.write(_alert(i)) for i in range(250)))
+    await sink.write({"patient_name": "단건", "CREATED_AT": "2026-01-02 03:04:05"})
+    await sink.aclose()
+
+    rows = store.fetch_rows()
+    assert store.calls == [100, 100, 50, 1]
+    assert [r["PATIENT_NAME"] for r in rows[:2]] == ["환자0", "환자1"]
+    assert rows[0]["AGE"] == "60" and rows[0]["CREATED_AT"]
+    assert rows[-1]["CREATED_AT"] == "2026-01-02 03:04:05"
+    stats = sink.get_stats()
+    assert stats["rows_written"] == 251 and stats["batches"] == 4 and stats["pending"] == 0
+
+
+async def test_sink_isolates_rejected_rows():
+    store = RecordingStore()
+    sink = PatientLogSink(store, max_batch_rows=10, linger_ms=5)
+
+    results = await asyncio.gather(
+        *(sink.write(_alert(i, **({"patient_name": "reject"} if i == 3 else {}))) for i in range(10)),
+        return_exceptions=True,
+    )
+    await sink.aclose()
+
+    assert isinstance(results[3], sqlite3.IntegrityError)
+    assert sum(r is None for r in results) == 9
+    assert store.count() == 9
+    assert sink.get_stats()["row_fallbacks"] == 1
+
+
+async def test_sink_applies_backpressure():
+    gate = threading.Event()
+    store = RecordingStore(gate=gate)
+    sink = PatientLogSink(store, max_batch_rows=5, linger_ms=1, max_pending_rows=10, max_in_flight=1)
+
+    writes = asyncio.gather(*(sink.write(_alert(i)) for i in range(40)))
+    await asyncio.sleep(0.05)
+    assert sink.get_stats()["pending"] == 10
+
+    gate.set()
+    await writes
+    await sink.aclose()
+    assert store.count() == 40
+
+
+async def test_consume_completes_messages_only_after_rows_are_written():
+    bus = InMemoryServiceBus()
+    bus.create_subscription('emc-patient-alert', 'patient-logs', max_delivery_count=5)
+    store = RecordingStore(fail_times=1)
+    sink = PatientLogSink(store, max_batch_rows=25, linger_ms=5)
+    codec = PatientAlertCodec()
+
+    async with AzureServiceBusConnectorInstance(transport=bus) as connector:
+        await connector.send_to_topic(
+            'emc-patient-alert',
+            [codec.to_message(_alert(i)) for i in range(60)] + [ServiceBusMessage(b"not json")],
+        )
+        stats = await sink.consume(connector, 'emc-patient-alert', 'patient-logs', idle_timeout=0.2)
+    await sink.aclose()
+
+    # 첫 배치는 실패하여 abandon → 재전달 후 기록된다.
+    assert stats["abandoned"] == 25
+    assert stats["completed"] == 60 and stats["dead_lettered"] == 1
+    assert store.count() == 60
+    assert sorted(int(r["PATIENT_NAME"][2:]) for r in store.fetch_rows()) == list(range(60))
+    assert sink.get_stats()["invalid_messages"] == 1
+    [dead_letter] = bus.peek_dead_letters('emc-patient-alert', 'patient-logs')
+    assert dead_letter.dead_letter_reason == "InvalidPatientAlert"
+
+
+async def test_closed_sink_rejects_writes():
+    sink = PatientLogSink(SQLitePatientLogStore())
+    await sink.aclose()
+    with pytest.raises(RuntimeError):
+        await sink.write(_alert(0))
+
+
+async def test_bench_patient_logs_scenario():
+    report = await run_benchmarks(BenchConfig(scenarios=["patient_logs"], messages=40, sizes=[256], batch_sizes=[1, 20]))
+
+    single, batched = report["results"]
+    assert single["errors"] == batched["errors"] == 0
+    assert (single["batches"], batched["batches"]) == (40, 2)
@@ -0,0 +1,429 @@
+import asyncio
+import json
+import uuid
+
+import pytest
+
+from siren_common_utility.bench import MockRegionalBackend, find_relay_app, load_relay_app
+from siren_common_utility.modules.dedup import LocalDedupStore
+
+from utils.fake_service_bus import FakeServiceBusClient
+
+
+class RelayMessage:
+    """Relay 트리거가 받는 `func.ServiceBusMessage` 대역."""
+
+    def __init__(self, body, message_id=None, **user_properties):
+        self._body = body.encode("utf-8") if isinstance(body, str) else body
+        self.message_id = message_id or str(uuid.uuid4())
+        self.user_properties = user_properties
+        self.correlation_id = ""
+        self.session_id = ""
+        self.content_type = "application/json"
+
+    def get_body(self) -> bytes:
+        return self._body
+
+
+@pytest.fixture
+async def relay():
+    if find_relay_app() is None:
+        pytest.skip("relay function app is not available")
+    pytest.importorskip("azure.functions")
+    module = load_relay_app(find_relay_app())
+    module._bound_loop = None
+    # 패키지를 함께 배포한 구성(RELAY_DEDUP_ENABLED=true)을 기준으로 검증한다.
+    if module._dedup is None:
+        module._dedup = LocalDedupStore()
+    yield module
+    if module._http_session is not None:
+        await module._http_session.close()
+
+
+@pytest.fixture
+def servicebus(relay, monkeypatch):
+    """재전송/Dead-letter에 사용하는 ServiceBusClient를 Fake 객체로 교체한다."""
+    client = FakeServiceBusClient()
+    monkeypatch.setattr(relay, "_get_servicebus_client", lambda: client)
+    return client
+
+
+def _batch_backend(relay, monkeypatch, failing=(), status=503):
+    """배치 POST를 가로채 `failing` 대상은 `status`, 나머지는 200과 메세지별 성공 결과로 응답한다."""
+    posted = {}
+
+    async def post(session, url, headers, req_payload, msg_id, target, **kwargs):
+        ids = posted[target] = [p["topic_message_id"] for p in req_payload["messages"]]
+        ok = target not in failing
+        body = json.dumps({"results": [{"topic_message_id": i, "ok": True} for i in ids]}) if ok else ""
+        return {"target": target, "status": 200 if ok else status, "ok": ok,
+                "retryable": not ok and relay._classify_status(status) == "retryable", "response_body": body}
+
+    monkeypatch.setattr(relay, "_post_with_retry", post)
+    return posted
+
+
+async def test_batch_dead_letters_invalid_and_exhausted_messages(relay, servicebus, monkeypatch):
+    relay.RELAY_DEAD_LETTER_TOPIC = "relay-dead-letter"
+    posted = _batch_backend(relay, monkeypatch, failing=("Honam",))
+    last_try = RelayMessage("{}", "m-last", Region="|Seoul|Honam|", RelayAttempt=relay.RELAY_MAX_ATTEMPTS - 1)
+    first_try = RelayMessage("{}", "m-first", Region="|Seoul|Honam|")
+    batch = [
+        last_try,
+        RelayMessage(b"\xff\xfe", "m-binary", Region="|Seoul|"),
+        RelayMessage("not json", "m-text", Region="|Seoul|"),
+        RelayMessage("{}", "m-no-region"),
+        first_try,
+    ]
+
+    await relay.emc_patient_alert_servicebus_batch_trigger(batch)
+
+    # 해석할 수 없는 메세지가 있어도 나머지는 전달된다.
+    assert posted == {"Seoul": ["m-last", "m-first"], "Honam": ["m-last", "m-first"]}
+    dead = servicebus.sent_messages("relay-dead-letter")
+    reasons = {m.application_properties["OriginalMessageId"]: m.application_properties["DeadLetterReason"]
+               for m in dead}
+    assert reasons == {
+        "m-binary": "InvalidMessage",
+        "m-text": "InvalidMessage",
+        "m-no-region": "InvalidRegion",
+        "m-last": "RelayAttemptsExhausted",
+    }
+    exhausted = next(m for m in dead if m.application_properties["OriginalMessageId"] == "m-last")
+    assert exhausted.application_properties["Region"] == "|Honam|"
+    assert b"".join(exhausted.body) == b"{}"
+
+    requeued = servicebus.sent_messages("emc-patient-alert")
+    assert [m.application_properties["OriginalMessageId"] for m in requeued] == ["m-first"]
+    assert requeued[0].application_properties["Region"] == "|Honam|"
+    assert requeued[0].application_properties["RelayAttempt"] == 1
+
+
+async def test_batch_dead_letters_messages_rejected_by_backend(relay, servicebus, monkeypatch):
+    relay.RELAY_DEAD_LETTER_TOPIC = "relay-dead-letter"
+    _batch_backend(relay, monkeypatch, failing=("Honam",), status=404)
+
+    await relay.emc_patient_alert_servicebus_batch_trigger([RelayMessage("{}", "m-1", Region="|Seoul|Honam|")])
+
+    # 영구 거절(4xx)은 재전송하지 않고, 거절한 리전만 담아 Dead-letter 한다.
+    assert servicebus.sent_messages("emc-patient-alert") == []
+    [dead] = servicebus.sent_messages("relay-dead-letter")
+    assert dead.application_properties["DeadLetterReason"] == "BackendRejected"
+    assert dead.application_properties["Region"] == "|Honam|"
+    assert dead.application_properties["DeadLetterErrorDescription"] == "Honam: status=404"
+
+    relay.RELAY_DEAD_LETTER_TOPIC = ""
+    _batch_backend(relay, monkeypatch, failing=("tenant:t-1",), status=405)
+    with pytest.raises(Exception, match="RELAY_DEAD_LETTER_TOPIC"):
+        await relay.emc_center_response_servicebus_batch_trigger([RelayMessage(json.dumps({"tenant_id": "t-1"}), "m-2")])
+
+
+async def test_batch_fails_without_dead_letter_topic(relay, servicebus, monkeypatch):
+    relay.RELAY_DEAD_LETTER_TOPIC = ""
+    _batch_backend(relay, monkeypatch, failing=("tenant:t-1",))
+    batch = [
+        RelayMessage(json.dumps({"tenant_id": "t-1"}), "m-1", RelayAttempt=relay.RELAY_MAX_ATTEMPTS - 1),
+        RelayMessage(json.dumps({"tenant_id": "t-1"}), "m-2"),
+    ]
+
+    # 메세지를 잃지 않도록 배치 전체를 실패시키고, 재전송도 하지 않는다. (호스트가 배치를 재전달)
+    with pytest.raises(Exception, match="RELAY_DEAD_LETTER_TOPIC"):
+        await relay.emc_center_response_servicebus_batch_trigger(batch)
+    assert servicebus.sent_messages() == []
+
+    relay.RELAY_DEAD_LETTER_TOPIC = "relay-dead-letter"
+    await relay.emc_center_response_servicebus_batch_trigger(batch + [RelayMessage("[]", "m-list")])
+    assert [m.application_properties["OriginalMessageId"] for m in servicebus.sent_messages("relay-dead-letter")] == [
+        "m-list", "m-1",
+    ]
+    assert [m.application_properties["OriginalMessageId"] for m in servicebus.sent_messages("emc-center-response")] == [
+        "m-2",
+    ]
+
+
+def test_aimd_halves_region_limit_once_per_latency_window(relay):
+    assert relay.REGION_MAX_CONCURRENCY < relay.MAX_CONCURRENCY
+    guard = relay._RegionGuard("Seoul")
+    guard.limit = 8.0
+
+    # 같은 혼잡 구간에 보낸 요청들이 모두 실패해도 한 번만 줄인다.
+    for _ in range(3):
+        guard.record(False, True, latency_ms=500)
+    assert guard.limit == 4.0
+    # 줄인 뒤에 보낸 요청이 실패하면 다시 줄인다.
+    guard.record(False, True, latency_ms=0)
+    assert guard.limit == 2.0
+    guard.record(True, False, latency_ms=0)
+    assert guard.limit == 2.5
+
+
+async def test_aimd_latency_excludes_global_slot_wait(relay):
+    relay.REGION_LATENCY_TARGET_MS = 100
+    async with MockRegionalBackend(latency_ms=0) as backend:
+        session = relay._get_http_session()
+        guard = relay._get_region_guard("Seoul")
+        guard.limit = 2.0
+        for _ in range(relay._limiter.limit):
+            await relay._limiter.acquire("critical")
+        post = asyncio.create_task(
+            relay._post_to_region(session, backend.url_for("Seoul"), {}, {"topic_body": "{}"}, "m-1", "Seoul")
+        )
+        await asyncio.sleep(0.3)
+        for _ in range(relay._limiter.limit):
+            relay._limiter.release()
+        result = await post
+
+    # 전체 슬롯을 기다린 0.3초는 리전의 지연이 아니므로 한도를 줄이지 않는다.
+    assert result["ok"] and guard.limit == 2.5
+
+
+async def test_cancelled_half_open_probe_does_not_stick(relay):
+    async with MockRegionalBackend(latency_ms=500) as backend:
+        session = relay._get_http_session()
+        guard = relay._get_region_guard("Seoul")
+        guard.state = "open"
+        guard._opened_at = -relay.CIRCUIT_OPEN_SEC
+
+        probe = asyncio.create_task(
+            relay._post_to_region(session, backend.url_for("Seoul"), {}, {"topic_body": "{}"}, "m-1", "Seoul")
+        )
+        await asyncio.sleep(0.05)
+        assert guard.state == "half_open" and not guard.allow_request()
+        probe.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await probe
+
+        # 취소된 탐색 대신 다음 요청이 탐색하여 서킷을 닫는다.
+        backend.latency_ms = 0
+        result = await relay._post_to_region(session, backend.url_for("Seoul"), {}, {"topic_body": "{}"}, "m-2", "Seoul")
+
+    assert result["ok"] and guard.state == "closed"
+
+
+async def test_http_session_is_shared_until_loop_changes(relay):
+    session = relay._get_http_session()
+    guard = relay._get_region_guard("Seoul")
+    limiter = relay._limiter
+
+    assert relay._get_http_session() is session and relay._get_region_guard("Seoul") is guard
+    assert session.connector.limit == relay.MAX_CONCURRENCY
+    async with MockRegionalBackend(latency_ms=0) as backend:
+        for i in range(5):
+            result = await relay._post_to_region(
+                session, backend.url_for("Seoul"), {}, {"topic_body": "{}"}, f"m-{i}", "Seoul",
+            )
+            assert result["ok"]
+    assert relay._get_http_session() is session
+
+    # 다른 이벤트 루프에서 호출되면 루프에 묶인 객체를 모두 새로 만든다.
+    relay._bound_loop = object()
+    fresh = relay._get_http_session()
+    assert fresh is not session and relay._limiter is not limiter
+    assert relay._get_region_guard("Seoul") is not guard
+    await session.close()
+
+
+def _user_function(trigger):
+    """`app.service_bus_topic_trigger`로 등록된 트리거의 원래 함수."""
+    function = getattr(trigger, "_function", None)
+    return function.get_user_function() if function is not None else trigger
+
+
+async def test_center_response_trigger_posts_to_tenant(relay, monkeypatch):
+    calls = []
+    status = {"t-1": 200, "t-2": 503}
+
+    async def post(session, url, headers, req_payload, msg_id, target, **kwargs):
+        calls.append((url.rsplit("/", 1)[-1], headers["x-idempotency-key"], kwargs["priority"]))
+        code = status[target.split(":", 1)[1]]
+        return {"target": target, "status": code, "ok": code == 200, "retryable": code >= 500}
+
+    monkeypatch.setattr(relay, "_post_with_retry", post)
+    trigger = _user_function(relay.emc_center_response_servicebus_trigger)
+
+    delivered = RelayMessage(json.dumps({"tenant_id": "t-1"}), "m-1", Severity="critical")
+    await trigger(delivered)
+    # 이미 전달한 메세지가 재전달되면 POST 하지 않는다.
+    await trigger(delivered)
+    with pytest.raises(Exception, match="t-2"):
+        await trigger(RelayMessage(json.dumps({"tenant_id": "t-1"}), "m-2", TenantId="t-2"))
+
+    assert [(tenant, priority) for tenant, _, priority in calls] == [("t-1", "critical"), ("t-2", "normal")]
+    assert calls[0][1] == relay._idempotency_key("m-1", "tenant:t-1")
+
+
+def test_batch_results_maps_response_to_messages(relay):
+    payloads = [{"topic_message_id": m} for m in ("m-1", "m-2", "m-3")]
+    body = json.dumps({"results": [{"topic_message_id": "m-1", "ok": True}, {"topic_message_id": "m-2", "ok": False}]})
+
+    # 결과가 없거나 빠진 메세지는 전달을 확인할 수 없으므로 재전송 대상이다.
+    assert relay._batch_results({"ok": True, "response_body": body}, payloads) == [True, False, False]
+    assert relay._batch_results({"ok": True, "response_body": "{}"}, payloads) == [False] * 3
+    assert relay._batch_results({"ok": True, "response_body": "[1, 2]"}, payloads) == [False] * 3
+    assert relay._batch_results({"ok": False, "response_body": body}, payloads) == [False] * 3
+
+
+async def test_batch_groups_messages_by_region(relay, servicebus, monkeypatch):
+    posted = []
+
+    async def post(session, url, headers, req_payload, msg_id, target, **kwargs):
+        ids = [p["topic_message_id"] for p in req_payload["messages"]]
+        posted.append((target, url.rsplit("/", 2)[-2:], headers["x-batch-size"], kwargs["priority"], ids))
+        results = [{"topic_message_id": i, "ok": not (target == "Seoul" and i == "m-2")} for i in ids]
+        return {"target": target, "status": 200, "ok": True, "retryable": False,
+                "response_body": json.dumps({"results": results})}
+
+    monkeypatch.setattr(relay, "_post_with_retry", post)
+    batch = [
+        RelayMessage("{}", "m-1", Region="|Seoul|Honam|", Priority="low"),
+        RelayMessage("{}", "m-2", Region="|Seoul|", Severity="critical"),
+        RelayMessage("{}", "m-3", Region="|Nowhere|Seoul|"),
+    ]
+    await relay.emc_patient_alert_servicebus_batch_trigger(batch)
+
+    assert posted == [
+        ("Seoul", ["Seoul", "batch"], "3", "critical", ["m-1", "m-2", "m-3"]),
+        ("Honam", ["Honam", "batch"], "1", "low", ["m-1"]),
+    ]
+    # 백엔드가 실패로 응답한 메세지만 실패한 리전으로 재전송한다.
+    requeued = servicebus.sent_messages("emc-patient-alert")
+    assert [(m.application_properties["OriginalMessageId"], m.application_properties["Region"]) for m in requeued] == [
+        ("m-2", "|Seoul|"),
+    ]
+
+    # 같은 배치가 재전달되면 전달에 성공한 항목은 다시 보내지 않는다.
+    posted.clear()
+    await relay.emc_patient_alert_servicebus_batch_trigger(batch)
+    assert posted == [("Seoul", ["Seoul", "batch"], "1", "critical", ["m-2"])]
+
+
+def test_classify_status(relay):
+    assert [relay._classify_status(s) for s in (200, 204, None, 408, 429, 500, 503, 400, 404, 409)] == [
+        "ok", "ok", "retryable", "retryable", "retryable", "retryable", "retryable",
+        "permanent", "permanent", "permanent",
+    ]
+
+
+async def test_post_with_retry_backs_off_only_on_retryable_failures(relay, monkeypatch):
+    relay.HTTP_RETRY_BASE_DELAY_SEC = 0.01
+    relay.HTTP_RETRY_MAX_DELAY_SEC = 0.03
+    bounds = []
+    monkeypatch.setattr(relay.random, "uniform", lambda low, high: bounds.append((low, high)) or 0.0)
+
+    async with MockRegionalBackend(latency_ms=0, error_rate=1.0) as backend:
+        session = relay._get_http_session()
+        relay.HTTP_RETRY_ATTEMPTS = 4
+        unavailable = await relay._post_with_retry(session, backend.url_for("Seoul"), {}, {}, "m-1", "Seoul")
+        # Full Jitter: [0, min(max, base * 2^n)] 범위에서 대기한다.
+        assert bounds == [(0, 0.01), (0, 0.02), (0, 0.03)]
+
+        backend.error_status = 400
+        rejected = await relay._post_with_retry(session, backend.url_for("Honam"), {}, {}, "m-1", "Honam")
+
+    assert unavailable["attempts"] == 4 and unavailable["status"] == 503 and unavailable["retryable"]
+    assert rejected["attempts"] == 1 and rejected["status"] == 400 and not rejected["retryable"]
+    assert dict(backend.requests) == {"Seoul": 4, "Honam": 1}
+
+
+async def test_requeue_failed_schedules_copies_until_attempts_exhausted(relay, servicebus):
+    relay.RELAY_REQUEUE_DELAY_SEC = 2
+    fresh = RelayMessage("{}", "m-1", Region="|Seoul|Honam|")
+    retried = RelayMessage("{}", "copy-2", Region="|Seoul|", RelayAttempt=2, OriginalMessageId="m-2")
+    last = RelayMessage("{}", "copy-3", Region="|Seoul|", RelayAttempt=relay.RELAY_MAX_ATTEMPTS - 1)
+
+    exhausted = await relay._requeue_failed("emc-patient-alert", [
+        (fresh, {"Region": "|Honam|"}), (retried, {}), (last, {}),
+    ])
+
+    assert exhausted == [last]
+    sent = servicebus.sent_messages("emc-patient-alert")
+    assert [(m.application_properties["OriginalMessageId"], m.application_properties["RelayAttempt"],
+             m.application_properties["Region"]) for m in sent] == [("m-1", 1, "|Honam|"), ("m-2", 3, "|Seoul|")]
+    # 시도 횟수에 따라 지수적으로 늦게 예약한다.
+    first, second = (m.scheduled_enqueue_time_utc for m in sent)
+    assert 6 < (second - first).total_seconds() < 6.5
+
+
+async def test_alert_trigger_requeues_only_failed_regions(relay, servicebus, monkeypatch):
+    failing = {"Honam"}
+    posted = []
+
+    async def post(session, url, headers, req_payload, msg_id, region, priority=None):
+        posted.append(region)
+        ok = region not in failing
+        return {"target": region, "region": region, "status": 200 if ok else 503, "ok": ok, "retryable": not ok}
+
+    monkeypatch.setattr(relay, "_post_to_region", post)
+    trigger = _user_function(relay.emc_patient_alert_servicebus_trigger)
+
+    await trigger(RelayMessage("{}", "m-1", Region="|Seoul|Honam|Nowhere|"))
+    requeued = servicebus.sent_messages("emc-patient-alert")
+    assert posted == ["Seoul", "Honam"]
+    assert [m.application_properties["Region"] for m in requeued] == ["|Honam|"]
+
+    # 재전송된 메세지는 같은 멱등 키를 사용하므로 이미 성공한 리전에는 다시 보내지 않는다.
+    posted.clear()
+    with pytest.raises(Exception, match="exhausted"):
+        await trigger(RelayMessage(
+            "{}", "copy", Region="|Seoul|Honam|", OriginalMessageId="m-1", RelayAttempt=relay.RELAY_MAX_ATTEMPTS - 1,
+        ))
+    assert posted == ["Honam"] and len(servicebus.sent_messages("emc-patient-alert")) == 1
+
+
+async def test_alert_trigger_dead_letters_rejected_regions(relay, servicebus, monkeypatch):
+    statuses = {"Seoul": 200, "Honam": 503, "Gangwon": 400}
+
+    async def post(session, url, headers, req_payload, msg_id, region, priority=None):
+        status = statuses[region]
+        return {"target": region, "region": region, "status": status, "ok": status == 200,
+                "retryable": relay._classify_status(status) == "retryable"}
+
+    monkeypatch.setattr(relay, "_post_to_region", post)
+    trigger = _user_function(relay.emc_patient_alert_servicebus_trigger)
+
+    # Dead-letter 토픽이 없으면 재전송 없이 실패시켜 호스트가 재전달하도록 한다.
+    relay.RELAY_DEAD_LETTER_TOPIC = ""
+    with pytest.raises(Exception, match="RELAY_DEAD_LETTER_TOPIC"):
+        await trigger(RelayMessage("{}", "m-1", Region="|Seoul|Honam|Gangwon|"))
+    assert servicebus.sent_messages() == []
+
+    relay.RELAY_DEAD_LETTER_TOPIC = "relay-dead-letter"
+    await trigger(RelayMessage("{}", "m-2", Region="|Seoul|Honam|Gangwon|"))
+    [dead] = servicebus.sent_messages("relay-dead-letter")
+    assert dead.application_properties["Region"] == "|Gangwon|"
+    assert dead.application_properties["DeadLetterReason"] == "BackendRejected"
+    assert [m.application_properties["Region"] for m in servicebus.sent_messages("emc-patient-alert")] == ["|Honam|"]
+
+
+async def test_circuit_opens_short_circuits_and_recovers(relay):
+    relay.CIRCUIT_FAILURE_THRESHOLD = 3
+    relay.HTTP_RETRY_ATTEMPTS = 1
+    async with MockRegionalBackend(latency_ms=0, error_rate=1.0) as backend:
+        session = relay._get_http_session()
+
+        async def post(region="Seoul"):
+            return await relay._post_to_region(session, backend.url_for(region), {}, {}, "m-1", region)
+
+        for _ in range(3):
+            assert not (await post())["ok"]
+        guard = relay._get_region_guard("Seoul")
+        assert guard.state == "open"
+
+        # open 동안은 백엔드를 호출하지 않고 즉시 실패한다. 다른 리전은 영향을 받지 않는다.
+        rejected = await post()
+        assert rejected["circuit_open"] and rejected["retryable"]
+        assert backend.requests["Seoul"] == 3
+        backend.error_status = 404
+        assert (await post("Honam"))["status"] == 404
+        assert relay._get_region_guard("Honam").state == "closed"
+
+        # half_open 탐색이 실패하면 다시 open, 성공하면 closed.
+        backend.error_status = 503
+        guard._opened_at -= relay.CIRCUIT_OPEN_SEC
+        assert not (await post())["ok"] and guard.state == "open"
+        backend.error_rate = 0
+        guard._opened_at -= relay.CIRCUIT_OPEN_SEC
+        assert (await post())["ok"] and guard.state == "closed"
+
+    assert backend.requests["Seoul"] == 5
+    assert guard.to_dict()["consecutive_failures"] == 0
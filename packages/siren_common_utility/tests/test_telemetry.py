@@ -0,0 +1,59 @@
+import pytest
+from azure.servicebus import ServiceBusMessage
+
+from siren_common_utility import AzureServiceBusConnectorInstance
+from siren_common_utility.modules.az_service_bus import InMemoryServiceBus
+from siren_common_utility.modules.telemetry import TELEMETRY, MetricsRegistry, render_prometheus
+
+
+@pytest.fixture
+def registry():
+    registry = TELEMETRY.enable(MetricsRegistry())
+    yield registry
+    TELEMETRY.disable()
+    TELEMETRY.registry = None
+
+
+async def _round_trip(bus, handler):
+    bus.create_subscription('alerts', 'sub')
+    async with AzureServiceBusConnectorInstance(transport=bus) as connector:
+        await connector.send_batch_to_topic('alerts', [ServiceBusMessage(f'm{i}') for i in range(20)])
+        return await connector.consume('alerts', 'sub', handler, idle_timeout=0.05)
+
+
+async def test_connector_records_send_and_settle_metrics(registry):
+    async def handler(msg):
+        pass
+
+    await _round_trip(InMemoryServiceBus(), handler)
+
+    snapshot = registry.snapshot()
+    assert snapshot["siren_servicebus_sent_messages_total"] == {"topic=alerts": 20.0}
+    assert snapshot["siren_servicebus_send_seconds"]["topic=alerts"]["count"] == 1
+    assert snapshot["siren_servicebus_batch_fill_ratio"]["topic=alerts"]["count"] == 1
+    settled = snapshot["siren_servicebus_receive_to_settle_seconds"]
+    assert settled["entity=alerts/Subscriptions/sub,outcome=completed"]["count"] == 20
+
+    text = render_prometheus(registry)
+    assert '# TYPE siren_servicebus_send_seconds histogram' in text
+    assert 'siren_servicebus_sent_messages_total{topic="alerts"} 20' in text
+    assert 'siren_servicebus_send_seconds_bucket{topic="alerts",le="+Inf"} 1' in text
+
+
+async def test_span_hooks_and_disabled_mode():
+    spans = []
+    TELEMETRY.add_span_hook(spans.append)
+    try:
+        async def handler(msg):
+            pass
+
+        await _round_trip(InMemoryServiceBus(), handler)
+    finally:
+        TELEMETRY.remove_span_hook(spans.append)
+
+    names = [span.name for span in spans]
+    assert names.count("servicebus.send") == 1 and names.count("servicebus.process") == 20
+    assert all(span.duration_s >= 0 and span.error is None for span in spans)
+    # 계측이 꺼져 있으면 레지스트리를 만들지 않는다.
+    assert TELEMETRY.registry is None
+    assert not TELEMETRY.tracing
@@ -0,0 +1,70 @@
+import asyncio
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+
+class FakeNaverMapsServer:
+    """Naver Maps Directions/Geocoding API를 흉내내는 로컬 HTTP 서버."""
+
+    def __init__(self, delay: float = 0.0) -> None:
+        self.delay = delay
+        self.calls: list[tuple[str, dict]] = []
+        self.fail_status: int | None = None
+        app = web.Application()
+        app.router.add_get("/map-direction/v1/driving", self._driving)
+        app.router.add_get("/map-geocode/v2/geocode", self._geocode)
+        app.router.add_get("/map-reversegeocode/v2/gc", self._reverse)
+        self.server = TestServer(app)
+
+    @property
+    def base_url(self) -> str:
+        return str(self.server.make_url("")).rstrip("/")
+
+    async def start(self) -> None:
+        await self.server.start_server()
+
+    async def close(self) -> None:
+        await self.server.close()
+
+    def driving_calls(self) -> list[dict]:
+        return [params for path, params in self.calls if path.endswith("/driving")]
+
+    async def _record(self, request: web.Request) -> None:
+        assert request.headers["X-NCP-APIGW-API-KEY-ID"] == "fake-id"
+        assert request.headers["X-NCP-APIGW-API-KEY"] == "fake-secret"
+        self.calls.append((request.path, dict(request.query)))
+        if self.delay:
+            await asyncio.sleep(self.delay)
+
+    async def _driving(self, request: web.Request) -> web.Response:
+        await self._record(request)
+        if self.fail_status is not None:
+            return web.json_response({"error": "fail"}, status=self.fail_status)
+        start, goal = request.query["start"], request.query["goal"]
+        option = request.query.get("option", "traoptimal")
+        if start == goal:
+            return web.json_response({"code": 1, "message": "출발지와 도착지가 동일합니다."})
+        (x1, y1), (x2, y2) = (map(float, p.split(",")) for p in (start, goal))
+        distance = int((abs(x1 - x2) + abs(y1 - y2)) * 100_000)
+        return web.json_response({
+            "code": 0,
+            "message": "길찾기를 성공하였습니다.",
+            "route": {option: [{"summary": {
+                "distance": distance,
+                "duration": distance * 60,
+                "tollFare": 0,
+                "fuelPrice": distance // 10,
+            }}]},
+        })
+
+    async def _geocode(self, request: web.Request) -> web.Response:
+        await self._record(request)
+        return web.json_response({
+            "status": "OK",
+            "addresses": [{"roadAddress": request.query["query"], "x": "126.97", "y": "37.56"}],
+        })
+
+    async def _reverse(self, request: web.Request) -> web.Response:
+        await self._record(request)
+        return web.json_response({"status": {"code": 0}, "results": [{"name": "admcode"}]})
@@ -0,0 +1,208 @@
+"""네임스페이스 없이 테스트하기 위한 ServiceBusClient 대역(Fake) 객체."""
+import asyncio
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from azure.servicebus import NEXT_AVAILABLE_SESSION, ServiceBusMessageBatch
+from azure.servicebus.exceptions import OperationTimeoutError
+
+
+class FakeSender:
+    def __init__(self, topic_name, batch_max_size=1024):
+        self.topic_name = topic_name
+        self.batch_max_size = batch_max_size
+        self.sent = []
+        self.send_calls = 0
+        self.closed = False
+        self.fail_with = []     # send_messages 호출마다 하나씩 꺼내서 발생시킬 예외
+        self.gate = None        # asyncio.Event를 넣으면 set될 때까지 전송이 대기한다
+
+    async def send_messages(self, message, **kwargs):
+        if self.closed:
+            raise RuntimeError("sender closed")
+        self.send_calls += 1
+        if self.gate is not None:
+            await self.gate.wait()
+        if self.fail_with:
+            raise self.fail_with.pop(0)
+        if isinstance(message, (list, ServiceBusMessageBatch)):
+            self.sent.extend(message if isinstance(message, list) else message._messages)
+        else:
+            self.sent.append(message)
+
+    async def create_message_batch(self, max_size_in_bytes=None):
+        return ServiceBusMessageBatch(max_size_in_bytes=max_size_in_bytes or self.batch_max_size)
+
+    async def close(self):
+        self.closed = True
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        await self.close()
+
+
+class FakeReceivedMessage:
+    def __init__(self, body, *, application_properties=None, session_id=None,
+                 correlation_id=None, lock_duration=30):
+        self.body = body
+        self.message_id = str(uuid.uuid4())
+        self.application_properties = application_properties or {}
+        self.session_id = session_id
+        self.correlation_id = correlation_id
+        self.lock_duration = lock_duration
+        self.locked_until_utc = datetime.now(timezone.utc) + timedelta(seconds=lock_duration)
+        self.delivery_count = 0
+
+    def __str__(self):
+        return str(self.body)
+
+
+class FakeReceiver:
+    def __init__(self, messages, **kwargs):
+        self.messages = messages        # 구독 큐 (list, 공유)
+        self.kwargs = kwargs
+        self.completed = []
+        self.abandoned = []
+        self.dead_lettered = []
+        self.renewed = 0
+        self.receive_calls = 0
+        self.closed = False
+
+    async def receive_messages(self, max_message_count=1, max_wait_time=None):
+        self.receive_calls += 1
+        if not self.messages:
+            await asyncio.sleep(min(max_wait_time or 0.01, 0.01))
+            return []
+        batch = self.messages[:max_message_count]
+        del self.messages[:max_message_count]
+        return batch
+
+    async def complete_message(self, message):
+        self.completed.append(message)
+
+    async def abandon_message(self, message):
+        message.delivery_count += 1
+        self.abandoned.append(message)
+
+    async def dead_letter_message(self, message, reason=None, error_description=None):
+        self.dead_lettered.append((message, reason, error_description))
+
+    async def renew_message_lock(self, message):
+        self.renewed += 1
+        message.locked_until_utc = datetime.now(timezone.utc) + timedelta(seconds=message.lock_duration)
+        return message.locked_until_utc
+
+    async def close(self):
+        self.closed = True
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        await self.close()
+
+
+class FakeSession:
+    def __init__(self, client, session_id, lock_duration=30):
+        self._client = client
+        self.session_id = session_id
+        self.lock_duration = lock_duration
+        self.locked_until_utc = datetime.now(timezone.utc) + timedelta(seconds=lock_duration)
+        self.renewed = 0
+
+    async def renew_lock(self):
+        self.renewed += 1
+        self.locked_until_utc = datetime.now(timezone.utc) + timedelta(seconds=self.lock_duration)
+        return self.locked_until_utc
+
+    async def get_state(self):
+        return self._client.session_states.get(self.session_id)
+
+    async def set_state(self, state):
+        self._client.session_states[self.session_id] = state
+
+
+class FakeSessionReceiver(FakeReceiver):
+    """session_id=NEXT_AVAILABLE_SESSION이면 잠기지 않은 세션 중 하나를 수락한다."""
+
+    def __init__(self, client, messages, session_id, **kwargs):
+        super().__init__(messages, **kwargs)
+        self._client = client
+        self._requested_session_id = session_id
+        self.session = None
+
+    async def __aenter__(self):
+        locked = self._client.locked_sessions
+        if self._requested_session_id == NEXT_AVAILABLE_SESSION:
+            session_id = next(
+                (m.session_id for m in self.messages if m.session_id not in locked), None
+            )
+        else:
+            session_id = self._requested_session_id if self._requested_session_id not in locked else None
+        if session_id is None:
+            await asyncio.sleep(min(self.kwargs.get('max_wait_time') or 0.01, 0.01))
+            raise OperationTimeoutError(message="No session available")
+        locked.add(session_id)
+        self.session = FakeSession(self._client, session_id, self._client.session_lock_duration)
+        return self
+
+    async def receive_messages(self, max_message_count=1, max_wait_time=None):
+        self.receive_calls += 1
+        batch = [m for m in self.messages if m.session_id == self.session.session_id][:max_message_count]
+        if not batch:
+            await asyncio.sleep(min(max_wait_time or 0.01, 0.01))
+            return []
+        for m in batch:
+            self.messages.remove(m)
+        return batch
+
+    async def close(self):
+        if self.session is not None:
+            self._client.locked_sessions.discard(self.session.session_id)
+        self.closed = True
+
+
+class FakeServiceBusClient:
+    def __init__(self, batch_max_size=1024):
+        self.batch_max_size = batch_max_size
+        self.senders = []
+        self.closed = False
+        self.sender_failures = []   # 새로 만드는 Sender에 주입할 예외 목록
+        self.send_gate = None       # 새로 만드는 Sender에 넣을 asyncio.Event
+        self.subscriptions = {}     # (topic, subscription) -> 수신 대기 메세지 리스트
+        self.receivers = []
+        self.locked_sessions = set()
+        self.session_states = {}
+        self.session_lock_duration = 30
+
+    @classmethod
+    def from_connection_string(cls, conn_str, **kwargs):
+        return cls()
+
+    def get_topic_sender(self, topic_name, **kwargs):
+        sender = FakeSender(topic_name, batch_max_size=self.batch_max_size)
+        sender.gate = self.send_gate
+        if self.sender_failures:
+            sender.fail_with.append(self.sender_failures.pop(0))
+        self.senders.append(sender)
+        return sender
+
+    def get_subscription_receiver(self, topic_name, subscription_name, **kwargs):
+        messages = self.subscriptions.setdefault((topic_name, subscription_name), [])
+        session_id = kwargs.pop('session_id', None)
+        if session_id is not None:
+            receiver = FakeSessionReceiver(self, messages, session_id, **kwargs)
+        else:
+            receiver = FakeReceiver(messages, **kwargs)
+        self.receivers.append(receiver)
+        return receiver
+
+    def sent_messages(self, topic_name=None):
+        return [
+            m for s in self.senders if topic_name in (None, s.topic_name) for m in s.sent
+        ]
+
+    async def close(self):
+        self.closed = True